@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for DPIA analysis results
+Two tiers: an in-memory LRU with TTL, and an optional SQLite store that survives restarts
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+def normalize_text(text: str) -> str:
+    """Normalize research text so re-pastes with different whitespace share a cache entry"""
+    return " ".join(text.split())
+
+def hash_context(context_data: Optional[Dict[str, Any]]) -> str:
+    """Stable hash of the reference context/guidelines sent with each analysis"""
+    serialized = json.dumps(context_data or {}, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+def make_cache_key(text: str,
+                   model_name: str,
+                   temperature: float,
+                   context_data: Optional[Dict[str, Any]] = None,
+                   prompt_version: str = "") -> str:
+    """Build a cache key from normalized text, model name, temperature, context hash and prompt version"""
+    parts = [
+        normalize_text(text),
+        model_name,
+        f"{temperature:.4f}",
+        hash_context(context_data),
+        prompt_version
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+class AnalysisCache:
+    """
+    LRU + TTL cache of analysis results (stored as JSON-compatible dicts)
+    backed by an optional SQLite file for persistence across restarts
+    """
+
+    def __init__(self,
+                 max_entries: int = 256,
+                 ttl_seconds: float = 3600.0,
+                 sqlite_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+        self._memory: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+            "writes": 0
+        }
+
+        if sqlite_path:
+            self._open_db(sqlite_path)
+
+    def _open_db(self, sqlite_path: str):
+        """Open the SQLite tier; the cache keeps working in memory if this fails"""
+        try:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_analysis_cache_expires ON analysis_cache(expires_at)")
+            self._db.execute("DELETE FROM analysis_cache WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+            logger.info(f"Analysis cache SQLite tier enabled at {sqlite_path}")
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache SQLite tier disabled: {e}")
+            self._db = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached result, checking memory first and then disk"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+                self._stats["expirations"] += 1
+
+            value = self._disk_get(key, now)
+            if value is not None:
+                self._memory_set(key, value, now + self.ttl_seconds)
+                self._stats["hits"] += 1
+                self._stats["disk_hits"] += 1
+                return value
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Store a result in both tiers"""
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._memory_set(key, value, expires_at)
+            self._disk_set(key, value, expires_at)
+            self._stats["writes"] += 1
+
+    def invalidate(self, key: str) -> bool:
+        """Remove a single entry from both tiers"""
+        with self._lock:
+            removed = self._memory.pop(key, None) is not None
+            if self._db is not None:
+                try:
+                    cursor = self._db.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    removed = removed or cursor.rowcount > 0
+                except sqlite3.Error as e:
+                    logger.warning(f"Analysis cache SQLite delete failed: {e}")
+            if removed:
+                self._stats["invalidations"] += 1
+            return removed
+
+    def invalidate_all(self) -> int:
+        """Drop every cached result, e.g. after the reference context changes"""
+        with self._lock:
+            removed = len(self._memory)
+            self._memory.clear()
+            if self._db is not None:
+                try:
+                    cursor = self._db.execute("DELETE FROM analysis_cache")
+                    self._db.commit()
+                    removed = max(removed, cursor.rowcount)
+                except sqlite3.Error as e:
+                    logger.warning(f"Analysis cache SQLite clear failed: {e}")
+            self._stats["invalidations"] += removed
+            logger.info(f"Analysis cache invalidated ({removed} entries)")
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and tier sizes"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "persistent": self._db is not None
+            }
+
+    def close(self):
+        """Close the SQLite tier"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _memory_set(self, key: str, value: Dict[str, Any], expires_at: float):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_get(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._db.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                self._db.commit()
+                self._stats["expirations"] += 1
+                return None
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Analysis cache SQLite read failed: {e}")
+            return None
+
+    def _disk_set(self, key: str, value: Dict[str, Any], expires_at: float):
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, default=str), expires_at, time.time())
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache SQLite write failed: {e}")
+
+def create_analysis_cache() -> Optional[AnalysisCache]:
+    """
+    Create the analysis cache from environment variables.
+    Set ANALYSIS_CACHE_SQLITE_PATH to enable the on-disk tier.
+    """
+    if os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() != "true":
+        logger.info("Analysis cache disabled")
+        return None
+
+    return AnalysisCache(
+        max_entries=int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "256")),
+        ttl_seconds=float(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "3600")),
+        sqlite_path=os.getenv("ANALYSIS_CACHE_SQLITE_PATH") or None
+    )
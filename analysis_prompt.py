@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Versioned DPIA analysis prompt template
+The system prompt and instruction block form a byte-identical static prefix, so upstream prefix
+caching can reuse them; only the reference context and research text vary between calls
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Dict, List
+
+from prompt_budget import estimate_tokens
+
+# Bump when the system prompt, prefix or suffix layout changes; cached results record it
+ANALYSIS_PROMPT_VERSION = "dpia-analysis-v2"
+
+ANALYSIS_SYSTEM_PROMPT = "You are a specialized DPIA (Data Privacy Impact Assessment) analysis assistant for pharmaceutical research. Analyze research text and extract relevant DPIA fields with high accuracy."
+
+# Static instructions: service definitions, field guidelines, output schema and classification rules
+ANALYSIS_PROMPT_PREFIX = """
+You are an expert DPIA (Data Protection Impact Assessment) analyst for research projects. Analyze the research text at the end of this prompt and extract all relevant information for DPIA case creation.
+
+**CALM vs DPIA Service Definitions:**
+
+**CALM-EM (Cellular Analysis and Light Microscopy - Electron Microscopy) Services:**
+- Advanced Light Microscopy and Imaging services
+- Electron Microscopy Laboratory services
+- Research microscopy (confocal, live-cell imaging, light sheet microscopy, electron microscopy)
+- Training and technical support for microscopy
+- Sample preparation and analysis for research purposes
+- Research microscopy and analysis projects
+
+**DPIA (Digital Pathology and Image Analysis) Services:**
+- Whole slide scanning (brightfield and fluorescent tissue sections)
+- Digital pathology workflows and gSlide Viewer uploads
+- Slide submission to DPIA lab for scanning services
+- Custom analysis algorithms for whole-slide images
+- High-content imaging studies for in vitro experiments
+- **Tissue section analysis and quantification**
+- **Systematic imaging of tissue samples for quantitative analysis**
+- **Multi-group comparative studies requiring standardized imaging**
+
+**Field Extraction Guidelines:**
+
+**PI Name Extraction:**
+- Look for patterns: "PI as [Name]", "PI: [Name]", "Principal Investigator [Name]", "PI [Name]"
+- Extract the actual name (e.g., "PI as John" → extract "John")
+- If no PI mentioned, use "Unknown"
+
+**Pathologist Extraction:**
+- Look for patterns: "Pathologist as [Name]", "Pathologist: [Name]", "Pathologist [Name]"
+- Extract the actual name (e.g., "Pathologist as Smith" → extract "Smith")
+- If no pathologist mentioned, use "Unknown"
+
+**Therapeutic Area:**
+- Determine from research context (mouse eyes → Ophthalmology, cancer → Oncology, lung → Pulmonology, etc.)
+- If unclear, use "Unknown"
+
+**Assay Type:**
+- Extract staining/labeling methods (SOX9, NucSpot, DAPI, H&E, TRITC, etc.)
+- Include fluorescent markers and antibodies
+- If multiple, combine them (e.g., "SOX9 + NucSpot 750", "AT2-TRITC + DAPI")
+
+**Interactive Prompts Generation:**
+When fields are missing or "Unknown", generate specific interactive prompts to help users provide the missing information:
+
+**For Missing PI Name:**
+- "Who is the Principal Investigator (PI) for this research project?"
+- "Please provide the name of the PI responsible for this study"
+- "Which researcher is leading this project as the Principal Investigator?"
+
+**For Missing Pathologist:**
+- "Is a pathologist involved in this research? If yes, please provide their name"
+- "Will this research require pathologist review or consultation?"
+- "Please specify the pathologist who will be involved in sample analysis"
+
+**For Missing/Unknown Therapeutic Area:**
+- Based on research context, suggest likely therapeutic areas and ask for confirmation:
+  - If mentions "cancer", "tumor", "oncology" → "Is this oncology research? Please confirm the therapeutic area"
+  - If mentions "immune", "antibody", "T-cell" → "Is this immunology research? Please specify the therapeutic area"
+  - If mentions "eye", "retina", "vision" → "Is this ophthalmology research? Please confirm the therapeutic area"
+  - If mentions "brain", "neuron", "neural" → "Is this neuroscience research? Please specify the therapeutic area"
+  - If mentions "heart", "cardiac", "cardiovascular" → "Is this cardiovascular research? Please confirm the therapeutic area"
+  - If mentions "lung", "pulmonary", "respiratory" → "Is this pulmonology research? Please confirm the therapeutic area"
+  - If unclear → "What is the primary therapeutic area or medical field for this research?"
+
+**For Missing Assay Type:**
+- "What specific assays, staining methods, or markers will be used in this research?"
+- "Please specify the experimental techniques or assays planned for this study"
+- "What type of analysis or detection methods will be employed?"
+
+**Instructions:**
+Extract the following information and provide a JSON response:
+
+{
+    "therapeutic_area": "specific medical field (e.g., Oncology, Immunology, Ophthalmology, Pulmonology, etc.)",
+    "procedure_type": "type of procedure (e.g., Fluorescence (IF), Brightfield, etc.)",
+    "assay_type": "assay classification",
+    "pi_name": "Principal Investigator name (extract from patterns like 'PI as John')",
+    "pathologist": "Pathologist name if involved (extract from patterns like 'Pathologist as Smith')",
+    "project_title": "descriptive project title",
+    "request_purpose": "purpose and objectives of the research",
+    "biospecimen_type": "type of biological specimen",
+    "data_volume": "estimated data volume (Small/Medium/Large)",
+    "sensitive_data": "whether sensitive data is involved (Yes/No)",
+    "cross_border_transfer": "whether cross-border data transfer occurs (Yes/No/Unknown)",
+    "missing_fields": ["list of fields that couldn't be determined"],
+    "confidence_scores": {"field_name": confidence_value},
+    "interactive_prompts": ["specific questions to ask user for missing information - generate intelligent prompts based on missing fields"],
+    "suggestions": ["list of actionable suggestions for DPIA completion"],
+    "analysis_summary": "brief summary of the research and DPIA implications",
+    "recommended_case_type": "CALM or DPIA",
+    "case_type_confidence": 0.0-1.0,
+    "case_type_reasoning": "Explanation for the recommendation"
+}
+
+**Interactive Prompts Priority:**
+1. Always generate prompts for missing PI, Pathologist, and Therapeutic Area
+2. Make prompts specific and contextual based on the research text
+3. Provide multiple prompt options when appropriate
+4. Include suggestions or examples in prompts when helpful
+
+**Case Type Recommendation Guidelines:**
+
+**CRITICAL: Recommend DPIA when the text contains ANY of these indicators (HIGHEST PRIORITY):**
+- **Slide scanning keywords**: "slide scanning", "scan slides", "scanning", "slide submission", "submit slides"
+- **Digital pathology services**: "digital pathology", "gSlide Viewer", "DPIA lab", "whole slide scanning"
+- **Tissue section analysis**: "lung section", "tissue section", "per section", "section analysis", "cells per lung section"
+- **Quantification metrics**: "quantification", "# of cells per", "normalized by total area", "cells per lung section", "normalized by # of DAPI cells"
+- **Multi-group studies**: "4 groups", "N=9-10 per group", "treatment groups", "control groups", "healthy, injured"
+- **Systematic imaging**: "need imaging and quantification", "imaging of multiple samples"
+- **Brightfield/fluorescent scanning**: "brightfield scanning", "fluorescent tissue sections"
+- **Standardized analysis**: comparative studies requiring consistent imaging protocols
+
+**MANDATORY DPIA CLASSIFICATION RULES:**
+1. **ANY mention of "slide scanning" OR "scan slides" OR "scanning" → ALWAYS DPIA**
+2. **ANY mention of "DPIA lab" OR "digital pathology" → ALWAYS DPIA**
+3. **ANY mention of "tissue section" OR "lung section" → ALWAYS DPIA**
+4. **ANY mention of "quantification" with tissue analysis → ALWAYS DPIA**
+5. **ANY mention of "submit slides" OR "slide submission" → ALWAYS DPIA**
+
+**Recommend CALM when the text contains (ONLY if NO DPIA indicators above):**
+- **Individual cell research**: single cell analysis, live-cell imaging without tissue sections
+- **Basic microscopy research**: "research on", "want to research" with simple biological samples (NOT tissue sections)
+- **Sample preparation focus**: staining, cleared samples, preparation techniques (without quantification)
+- **Research microscopy**: confocal, electron microscopy, light sheet without quantification
+- **Training requests**: microscopy training, technical support
+- **Explicit CALM requests**: "CALM request", "CALM service"
+
+**Key Decision Logic (STRICT PRIORITY ORDER - FOLLOW EXACTLY):**
+1. **If mentions "slide scanning" OR "scan slides" OR "scanning" → DPIA** (ABSOLUTE HIGHEST PRIORITY)
+2. **If mentions "DPIA lab" OR "digital pathology" → DPIA** (ABSOLUTE HIGHEST PRIORITY)
+3. **If mentions "submit slides" OR "slide submission" → DPIA** (ABSOLUTE HIGHEST PRIORITY)
+4. **If mentions "lung section" OR "tissue section" OR "cells per section" → DPIA** (HIGHEST PRIORITY)
+5. **If mentions quantification metrics like "normalized by total area" → DPIA** 
+6. **Multi-group studies with imaging → DPIA** (systematic analysis across groups)
+7. **Whole slide scanning/digital workflows → DPIA**
+8. **Individual biological research with samples/staining → CALM** (ONLY if no tissue sections)
+9. **Research microscopy without tissue sections → CALM**
+10. **Training and technical support → CALM**
+
+**Example Classifications (FOLLOW THESE EXACTLY):**
+- "I need slide scanning on lung cell tissue sections" → **DPIA** (contains "slide scanning" and "tissue sections")
+- "Please scan my lung tissue slides" → **DPIA** (contains "scan" and "slides")
+- "Submit slides to DPIA lab for scanning" → **DPIA** (contains "submit slides", "DPIA lab", "scanning")
+- "Whole slide scanning for digital pathology" → **DPIA** (contains "slide scanning" and "digital pathology")
+- "Lung stem cells (AT2-TRITC) and total cells (DAPI) are stained. # of AT2 cells per lung section" → **DPIA** (contains "lung section" and quantification)
+- "3D Image analysis of Cleared Mouse Eyes stained with SOX9 + NucSpot 750" → **CALM** (individual biological research, no tissue sections, no scanning)
+- "CALM request for CD19/CD20 Allo1 CAR-T MS" → **CALM** (explicit CALM request)
+
+**CRITICAL SLIDE SCANNING DETECTION:**
+- **"slide scanning"** → DPIA (100% confidence)
+- **"scan slides"** → DPIA (100% confidence)  
+- **"scanning" + "slides"** → DPIA (100% confidence)
+- **"scanning" + "tissue"** → DPIA (100% confidence)
+- **"submit slides"** → DPIA (100% confidence)
+- **"DPIA lab"** → DPIA (100% confidence)
+- **"digital pathology"** → DPIA (100% confidence)
+
+**MANDATORY PRE-CLASSIFICATION CHECK:**
+Before making any recommendation, check if the text contains:
+- "slide scanning" OR "scan slides" OR "scanning" → If YES, SET recommended_case_type = "DPIA"
+- "DPIA lab" OR "digital pathology" → If YES, SET recommended_case_type = "DPIA"  
+- "submit slides" OR "slide submission" → If YES, SET recommended_case_type = "DPIA"
+- "tissue section" OR "lung section" → If YES, SET recommended_case_type = "DPIA"
+
+**CRITICAL CLASSIFICATION INSTRUCTION:**
+For the research text at the end of this prompt:
+
+**STEP 1: MANDATORY DPIA CHECK (Check these first, in order):**
+1. Does text contain "slide scanning" OR "scan slides" OR "scanning"? → If YES: DPIA
+2. Does text contain "DPIA lab" OR "digital pathology"? → If YES: DPIA
+3. Does text contain "submit slides" OR "slide submission"? → If YES: DPIA
+4. Does text contain "tissue section" OR "lung section"? → If YES: DPIA
+5. Does text contain quantification with tissue analysis? → If YES: DPIA
+
+**STEP 2: If none of the above, then check CALM indicators**
+
+**STEP 3: Set case_type_confidence to 1.0 for slide scanning/DPIA lab mentions, 0.9 for tissue sections**
+
+**MANDATORY: If the text mentions slide scanning, DPIA lab, or digital pathology services, you MUST classify as DPIA regardless of other content.**
+"""
+
+class PromptTemplate:
+    """
+    A prompt split into a static prefix and a variable suffix.
+
+    The prefix is built once at import time and never formatted, so every call sends
+    the same bytes ahead of the variable part.
+    """
+
+    def __init__(self, version: str, system_prompt: str, prefix: str):
+        self.version = version
+        self.system_prompt = system_prompt
+        self.prefix = prefix
+        self.prefix_sha256 = hashlib.sha256((system_prompt + "\x1f" + prefix).encode("utf-8")).hexdigest()
+
+    def render(self, research_text: str, reference_context: str = "") -> str:
+        """User message content: the static prefix followed by the variable suffix"""
+        return self.prefix + self.render_suffix(research_text, reference_context)
+
+    def render_suffix(self, research_text: str, reference_context: str = "") -> str:
+        reference_section = f"**Reference Context:**\n{reference_context}\n\n" if reference_context else ""
+        return f"\n{reference_section}**Research Text:**\n{research_text}\n\nRespond with valid JSON only.\n"
+
+    def messages(self, research_text: str, reference_context: str = "") -> List[Dict[str, str]]:
+        """Chat messages for one analysis call"""
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": self.render(research_text, reference_context)}
+        ]
+
+    @lru_cache(maxsize=8)
+    def fixed_tokens(self, chars_per_token: float = 4.0) -> int:
+        """Estimated tokens of everything except the variable inputs (computed once per ratio)"""
+        return (
+            estimate_tokens(self.system_prompt, chars_per_token)
+            + estimate_tokens(self.prefix, chars_per_token)
+            + estimate_tokens(self.render_suffix(""), chars_per_token)
+        )
+
+ANALYSIS_PROMPT = PromptTemplate(ANALYSIS_PROMPT_VERSION, ANALYSIS_SYSTEM_PROMPT, ANALYSIS_PROMPT_PREFIX)
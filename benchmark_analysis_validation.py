@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark for turning a Galileo completion response into an AnalysisResult
+Compares the previous multi-pass conversion (response.json(), json.loads of the content,
+DPIAAnalysisResult from .get() lookups, then a validated AnalysisResult copy) with
+single-pass validation from the response bytes
+"""
+
+import json
+import time
+import logging
+import timeit
+import tracemalloc
+
+import httpx
+
+from galileo_claude_adapter import AnalysisResult
+from galileo_integration import ChatCompletionEnvelope, DPIAAnalysisResult, _strip_code_fences
+from mock_galileo_server import build_dpia_analysis
+from tiered_analysis import KeywordAnalyzer
+
+logger = logging.getLogger("galileo_integration")
+
+SAMPLE_TEXT = (
+    "Lung stem cells (AT2-TRITC) and total cells (DAPI) are stained in lung sections from 4 groups "
+    "(healthy, injured, injured + vehicle, injured + treatment), N=9-10 per group. We need slide scanning and "
+    "quantification: # of AT2 cells per lung section normalized by total area. PI as John, Pathologist as Smith."
+)
+
+def _sample_response() -> httpx.Response:
+    content = json.dumps(build_dpia_analysis(KeywordAnalyzer(), SAMPLE_TEXT))
+    body = {
+        "id": "chatcmpl-benchmark",
+        "object": "chat.completion",
+        "model": "galileo-llm-v1",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 3100, "completion_tokens": 420}
+    }
+    return httpx.Response(200, content=json.dumps(body).encode("utf-8"))
+
+def legacy_convert(response: httpx.Response) -> AnalysisResult:
+    """Previous path: dict envelope, re-parsed content, field-by-field copies validated twice"""
+    llm_response = response.json()["choices"][0]["message"]["content"].strip()
+    if llm_response.startswith("```json"):
+        llm_response = llm_response[7:]
+    if llm_response.endswith("```"):
+        llm_response = llm_response[:-3]
+    parsed = json.loads(llm_response)
+    logger.info(f"🔍 Galileo AI parsed response keys: {list(parsed.keys())}")
+    if "recommended_case_type" in parsed:
+        logger.info(f"🎯 Case type recommendation found: {parsed['recommended_case_type']}")
+    galileo_result = DPIAAnalysisResult(
+        therapeutic_area=parsed.get("therapeutic_area", "Unknown"),
+        procedure_type=parsed.get("procedure_type", "Unknown"),
+        assay_type=parsed.get("assay_type", "Unknown"),
+        pi_name=parsed.get("pi_name", "Unknown"),
+        pathologist=parsed.get("pathologist", "Unknown"),
+        project_title=parsed.get("project_title", "Research Analysis"),
+        request_purpose=parsed.get("request_purpose", "Data Analysis"),
+        biospecimen_type=parsed.get("biospecimen_type", "Unknown"),
+        data_volume=parsed.get("data_volume", "Unknown"),
+        sensitive_data=parsed.get("sensitive_data", "Unknown"),
+        cross_border_transfer=parsed.get("cross_border_transfer", "Unknown"),
+        missing_fields=parsed.get("missing_fields", []),
+        confidence_scores=parsed.get("confidence_scores", {}),
+        interactive_prompts=parsed.get("interactive_prompts", []),
+        suggestions=parsed.get("suggestions", []),
+        analysis_summary=parsed.get("analysis_summary", "Analysis completed"),
+        recommended_case_type=parsed.get("recommended_case_type", "Unknown"),
+        case_type_confidence=parsed.get("case_type_confidence", 0.0),
+        case_type_reasoning=parsed.get("case_type_reasoning", ""),
+        is_fallback=parsed.get("is_fallback", False)
+    )
+    detected_fields = {
+        field: getattr(galileo_result, field) for field in (
+            "therapeutic_area", "procedure_type", "assay_type", "pi_name", "pathologist", "project_title",
+            "request_purpose", "biospecimen_type", "data_volume", "sensitive_data", "cross_border_transfer",
+            "recommended_case_type"
+        )
+    }
+    interactive_prompts = []
+    for prompt in galileo_result.interactive_prompts:
+        if isinstance(prompt, str):
+            interactive_prompts.append({"question": prompt, "field": "unknown", "type": "text"})
+        else:
+            interactive_prompts.append(prompt)
+    return AnalysisResult(
+        detected_fields=detected_fields,
+        missing_fields=galileo_result.missing_fields,
+        confidence_scores=galileo_result.confidence_scores,
+        interactive_prompts=interactive_prompts,
+        suggestions=galileo_result.suggestions,
+        analysis_summary=galileo_result.analysis_summary,
+        therapeutic_area=galileo_result.therapeutic_area,
+        procedure_type=galileo_result.procedure_type,
+        assay_type=galileo_result.assay_type,
+        pi_name=galileo_result.pi_name,
+        pathologist=galileo_result.pathologist,
+        project_title=galileo_result.project_title,
+        request_purpose=galileo_result.request_purpose,
+        compliance_status="Requires Review",
+        galileo_insights={"analysis_type": "dpia_analysis", **(galileo_result.galileo_insights or {})},
+        recommended_case_type=galileo_result.recommended_case_type,
+        case_type_confidence=galileo_result.case_type_confidence,
+        case_type_reasoning=galileo_result.case_type_reasoning
+    )
+
+def single_pass_convert(response: httpx.Response) -> AnalysisResult:
+    """Current path: envelope and content validated from bytes, adapter view built without re-validation"""
+    content = ChatCompletionEnvelope.model_validate_json(response.content).content
+    galileo_result = DPIAAnalysisResult.model_validate_json(_strip_code_fences(content))
+    return AnalysisResult.from_galileo_result(galileo_result)
+
+def _measure(convert, response: httpx.Response, iterations: int, repeat: int = 5):
+    """Best-of-repeat CPU time per conversion and the peak traced allocation of one conversion"""
+    timer = timeit.Timer(lambda: convert(response), timer=time.process_time)
+    cpu_us = min(timer.repeat(repeat=repeat, number=iterations)) / iterations * 1e6
+
+    tracemalloc.start()
+    result = convert(response)
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    convert(response)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return cpu_us, peak, result
+
+def main(iterations: int = 2000):
+    response = _sample_response()
+    print(f"📏 Analysis validation benchmark ({iterations} conversions x 5, {len(response.content)} byte response)")
+    results = {}
+    for name, convert in (("legacy multi-pass", legacy_convert), ("single-pass", single_pass_convert)):
+        cpu_us, peak, results[name] = _measure(convert, response, iterations)
+        print(f"  {name:18s} {cpu_us:8.2f} µs CPU/analysis | peak allocation {peak / 1024:6.1f} KiB")
+    assert results["legacy multi-pass"].model_dump() == results["single-pass"].model_dump()
+    print("  Both paths produce identical AnalysisResult values")
+
+if __name__ == "__main__":
+    main()
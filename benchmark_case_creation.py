@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark for case creation throughput against the local Pega stand-in
+Submits cases through the outbox at several concurrency levels while the mock Pega adds latency,
+injects 5xx errors and throttles with 429 + Retry-After, and reports how long it takes until every
+case is confirmed
+"""
+
+import os
+import time
+import asyncio
+import logging
+import tempfile
+
+import httpx
+
+from case_outbox import OUTBOX_CREATED, OUTBOX_FAILED, CaseOutbox, CaseOutboxConfig
+from mock_galileo_server import LATENCY_LOGNORMAL
+from mock_pega_server import MockPegaConfig, create_app
+from pega_cache import PegaCacheConfig
+from pega_client import PegaClient, PegaConfig
+
+CASES = 200
+MOCK_PEGA = MockPegaConfig(
+    latency_profile=LATENCY_LOGNORMAL,
+    latency_ms=150,  # median create_case round trip
+    error_rate=0.03,
+    throttle_rate=0.02,
+    retry_after_seconds=0.2,
+    validation_error_rate=0.01,
+    seed=42
+)
+
+def _percentile(samples, percentile: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+async def _run(concurrency: int):
+    app = create_app(MOCK_PEGA)
+    client = PegaClient(
+        PegaConfig(base_url="http://mock-pega/prweb/api/v1", cache=PegaCacheConfig(enabled=False)),
+        transport=httpx.ASGITransport(app=app)
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        outbox = CaseOutbox(client.create_case, CaseOutboxConfig(
+            sqlite_path=os.path.join(directory, "outbox.sqlite3"),
+            ack_timeout_seconds=1.0, base_backoff_seconds=0.05, max_backoff_seconds=1.0, poll_interval_seconds=0.05
+        ))
+        slots = asyncio.Semaphore(concurrency)
+        ack_ms = []
+
+        async def submit(number: int):
+            async with slots:
+                start_time = time.perf_counter()
+                await outbox.submit({"caseTypeID": "Roche-Pathworks-Work-DPIA", "processID": "pyStartCase",
+                                     "content": {"pyLabel": f"Benchmark case {number}"}})
+                ack_ms.append((time.perf_counter() - start_time) * 1000)
+
+        start_time = time.perf_counter()
+        try:
+            await asyncio.gather(*[submit(number) for number in range(CASES)])
+            while True:
+                stats = outbox.stats()
+                if stats[OUTBOX_CREATED] + stats[OUTBOX_FAILED] >= CASES:
+                    break
+                await asyncio.sleep(0.02)
+            total = time.perf_counter() - start_time
+        finally:
+            await outbox.stop()
+            await client.close()
+    return stats, app.state.mock.get_stats(), ack_ms, total
+
+def main(levels=(1, 8, 32)):
+    logging.getLogger("case_outbox").setLevel(logging.CRITICAL)  # every injected failure would log a retry
+    print(
+        f"📮 Case creation benchmark ({CASES} cases, {MOCK_PEGA.latency_ms:.0f} ms median Pega latency, "
+        f"{MOCK_PEGA.error_rate:.0%} errors, {MOCK_PEGA.throttle_rate:.0%} throttled, "
+        f"{MOCK_PEGA.validation_error_rate:.0%} validation failures)"
+    )
+    for concurrency in levels:
+        stats, pega, ack_ms, total = asyncio.run(_run(concurrency))
+        print(
+            f"  concurrency {concurrency:3d} | {stats[OUTBOX_CREATED] / total:7.1f} cases/s | total {total * 1000:8.1f} ms | "
+            f"ack p50 {_percentile(ack_ms, 50):7.1f} ms p95 {_percentile(ack_ms, 95):7.1f} ms | "
+            f"created {stats[OUTBOX_CREATED]} failed {stats[OUTBOX_FAILED]} | "
+            f"pega requests {pega['requests']} ({pega['errors_injected']} 5xx, {pega['throttled']} 429)"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark for listing every Pega case
+Compares buffering all pages before responding, streaming page by page, and streaming with the
+next page prefetched, against a mock Pega with per-page latency and a consumer that spends time
+writing each page (as /cases/stream does to a client)
+"""
+
+import time
+import asyncio
+
+import httpx
+
+from case_batch import ndjson_line
+from pega_client import PegaClient, PegaConfig
+from pega_cache import PegaCacheConfig
+
+PER_PAGE = 100
+PAGE_LATENCY_SECONDS = 0.04  # Pega round trip per page
+ROW_LATENCY_SECONDS = 0.00005  # Pega serialization cost per case
+CONSUMER_PAGE_SECONDS = 0.03  # writing one page of NDJSON to a client
+
+def _mock_pega(total_cases: int) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get("page", 1))
+        per_page = int(request.url.params.get("per_page", PER_PAGE))
+        start = (page - 1) * per_page
+        cases = [
+            {"ID": f"DPIA-{number}", "caseTypeID": "Roche-Pathworks-Work-DPIA", "status": "Open" if number % 3 else "Resolved"}
+            for number in range(start + 1, min(start + per_page, total_cases) + 1)
+        ]
+        await asyncio.sleep(PAGE_LATENCY_SECONDS + ROW_LATENCY_SECONDS * len(cases))
+        return httpx.Response(200, json={"cases": cases})
+
+    return httpx.MockTransport(handler)
+
+async def _consume_page(rows) -> int:
+    """Serialize a page as NDJSON and wait for the (simulated) client to take it"""
+    written = sum(len(ndjson_line({"type": "case", "case": row})) for row in rows)
+    await asyncio.sleep(CONSUMER_PAGE_SECONDS)
+    return written
+
+async def _run(total_cases: int, mode: str):
+    client = PegaClient(
+        PegaConfig(base_url="http://pega.test/prweb/api/v1", cache=PegaCacheConfig(enabled=False)),
+        transport=_mock_pega(total_cases)
+    )
+    start_time = time.perf_counter()
+    first_row = None
+    rows = 0
+    try:
+        if mode == "buffered":
+            pages = [items async for items in client.iter_case_pages(per_page=PER_PAGE, prefetch=False)]
+            for items in pages:
+                first_row = first_row or time.perf_counter()
+                rows += len(items)
+                await _consume_page(items)
+        else:
+            async for items in client.iter_case_pages(per_page=PER_PAGE, prefetch=mode == "prefetch"):
+                first_row = first_row or time.perf_counter()
+                rows += len(items)
+                await _consume_page(items)
+    finally:
+        await client.close()
+    total = time.perf_counter() - start_time
+    return rows, (first_row - start_time) * 1000, total * 1000
+
+def main(sizes=(1000, 10000)):
+    print(
+        f"📄 Case listing benchmark ({PER_PAGE} per page, {PAGE_LATENCY_SECONDS * 1000:.0f} ms Pega page latency, "
+        f"{CONSUMER_PAGE_SECONDS * 1000:.0f} ms to write each page)"
+    )
+    for total_cases in sizes:
+        for mode, label in (("buffered", "buffer all pages"), ("sequential", "stream page by page"), ("prefetch", "stream + prefetch")):
+            rows, first_row_ms, total_ms = asyncio.run(_run(total_cases, mode))
+            print(f"  {total_cases:6d} cases | {label:20s} | first row {first_row_ms:8.1f} ms | total {total_ms:8.1f} ms | {rows} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark for analysis prompt assembly
+Compares the previous layout (whole instruction block rebuilt with an f-string, research text
+interpolated twice) with the precompiled template (static prefix + variable suffix)
+"""
+
+import json
+import timeit
+
+from analysis_prompt import ANALYSIS_PROMPT, ANALYSIS_SYSTEM_PROMPT
+
+SAMPLE_TEXT = (
+    "Lung stem cells (AT2-TRITC) and total cells (DAPI) are stained in lung sections from 4 groups "
+    "(healthy, injured, injured + vehicle, injured + treatment), N=9-10 per group. We need imaging and "
+    "quantification: # of AT2 cells per lung section normalized by total area. PI as John, Pathologist as Smith."
+)
+
+_INTRO_END = "for DPIA case creation.\n"
+_CLASSIFICATION_MARKER = "**CRITICAL CLASSIFICATION INSTRUCTION:**\nFor the research text at the end of this prompt:"
+_intro, _body = ANALYSIS_PROMPT.prefix.split(_INTRO_END, 1)
+_intro = _intro.replace("Analyze the research text at the end of this prompt", "Analyze the following research text")
+_body_before, _body_after = _body.split(_CLASSIFICATION_MARKER, 1)
+
+def legacy_build(research_text: str, reference_context: str = "") -> str:
+    """Previous layout: the research text near the top and again in the classification step"""
+    reference_section = f"\n**Reference Context:**\n{reference_context}\n" if reference_context else ""
+    return f"""{_intro}{_INTRO_END}
+**Research Text:** {research_text}
+{reference_section}{_body_before}**CRITICAL CLASSIFICATION INSTRUCTION:**
+For the current research text: "{research_text}"{_body_after}
+Respond with valid JSON only.
+"""
+
+def template_build(research_text: str, reference_context: str = "") -> str:
+    return ANALYSIS_PROMPT.render(research_text, reference_context)
+
+def _payload_bytes(user_prompt: str) -> int:
+    messages = [
+        {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+    return len(json.dumps({"messages": messages}).encode("utf-8"))
+
+def _stable_prefix_bytes(build) -> int:
+    """Bytes of the user prompt that are identical for two different research texts"""
+    first, second = build("alpha research text"), build("omega research text")
+    length = 0
+    for a, b in zip(first, second):
+        if a != b:
+            break
+        length += 1
+    return len(ANALYSIS_SYSTEM_PROMPT.encode("utf-8")) + len(first[:length].encode("utf-8"))
+
+def main(iterations: int = 20000):
+    print(f"📏 Analysis prompt build benchmark ({iterations} calls, template {ANALYSIS_PROMPT.version})")
+    for name, build in (("legacy f-string", legacy_build), ("precompiled template", template_build)):
+        seconds = timeit.timeit(lambda: build(SAMPLE_TEXT), number=iterations)
+        prompt = build(SAMPLE_TEXT)
+        print(
+            f"  {name:22s} {seconds / iterations * 1e6:8.2f} µs/call | "
+            f"payload {_payload_bytes(prompt):6d} bytes | "
+            f"cacheable prefix {_stable_prefix_bytes(build):6d} bytes"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Bounded-concurrency batch runner for case creation
+Items run concurrently and their results are yielded in completion order; one item's failure
+is reported as its own result instead of failing the batch
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Sequence, TypeVar
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BATCH_ITEM_CREATED = "created"
+BATCH_ITEM_QUEUED = "queued"  # Pega has not confirmed yet; case_id is the outbox's provisional ID
+BATCH_ITEM_DEMO = "demo"  # Pega unavailable, a demo case ID was returned (outbox disabled)
+BATCH_ITEM_FAILED = "failed"
+
+class CaseBatchConfig(BaseModel):
+    """Default and maximum concurrency for batch case creation"""
+    analysis_concurrency: int = 4  # concurrent Galileo AI analyses per batch
+    pega_concurrency: int = 4  # concurrent Pega case creations per batch
+    max_concurrency: int = 16  # cap on per-request overrides
+    max_items: int = 200
+
+    def bounded(self, requested: Optional[int], default: int) -> int:
+        """A per-request concurrency override, clamped to 1..max_concurrency"""
+        return max(1, min(requested or default, self.max_concurrency))
+
+def ndjson_line(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, default=str) + "\n"
+
+async def run_batch(items: Sequence[T],
+                    process: Callable[[int, T], Awaitable[Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run process(index, item) for every item and yield each result as soon as it completes.
+    Concurrency is bounded by the semaphores process itself acquires. If the consumer stops
+    early (e.g. the client disconnected), items still running are cancelled.
+    """
+    async def guarded(index: int, item: T) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+        try:
+            result = await process(index, item)
+        except Exception as e:
+            logger.error(f"Batch item {index} failed: {e}")
+            result = {"status": BATCH_ITEM_FAILED, "error": str(e)}
+        return {"index": index, **result, "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 2)}
+
+    tasks = [asyncio.create_task(guarded(index, item)) for index, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def batch_summary(results: Sequence[Dict[str, Any]], elapsed_ms: float) -> Dict[str, Any]:
+    """Counts per item status for the closing line of a batch"""
+    counts = {BATCH_ITEM_CREATED: 0, BATCH_ITEM_QUEUED: 0, BATCH_ITEM_DEMO: 0, BATCH_ITEM_FAILED: 0}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    return {"type": "summary", "total": len(results), **counts, "elapsed_ms": round(elapsed_ms, 2)}
+
+def create_case_batch_config() -> CaseBatchConfig:
+    """
+    Create the batch case creation configuration from environment variables
+    """
+    return CaseBatchConfig(
+        analysis_concurrency=int(os.getenv("CASE_BATCH_ANALYSIS_CONCURRENCY", "4")),
+        pega_concurrency=int(os.getenv("CASE_BATCH_PEGA_CONCURRENCY", "4")),
+        max_concurrency=int(os.getenv("CASE_BATCH_MAX_CONCURRENCY", "16")),
+        max_items=int(os.getenv("CASE_BATCH_MAX_ITEMS", "200"))
+    )
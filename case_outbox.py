@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Durable outbox for Pega case creation
+Every case-creation intent is written to SQLite (WAL mode) before it is sent. Callers get the
+Pega case, or a provisional ID when Pega has not answered within the acknowledgment timeout,
+and a background worker replays pending intents with backoff until Pega confirms them
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+from pydantic import BaseModel
+
+from pega_client import pega_error_message
+
+logger = logging.getLogger(__name__)
+
+# Outbox entry states
+OUTBOX_PENDING = "pending"  # waiting for its next attempt
+OUTBOX_SENDING = "sending"  # an attempt is in flight (leased)
+OUTBOX_CREATED = "created"  # Pega confirmed the case; case_id holds the real ID
+OUTBOX_FAILED = "failed"  # Pega rejected the case, or attempts ran out
+
+PROVISIONAL_ID_PREFIX = "PENDING-"
+
+# Pega answers worth retrying; anything else 4xx is a rejection that a retry cannot fix
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Errors raised while building or encoding the request; the same payload would fail the same way
+NON_RETRYABLE_ERRORS = (ValueError, TypeError)
+
+class CaseOutboxConfig(BaseModel):
+    """Where intents are stored and how they are retried"""
+    enabled: bool = True
+    sqlite_path: str = "case_outbox.sqlite3"
+    ack_timeout_seconds: float = 3.0  # callers wait this long for Pega before getting a provisional ID
+    max_attempts: int = 10
+    base_backoff_seconds: float = 2.0  # doubled per attempt, with full jitter
+    max_backoff_seconds: float = 300.0
+    poll_interval_seconds: float = 2.0
+    lease_seconds: float = 60.0  # an attempt not finished by then (e.g. the process died) is retried
+    replay_concurrency: int = 4
+
+class DeliveryOutcome(BaseModel):
+    """Where one case-creation intent stands after an attempt"""
+    outbox_id: str
+    status: str
+    case_id: Optional[str] = None
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+class CaseOutbox:
+    """
+    SQLite-backed outbox of case-creation intents with a background replay worker.
+    send(payload) performs one Pega create call and returns its httpx.Response.
+    """
+
+    def __init__(self,
+                 send: Callable[[Dict[str, Any]], Awaitable[httpx.Response]],
+                 config: Optional[CaseOutboxConfig] = None):
+        self.config = config or CaseOutboxConfig()
+        self._send = send
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.config.sqlite_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS case_outbox ("
+            "id TEXT PRIMARY KEY, payload TEXT NOT NULL, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL, lease_until REAL, "
+            "case_id TEXT, response TEXT, last_error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_case_outbox_due ON case_outbox(status, next_attempt_at)")
+        self._db.commit()
+        self._attempts: Set["asyncio.Task[DeliveryOutcome]"] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self._stopping = False
+        self._stats = {"submitted": 0, "acknowledged_provisionally": 0, "replayed": 0, "reconciled": 0}
+        logger.info(f"📮 Case outbox enabled at {self.config.sqlite_path}")
+
+    @staticmethod
+    def is_provisional(case_id: str) -> bool:
+        return case_id.startswith(PROVISIONAL_ID_PREFIX)
+
+    async def submit(self, payload: Dict[str, Any]) -> DeliveryOutcome:
+        """
+        Record the intent, then try Pega for up to ack_timeout_seconds. If Pega has not answered
+        by then, the pending outcome carries the provisional ID and the attempt keeps running.
+        """
+        outbox_id = self._record(payload)
+        self._stats["submitted"] += 1
+        self._ensure_worker()
+        attempt = asyncio.ensure_future(self.deliver(outbox_id, payload))
+        self._attempts.add(attempt)
+        attempt.add_done_callback(self._attempts.discard)
+        try:
+            outcome = await asyncio.wait_for(asyncio.shield(attempt), timeout=self.config.ack_timeout_seconds)
+        except asyncio.TimeoutError:
+            attempt.add_done_callback(self._count_late_confirmation)
+            outcome = DeliveryOutcome(outbox_id=outbox_id, status=OUTBOX_PENDING, error="Pega has not answered yet")
+        if outcome.status == OUTBOX_PENDING:
+            self._stats["acknowledged_provisionally"] += 1
+            logger.info(f"📮 Case acknowledged as {outbox_id}; the outbox will deliver it to Pega")
+        return outcome
+
+    def _count_late_confirmation(self, attempt: "asyncio.Task[DeliveryOutcome]"):
+        """An attempt that outlived the acknowledgment timeout reconciles its provisional ID itself"""
+        if not attempt.cancelled() and attempt.exception() is None and attempt.result().status == OUTBOX_CREATED:
+            self._stats["reconciled"] += 1
+
+    async def deliver(self, outbox_id: str, payload: Dict[str, Any]) -> DeliveryOutcome:
+        """One attempt at an intent already leased as sending; records the outcome"""
+        try:
+            response = await self._send(payload)
+        except httpx.HTTPError as e:
+            return self._retry_later(outbox_id, f"{type(e).__name__}: {e}")
+        except NON_RETRYABLE_ERRORS as e:
+            return self._mark_failed(outbox_id, f"Case request could not be sent ({type(e).__name__}: {e})")
+        except Exception as e:
+            # e.g. an open circuit breaker in front of Pega: the intent stays pending for the worker
+            return self._retry_later(outbox_id, f"{type(e).__name__}: {e}")
+
+        if response.status_code in (200, 201):
+            try:
+                result = response.json()
+            except ValueError:
+                result = {}
+            return self._mark_created(outbox_id, result)
+        error = pega_error_message(response)
+        if response.status_code in RETRYABLE_STATUSES:
+            return self._retry_later(outbox_id, error, response.headers.get("Retry-After"))
+        return self._mark_failed(outbox_id, f"Pega rejected the case ({response.status_code}): {error}")
+
+    async def replay_due(self) -> int:
+        """Send every intent whose next attempt is due; returns how many were attempted"""
+        claimed = self._claim_due(self.config.replay_concurrency)
+        if claimed:
+            self._stats["replayed"] += len(claimed)
+            outcomes = await asyncio.gather(*[self.deliver(outbox_id, payload) for outbox_id, payload in claimed])
+            for outcome in outcomes:
+                if outcome.status == OUTBOX_CREATED:
+                    self._stats["reconciled"] += 1
+                    logger.info(f"📮 Reconciled {outcome.outbox_id} to Pega case {outcome.case_id}")
+        return len(claimed)
+
+    def get(self, outbox_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM case_outbox WHERE id = ?", (outbox_id,)).fetchone()
+        return self._entry(row) if row else None
+
+    def entries(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent intents, optionally in one state"""
+        query, params = "SELECT * FROM case_outbox", []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Intents per state, the oldest undelivered one and replay counters"""
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM case_outbox GROUP BY status").fetchall())
+            oldest = self._db.execute(
+                "SELECT MIN(created_at) FROM case_outbox WHERE status IN (?, ?)", (OUTBOX_PENDING, OUTBOX_SENDING)
+            ).fetchone()[0]
+        return {
+            "enabled": True,
+            **{status: counts.get(status, 0) for status in (OUTBOX_PENDING, OUTBOX_SENDING, OUTBOX_CREATED, OUTBOX_FAILED)},
+            "oldest_undelivered_age_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+            **self._stats
+        }
+
+    def start(self):
+        """Start the replay worker (picks up intents left over from a previous run)"""
+        self._ensure_worker()
+
+    async def stop(self):
+        """Stop the replay worker and let attempts in flight record their outcome"""
+        self._stopping = True
+        if self._worker is not None:
+            self._wakeup.set()
+            await self._worker
+            self._worker = None
+        if self._attempts:
+            await asyncio.gather(*self._attempts, return_exceptions=True)
+        with self._lock:
+            self._db.close()
+
+    def _ensure_worker(self):
+        """Start the worker on first use; it needs a running event loop"""
+        if self._stopping or (self._worker is not None and not self._worker.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wakeup = asyncio.Event()
+        self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                if await self.replay_due():
+                    continue
+            except Exception as e:
+                logger.error(f"Case outbox replay failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.config.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def _record(self, payload: Dict[str, Any]) -> str:
+        """Persist a new intent, leased to the attempt that submit() starts right away"""
+        outbox_id = f"{PROVISIONAL_ID_PREFIX}{uuid.uuid4().hex[:12].upper()}"
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO case_outbox (id, payload, status, attempts, next_attempt_at, lease_until, created_at, updated_at) "
+                "VALUES (?, ?, ?, 1, ?, ?, ?, ?)",
+                (outbox_id, json.dumps(payload, default=str), OUTBOX_SENDING, now, now + self.config.lease_seconds, now, now)
+            )
+            self._db.commit()
+        return outbox_id
+
+    def _claim_due(self, limit: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """Lease due intents (and ones whose lease expired) to this worker"""
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, payload FROM case_outbox WHERE (status = ? AND next_attempt_at <= ?) "
+                "OR (status = ? AND lease_until <= ?) ORDER BY next_attempt_at LIMIT ?",
+                (OUTBOX_PENDING, now, OUTBOX_SENDING, now, limit)
+            ).fetchall()
+            self._db.executemany(
+                "UPDATE case_outbox SET status = ?, attempts = attempts + 1, lease_until = ?, updated_at = ? WHERE id = ?",
+                [(OUTBOX_SENDING, now + self.config.lease_seconds, now, row["id"]) for row in rows]
+            )
+            self._db.commit()
+        return [(row["id"], json.loads(row["payload"])) for row in rows]
+
+    def _mark_created(self, outbox_id: str, result: Dict[str, Any]) -> DeliveryOutcome:
+        case_id = result.get("ID", "")
+        self._update(outbox_id, status=OUTBOX_CREATED, case_id=case_id, response=json.dumps(result, default=str),
+                     last_error=None, lease_until=None)
+        return DeliveryOutcome(outbox_id=outbox_id, status=OUTBOX_CREATED, case_id=case_id, response=result)
+
+    def _mark_failed(self, outbox_id: str, error: str) -> DeliveryOutcome:
+        logger.error(f"📮 Case intent {outbox_id} failed: {error}")
+        self._update(outbox_id, status=OUTBOX_FAILED, last_error=error, lease_until=None)
+        return DeliveryOutcome(outbox_id=outbox_id, status=OUTBOX_FAILED, error=error)
+
+    def _retry_later(self, outbox_id: str, error: str, retry_after: Optional[str] = None) -> DeliveryOutcome:
+        """Schedule the next attempt with full-jitter exponential backoff, honouring Retry-After"""
+        with self._lock:
+            row = self._db.execute("SELECT attempts FROM case_outbox WHERE id = ?", (outbox_id,)).fetchone()
+        attempts = row["attempts"] if row else self.config.max_attempts
+        if attempts >= self.config.max_attempts:
+            return self._mark_failed(outbox_id, f"Gave up after {attempts} attempt(s): {error}")
+
+        delay = random.uniform(0, min(self.config.max_backoff_seconds,
+                                      self.config.base_backoff_seconds * (2 ** (attempts - 1))))
+        if retry_after:
+            try:
+                delay = max(delay, min(self.config.max_backoff_seconds, float(retry_after)))
+            except ValueError:
+                pass
+        logger.warning(f"📮 Case intent {outbox_id} attempt {attempts} failed ({error}); retrying in {delay:.1f}s")
+        self._update(outbox_id, status=OUTBOX_PENDING, last_error=error, lease_until=None,
+                     next_attempt_at=time.time() + delay)
+        return DeliveryOutcome(outbox_id=outbox_id, status=OUTBOX_PENDING, error=error)
+
+    def _update(self, outbox_id: str, **columns):
+        columns["updated_at"] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        with self._lock:
+            self._db.execute(f"UPDATE case_outbox SET {assignments} WHERE id = ?", (*columns.values(), outbox_id))
+            self._db.commit()
+
+    @staticmethod
+    def _entry(row: sqlite3.Row) -> Dict[str, Any]:
+        payload = json.loads(row["payload"])
+        return {
+            "outbox_id": row["id"],
+            "status": row["status"],
+            "case_id": row["case_id"],
+            "caseTypeID": payload.get("caseTypeID"),
+            "attempts": row["attempts"],
+            "last_error": row["last_error"],
+            "next_attempt_at": _iso(row["next_attempt_at"]) if row["status"] == OUTBOX_PENDING else None,
+            "created_at": _iso(row["created_at"]),
+            "updated_at": _iso(row["updated_at"])
+        }
+
+def create_case_outbox_config() -> CaseOutboxConfig:
+    """
+    Create the case outbox configuration from environment variables.
+    CASE_OUTBOX_ENABLED=false restores the old demo-case fallback when Pega is unavailable.
+    """
+    return CaseOutboxConfig(
+        enabled=os.getenv("CASE_OUTBOX_ENABLED", "true").lower() == "true",
+        sqlite_path=os.getenv("CASE_OUTBOX_SQLITE_PATH", "case_outbox.sqlite3"),
+        ack_timeout_seconds=float(os.getenv("CASE_OUTBOX_ACK_TIMEOUT", "3")),
+        max_attempts=int(os.getenv("CASE_OUTBOX_MAX_ATTEMPTS", "10")),
+        base_backoff_seconds=float(os.getenv("CASE_OUTBOX_BASE_BACKOFF", "2")),
+        max_backoff_seconds=float(os.getenv("CASE_OUTBOX_MAX_BACKOFF", "300")),
+        poll_interval_seconds=float(os.getenv("CASE_OUTBOX_POLL_INTERVAL", "2"))
+    )
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+DPIA analysis state of a chat session
+Each user step (answering missing fields, creating the case) advances a progress marker, so an
+analysis that finishes in the background after the user moved on does not undo their answers
+"""
+
+from typing import Any, Dict
+
+from galileo_claude_adapter import AnalysisResult
+from tiered_analysis import FIELD_DEFAULTS
+
+SESSION_ANALYSIS_REPLACED = "replaced"  # the late analysis became the session's analysis
+SESSION_ANALYSIS_MERGED = "merged"  # the user moved on; only fields still missing were filled in
+
+def apply_analysis_to_session(session: Dict[str, Any], analysis_result: AnalysisResult, research_text: str):
+    """
+    Store an analysis as the session's current DPIA analysis, with the research text it was made
+    from (case creation fingerprints the case by it)
+    """
+    session["analysis_results"] = {
+        "detected_fields": analysis_result.detected_fields,
+        "missing_fields": analysis_result.missing_fields,
+        "confidence_scores": analysis_result.confidence_scores,
+        "analysis_summary": analysis_result.analysis_summary
+    }
+    session["extracted_fields"].update(analysis_result.detected_fields)
+    session["missing_fields"] = analysis_result.missing_fields
+    session["original_text"] = research_text
+    session["current_task"] = "dpia_analysis"
+
+def session_progress(session: Dict[str, Any]) -> int:
+    return session.get("progress", 0)
+
+def mark_session_progress(session: Dict[str, Any]):
+    """Record a user step that a late analysis must not undo"""
+    session["progress"] = session_progress(session) + 1
+
+def apply_late_analysis(session: Dict[str, Any], analysis_result: AnalysisResult,
+                        research_text: str, started_at_progress: int) -> str:
+    """
+    Apply an analysis that finished in the background. If the session has not moved since the
+    analysis started it replaces the current analysis; otherwise it only fills in fields the user
+    still has to provide and the conversation stays where it is.
+    """
+    if session_progress(session) == started_at_progress:
+        apply_analysis_to_session(session, analysis_result, research_text)
+        return SESSION_ANALYSIS_REPLACED
+
+    filled = {
+        field: analysis_result.detected_fields[field]
+        for field in session.get("missing_fields", [])
+        if analysis_result.detected_fields.get(field, "Unknown") not in ("", "Unknown", FIELD_DEFAULTS.get(field, "Unknown"))
+    }
+    session["extracted_fields"].update(filled)
+    session["missing_fields"] = [field for field in session.get("missing_fields", []) if field not in filled]
+    return SESSION_ANALYSIS_MERGED
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures for the test scripts
+"""
+
+import httpx
+import pytest
+
+import galileo_integration
+from galileo_integration import GalileoConfig, GalileoLLMIntegration
+
+GALILEO_TEST_URL = "http://galileo.test/v1"
+
+@pytest.fixture
+def mock_galileo():
+    """
+    Factory for Galileo integrations whose HTTP client talks to a fake instead of the network.
+
+    `handler` is an httpx.MockTransport handler, or a ready transport (e.g. an ASGITransport
+    for mock_galileo_server). Config overrides are applied over a test config with insights
+    and monitoring off. With install=True the integration becomes the galileo_llm() instance,
+    which is reset here when the test ends.
+    """
+    def factory(handler, install: bool = False, **config_overrides) -> GalileoLLMIntegration:
+        config = GalileoConfig(**{
+            "api_key": "test-key",
+            "project_id": "test-project",
+            "base_url": GALILEO_TEST_URL,
+            "insights_mode": "off",
+            "enable_monitoring": False,
+            **config_overrides
+        })
+        transport = handler if isinstance(handler, httpx.AsyncBaseTransport) else httpx.MockTransport(handler)
+        integration = GalileoLLMIntegration(config)
+        integration.client = httpx.AsyncClient(base_url=config.base_url, transport=transport)
+        if install:
+            galileo_integration._galileo_llm_instance = integration
+        return integration
+
+    yield factory
+    galileo_integration._galileo_llm_instance = None
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Bounded conversation context for conversational replies
+Recent turns are sent verbatim within a token budget, older turns are folded into a running
+summary, and session state is serialized compactly, so prompts stop growing with the session
+"""
+
+import os
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from prompt_budget import OMISSION_MARKER, estimate_tokens, truncate_text
+
+logger = logging.getLogger(__name__)
+
+# Session state entries kept longest when the state is over budget: the task and what is still missing
+ESSENTIAL_STATE_KEYS = ("current_task", "missing_fields")
+
+class ConversationContextConfig(BaseModel):
+    """Token budgets for the variable parts of a conversational prompt"""
+    history_token_budget: int = 1500  # recent turns sent verbatim
+    summary_token_budget: int = 300  # running summary of turns that left the history window
+    state_token_budget: int = 400  # compact session state (fields, missing fields, task)
+    summary_chars_per_message: int = 160  # each side of a summarized turn is clipped to this
+    chars_per_token: float = 4.0  # local token estimate, as in PromptBudgetConfig
+
+class ConversationTurn(BaseModel):
+    """One user message and the reply to it"""
+    user: str
+    assistant: str
+    tokens: int
+    timestamp: str
+
+def _prune(value: Any) -> Any:
+    """Drop empty and Unknown values, which tell the LLM nothing"""
+    if isinstance(value, dict):
+        pruned = {key: _prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, "", "Unknown", [], {})}
+    if isinstance(value, (list, tuple)):
+        return [_prune(item) for item in value if item not in (None, "", "Unknown")]
+    return value
+
+def _dumps(state: Dict[str, Any]) -> str:
+    return json.dumps(state, separators=(",", ":"), ensure_ascii=False, default=str) if state else ""
+
+def compact_context(context: Optional[Dict[str, Any]]) -> str:
+    """Session state as compact JSON: no indentation and no empty or Unknown values"""
+    return _dumps(_prune(context or {}))
+
+def _drop_state_entry(state: Dict[str, Any]):
+    """
+    Remove one whole entry from pruned session state: the oldest answered field first, then
+    other state (newest key first), and the essential keys last
+    """
+    missing = set(state.get("missing_fields") or [])
+    for key, value in state.items():
+        answered = [field for field in value if field not in missing] if isinstance(value, dict) else []
+        if answered:
+            del value[answered[0]]
+            if not value:
+                del state[key]
+            return
+    keys = [key for key in ESSENTIAL_STATE_KEYS if key in state] + [key for key in state if key not in ESSENTIAL_STATE_KEYS]
+    del state[keys[-1]]
+
+def fit_context(context: Optional[Dict[str, Any]], budget_tokens: int, chars_per_token: float = 4.0) -> Tuple[str, int]:
+    """
+    Compact session state within budget_tokens. Whole entries are dropped until it fits, so the
+    JSON always stays valid. Returns the JSON and the number of entries dropped.
+    """
+    state = _prune(context or {})
+    dropped = 0
+    while state and estimate_tokens(_dumps(state), chars_per_token) > budget_tokens:
+        _drop_state_entry(state)
+        dropped += 1
+    return _dumps(state), dropped
+
+def clip_text(text: str, max_chars: int) -> str:
+    """Collapse whitespace and cut text to max_chars, marking the cut"""
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max(max_chars - len(OMISSION_MARKER) - 1, 0)].rstrip()} {OMISSION_MARKER}"
+
+class ConversationContext:
+    """
+    One session's conversation: the most recent turns that fit the history budget, plus a
+    running summary that each evicted turn is appended to (oldest summary lines drop first)
+    """
+
+    def __init__(self, config: Optional[ConversationContextConfig] = None):
+        self.config = config or ConversationContextConfig()
+        self.turns: Deque[ConversationTurn] = deque()
+        self.history_tokens = 0
+        self.summary_lines: Deque[str] = deque()
+        self.summary_tokens = 0
+        self.turns_total = 0
+        self.turns_summarized = 0
+        self.summary_lines_dropped = 0
+        # Size breakdown of the most recent prompt built from this context
+        self.last_prompt: Optional[Dict[str, Any]] = None
+
+    def add_turn(self, user_message: str, assistant_message: str):
+        """Record a turn, folding the oldest turns into the summary once the history is over budget"""
+        turn = ConversationTurn(
+            user=user_message,
+            assistant=assistant_message,
+            tokens=(estimate_tokens(user_message, self.config.chars_per_token)
+                    + estimate_tokens(assistant_message, self.config.chars_per_token)),
+            timestamp=datetime.now().isoformat()
+        )
+        self.turns.append(turn)
+        self.history_tokens += turn.tokens
+        self.turns_total += 1
+        # The newest turn always stays; if it alone is over budget it is clipped when rendered
+        while self.history_tokens > self.config.history_token_budget and len(self.turns) > 1:
+            self._summarize(self.turns.popleft())
+
+    def _summarize(self, turn: ConversationTurn):
+        """Append an evicted turn to the running summary"""
+        self.history_tokens -= turn.tokens
+        max_chars = self.config.summary_chars_per_message
+        line = f"- User: {clip_text(turn.user, max_chars)} | Assistant: {clip_text(turn.assistant, max_chars)}"
+        self.summary_lines.append(line)
+        self.summary_tokens += estimate_tokens(line, self.config.chars_per_token) + 1
+        self.turns_summarized += 1
+        while self.summary_tokens > self.config.summary_token_budget and len(self.summary_lines) > 1:
+            self.summary_tokens -= estimate_tokens(self.summary_lines.popleft(), self.config.chars_per_token) + 1
+            self.summary_lines_dropped += 1
+
+    @property
+    def summary(self) -> str:
+        """Running summary of turns no longer sent verbatim"""
+        if not self.summary_lines:
+            return ""
+        omitted = f"({self.summary_lines_dropped} earlier turn(s) omitted)\n" if self.summary_lines_dropped else ""
+        return omitted + "\n".join(self.summary_lines)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "turns_total": self.turns_total,
+            "turns_in_history": len(self.turns),
+            "turns_summarized": self.turns_summarized,
+            "history_tokens": self.history_tokens,
+            "summary_tokens": self.summary_tokens,
+            "last_prompt": self.last_prompt
+        }
+
+def build_conversation_messages(system_prompt: str,
+                                user_message: str,
+                                context: Optional[Dict[str, Any]] = None,
+                                conversation: Optional[ConversationContext] = None,
+                                config: Optional[ConversationContextConfig] = None) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+    """
+    Chat messages for a conversational reply: the system prompt with compact session state and
+    the running summary, the recent turns, then the new message. Returns the messages and the
+    estimated token size of each part.
+    """
+    config = config or (conversation.config if conversation else ConversationContextConfig())
+    chars_per_token = config.chars_per_token
+
+    state, state_entries_dropped = fit_context(context, config.state_token_budget, chars_per_token)
+    summary = conversation.summary if conversation else ""
+
+    system_content = system_prompt
+    if state:
+        system_content += f"\n\nSession state (JSON): {state}"
+    if summary:
+        system_content += f"\n\nEarlier in this conversation (summary):\n{summary}"
+    messages = [{"role": "system", "content": system_content}]
+
+    history_tokens = 0
+    turns = list(conversation.turns) if conversation else []
+    for turn in turns:
+        user_text, assistant_text = turn.user, turn.assistant
+        if len(turns) == 1 and turn.tokens > config.history_token_budget:
+            half = config.history_token_budget // 2
+            user_text = truncate_text(user_text, half, chars_per_token)
+            assistant_text = truncate_text(assistant_text, half, chars_per_token)
+        messages.append({"role": "user", "content": user_text})
+        messages.append({"role": "assistant", "content": assistant_text})
+        history_tokens += estimate_tokens(user_text, chars_per_token) + estimate_tokens(assistant_text, chars_per_token)
+    messages.append({"role": "user", "content": user_message})
+
+    report = {
+        "prompt_tokens": sum(estimate_tokens(message["content"], chars_per_token) for message in messages),
+        "state_tokens": estimate_tokens(state, chars_per_token),
+        "state_entries_dropped": state_entries_dropped,
+        "summary_tokens": estimate_tokens(summary, chars_per_token),
+        "history_tokens": history_tokens,
+        "turns_in_prompt": len(turns),
+        "turns_summarized": conversation.turns_summarized if conversation else 0
+    }
+    if conversation:
+        conversation.last_prompt = report
+    return messages, report
+
+def create_conversation_context_config() -> ConversationContextConfig:
+    """
+    Create the conversation context budgets from environment variables
+    """
+    return ConversationContextConfig(
+        history_token_budget=int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500")),
+        summary_token_budget=int(os.getenv("CHAT_SUMMARY_TOKEN_BUDGET", "300")),
+        state_token_budget=int(os.getenv("CHAT_STATE_TOKEN_BUDGET", "400"))
+    )
@@ -4,20 +4,12 @@ Simple DPIA Case Creation Tool
 Creates a Scanning request case in Pega with a single command.
 """
 
-import requests
+import httpx
 import json
-import base64
 import sys
-import os
 from datetime import datetime
 
-# Pega Configuration
-PEGA_BASE_URL = "https://roche-gtech-dt1.pegacloud.net/prweb/api/v1"
-PEGA_USERNAME = "nadadhub"
-PEGA_PASSWORD = "Pwrm*2025"
-
-# Basic auth header
-BASIC_AUTH = base64.b64encode(f"{PEGA_USERNAME}:{PEGA_PASSWORD}".encode()).decode()
+from pega_client import SyncPegaClient
 
 def create_dpia_case(title=None, description=None):
     """Create a Scanning request case in Pega"""
@@ -30,11 +22,6 @@ def create_dpia_case(title=None, description=None):
     if not description:
         description = "DPIA Scanning Request"
     
-    headers = {
-        "Authorization": f"Basic {BASIC_AUTH}",
-        "Content-Type": "application/json"
-    }
-    
     payload = {
         "caseTypeID": "Roche-Pathworks-Work-DPIA",
         "processID": "pyStartCase",
@@ -45,15 +32,14 @@ def create_dpia_case(title=None, description=None):
         }
     }
     
-    url = f"{PEGA_BASE_URL}/cases"
-    
     print("🔄 Creating Scanning request case...")
     print(f"   Title: {title}")
     print(f"   Description: {description}")
-    print(f"   Pega URL: {PEGA_BASE_URL}")
     
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        with SyncPegaClient() as pega:
+            print(f"   Pega URL: {pega.config.base_url}")
+            response = pega.create_case(payload)
         response.raise_for_status()
         
         result = response.json()
@@ -69,7 +55,7 @@ def create_dpia_case(title=None, description=None):
         
         return result
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"\n❌ Failed to create Scanning request case: {str(e)}")
         if hasattr(e, 'response') and e.response is not None:
             try:
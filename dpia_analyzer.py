@@ -4,9 +4,8 @@ Combined DPIA Analyzer and Case Creator
 Analyzes text for scanning requests and creates DPIA cases in Pega with the results.
 """
 
-import requests
+import httpx
 import json
-import base64
 import sys
 import os
 import re
@@ -15,14 +14,7 @@ from typing import List, Dict, Any
 
 # Import the scanning summarizer functionality
 from scanning_summarizer import ScanningRequestSummarizer
-
-# Pega Configuration
-PEGA_BASE_URL = "https://roche-gtech-dt1.pegacloud.net/prweb/api/v1"
-PEGA_USERNAME = ""
-PEGA_PASSWORD = ""
-
-# Basic auth header
-BASIC_AUTH = base64.b64encode(f"{PEGA_USERNAME}:{PEGA_PASSWORD}".encode()).decode()
+from pega_client import SyncPegaClient
 
 class DPIAAnalyzer:
     def __init__(self):
@@ -119,11 +111,6 @@ class DPIAAnalyzer:
     def _create_pega_case(self, title: str, description: str) -> Dict[str, Any]:
         """Create a DPIA case in Pega"""
         
-        headers = {
-            "Authorization": f"Basic {BASIC_AUTH}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "caseTypeID": "Roche-Pathworks-Work-DPIA",
             "processID": "pyStartCase",
@@ -134,13 +121,12 @@ class DPIAAnalyzer:
             }
         }
         
-        url = f"{PEGA_BASE_URL}/cases"
-        
         print(f"   Title: {title}")
         print(f"   Description: {description[:100]}...")
         
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            with SyncPegaClient() as pega:
+                response = pega.create_case(payload)
             response.raise_for_status()
             
             result = response.json()
@@ -154,7 +140,7 @@ class DPIAAnalyzer:
                 "response": result
             }
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"\n   ❌ Failed to create DPIA case: {str(e)}")
             return {
                 "success": False,
@@ -6,14 +6,57 @@ Maintains the same interface as claude_integration.py but uses Galileo AI LLM
 
 import os
 import json
+import time
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 from datetime import datetime
 from pydantic import BaseModel
-from galileo_integration import galileo_llm, DPIAAnalysisRequest, DPIAAnalysisResult
+from galileo_integration import galileo_llm, DPIAAnalysisRequest, DPIAAnalysisResult, _strip_code_fences
+from analysis_cache import create_analysis_cache, make_cache_key, hash_context
+from prompt_budget import estimate_tokens, fit_text, format_reference_context, input_budget
+from analysis_prompt import ANALYSIS_PROMPT, ANALYSIS_PROMPT_VERSION
+from conversation_context import (
+    ConversationContext, build_conversation_messages, create_conversation_context_config
+)
+from tiered_analysis import (
+    CASE_TYPE_FIELD, CASE_TYPES, FIELD_HINTS, TIER_KEYWORD, TIER_LLM, TIERED_ANALYSIS_VERSION, TIERED_FIELDS,
+    FIELD_DEFAULTS, FieldDetection, KeywordAnalyzer,
+    create_tiered_analysis_config
+)
 
 logger = logging.getLogger(__name__)
 
+# Field enhancement strategies for weak (Unknown or low-confidence) fields
+ENHANCEMENT_SINGLE_PROMPT = "single_prompt"  # resolve every weak field in one structured prompt
+ENHANCEMENT_CONCURRENT = "concurrent"  # one prompt per field, fanned out under a concurrency cap
+ENHANCEMENT_STRATEGIES = (ENHANCEMENT_SINGLE_PROMPT, ENHANCEMENT_CONCURRENT)
+
+# Completion tokens reserved per field for enhancement answers ({"enhanced_value": ..., "confidence": ...})
+ENHANCEMENT_OUTPUT_TOKENS_PER_FIELD = 150
+ENHANCEMENT_OUTPUT_TOKENS_BASE = 100
+
+# Generated project titles are cached next to analyses under their own prompt version
+PROJECT_TITLE_PROMPT_VERSION = "project-title-v1"
+PROJECT_TITLE_TEMPERATURE = 0.1
+# Titles that mean the analysis did not find one
+PLACEHOLDER_TITLES = ("", "Unknown", FIELD_DEFAULTS["project_title"])
+
+# Galileo result fields exposed in AnalysisResult.detected_fields
+DETECTED_FIELDS = (
+    "therapeutic_area", "procedure_type", "assay_type", "pi_name", "pathologist", "project_title",
+    "request_purpose", "biospecimen_type", "data_volume", "sensitive_data", "cross_border_transfer",
+    "recommended_case_type"
+)
+
+def _attribution(user_id: Optional[str], session_id: Optional[str]) -> Dict[str, str]:
+    """user_id / session_id for a completion payload, omitting the ones not known"""
+    return {key: value for key, value in (("user_id", user_id), ("session_id", session_id)) if value}
+
+def _field_label(field: str) -> str:
+    """Field name for enhancement prompts, with its allowed values when they are fixed"""
+    return f"{field} ({FIELD_HINTS[field]})" if field in FIELD_HINTS else field
+
 # Maintain compatibility with existing AnalysisResult model
 class AnalysisResult(BaseModel):
     """Analysis result model compatible with existing claude_integration interface"""
@@ -38,6 +81,55 @@ class AnalysisResult(BaseModel):
     recommended_case_type: Optional[str] = None
     case_type_confidence: Optional[float] = None
     case_type_reasoning: Optional[str] = None
+    # Strategy, call count and latency of the weak-field enhancement pass (when run)
+    enhancement_metrics: Optional[Dict[str, Any]] = None
+    # Token budget and trim decisions made while assembling the analysis prompt
+    prompt_budget: Optional[Dict[str, Any]] = None
+    # Analysis prompt template version (recorded with cached results)
+    prompt_version: Optional[str] = None
+    # Tier ("keyword" or "llm") that answered each detected field
+    field_tiers: Optional[Dict[str, str]] = None
+    # Set when Galileo AI could not produce the analysis
+    is_fallback: bool = False
+    # Keyword result sent ahead of a speculative LLM analysis that will replace it
+    provisional: bool = False
+    
+    @classmethod
+    def from_galileo_result(cls, galileo_result: DPIAAnalysisResult) -> "AnalysisResult":
+        """
+        Compatible view of a Galileo result. The values were validated when the LLM output
+        was parsed, so the model is constructed without validating them a second time.
+        """
+        return cls.model_construct(
+            detected_fields={field: getattr(galileo_result, field) or "Unknown" for field in DETECTED_FIELDS},
+            missing_fields=galileo_result.missing_fields,
+            confidence_scores=galileo_result.confidence_scores,
+            interactive_prompts=[
+                {"question": prompt, "field": "unknown", "type": "text"}
+                for prompt in galileo_result.interactive_prompts
+            ],
+            suggestions=galileo_result.suggestions,
+            analysis_summary=galileo_result.analysis_summary,
+            therapeutic_area=galileo_result.therapeutic_area,
+            procedure_type=galileo_result.procedure_type,
+            assay_type=galileo_result.assay_type,
+            pi_name=galileo_result.pi_name,
+            pathologist=galileo_result.pathologist,
+            project_title=galileo_result.project_title,
+            request_purpose=galileo_result.request_purpose,
+            compliance_status="Requires Review",  # Default value since not in new model
+            galileo_insights={"analysis_type": "dpia_analysis", **(galileo_result.galileo_insights or {})},
+            recommended_case_type=galileo_result.recommended_case_type,
+            case_type_confidence=galileo_result.case_type_confidence,
+            case_type_reasoning=galileo_result.case_type_reasoning,
+            enhancement_metrics=None,
+            prompt_budget=galileo_result.prompt_budget,
+            prompt_version=galileo_result.prompt_version,
+            # A fallback was not answered by any tier (same as _create_fallback_result)
+            field_tiers=None if galileo_result.is_fallback else {field: TIER_LLM for field in TIERED_FIELDS},
+            is_fallback=galileo_result.is_fallback,
+            provisional=False
+        )
 
 class GalileoClaudeAdapter:
     """
@@ -50,6 +142,24 @@ class GalileoClaudeAdapter:
             "reference_context": "",
             "analysis_guidelines": ""
         }
+        self.analysis_cache = create_analysis_cache()
+        self.enhancement_strategy = os.getenv("GALILEO_ENHANCEMENT_STRATEGY", ENHANCEMENT_SINGLE_PROMPT)
+        self.enhancement_max_concurrency = int(os.getenv("GALILEO_ENHANCEMENT_MAX_CONCURRENCY", "4"))
+        self._enhancement_stats = {
+            strategy: {"runs": 0, "fields": 0, "llm_calls": 0, "total_latency_ms": 0.0}
+            for strategy in ENHANCEMENT_STRATEGIES
+        }
+        # Keyword detectors answer first; only weak fields are escalated to the LLM
+        self.tiered_analysis = create_tiered_analysis_config()
+        self.keyword_analyzer = KeywordAnalyzer()
+        self._tier_stats = {"requests": 0, "keyword_only": 0, "cache_hits": 0, "llm_unavailable": 0, "llm_escalations": 0, "fields_escalated": 0}
+        self._speculative_stats = {"runs": 0, "revised": 0, "kept_provisional": 0, "fields_changed": 0}
+        # Project titles being generated in the background, by cache key
+        self._title_tasks: Dict[str, "asyncio.Task[str]"] = {}
+        self._title_stats = {"from_analysis": 0, "prefetched": 0, "cache_hits": 0, "awaited_in_flight": 0, "generated_on_demand": 0}
+        # Token budgets for conversational prompts (recent turns, running summary, session state)
+        self.conversation_config = create_conversation_context_config()
+        self._conversation_stats = {"prompts": 0, "prompt_tokens_total": 0, "prompt_tokens_max": 0, "prompt_tokens_last": 0}
         logger.info("Galileo AI LLM adapter initialized (replacing Claude)")
     
     @property
@@ -66,93 +176,65 @@ class GalileoClaudeAdapter:
         Analyze research text using Galileo AI LLM instead of Claude
         Maintains compatibility with existing claude_integration interface
         """
+        if self.tiered_analysis.enabled:
+            analysis_result = await self._analyze_tiered(research_text, enhance_fields, user_id, session_id)
+        else:
+            analysis_result = await self._analyze_with_llm(research_text, enhance_fields, user_id, session_id)
+        self.prefetch_project_title(research_text, analysis_result)
+        return analysis_result
+    
+    async def _analyze_with_llm(self,
+                                research_text: str,
+                                enhance_fields: bool = True,
+                                user_id: Optional[str] = None,
+                                session_id: Optional[str] = None) -> AnalysisResult:
+        """Full analysis prompt sent to Galileo AI (results cached by text and context)"""
         if not self.galileo_client:
             logger.error("Galileo AI LLM client not available")
             return self._create_fallback_result(research_text)
         
+        cache_key = self._analysis_cache_key(research_text)
+        if cache_key:
+            cached = self.analysis_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Galileo AI analysis served from cache")
+                return AnalysisResult.model_validate(cached)
+        
         try:
             # Create Galileo AI analysis request
             request = DPIAAnalysisRequest(
                 text=research_text,
                 analysis_type="dpia_analysis",
                 metadata={
-                    "context": self.context_data,
+                    # The context itself goes into the prompt (within budget), not into every call's metadata
+                    "context_hash": hash_context(self.context_data),
+                    "reference_context_length": len(self.context_data.get("reference_context", "")),
+                    "guidelines_length": len(self.context_data.get("analysis_guidelines", "")),
                     "enhance_fields": enhance_fields
                 },
                 user_id=user_id,
                 session_id=session_id,
-                enhance_fields=enhance_fields
+                enhance_fields=enhance_fields,
+                context=self.context_data if any(self.context_data.values()) else None
             )
             
             # Perform analysis using Galileo AI LLM
             galileo_result = await self.galileo_client.analyze_dpia_text(request)
             
             # Convert to compatible AnalysisResult format
-            detected_fields = {
-                "therapeutic_area": galileo_result.therapeutic_area,
-                "procedure_type": galileo_result.procedure_type,
-                "assay_type": galileo_result.assay_type,
-                "pi_name": galileo_result.pi_name,
-                "pathologist": galileo_result.pathologist,
-                "project_title": galileo_result.project_title,
-                "request_purpose": galileo_result.request_purpose,
-                "biospecimen_type": galileo_result.biospecimen_type,
-                "data_volume": galileo_result.data_volume,
-                "sensitive_data": galileo_result.sensitive_data,
-                "cross_border_transfer": galileo_result.cross_border_transfer,
-                # Include case type recommendation in detected_fields
-                "recommended_case_type": galileo_result.recommended_case_type
-            }
+            analysis_result = AnalysisResult.from_galileo_result(galileo_result)
             
-            # Convert interactive_prompts to proper format if needed
-            interactive_prompts = []
-            if galileo_result.interactive_prompts:
-                for prompt in galileo_result.interactive_prompts:
-                    if isinstance(prompt, str):
-                        # Convert string to dictionary format
-                        interactive_prompts.append({
-                            "question": prompt,
-                            "field": "unknown",
-                            "type": "text"
-                        })
-                    elif isinstance(prompt, dict):
-                        interactive_prompts.append(prompt)
-                    else:
-                        # Fallback for other types
-                        interactive_prompts.append({
-                            "question": str(prompt),
-                            "field": "unknown", 
-                            "type": "text"
-                        })
-            
-            analysis_result = AnalysisResult(
-                detected_fields=detected_fields,
-                missing_fields=galileo_result.missing_fields,
-                confidence_scores=galileo_result.confidence_scores,
-                interactive_prompts=interactive_prompts,
-                suggestions=galileo_result.suggestions,
-                analysis_summary=galileo_result.analysis_summary,
-                therapeutic_area=galileo_result.therapeutic_area,
-                procedure_type=galileo_result.procedure_type,
-                assay_type=galileo_result.assay_type,
-                pi_name=galileo_result.pi_name,
-                pathologist=galileo_result.pathologist,
-                project_title=galileo_result.project_title,
-                request_purpose=galileo_result.request_purpose,
-                compliance_status="Requires Review",  # Default value since not in new model
-                galileo_insights={"analysis_type": "dpia_analysis"},
-                recommended_case_type=galileo_result.recommended_case_type,
-                case_type_confidence=galileo_result.case_type_confidence,
-                case_type_reasoning=galileo_result.case_type_reasoning
-            )
-            
-            # Log metrics to Galileo AI
+            # Queue metrics for Galileo AI (flushed in the background)
             if self.galileo_client.config.enable_monitoring:
                 await self.galileo_client.log_analysis_metrics(
                     analysis_input=research_text,
                     analysis_output=galileo_result
                 )
             
+            # Only cache real LLM results so a transient outage is not replayed
+            if cache_key and not galileo_result.is_fallback:
+                self.analysis_cache.set(cache_key, analysis_result.model_dump())
+            
             logger.info(f"Galileo AI analysis completed. Detected {len(analysis_result.detected_fields)} fields")
             return analysis_result
             
@@ -160,6 +242,172 @@ class GalileoClaudeAdapter:
             logger.error(f"Galileo AI analysis failed: {e}")
             return self._create_fallback_result(research_text, error=str(e))
     
+    async def _analyze_tiered(self,
+                              research_text: str,
+                              enhance_fields: bool = True,
+                              user_id: Optional[str] = None,
+                              session_id: Optional[str] = None) -> AnalysisResult:
+        """
+        Run the keyword detectors first and send only fields below the confidence threshold
+        to the LLM, in one field-scoped enhancement prompt. Each field records which tier answered it.
+        Without enhance_fields the keyword values are kept for weak fields too.
+        """
+        stats = self._tier_stats
+        stats["requests"] += 1
+        detections = self.keyword_analyzer.detect_fields(research_text)
+        threshold = self.tiered_analysis.confidence_threshold
+        weak_fields = {
+            field: detections[field].value for field in self.tiered_analysis.escalation_fields
+            if field in detections and detections[field].confidence < threshold
+        }
+        
+        if not weak_fields:
+            stats["keyword_only"] += 1
+            logger.info("⚡ Keyword tier answered every field; Galileo AI not called")
+            return self._tiered_result(research_text, detections)
+        
+        if not enhance_fields:
+            stats["keyword_only"] += 1
+            logger.info(f"Field enhancement not requested; keeping keyword values for weak fields {list(weak_fields)}")
+            return self._tiered_result(research_text, detections)
+        
+        if not self.galileo_client:
+            stats["llm_unavailable"] += 1
+            logger.warning(f"Galileo AI not available; keeping keyword values for weak fields {list(weak_fields)}")
+            return self._tiered_result(research_text, detections)
+        
+        cache_key = self._analysis_cache_key(research_text, prompt_version=TIERED_ANALYSIS_VERSION)
+        if cache_key:
+            cached = self.analysis_cache.get(cache_key)
+            if cached is not None:
+                stats["cache_hits"] += 1
+                logger.info("Tiered analysis served from cache")
+                return AnalysisResult.model_validate(cached)
+        
+        stats["llm_escalations"] += 1
+        stats["fields_escalated"] += len(weak_fields)
+        logger.info(f"🔼 Escalating {len(weak_fields)} weak field(s) to Galileo AI: {list(weak_fields)}")
+        # The keyword tier never recommends CALM, so the escalation also asks for the case type
+        case_type = self.keyword_analyzer.classify_case_type(research_text)
+        fields_to_enhance = dict(weak_fields)
+        if case_type[1] < threshold:
+            fields_to_enhance[CASE_TYPE_FIELD] = case_type[0]
+        enhancements, enhancement_metrics = await self.enhance_fields_batch(
+            fields_to_enhance, research_text, user_id=user_id, session_id=session_id
+        )
+        if CASE_TYPE_FIELD in enhancements:
+            value, confidence = enhancements.pop(CASE_TYPE_FIELD)
+            if str(value).upper() in CASE_TYPES and confidence > case_type[1]:
+                case_type = (str(value).upper(), confidence, "Recommended by a field-scoped LLM prompt")
+        for field, (value, confidence) in enhancements.items():
+            if value and value != "Unknown" and confidence > detections[field].confidence:
+                detections[field] = FieldDetection(
+                    value=str(value), confidence=confidence, evidence="field-scoped LLM prompt", tier=TIER_LLM
+                )
+        
+        galileo_result = self._tiered_galileo_result(research_text, detections, case_type)
+        analysis_result = self._tiered_result(research_text, detections, enhancement_metrics, galileo_result)
+        if self.galileo_client.config.enable_monitoring:
+            await self.galileo_client.log_analysis_metrics(
+                analysis_input=research_text,
+                analysis_output=galileo_result
+            )
+        # Only cache results the LLM contributed to, so an outage is not replayed
+        if cache_key and TIER_LLM in analysis_result.field_tiers.values():
+            self.analysis_cache.set(cache_key, analysis_result.model_dump())
+        return analysis_result
+    
+    def _tiered_galileo_result(self,
+                               research_text: str,
+                               detections: Dict[str, FieldDetection],
+                               case_type: Optional[Tuple[str, float, str]] = None) -> DPIAAnalysisResult:
+        """A tiered analysis as a Galileo result (the shape analysis metrics are logged in)"""
+        llm_fields = [field for field, detection in detections.items() if detection.tier == TIER_LLM]
+        analysis = self.keyword_analyzer.build_analysis(research_text, detections, case_type=case_type)
+        if llm_fields:
+            analysis["analysis_summary"] += f"; Galileo AI resolved {', '.join(llm_fields)}"
+        return DPIAAnalysisResult.model_validate(analysis)
+    
+    def _tiered_result(self,
+                       research_text: str,
+                       detections: Dict[str, FieldDetection],
+                       enhancement_metrics: Optional[Dict[str, Any]] = None,
+                       galileo_result: Optional[DPIAAnalysisResult] = None) -> AnalysisResult:
+        """Assemble a tiered analysis in the same shape as a full LLM analysis"""
+        analysis_result = AnalysisResult.from_galileo_result(
+            galileo_result or self._tiered_galileo_result(research_text, detections)
+        )
+        analysis_result.field_tiers = {field: detection.tier for field, detection in detections.items()}
+        analysis_result.enhancement_metrics = enhancement_metrics
+        analysis_result.prompt_version = TIERED_ANALYSIS_VERSION
+        return analysis_result
+    
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """Tiered analysis counters and the share of analyses that never called the LLM"""
+        stats = self._tier_stats
+        return {
+            "enabled": self.tiered_analysis.enabled,
+            "confidence_threshold": self.tiered_analysis.confidence_threshold,
+            **stats,
+            "llm_avoided_ratio": round((stats["requests"] - stats["llm_escalations"]) / stats["requests"], 3) if stats["requests"] else 0.0
+        }
+    
+    def start_speculative_analysis(self, research_text: str) -> Tuple[AnalysisResult, "asyncio.Task[AnalysisResult]"]:
+        """
+        Start the full Galileo AI analysis and answer from the keyword detectors at the same time.
+        Returns the keyword result (marked provisional) and the task that will produce the LLM result;
+        pass both to reconcile_analysis once the task is done.
+        """
+        self._speculative_stats["runs"] += 1
+        llm_task = asyncio.create_task(self._analyze_with_llm(research_text))
+        provisional = self._tiered_result(research_text, self.keyword_analyzer.detect_fields(research_text))
+        provisional.provisional = True
+        return provisional, llm_task
+    
+    def reconcile_analysis(self,
+                           provisional: AnalysisResult,
+                           final: AnalysisResult) -> Tuple[AnalysisResult, Dict[str, Any]]:
+        """
+        Replace a provisional keyword result with the LLM result. Fields the LLM left Unknown (or at
+        their default) keep their keyword value, and a fallback LLM result keeps the provisional answer as it is.
+        Returns the reconciled result and the changes relative to what was sent provisionally.
+        """
+        stats = self._speculative_stats
+        if final.is_fallback:
+            stats["kept_provisional"] += 1
+            logger.warning("Speculative Galileo AI analysis failed; keeping the keyword result")
+            return provisional.model_copy(update={"provisional": False}), {
+                "status": "llm_unavailable", "changed_fields": {}, "kept_fields": sorted(provisional.detected_fields)
+            }
+        
+        reconciled = final.model_copy(deep=True)
+        kept_fields = []
+        for field in TIERED_FIELDS:
+            placeholders = ("Unknown", FIELD_DEFAULTS.get(field, "Unknown"))
+            keyword_value = provisional.detected_fields.get(field, "Unknown")
+            if reconciled.detected_fields.get(field, "Unknown") in placeholders and keyword_value not in placeholders:
+                reconciled.detected_fields[field] = keyword_value
+                setattr(reconciled, field, keyword_value)
+                reconciled.field_tiers[field] = provisional.field_tiers.get(field, TIER_LLM)
+                kept_fields.append(field)
+        reconciled.missing_fields = [field for field in reconciled.missing_fields if field not in kept_fields]
+        
+        changed_fields = {
+            field: {"provisional": provisional.detected_fields.get(field, "Unknown"), "final": value}
+            for field, value in reconciled.detected_fields.items()
+            if value != provisional.detected_fields.get(field, "Unknown")
+        }
+        if changed_fields:
+            stats["revised"] += 1
+            stats["fields_changed"] += len(changed_fields)
+        logger.info(f"🔁 Speculative analysis reconciled: {len(changed_fields)} field(s) changed, {len(kept_fields)} kept from keywords")
+        return reconciled, {"status": "reconciled", "changed_fields": changed_fields, "kept_fields": kept_fields}
+    
+    def get_speculative_stats(self) -> Dict[str, Any]:
+        """Speculative analysis counters and how often the LLM revised the provisional answer"""
+        stats = self._speculative_stats
+        return {**stats, "revision_ratio": round(stats["revised"] / stats["runs"], 3) if stats["runs"] else 0.0}
+    
     async def chat_completion(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """
         General chat completion using Galileo AI LLM
@@ -178,7 +426,8 @@ class GalileoClaudeAdapter:
     
     async def generate_conversational_response(self, 
                                              user_message: str,
-                                             context: Optional[Dict[str, Any]] = None) -> str:
+                                             context: Optional[Dict[str, Any]] = None,
+                                             conversation: Optional[ConversationContext] = None) -> str:
         """
         Generate conversational response using Galileo AI LLM
         Maintains compatibility with existing interface
@@ -187,22 +436,7 @@ class GalileoClaudeAdapter:
             return "Galileo AI LLM is not available. Please check your configuration."
         
         try:
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are a helpful DPIA (Data Privacy Impact Assessment) assistant for pharmaceutical research. Provide clear, accurate, and helpful responses about data privacy, research compliance, and DPIA requirements."
-                },
-                {
-                    "role": "user",
-                    "content": user_message
-                }
-            ]
-            
-            # Add context if provided
-            if context:
-                context_str = f"Additional context: {json.dumps(context, indent=2)}"
-                messages[0]["content"] += f"\n\n{context_str}"
-            
+            messages = self._conversational_messages(user_message, context, conversation)
             response = await self.galileo_client.chat_completion(messages)
             return response
             
@@ -210,10 +444,68 @@ class GalileoClaudeAdapter:
             logger.error(f"Galileo AI conversational response failed: {e}")
             return f"I apologize, but I'm experiencing technical difficulties. Error: {str(e)}"
     
+    async def stream_conversational_response(self,
+                                             user_message: str,
+                                             context: Optional[Dict[str, Any]] = None,
+                                             conversation: Optional[ConversationContext] = None) -> AsyncIterator[str]:
+        """
+        Stream a conversational response from Galileo AI LLM, one delta at a time
+        Errors are yielded as a final apology message, like generate_conversational_response
+        """
+        if not self.galileo_client:
+            yield "Galileo AI LLM is not available. Please check your configuration."
+            return
+        
+        try:
+            messages = self._conversational_messages(user_message, context, conversation)
+            async for delta in self.galileo_client.stream_chat_completion(messages):
+                yield delta
+                
+        except Exception as e:
+            logger.error(f"Galileo AI streaming response failed: {e}")
+            yield f"I apologize, but I'm experiencing technical difficulties. Error: {str(e)}"
+    
+    def _conversational_messages(self,
+                                 user_message: str,
+                                 context: Optional[Dict[str, Any]] = None,
+                                 conversation: Optional[ConversationContext] = None) -> List[Dict[str, str]]:
+        """Build the messages for a conversational reply within the conversation token budgets"""
+        messages, report = build_conversation_messages(
+            "You are a helpful DPIA (Data Privacy Impact Assessment) assistant for pharmaceutical research. Provide clear, accurate, and helpful responses about data privacy, research compliance, and DPIA requirements.",
+            user_message,
+            context,
+            conversation,
+            self.conversation_config
+        )
+        
+        stats = self._conversation_stats
+        stats["prompts"] += 1
+        stats["prompt_tokens_total"] += report["prompt_tokens"]
+        stats["prompt_tokens_max"] = max(stats["prompt_tokens_max"], report["prompt_tokens"])
+        stats["prompt_tokens_last"] = report["prompt_tokens"]
+        logger.info(f"💬 Conversational prompt: ~{report['prompt_tokens']} tokens "
+                    f"({report['turns_in_prompt']} recent turn(s), {report['turns_summarized']} summarized)")
+        return messages
+    
+    def new_conversation(self) -> ConversationContext:
+        """Bounded conversation context for a new chat session"""
+        return ConversationContext(self.conversation_config)
+    
+    def get_conversation_stats(self) -> Dict[str, Any]:
+        """Conversational prompt sizes across all sessions"""
+        stats = self._conversation_stats
+        return {
+            **self.conversation_config.model_dump(),
+            **stats,
+            "prompt_tokens_avg": round(stats["prompt_tokens_total"] / stats["prompts"], 1) if stats["prompts"] else 0.0
+        }
+    
     async def enhance_field_detection(self, 
                                     field: str,
                                     research_text: str, 
-                                    current_value: str) -> tuple[str, float]:
+                                    current_value: str,
+                                    user_id: Optional[str] = None,
+                                    session_id: Optional[str] = None) -> tuple[str, float]:
         """
         Enhance field detection using Galileo AI LLM
         Maintains compatibility with existing claude_integration interface
@@ -231,11 +523,14 @@ class GalileoClaudeAdapter:
             return current_value, 0.3
         
         try:
+            output_tokens = ENHANCEMENT_OUTPUT_TOKENS_BASE + ENHANCEMENT_OUTPUT_TOKENS_PER_FIELD
+            reference_context, research_text = self._fit_enhancement_text(research_text, field + current_value, output_tokens)
+            
             # Create enhancement prompt
             enhancement_prompt = f"""
-            Analyze the following research text and improve the detection of the field '{field}'.
+            Analyze the following research text and improve the detection of the field '{_field_label(field)}'.
             Current detected value: '{current_value}'
-            
+            {reference_context}
             Research text: {research_text}
             
             Please provide:
@@ -247,12 +542,13 @@ class GalileoClaudeAdapter:
             """
             
             messages = [{"role": "user", "content": enhancement_prompt}]
-            response = await self.galileo_client.chat_completion(messages)
+            response = await self.galileo_client.chat_completion(
+                messages, max_tokens=output_tokens, **_attribution(user_id, session_id)
+            )
             
             # Parse response
-            import json
             try:
-                result = json.loads(response)
+                result = json.loads(_strip_code_fences(response))
                 enhanced_value = result.get("enhanced_value", current_value)
                 confidence = float(result.get("confidence", 0.5))
                 return enhanced_value, confidence
@@ -264,19 +560,228 @@ class GalileoClaudeAdapter:
             logger.error(f"Field enhancement failed: {e}")
             return current_value, 0.3
     
+    async def enhance_fields_batch(self,
+                                   fields: Dict[str, str],
+                                   research_text: str,
+                                   strategy: Optional[str] = None,
+                                   max_concurrency: Optional[int] = None,
+                                   user_id: Optional[str] = None,
+                                   session_id: Optional[str] = None) -> Tuple[Dict[str, Tuple[str, float]], Dict[str, Any]]:
+        """
+        Enhance several weak fields at once using Galileo AI LLM
+        
+        Args:
+            fields: Mapping of field name to its current detected value
+            research_text: The research text to analyze
+            strategy: "single_prompt" (one structured call) or "concurrent" (one call per field)
+            max_concurrency: Maximum concurrent calls for the "concurrent" strategy
+            user_id, session_id: Attribution sent with the completion calls
+            
+        Returns:
+            Tuple of ({field: (enhanced_value, confidence_score)}, enhancement metrics)
+        """
+        strategy = strategy or self.enhancement_strategy
+        if strategy not in ENHANCEMENT_STRATEGIES:
+            raise ValueError(f"Unknown enhancement strategy: {strategy}. Use one of {', '.join(ENHANCEMENT_STRATEGIES)}")
+        max_concurrency = max(1, max_concurrency or self.enhancement_max_concurrency)
+        
+        start_time = time.perf_counter()
+        if not fields:
+            results, llm_calls = {}, 0
+        elif strategy == ENHANCEMENT_SINGLE_PROMPT:
+            results, llm_calls = await self._enhance_fields_single_prompt(fields, research_text, user_id, session_id), 1
+        else:
+            results = await self._enhance_fields_concurrently(fields, research_text, max_concurrency, user_id, session_id)
+            llm_calls = len(fields)
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        
+        if not self.galileo_client:
+            llm_calls = 0
+        stats = self._enhancement_stats[strategy]
+        stats["runs"] += 1
+        stats["fields"] += len(fields)
+        stats["llm_calls"] += llm_calls
+        stats["total_latency_ms"] += latency_ms
+        
+        metrics = {
+            "strategy": strategy,
+            "fields_enhanced": len(fields),
+            "llm_calls": llm_calls,
+            "max_concurrency": max_concurrency if strategy == ENHANCEMENT_CONCURRENT else 1,
+            "latency_ms": round(latency_ms, 2)
+        }
+        logger.info(f"Enhanced {len(fields)} field(s) with '{strategy}' strategy in {latency_ms:.0f}ms")
+        return results, metrics
+    
+    async def _enhance_fields_concurrently(self,
+                                           fields: Dict[str, str],
+                                           research_text: str,
+                                           max_concurrency: int,
+                                           user_id: Optional[str] = None,
+                                           session_id: Optional[str] = None) -> Dict[str, Tuple[str, float]]:
+        """Fan out one enhancement call per field, at most max_concurrency at a time"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _enhance(field: str, current_value: str) -> Tuple[str, Tuple[str, float]]:
+            async with semaphore:
+                return field, await self.enhance_field_detection(field, research_text, current_value, user_id, session_id)
+        
+        enhanced = await asyncio.gather(*[_enhance(field, value) for field, value in fields.items()])
+        return dict(enhanced)
+    
+    async def _enhance_fields_single_prompt(self,
+                                            fields: Dict[str, str],
+                                            research_text: str,
+                                            user_id: Optional[str] = None,
+                                            session_id: Optional[str] = None) -> Dict[str, Tuple[str, float]]:
+        """Resolve every weak field with one structured prompt"""
+        fallback = {field: (value, 0.3) for field, value in fields.items()}
+        if not self.galileo_client:
+            logger.warning("Galileo AI not available for field enhancement")
+            return fallback
+        
+        try:
+            current_values = "\n".join(f"- {_field_label(field)}: '{value}'" for field, value in fields.items())
+            output_tokens = ENHANCEMENT_OUTPUT_TOKENS_BASE + ENHANCEMENT_OUTPUT_TOKENS_PER_FIELD * len(fields)
+            reference_context, research_text = self._fit_enhancement_text(research_text, current_values, output_tokens)
+            enhancement_prompt = f"""
+            Analyze the following research text and improve the detection of each field listed below.
+            
+            Fields and their current detected values:
+            {current_values}
+            {reference_context}
+            Research text: {research_text}
+            
+            For every field provide an improved value based on the text and a confidence score (0.0-1.0).
+            If the text does not contain the information, keep the current value with a low confidence.
+            
+            Respond in JSON format with one entry per field:
+            {{"field_name": {{"enhanced_value": "improved_value", "confidence": 0.8}}}}
+            """
+            
+            messages = [{"role": "user", "content": enhancement_prompt}]
+            response = await self.galileo_client.chat_completion(
+                messages, max_tokens=output_tokens, **_attribution(user_id, session_id)
+            )
+            
+            try:
+                parsed = json.loads(_strip_code_fences(response))
+            except (json.JSONDecodeError, ValueError):
+                logger.warning(f"Failed to parse batch enhancement response: {response}")
+                return fallback
+            
+            results = dict(fallback)
+            for field, current_value in fields.items():
+                entry = parsed.get(field) if isinstance(parsed, dict) else None
+                if not isinstance(entry, dict):
+                    continue
+                try:
+                    results[field] = (entry.get("enhanced_value", current_value), float(entry.get("confidence", 0.5)))
+                except (TypeError, ValueError):
+                    continue
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch field enhancement failed: {e}")
+            return fallback
+    
+    def _fit_enhancement_text(self, research_text: str, prompt_variables: str, output_tokens: int) -> Tuple[str, str]:
+        """
+        Fit the reference context and research text into an enhancement prompt's context window.
+        As in the full analysis prompt, reference context gets its share of the budget and the
+        text the rest. Returns the reference context section (empty without context) and the text.
+        """
+        budget_config = self.galileo_client.config.prompt_budget
+        # Instruction text of the enhancement prompts is well under 300 tokens
+        fixed_tokens = 300 + estimate_tokens(prompt_variables, budget_config.chars_per_token)
+        available = input_budget(budget_config, output_tokens, fixed_tokens)
+        
+        reference_context = format_reference_context(self.context_data)
+        if reference_context:
+            reference_budget = int(available * budget_config.reference_context_share)
+            reference_context, reference_report = fit_text(reference_context, reference_budget, budget_config.chars_per_token)
+            available -= reference_report.kept_tokens
+            reference_context = f"\n{reference_context}\n"
+        
+        fitted, report = fit_text(research_text, available, budget_config.chars_per_token)
+        if report.trimmed:
+            logger.info(
+                f"✂️ Enhancement research text trimmed from ~{report.original_tokens} to ~{report.kept_tokens} tokens"
+            )
+        return reference_context, fitted
+    
+    def get_enhancement_stats(self) -> Dict[str, Any]:
+        """Cumulative run count, LLM calls and average latency per enhancement strategy"""
+        return {
+            strategy: {
+                **stats,
+                "total_latency_ms": round(stats["total_latency_ms"], 2),
+                "avg_latency_ms": round(stats["total_latency_ms"] / stats["runs"], 2) if stats["runs"] else 0.0
+            }
+            for strategy, stats in self._enhancement_stats.items()
+        }
+    
+    def get_analysis_insights(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Get Galileo insights for an analysis fingerprint
+        Used to pick up insights that were fetched in the background
+        """
+        if not self.galileo_client:
+            return None
+        return self.galileo_client.get_cached_insights(fingerprint)
+    
+    def _analysis_cache_key(self, research_text: str, prompt_version: str = ANALYSIS_PROMPT_VERSION) -> Optional[str]:
+        """Cache key for an analysis with the current model settings and context"""
+        if not self.analysis_cache:
+            return None
+        config = self.galileo_client.config
+        return make_cache_key(research_text, config.model_name, config.temperature, self.context_data,
+                              prompt_version=prompt_version)
+    
+    def invalidate_analysis_cache(self) -> int:
+        """
+        Drop all cached analysis results
+        Returns the number of entries removed
+        """
+        if not self.analysis_cache:
+            return 0
+        return self.analysis_cache.invalidate_all()
+    
     def set_context(self, context: str, context_type: str = "reference"):
         """
         Set analysis context (reference materials or guidelines)
         """
         if context_type == "reference":
-            self.context_data["reference_context"] = context
+            key = "reference_context"
         elif context_type == "guidelines":
-            self.context_data["analysis_guidelines"] = context
+            key = "analysis_guidelines"
         else:
-            self.context_data[context_type] = context
+            key = context_type
+        
+        if self.context_data.get(key) != context:
+            # Results computed against the old context are stale
+            self.invalidate_analysis_cache()
+        self.context_data[key] = context
         
         logger.info(f"Updated {context_type} context ({len(context)} characters)")
     
+    def set_reference_context(self, context: str):
+        """Set additional reference context (claude_integration compatible)"""
+        self.set_context(context, "reference")
+    
+    def set_analysis_guidelines(self, guidelines: str):
+        """Set analysis guidelines (claude_integration compatible)"""
+        self.set_context(guidelines, "guidelines")
+    
+    def load_context_from_file(self, file_path: str):
+        """Load reference context from a text file (claude_integration compatible)"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                self.set_reference_context(f.read())
+            logger.info(f"Loaded context from {file_path}")
+        except Exception as e:
+            logger.error(f"Failed to load context from {file_path}: {e}")
+    
     def get_context_status(self) -> Dict[str, Any]:
         """
         Get current context status
@@ -287,8 +792,22 @@ class GalileoClaudeAdapter:
             "has_reference_context": bool(self.context_data.get("reference_context")),
             "has_guidelines": bool(self.context_data.get("analysis_guidelines")),
             "llm_provider": "Galileo AI",
+            "prompt_template": {"version": ANALYSIS_PROMPT.version, "prefix_sha256": ANALYSIS_PROMPT.prefix_sha256},
             "model_name": self.galileo_client.config.model_name if self.galileo_client else "Not Available",
-            "monitoring_enabled": self.galileo_client.config.enable_monitoring if self.galileo_client else False
+            "monitoring_enabled": self.galileo_client.config.enable_monitoring if self.galileo_client else False,
+            "analysis_cache": self.analysis_cache.stats() if self.analysis_cache else {"enabled": False},
+            "request_coalescing": self.galileo_client.get_coalescing_stats() if self.galileo_client else {},
+            "field_enhancement": self.get_enhancement_stats(),
+            "tiered_analysis": self.get_tier_stats(),
+            "speculative_analysis": self.get_speculative_stats(),
+            "project_titles": self.get_title_stats(),
+            "conversation_context": self.get_conversation_stats(),
+            "telemetry": self.galileo_client.get_telemetry_stats() if self.galileo_client else {},
+            "insights": self.galileo_client.get_insights_stats() if self.galileo_client else {},
+            "streaming": self.galileo_client.get_streaming_stats() if self.galileo_client else {},
+            "resilience": self.galileo_client.get_resilience_stats() if self.galileo_client else {},
+            "retries": self.galileo_client.get_retry_stats() if self.galileo_client else {},
+            "response_parsing": self.galileo_client.get_parse_stats() if self.galileo_client else {}
         }
     
     async def get_performance_metrics(self) -> Dict[str, Any]:
@@ -330,11 +849,27 @@ class GalileoClaudeAdapter:
             compliance_status="Requires Review",
             recommended_case_type=None,
             case_type_confidence=None,
-            case_type_reasoning=None
+            case_type_reasoning=None,
+            is_fallback=True
         )
     
+    async def warmup(self) -> int:
+        """
+        Pre-open Galileo AI connections during application startup
+        """
+        if not self.galileo_client:
+            return 0
+        
+        try:
+            return await self.galileo_client.warmup()
+        except Exception as e:
+            logger.warning(f"Galileo AI warmup failed: {e}")
+            return 0
+    
     async def close(self):
         """Close connections"""
+        if self.analysis_cache:
+            self.analysis_cache.close()
         if self.galileo_client:
             await self.galileo_client.close()
     
@@ -349,9 +884,12 @@ class GalileoClaudeAdapter:
         Returns:
             Generated project title
         """
+        return await self._llm_project_title(research_text) or self._generate_simple_title(research_text)
+    
+    async def _llm_project_title(self, research_text: str) -> Optional[str]:
+        """Ask Galileo AI for a project title; None when it is unavailable or gives no usable answer"""
         if not self.galileo_client:
-            # Fallback to simple title generation
-            return self._generate_simple_title(research_text)
+            return None
         
         try:
             prompt = f"""Based on the following research text, generate a concise and descriptive project title (maximum 100 characters):
@@ -367,26 +905,107 @@ Generate a professional project title that captures the main research focus. The
 
 Project Title:"""
 
+            # chat_completion returns the completion text
             response = await self.galileo_client.chat_completion(
                 messages=[{"role": "user", "content": prompt}],
-                model=self.galileo_client.config.model_name,
-                temperature=0.1,
+                temperature=PROJECT_TITLE_TEMPERATURE,
                 max_tokens=100
             )
             
-            if response and response.choices:
-                title = response.choices[0].message.content.strip()
-                # Clean up the title
-                title = title.replace('"', '').replace("'", "").strip()
-                if title.lower().startswith("project title:"):
-                    title = title[14:].strip()
-                return title[:100]  # Ensure max length
+            # Clean up the title
+            title = (response or "").replace('"', '').replace("'", "").strip()
+            if title.lower().startswith("project title:"):
+                title = title[14:].strip()
+            return title[:100] or None  # Ensure max length
             
         except Exception as e:
             logger.error(f"Error generating project title with Galileo AI: {e}")
+            return None
+    
+    def prefetch_project_title(self, research_text: str, analysis_result: AnalysisResult):
+        """
+        Start generating a project title in the background when the analysis did not find one,
+        so it is cached (or in flight) by the time it is asked for. Keyword-only analyses are
+        skipped: they avoided the LLM and count that way in the tiered analysis stats.
+        """
+        if self._has_analysed_title(analysis_result) or self._keyword_only(analysis_result):
+            return
+        key = self._title_cache_key(research_text)
+        if key is None or key in self._title_tasks:
+            return
+        if self.analysis_cache and self.analysis_cache.get(key) is not None:
+            return
+        self._title_stats["prefetched"] += 1
+        self._start_title_task(research_text, key)
+    
+    @staticmethod
+    def _keyword_only(analysis_result: AnalysisResult) -> bool:
+        """Whether every field of the analysis was answered by the keyword tier"""
+        tiers = analysis_result.field_tiers or {}
+        return bool(tiers) and all(tier == TIER_KEYWORD for tier in tiers.values())
+    
+    async def resolve_project_title(self, research_text: str, detected_title: Optional[str] = None) -> str:
+        """
+        Project title for case creation. A title generated after the analysis (cached or still in
+        flight) replaces the analysis's weak guess; otherwise the detected title is used, and a
+        title is generated now only when there is neither.
+        """
+        stats = self._title_stats
+        key = self._title_cache_key(research_text)
+        if key is not None:
+            cached = self.analysis_cache.get(key) if self.analysis_cache else None
+            if cached is not None:
+                stats["cache_hits"] += 1
+                return cached["project_title"]
+            task = self._title_tasks.get(key)
+            if task is not None:
+                stats["awaited_in_flight"] += 1
+                return await asyncio.shield(task)
         
-        # Fallback to simple title generation
-        return self._generate_simple_title(research_text)
+        if (detected_title or "") not in PLACEHOLDER_TITLES:
+            stats["from_analysis"] += 1
+            return detected_title
+        if key is None:
+            return self._generate_simple_title(research_text)
+        stats["generated_on_demand"] += 1
+        task = self._start_title_task(research_text, key)
+        # Shielded so a cancelled caller does not abandon a title other requests may be waiting for
+        return await asyncio.shield(task)
+    
+    def _has_analysed_title(self, analysis_result: AnalysisResult) -> bool:
+        """Whether the analysis found a real title rather than a placeholder or a weak keyword guess"""
+        if analysis_result.detected_fields.get("project_title", "") in PLACEHOLDER_TITLES:
+            return False
+        if (analysis_result.field_tiers or {}).get("project_title") == TIER_KEYWORD:
+            return analysis_result.confidence_scores.get("project_title", 0.0) >= self.tiered_analysis.confidence_threshold
+        return True
+    
+    def _start_title_task(self, research_text: str, key: str) -> "asyncio.Task[str]":
+        task = asyncio.create_task(self._generate_and_cache_title(research_text, key))
+        self._title_tasks[key] = task
+        task.add_done_callback(lambda _: self._title_tasks.pop(key, None))
+        return task
+    
+    async def _generate_and_cache_title(self, research_text: str, key: str) -> str:
+        title = await self._llm_project_title(research_text)
+        if title is None:
+            # Not cached, so a later request can try Galileo AI again
+            return self._generate_simple_title(research_text)
+        if self.analysis_cache:
+            self.analysis_cache.set(key, {"project_title": title})
+        logger.info(f"📝 Project title generated: {title}")
+        return title
+    
+    def _title_cache_key(self, research_text: str) -> Optional[str]:
+        """Cache key for a generated title (text hash, model and title prompt version); None without Galileo AI"""
+        if not self.galileo_client:
+            return None
+        return make_cache_key(research_text, self.galileo_client.config.model_name, PROJECT_TITLE_TEMPERATURE,
+                              prompt_version=PROJECT_TITLE_PROMPT_VERSION)
+    
+    def get_title_stats(self) -> Dict[str, Any]:
+        """Where case-creation project titles came from"""
+        return {**self._title_stats, "in_flight": len(self._title_tasks)}
     
     def _generate_simple_title(self, research_text: str) -> str:
         """Generate a simple project title from research text"""
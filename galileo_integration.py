@@ -7,14 +7,104 @@ Replaces Claude with Galileo AI's LLM for enhanced analysis and monitoring
 import os
 import json
 import httpx
+import asyncio
 import logging
 import time
-from typing import Dict, Any, Optional, List
+import hashlib
+import importlib.util
+from contextlib import AsyncExitStack
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple, Callable, Iterable
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError
+from request_coalescing import SingleFlight
+from galileo_telemetry import TelemetryConfig, TelemetryQueue
+from analysis_cache import AnalysisCache, hash_context
+from galileo_resilience import AdaptiveLimiterConfig, CircuitBreakerConfig, GalileoCallGuard
+from galileo_retry import GalileoRetryConfig, RetryBudgetConfig, RetryPolicy, RetryingExecutor
+from incremental_json import IncrementalJSONParser
+from analysis_prompt import ANALYSIS_PROMPT, ANALYSIS_SYSTEM_PROMPT
+from prompt_budget import PromptBudgetConfig, fit_text, format_reference_context, input_budget
 
 logger = logging.getLogger(__name__)
 
+# Fields an analysis must contain to be usable without asking the user
+MANDATORY_ANALYSIS_FIELDS = ["therapeutic_area", "procedure_type", "assay_type", "pi_name", "pathologist"]
+
+# DPIAAnalysisResult fields set by the integration rather than the LLM
+ANALYSIS_RUN_METADATA_FIELDS = {"galileo_insights", "prompt_budget", "prompt_version"}
+
+# Insights stage modes
+INSIGHTS_OFF = "off"  # never call /insights/analysis
+INSIGHTS_INLINE = "inline"  # fetch concurrently with building the result and attach it
+INSIGHTS_BACKGROUND = "background"  # fetch after returning; attach from cache on later requests
+INSIGHTS_MODES = (INSIGHTS_OFF, INSIGHTS_INLINE, INSIGHTS_BACKGROUND)
+
+# Galileo endpoints used by the integration
+CHAT_COMPLETIONS_PATH = "/chat/completions"
+INSIGHTS_PATH = "/insights/analysis"
+METRICS_LOG_PATH = "/metrics/log"
+METRICS_PERFORMANCE_PATH = "/metrics/performance"
+# Latency key for time to first streamed delta, kept apart from full /chat/completions latencies
+CHAT_COMPLETIONS_STREAM_LATENCY = "/chat/completions:stream"
+
+class GalileoEndpointTimeouts(BaseModel):
+    """Timeouts (in seconds) applied to a single Galileo endpoint"""
+    connect: float = 5.0
+    read: float = 60.0
+    write: float = 10.0
+    pool: float = 5.0
+
+    def to_httpx(self) -> httpx.Timeout:
+        return httpx.Timeout(connect=self.connect, read=self.read, write=self.write, pool=self.pool)
+
+def _default_endpoint_timeouts() -> Dict[str, GalileoEndpointTimeouts]:
+    """Completions are slow to generate; insights and metrics should never hold a worker for long"""
+    return {
+        CHAT_COMPLETIONS_PATH: GalileoEndpointTimeouts(connect=5.0, read=60.0, write=10.0, pool=5.0),
+        INSIGHTS_PATH: GalileoEndpointTimeouts(connect=3.0, read=10.0, write=5.0, pool=2.0),
+        METRICS_LOG_PATH: GalileoEndpointTimeouts(connect=3.0, read=5.0, write=5.0, pool=1.0),
+        METRICS_PERFORMANCE_PATH: GalileoEndpointTimeouts(connect=3.0, read=10.0, write=5.0, pool=2.0),
+    }
+
+def _default_retry_policies() -> Dict[str, RetryPolicy]:
+    """Completions and reads are safe to repeat; a repeated metrics batch would be logged twice"""
+    return {
+        CHAT_COMPLETIONS_PATH: RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=4.0),
+        INSIGHTS_PATH: RetryPolicy(max_attempts=2, base_delay=0.25, max_delay=1.0),
+        METRICS_LOG_PATH: RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=4.0, idempotent=False),
+        METRICS_PERFORMANCE_PATH: RetryPolicy(max_attempts=2, base_delay=0.25, max_delay=1.0),
+    }
+
+class GalileoTransportConfig(BaseModel):
+    """Connection pool, HTTP/2 and timeout settings for the Galileo HTTP transport"""
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    warmup_connections: int = 2
+    default_timeouts: GalileoEndpointTimeouts = Field(default_factory=GalileoEndpointTimeouts)
+    endpoint_timeouts: Dict[str, GalileoEndpointTimeouts] = Field(default_factory=_default_endpoint_timeouts)
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def timeout_for(self, path: str) -> httpx.Timeout:
+        """Get the httpx timeout for an endpoint path, falling back to the defaults"""
+        return self.endpoint_timeouts.get(path, self.default_timeouts).to_httpx()
+
+    def http2_enabled(self) -> bool:
+        """HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 without it"""
+        if not self.http2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("GALILEO_HTTP2 is enabled but the 'h2' package is not installed. Using HTTP/1.1.")
+            return False
+        return True
+
 class GalileoConfig(BaseModel):
     """Configuration for Galileo AI integration"""
     api_key: str
@@ -25,6 +115,15 @@ class GalileoConfig(BaseModel):
     model_name: str = "galileo-llm-v1"  # Galileo's LLM model
     temperature: float = 0.1
     max_tokens: int = 4000
+    transport: GalileoTransportConfig = Field(default_factory=GalileoTransportConfig)
+    telemetry: TelemetryConfig = Field(default_factory=TelemetryConfig)
+    insights_mode: str = INSIGHTS_BACKGROUND  # "off", "inline" or "background"
+    insights_cache_ttl: float = 3600.0
+    limiter: AdaptiveLimiterConfig = Field(default_factory=AdaptiveLimiterConfig)
+    circuit_breaker: CircuitBreakerConfig = Field(default_factory=CircuitBreakerConfig)
+    retries: GalileoRetryConfig = Field(default_factory=lambda: GalileoRetryConfig(endpoint_policies=_default_retry_policies()))
+    prompt_budget: PromptBudgetConfig = Field(default_factory=PromptBudgetConfig)
+    stream_analysis: bool = False  # stream analysis completions and parse fields as they arrive
 
 class DPIAAnalysisRequest(BaseModel):
     """Request model for DPIA analysis using Galileo AI LLM"""
@@ -34,40 +133,83 @@ class DPIAAnalysisRequest(BaseModel):
     user_id: Optional[str] = None
     session_id: Optional[str] = None
     enhance_fields: bool = True
+    context: Optional[Dict[str, Any]] = None  # reference context and guidelines, fitted into the prompt budget
 
 class DPIAAnalysisResult(BaseModel):
     """Result model for DPIA analysis from Galileo AI LLM"""
     
-    # Core DPIA fields
-    therapeutic_area: str
-    procedure_type: str
-    assay_type: str
+    # Core DPIA fields (defaults apply when the LLM omits a field, so its JSON validates directly)
+    therapeutic_area: str = "Unknown"
+    procedure_type: str = "Unknown"
+    assay_type: str = "Unknown"
     pi_name: Optional[str] = "Unknown"  # Make optional with default
     pathologist: Optional[str] = "Unknown"  # Make optional with default
-    project_title: str
-    request_purpose: str
-    biospecimen_type: str
-    data_volume: str
-    sensitive_data: str
-    cross_border_transfer: str
+    project_title: str = "Research Analysis"
+    request_purpose: str = "Data Analysis"
+    biospecimen_type: str = "Unknown"
+    data_volume: str = "Unknown"
+    sensitive_data: str = "Unknown"
+    cross_border_transfer: str = "Unknown"
     
     # Analysis metadata
-    missing_fields: List[str]
-    confidence_scores: Dict[str, float]
-    interactive_prompts: List[str]
-    suggestions: List[str]
-    analysis_summary: str
+    missing_fields: List[str] = Field(default_factory=list)
+    confidence_scores: Dict[str, float] = Field(default_factory=dict)
+    interactive_prompts: List[str] = Field(default_factory=list)
+    suggestions: List[str] = Field(default_factory=list)
+    analysis_summary: str = "Analysis completed"
     
     # Case type recommendation fields
     recommended_case_type: Optional[str] = "Unknown"  # "CALM" or "DPIA"
     case_type_confidence: Optional[float] = 0.0  # 0.0-1.0
     case_type_reasoning: Optional[str] = ""  # Explanation for the recommendation
+    
+    # True when the result was produced without a usable LLM response
+    is_fallback: bool = False
+    
+    # Galileo platform insights for this analysis (or a pending marker in background mode)
+    galileo_insights: Optional[Dict[str, Any]] = None
+    
+    # Token budget and trim decisions made while assembling the prompt
+    prompt_budget: Optional[Dict[str, Any]] = None
+    
+    # Version of the analysis prompt template that produced this result
+    prompt_version: Optional[str] = None
+
+class _CompletionMessage(BaseModel):
+    content: str
+
+class _CompletionChoice(BaseModel):
+    message: _CompletionMessage
+
+class ChatCompletionEnvelope(BaseModel):
+    """
+    The part of a /chat/completions response the integration reads.
+    Validated straight from the response bytes; ids, usage and other keys are skipped
+    without building Python objects for them.
+    """
+    choices: List[_CompletionChoice]
+
+    @property
+    def content(self) -> str:
+        return self.choices[0].message.content
+
+def _strip_code_fences(response: str) -> str:
+    """Remove ```json fences that LLMs sometimes wrap around JSON output"""
+    response = response.strip()
+    if response.startswith("```json"):
+        response = response[7:]
+    elif response.startswith("```"):
+        response = response[3:]
+    if response.endswith("```"):
+        response = response[:-3]
+    return response.strip()
 
 class GalileoLLMIntegration:
     """Main integration class for Galileo AI LLM platform"""
     
     def __init__(self, config: GalileoConfig):
         self.config = config
+        transport = config.transport
         self.client = httpx.AsyncClient(
             base_url=config.base_url,
             headers={
@@ -75,77 +217,128 @@ class GalileoLLMIntegration:
                 "Content-Type": "application/json",
                 "X-Galileo-Project": config.project_id
             },
-            timeout=60.0
+            limits=transport.limits(),
+            timeout=transport.default_timeouts.to_httpx(),
+            http2=transport.http2_enabled()
         )
+        # Identical analyses requested concurrently share one upstream completion
+        self._analysis_flights = SingleFlight("galileo_analysis")
+        # LLM calls go through an adaptive concurrency window and fail fast while the circuit is open
+        self.guard = GalileoCallGuard(config.limiter, config.circuit_breaker)
+        # Transient failures are retried (and slow completions optionally hedged) per endpoint policy
+        self.retries = RetryingExecutor(config.retries)
+        # Metrics and feedback are batched to /metrics/log off the request path
+        self.telemetry = TelemetryQueue(self._send_metrics_batch, config.telemetry)
+        # Insights are cached by analysis fingerprint and may be fetched in the background
+        if config.insights_mode not in INSIGHTS_MODES:
+            logger.warning(f"Unknown insights mode '{config.insights_mode}', using '{INSIGHTS_BACKGROUND}'")
+            config.insights_mode = INSIGHTS_BACKGROUND
+        self._insights_cache = AnalysisCache(max_entries=256, ttl_seconds=config.insights_cache_ttl)
+        self._insights_tasks: Dict[str, "asyncio.Task[None]"] = {}
+        self._insights_stats = {"requests": 0, "cache_hits": 0, "background_fetches": 0, "critical_path_ms": 0.0}
+        self._parse_stats = {"streamed": 0, "early_stops": 0, "recovered_partial": 0, "slow_path": 0}
+        self._stream_stats = {"streams": 0, "first_tokens": 0, "failed": 0, "last_ttft_ms": 0.0, "max_ttft_ms": 0.0, "total_ttft_ms": 0.0}
         logger.info(f"Galileo AI LLM integration initialized for project: {config.project_id}")
     
+    async def _send(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """Make one request to a Galileo endpoint using that endpoint's timeouts; raises on error statuses"""
+        response = await self.client.request(method, path, json=payload, timeout=self.config.transport.timeout_for(path))
+        response.raise_for_status()
+        return response
+    
+    async def _post(self, path: str, payload: Dict[str, Any]) -> httpx.Response:
+        """POST to a Galileo endpoint with that endpoint's timeouts and retry policy"""
+        return await self.retries.execute(path, lambda: self._send("POST", path, payload))
+    
+    async def _post_completion(self, payload: Dict[str, Any]) -> str:
+        """
+        Call /chat/completions with retries, each attempt under the circuit breaker and
+        concurrency limiter, and return the completion content
+        """
+        async def _attempt() -> str:
+            async with self.guard.guarded():
+                response = await self._send("POST", CHAT_COMPLETIONS_PATH, payload)
+                return ChatCompletionEnvelope.model_validate_json(response.content).content
+        
+        return await self.retries.execute(CHAT_COMPLETIONS_PATH, _attempt)
+    
+    async def _get(self, path: str) -> httpx.Response:
+        """GET from a Galileo endpoint with that endpoint's timeouts and retry policy"""
+        return await self.retries.execute(path, lambda: self._send("GET", path))
+    
+    async def warmup(self) -> int:
+        """
+        Pre-open pooled connections (DNS, TCP and TLS) so the first real request
+        after startup does not pay for connection setup.
+        Returns the number of connections that were opened successfully.
+        """
+        count = self.config.transport.warmup_connections
+        if count <= 0:
+            return 0
+        
+        async def _open_connection() -> bool:
+            try:
+                # Any HTTP response means the connection is established and pooled
+                await self.client.request("HEAD", "/", timeout=self.config.transport.default_timeouts.to_httpx())
+                return True
+            except httpx.HTTPError as e:
+                logger.warning(f"Galileo AI warmup connection failed: {e}")
+                return False
+        
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*[_open_connection() for _ in range(count)])
+        opened = sum(1 for ok in results if ok)
+        logger.info(f"Galileo AI transport warmed up: {opened}/{count} connections in {(time.perf_counter() - start_time) * 1000:.0f}ms")
+        return opened
+    
     async def analyze_dpia_text(self, request: DPIAAnalysisRequest) -> DPIAAnalysisResult:
         """
         Analyze DPIA text using Galileo AI's LLM instead of Claude
+        Concurrent requests with the same fingerprint are coalesced into one upstream call
         """
+        fingerprint = self._request_fingerprint(request)
+        return await self._analysis_flights.run(fingerprint, lambda: self._analyze_dpia_text(request))
+    
+    def _request_fingerprint(self, request: DPIAAnalysisRequest) -> str:
+        """Hash of everything that affects the completion (user and session IDs do not)"""
+        fingerprint_source = json.dumps({
+            "text": request.text,
+            "analysis_type": request.analysis_type,
+            "metadata": request.metadata or {},
+            "context": hash_context(request.context),
+            "prompt_version": ANALYSIS_PROMPT.version,
+            "model": self.config.model_name,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(fingerprint_source.encode("utf-8")).hexdigest()
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Upstream analysis calls made and calls saved by coalescing"""
+        return self._analysis_flights.stats()
+    
+    async def _analyze_dpia_text(self, request: DPIAAnalysisRequest) -> DPIAAnalysisResult:
+        """Run a single DPIA analysis against Galileo AI"""
         try:
-            # Enhanced DPIA analysis prompt for Galileo AI LLM
-            analysis_prompt = self._create_analysis_prompt(request.text)
+            # Enhanced DPIA analysis prompt for Galileo AI LLM, fitted to the token budget
+            analysis_prompt, prompt_budget = self._build_analysis_prompt(request)
+            payload = self._analysis_payload(request, analysis_prompt)
             
-            payload = {
-                "model": self.config.model_name,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a specialized DPIA (Data Privacy Impact Assessment) analysis assistant for pharmaceutical research. Analyze research text and extract relevant DPIA fields with high accuracy."
-                    },
-                    {
-                        "role": "user", 
-                        "content": analysis_prompt
-                    }
-                ],
-                "temperature": self.config.temperature,
-                "max_tokens": self.config.max_tokens,
-                "metadata": {
-                    **(request.metadata or {}),
-                    "timestamp": datetime.now().isoformat(),
-                    "source": "dpia_chatbot",
-                    "environment": self.config.environment,
-                    "analysis_type": request.analysis_type
-                },
-                "user_id": request.user_id,
-                "session_id": request.session_id
-            }
-            
-            # Call Galileo AI LLM
-            response = await self.client.post("/chat/completions", json=payload)
-            response.raise_for_status()
+            if self.config.stream_analysis:
+                # Fields are decoded as they arrive; a truncated stream keeps what was decoded
+                analysis_result = DPIAAnalysisResult.model_validate(await self._stream_analysis_payload(payload))
+            else:
+                # Call Galileo AI LLM and validate its content straight into the result model
+                analysis_result = self._validate_analysis(await self._post_completion(payload))
             
-            result = response.json()
-            llm_response = result["choices"][0]["message"]["content"]
+            analysis_result.prompt_budget = prompt_budget
+            analysis_result.prompt_version = ANALYSIS_PROMPT.version
             
-            # Parse the structured response
-            parsed_analysis = self._parse_llm_response(llm_response)
+            stage_start = time.perf_counter()
+            analysis_result.galileo_insights = await self._run_insights_stage(request.text, analysis_result)
+            self._insights_stats["critical_path_ms"] += (time.perf_counter() - stage_start) * 1000
             
-            # Get additional Galileo insights
-            insights = await self._get_analysis_insights(request.text, parsed_analysis)
-            
-            return DPIAAnalysisResult(
-                therapeutic_area=parsed_analysis.get("therapeutic_area", "Unknown"),
-                procedure_type=parsed_analysis.get("procedure_type", "Unknown"),
-                assay_type=parsed_analysis.get("assay_type", "Unknown"),
-                pi_name=parsed_analysis.get("pi_name", "Unknown"),
-                pathologist=parsed_analysis.get("pathologist", "Unknown"),
-                project_title=parsed_analysis.get("project_title", "Research Analysis"),
-                request_purpose=parsed_analysis.get("request_purpose", "Data Analysis"),
-                biospecimen_type=parsed_analysis.get("biospecimen_type", "Unknown"),
-                data_volume=parsed_analysis.get("data_volume", "Unknown"),
-                sensitive_data=parsed_analysis.get("sensitive_data", "Unknown"),
-                cross_border_transfer=parsed_analysis.get("cross_border_transfer", "Unknown"),
-                missing_fields=parsed_analysis.get("missing_fields", []),
-                confidence_scores=parsed_analysis.get("confidence_scores", {}),
-                interactive_prompts=parsed_analysis.get("interactive_prompts", []),
-                suggestions=parsed_analysis.get("suggestions", []),
-                analysis_summary=parsed_analysis.get("analysis_summary", "Analysis completed"),
-                recommended_case_type=parsed_analysis.get("recommended_case_type", "Unknown"),
-                case_type_confidence=parsed_analysis.get("case_type_confidence", 0.0),
-                case_type_reasoning=parsed_analysis.get("case_type_reasoning", "")
-            )
+            return analysis_result
             
         except httpx.HTTPError as e:
             logger.error(f"Galileo AI LLM API error: {e}")
@@ -180,208 +373,166 @@ class GalileoLLMIntegration:
                 analysis_summary=f"Fallback analysis completed. Error: {str(e)}",
                 recommended_case_type="Unknown",
                 case_type_confidence=0.0,
-                case_type_reasoning=""
+                case_type_reasoning="",
+                is_fallback=True
             )
     
-    def _create_analysis_prompt(self, research_text: str) -> str:
-        """Create a comprehensive analysis prompt for Galileo AI LLM"""
-        return f"""
-You are an expert DPIA (Data Protection Impact Assessment) analyst for research projects. Analyze the following research text and extract all relevant information for DPIA case creation.
-
-**Research Text:** {research_text}
-
-**CALM vs DPIA Service Definitions:**
-
-**CALM-EM (Cellular Analysis and Light Microscopy - Electron Microscopy) Services:**
-- Advanced Light Microscopy and Imaging services
-- Electron Microscopy Laboratory services
-- Research microscopy (confocal, live-cell imaging, light sheet microscopy, electron microscopy)
-- Training and technical support for microscopy
-- Sample preparation and analysis for research purposes
-- Research microscopy and analysis projects
-
-**DPIA (Digital Pathology and Image Analysis) Services:**
-- Whole slide scanning (brightfield and fluorescent tissue sections)
-- Digital pathology workflows and gSlide Viewer uploads
-- Slide submission to DPIA lab for scanning services
-- Custom analysis algorithms for whole-slide images
-- High-content imaging studies for in vitro experiments
-- **Tissue section analysis and quantification**
-- **Systematic imaging of tissue samples for quantitative analysis**
-- **Multi-group comparative studies requiring standardized imaging**
-
-**Field Extraction Guidelines:**
-
-**PI Name Extraction:**
-- Look for patterns: "PI as [Name]", "PI: [Name]", "Principal Investigator [Name]", "PI [Name]"
-- Extract the actual name (e.g., "PI as John" → extract "John")
-- If no PI mentioned, use "Unknown"
-
-**Pathologist Extraction:**
-- Look for patterns: "Pathologist as [Name]", "Pathologist: [Name]", "Pathologist [Name]"
-- Extract the actual name (e.g., "Pathologist as Smith" → extract "Smith")
-- If no pathologist mentioned, use "Unknown"
-
-**Therapeutic Area:**
-- Determine from research context (mouse eyes → Ophthalmology, cancer → Oncology, lung → Pulmonology, etc.)
-- If unclear, use "Unknown"
-
-**Assay Type:**
-- Extract staining/labeling methods (SOX9, NucSpot, DAPI, H&E, TRITC, etc.)
-- Include fluorescent markers and antibodies
-- If multiple, combine them (e.g., "SOX9 + NucSpot 750", "AT2-TRITC + DAPI")
-
-**Interactive Prompts Generation:**
-When fields are missing or "Unknown", generate specific interactive prompts to help users provide the missing information:
-
-**For Missing PI Name:**
-- "Who is the Principal Investigator (PI) for this research project?"
-- "Please provide the name of the PI responsible for this study"
-- "Which researcher is leading this project as the Principal Investigator?"
-
-**For Missing Pathologist:**
-- "Is a pathologist involved in this research? If yes, please provide their name"
-- "Will this research require pathologist review or consultation?"
-- "Please specify the pathologist who will be involved in sample analysis"
-
-**For Missing/Unknown Therapeutic Area:**
-- Based on research context, suggest likely therapeutic areas and ask for confirmation:
-  - If mentions "cancer", "tumor", "oncology" → "Is this oncology research? Please confirm the therapeutic area"
-  - If mentions "immune", "antibody", "T-cell" → "Is this immunology research? Please specify the therapeutic area"
-  - If mentions "eye", "retina", "vision" → "Is this ophthalmology research? Please confirm the therapeutic area"
-  - If mentions "brain", "neuron", "neural" → "Is this neuroscience research? Please specify the therapeutic area"
-  - If mentions "heart", "cardiac", "cardiovascular" → "Is this cardiovascular research? Please confirm the therapeutic area"
-  - If mentions "lung", "pulmonary", "respiratory" → "Is this pulmonology research? Please confirm the therapeutic area"
-  - If unclear → "What is the primary therapeutic area or medical field for this research?"
-
-**For Missing Assay Type:**
-- "What specific assays, staining methods, or markers will be used in this research?"
-- "Please specify the experimental techniques or assays planned for this study"
-- "What type of analysis or detection methods will be employed?"
-
-**Instructions:**
-Extract the following information and provide a JSON response:
-
-{{
-    "therapeutic_area": "specific medical field (e.g., Oncology, Immunology, Ophthalmology, Pulmonology, etc.)",
-    "procedure_type": "type of procedure (e.g., Fluorescence (IF), Brightfield, etc.)",
-    "assay_type": "assay classification",
-    "pi_name": "Principal Investigator name (extract from patterns like 'PI as John')",
-    "pathologist": "Pathologist name if involved (extract from patterns like 'Pathologist as Smith')",
-    "project_title": "descriptive project title",
-    "request_purpose": "purpose and objectives of the research",
-    "biospecimen_type": "type of biological specimen",
-    "data_volume": "estimated data volume (Small/Medium/Large)",
-    "sensitive_data": "whether sensitive data is involved (Yes/No)",
-    "cross_border_transfer": "whether cross-border data transfer occurs (Yes/No/Unknown)",
-    "missing_fields": ["list of fields that couldn't be determined"],
-    "confidence_scores": {{"field_name": confidence_value}},
-    "interactive_prompts": ["specific questions to ask user for missing information - generate intelligent prompts based on missing fields"],
-    "suggestions": ["list of actionable suggestions for DPIA completion"],
-    "analysis_summary": "brief summary of the research and DPIA implications",
-    "recommended_case_type": "CALM or DPIA",
-    "case_type_confidence": 0.0-1.0,
-    "case_type_reasoning": "Explanation for the recommendation"
-}}
-
-**Interactive Prompts Priority:**
-1. Always generate prompts for missing PI, Pathologist, and Therapeutic Area
-2. Make prompts specific and contextual based on the research text
-3. Provide multiple prompt options when appropriate
-4. Include suggestions or examples in prompts when helpful
-
-**Case Type Recommendation Guidelines:**
-
-**CRITICAL: Recommend DPIA when the text contains ANY of these indicators (HIGHEST PRIORITY):**
-- **Slide scanning keywords**: "slide scanning", "scan slides", "scanning", "slide submission", "submit slides"
-- **Digital pathology services**: "digital pathology", "gSlide Viewer", "DPIA lab", "whole slide scanning"
-- **Tissue section analysis**: "lung section", "tissue section", "per section", "section analysis", "cells per lung section"
-- **Quantification metrics**: "quantification", "# of cells per", "normalized by total area", "cells per lung section", "normalized by # of DAPI cells"
-- **Multi-group studies**: "4 groups", "N=9-10 per group", "treatment groups", "control groups", "healthy, injured"
-- **Systematic imaging**: "need imaging and quantification", "imaging of multiple samples"
-- **Brightfield/fluorescent scanning**: "brightfield scanning", "fluorescent tissue sections"
-- **Standardized analysis**: comparative studies requiring consistent imaging protocols
-
-**MANDATORY DPIA CLASSIFICATION RULES:**
-1. **ANY mention of "slide scanning" OR "scan slides" OR "scanning" → ALWAYS DPIA**
-2. **ANY mention of "DPIA lab" OR "digital pathology" → ALWAYS DPIA**
-3. **ANY mention of "tissue section" OR "lung section" → ALWAYS DPIA**
-4. **ANY mention of "quantification" with tissue analysis → ALWAYS DPIA**
-5. **ANY mention of "submit slides" OR "slide submission" → ALWAYS DPIA**
-
-**Recommend CALM when the text contains (ONLY if NO DPIA indicators above):**
-- **Individual cell research**: single cell analysis, live-cell imaging without tissue sections
-- **Basic microscopy research**: "research on", "want to research" with simple biological samples (NOT tissue sections)
-- **Sample preparation focus**: staining, cleared samples, preparation techniques (without quantification)
-- **Research microscopy**: confocal, electron microscopy, light sheet without quantification
-- **Training requests**: microscopy training, technical support
-- **Explicit CALM requests**: "CALM request", "CALM service"
-
-**Key Decision Logic (STRICT PRIORITY ORDER - FOLLOW EXACTLY):**
-1. **If mentions "slide scanning" OR "scan slides" OR "scanning" → DPIA** (ABSOLUTE HIGHEST PRIORITY)
-2. **If mentions "DPIA lab" OR "digital pathology" → DPIA** (ABSOLUTE HIGHEST PRIORITY)
-3. **If mentions "submit slides" OR "slide submission" → DPIA** (ABSOLUTE HIGHEST PRIORITY)
-4. **If mentions "lung section" OR "tissue section" OR "cells per section" → DPIA** (HIGHEST PRIORITY)
-5. **If mentions quantification metrics like "normalized by total area" → DPIA** 
-6. **Multi-group studies with imaging → DPIA** (systematic analysis across groups)
-7. **Whole slide scanning/digital workflows → DPIA**
-8. **Individual biological research with samples/staining → CALM** (ONLY if no tissue sections)
-9. **Research microscopy without tissue sections → CALM**
-10. **Training and technical support → CALM**
-
-**Example Classifications (FOLLOW THESE EXACTLY):**
-- "I need slide scanning on lung cell tissue sections" → **DPIA** (contains "slide scanning" and "tissue sections")
-- "Please scan my lung tissue slides" → **DPIA** (contains "scan" and "slides")
-- "Submit slides to DPIA lab for scanning" → **DPIA** (contains "submit slides", "DPIA lab", "scanning")
-- "Whole slide scanning for digital pathology" → **DPIA** (contains "slide scanning" and "digital pathology")
-- "Lung stem cells (AT2-TRITC) and total cells (DAPI) are stained. # of AT2 cells per lung section" → **DPIA** (contains "lung section" and quantification)
-- "3D Image analysis of Cleared Mouse Eyes stained with SOX9 + NucSpot 750" → **CALM** (individual biological research, no tissue sections, no scanning)
-- "CALM request for CD19/CD20 Allo1 CAR-T MS" → **CALM** (explicit CALM request)
-
-**CRITICAL SLIDE SCANNING DETECTION:**
-- **"slide scanning"** → DPIA (100% confidence)
-- **"scan slides"** → DPIA (100% confidence)  
-- **"scanning" + "slides"** → DPIA (100% confidence)
-- **"scanning" + "tissue"** → DPIA (100% confidence)
-- **"submit slides"** → DPIA (100% confidence)
-- **"DPIA lab"** → DPIA (100% confidence)
-- **"digital pathology"** → DPIA (100% confidence)
-
-**MANDATORY PRE-CLASSIFICATION CHECK:**
-Before making any recommendation, check if the text contains:
-- "slide scanning" OR "scan slides" OR "scanning" → If YES, SET recommended_case_type = "DPIA"
-- "DPIA lab" OR "digital pathology" → If YES, SET recommended_case_type = "DPIA"  
-- "submit slides" OR "slide submission" → If YES, SET recommended_case_type = "DPIA"
-- "tissue section" OR "lung section" → If YES, SET recommended_case_type = "DPIA"
-
-**CRITICAL CLASSIFICATION INSTRUCTION:**
-For the current research text: "{research_text}"
-
-**STEP 1: MANDATORY DPIA CHECK (Check these first, in order):**
-1. Does text contain "slide scanning" OR "scan slides" OR "scanning"? → If YES: DPIA
-2. Does text contain "DPIA lab" OR "digital pathology"? → If YES: DPIA
-3. Does text contain "submit slides" OR "slide submission"? → If YES: DPIA
-4. Does text contain "tissue section" OR "lung section"? → If YES: DPIA
-5. Does text contain quantification with tissue analysis? → If YES: DPIA
-
-**STEP 2: If none of the above, then check CALM indicators**
-
-**STEP 3: Set case_type_confidence to 1.0 for slide scanning/DPIA lab mentions, 0.9 for tissue sections**
-
-**MANDATORY: If the text mentions slide scanning, DPIA lab, or digital pathology services, you MUST classify as DPIA regardless of other content.**
-
-Respond with valid JSON only.
-"""
+    def _analysis_payload(self, request: DPIAAnalysisRequest, analysis_prompt: str) -> Dict[str, Any]:
+        """Chat completion payload for a DPIA analysis"""
+        return {
+            "model": self.config.model_name,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": ANALYSIS_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user", 
+                    "content": analysis_prompt
+                }
+            ],
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "metadata": {
+                **(request.metadata or {}),
+                "timestamp": datetime.now().isoformat(),
+                "source": "dpia_chatbot",
+                "environment": self.config.environment,
+                "analysis_type": request.analysis_type,
+                "prompt_version": ANALYSIS_PROMPT.version
+            },
+            "user_id": request.user_id,
+            "session_id": request.session_id
+        }
+    
+    async def stream_analysis(self,
+                              request: DPIAAnalysisRequest,
+                              on_field: Optional[Callable[[str, Any], None]] = None,
+                              stop_when_fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Stream a DPIA analysis and decode each field as soon as its value closes.
+        on_field is called with (field, value) for every decoded field. If stop_when_fields
+        is given (e.g. MANDATORY_ANALYSIS_FIELDS), generation is stopped as soon as all of
+        them are present. Returns the decoded fields.
+        """
+        analysis_prompt, _ = self._build_analysis_prompt(request)
+        payload = self._analysis_payload(request, analysis_prompt)
+        return await self._stream_analysis_payload(payload, on_field, stop_when_fields)
+    
+    async def _stream_analysis_payload(self,
+                                       payload: Dict[str, Any],
+                                       on_field: Optional[Callable[[str, Any], None]] = None,
+                                       stop_when_fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        required = list(stop_when_fields or [])
+        parser = IncrementalJSONParser()
+        options = {key: value for key, value in payload.items() if key not in ("model", "messages")}
+        stream = self.stream_chat_completion(payload["messages"], **options)
+        stopped_early = False
+        self._parse_stats["streamed"] += 1
+        try:
+            async for delta in stream:
+                for field, value in parser.feed(delta):
+                    if on_field is not None:
+                        on_field(field, value)
+                if parser.complete:
+                    break
+                if required and parser.has_fields(required):
+                    stopped_early = True
+                    self._parse_stats["early_stops"] += 1
+                    logger.info(f"⏹️ Stopped analysis stream early; all {len(required)} required fields received")
+                    break
+        finally:
+            # Closing the generator closes the HTTP stream, which stops upstream generation
+            await stream.aclose()
+        
+        if parser.complete or stopped_early:
+            return parser.fields
+        return self._recover_partial_analysis(parser.fields)
+    
+    def _recover_partial_analysis(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Keep the fields decoded from a truncated or malformed response and fill in the rest
+        from the fallback. The result still counts as a fallback if a mandatory field is missing.
+        """
+        if not fields:
+            return self._fallback_parse_response("")
+        self._parse_stats["recovered_partial"] += 1
+        missing = [field for field in MANDATORY_ANALYSIS_FIELDS if field not in fields]
+        logger.warning(f"🩹 Recovered {len(fields)} field(s) from a partial Galileo AI response; missing: {missing}")
+        return {
+            **self._fallback_parse_response(""),
+            **fields,
+            "missing_fields": fields.get("missing_fields", missing),
+            "is_fallback": bool(missing)
+        }
+    
+    def get_parse_stats(self) -> Dict[str, Any]:
+        """Streamed analyses, early stops, partial recoveries and responses that missed the single-pass validation"""
+        return dict(self._parse_stats)
+    
+    def _build_analysis_prompt(self, request: DPIAAnalysisRequest) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the analysis prompt within the context window.
+        The completion keeps max_tokens of output budget; reference context may use a fixed
+        share of what is left and the research text gets the rest. Returns the prompt and
+        a report of the budget and any trimming.
+        """
+        budget_config = self.config.prompt_budget
+        chars_per_token = budget_config.chars_per_token
+        fixed_tokens = ANALYSIS_PROMPT.fixed_tokens(chars_per_token)
+        available = input_budget(budget_config, self.config.max_tokens, fixed_tokens)
+        
+        reference_context = format_reference_context(request.context)
+        reference_report = None
+        if reference_context:
+            reference_budget = int(available * budget_config.reference_context_share)
+            reference_context, reference_report = fit_text(reference_context, reference_budget, chars_per_token)
+            available -= reference_report.kept_tokens
+        
+        research_text, research_report = fit_text(request.text, available, chars_per_token)
+        if research_report.trimmed:
+            logger.warning(
+                f"✂️ Research text trimmed from ~{research_report.original_tokens} to "
+                f"~{research_report.kept_tokens} tokens ({research_report.strategy})"
+            )
+        
+        prompt = self._create_analysis_prompt(research_text, reference_context)
+        return prompt, {
+            "context_window": budget_config.context_window,
+            "output_reserve_tokens": self.config.max_tokens,
+            "estimated_prompt_tokens": fixed_tokens + research_report.kept_tokens + (reference_report.kept_tokens if reference_report else 0),
+            "prompt_version": ANALYSIS_PROMPT.version,
+            "research_text": research_report.model_dump(),
+            "reference_context": reference_report.model_dump() if reference_report else None
+        }
+    
+    def _create_analysis_prompt(self, research_text: str, reference_context: str = "") -> str:
+        """Create the analysis prompt for Galileo AI LLM from the precompiled template"""
+        return ANALYSIS_PROMPT.render(research_text, reference_context)
+    
+    def _validate_analysis(self, response: str) -> DPIAAnalysisResult:
+        """
+        Validate the LLM's JSON content into a DPIAAnalysisResult in a single pass.
+        Content that does not validate (malformed or truncated JSON) goes through the
+        tolerant parser, which recovers intact fields or falls back.
+        """
+        try:
+            analysis_result = DPIAAnalysisResult.model_validate_json(_strip_code_fences(response))
+        except ValidationError:
+            self._parse_stats["slow_path"] += 1
+            return DPIAAnalysisResult.model_validate(self._parse_llm_response(response))
+        
+        if analysis_result.recommended_case_type == "Unknown":
+            logger.warning("⚠️ No case type recommendation in Galileo AI response")
+        else:
+            logger.info(f"🎯 Case type recommendation found: {analysis_result.recommended_case_type}")
+        return analysis_result
     
     def _parse_llm_response(self, response: str) -> Dict[str, Any]:
         """Parse the structured JSON response from Galileo AI LLM"""
         try:
             # Clean the response to extract JSON
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.endswith("```"):
-                response = response[:-3]
+            response = _strip_code_fences(response)
             
             parsed = json.loads(response)
             
@@ -399,8 +550,8 @@ Respond with valid JSON only.
             logger.error(f"Failed to parse LLM response as JSON: {e}")
             logger.error(f"Response content: {response}")
             
-            # Fallback parsing for non-JSON responses
-            return self._fallback_parse_response(response)
+            # Keep whatever fields are intact before falling back entirely
+            return self._recover_partial_analysis(IncrementalJSONParser.parse_partial(response))
     
     def _fallback_parse_response(self, response: str) -> Dict[str, Any]:
         """Fallback parsing when JSON parsing fails"""
@@ -436,11 +587,71 @@ Respond with valid JSON only.
             "analysis_summary": "Analysis completed with limited information extraction - additional details needed",
             "recommended_case_type": "Unknown",
             "case_type_confidence": 0.0,
-            "case_type_reasoning": "Insufficient information to determine case type"
+            "case_type_reasoning": "Insufficient information to determine case type",
+            "is_fallback": True
         }
     
-    async def _get_analysis_insights(self, text: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Get additional insights from Galileo AI platform"""
+    def _analysis_fingerprint(self, text: str, analysis: Dict[str, Any]) -> str:
+        """Hash of the insights request inputs"""
+        fingerprint_source = json.dumps({"analysis": analysis, "input_text_length": len(text)}, sort_keys=True, default=str)
+        return hashlib.sha256(fingerprint_source.encode("utf-8")).hexdigest()
+    
+    async def _run_insights_stage(self, text: str, analysis_result: DPIAAnalysisResult) -> Optional[Dict[str, Any]]:
+        """
+        Optional insights stage: skipped, served from cache, awaited inline,
+        or deferred to a background task depending on config.insights_mode
+        """
+        if self.config.insights_mode == INSIGHTS_OFF:
+            return None
+        
+        analysis = analysis_result.model_dump(exclude=ANALYSIS_RUN_METADATA_FIELDS)
+        self._insights_stats["requests"] += 1
+        fingerprint = self._analysis_fingerprint(text, analysis)
+        cached = self._insights_cache.get(fingerprint)
+        if cached is not None:
+            self._insights_stats["cache_hits"] += 1
+            return {**cached, "fingerprint": fingerprint, "cached": True}
+        
+        if self.config.insights_mode == INSIGHTS_BACKGROUND:
+            if fingerprint not in self._insights_tasks:
+                task = asyncio.ensure_future(self._fetch_and_cache_insights(fingerprint, text, analysis))
+                self._insights_tasks[fingerprint] = task
+                task.add_done_callback(lambda _, fingerprint=fingerprint: self._insights_tasks.pop(fingerprint, None))
+                self._insights_stats["background_fetches"] += 1
+            return {"status": "pending", "fingerprint": fingerprint}
+        
+        insights = await self._fetch_and_cache_insights(fingerprint, text, analysis)
+        return {**insights, "fingerprint": fingerprint}
+    
+    async def _fetch_and_cache_insights(self, fingerprint: str, text: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch insights and cache successful responses"""
+        insights = await self._get_analysis_insights(text, analysis)
+        if insights is None:
+            return {
+                "model_performance": "standard",
+                "analysis_quality": "good",
+                "recommendations": []
+            }
+        self._insights_cache.set(fingerprint, insights)
+        return insights
+    
+    def get_cached_insights(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Look up insights for an analysis fingerprint (e.g. after a background fetch)"""
+        return self._insights_cache.get(fingerprint)
+    
+    def get_insights_stats(self) -> Dict[str, Any]:
+        """Insights stage mode, cache usage and time added to the critical path"""
+        return {
+            "mode": self.config.insights_mode,
+            "requests": self._insights_stats["requests"],
+            "cache_hits": self._insights_stats["cache_hits"],
+            "background_fetches": self._insights_stats["background_fetches"],
+            "background_in_flight": len(self._insights_tasks),
+            "critical_path_ms_total": round(self._insights_stats["critical_path_ms"], 2)
+        }
+    
+    async def _get_analysis_insights(self, text: str, analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get additional insights from Galileo AI platform (None if unavailable)"""
         try:
             insights_payload = {
                 "analysis_result": analysis,
@@ -448,25 +659,22 @@ Respond with valid JSON only.
                 "timestamp": datetime.now().isoformat()
             }
             
-            response = await self.client.post("/insights/analysis", json=insights_payload)
+            response = await self._post(INSIGHTS_PATH, insights_payload)
             response.raise_for_status()
             
             return response.json()
             
         except Exception as e:
             logger.warning(f"Failed to get Galileo insights: {e}")
-            return {
-                "model_performance": "standard",
-                "analysis_quality": "good",
-                "recommendations": []
-            }
+            return None
     
     async def log_analysis_metrics(self, 
                                  analysis_input: str,
-                                 analysis_output: DPIAAnalysisResult,
+                                 analysis_output: Optional[DPIAAnalysisResult],
                                  user_feedback: Optional[Dict[str, Any]] = None):
         """
         Log analysis metrics to Galileo AI for monitoring and improvement
+        The event is queued and sent in the background, so this returns immediately
         """
         if not self.config.enable_monitoring:
             return
@@ -476,7 +684,7 @@ Respond with valid JSON only.
                 "timestamp": datetime.now().isoformat(),
                 "input_text": analysis_input,
                 "input_length": len(analysis_input),
-                "analysis_result": analysis_output.dict(),
+                "analysis_result": analysis_output.model_dump() if analysis_output else None,
                 "user_feedback": user_feedback,
                 "metadata": {
                     "source": "dpia_chatbot",
@@ -486,18 +694,33 @@ Respond with valid JSON only.
                 }
             }
             
-            response = await self.client.post("/metrics/log", json=metrics_payload)
-            response.raise_for_status()
-            
-            logger.info("Analysis metrics logged to Galileo AI")
+            self.telemetry.enqueue(metrics_payload)
             
         except Exception as e:
-            logger.warning(f"Failed to log metrics to Galileo AI: {e}")
+            logger.warning(f"Failed to queue metrics for Galileo AI: {e}")
+    
+    async def _send_metrics_batch(self, events: List[Dict[str, Any]]):
+        """Send a batch of queued metrics events to Galileo AI"""
+        response = await self._post(METRICS_LOG_PATH, {"events": events, "batch_size": len(events)})
+        response.raise_for_status()
+        logger.info(f"Logged {len(events)} analysis metrics event(s) to Galileo AI")
+    
+    def get_resilience_stats(self) -> Dict[str, Any]:
+        """Circuit breaker state and adaptive concurrency window"""
+        return self.guard.stats()
+    
+    def get_retry_stats(self) -> Dict[str, Any]:
+        """Retries, hedges and hedge wins per endpoint, plus the remaining retry budget"""
+        return self.retries.stats()
+    
+    def get_telemetry_stats(self) -> Dict[str, Any]:
+        """Telemetry queue depth, drop count and flush latency"""
+        return self.telemetry.stats()
     
     async def get_model_performance(self) -> Dict[str, Any]:
         """Get model performance metrics from Galileo AI"""
         try:
-            response = await self.client.get("/metrics/performance")
+            response = await self._get(METRICS_PERFORMANCE_PATH)
             response.raise_for_status()
             
             return response.json()
@@ -519,18 +742,122 @@ Respond with valid JSON only.
                 **kwargs
             }
             
-            response = await self.client.post("/chat/completions", json=payload)
-            response.raise_for_status()
-            
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
+            return await self._post_completion(payload)
             
         except Exception as e:
             logger.error(f"Chat completion failed: {e}")
             raise
     
+    async def stream_chat_completion(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """
+        Streaming chat completion using Galileo AI LLM
+        Yields content deltas as they arrive and records time-to-first-token. Failures before the
+        first delta are retried with the /chat/completions retry policy; once content has been
+        yielded a failure is raised to the caller.
+        """
+        payload = {
+            "model": self.config.model_name,
+            "messages": messages,
+            "temperature": kwargs.get("temperature", self.config.temperature),
+            "max_tokens": kwargs.get("max_tokens", self.config.max_tokens),
+            **kwargs,
+            "stream": True
+        }
+        
+        start_time = time.perf_counter()
+        self._stream_stats["streams"] += 1
+        try:
+            stream, lines, first_delta = await self.retries.execute(
+                CHAT_COMPLETIONS_PATH,
+                lambda: self._open_stream(payload),
+                discard=lambda opened: opened[0].aclose(),
+                latency_key=CHAT_COMPLETIONS_STREAM_LATENCY
+            )
+            async with stream:
+                if first_delta is None:
+                    return
+                self._record_ttft((time.perf_counter() - start_time) * 1000)
+                yield first_delta
+                async for line in lines:
+                    delta = self._parse_stream_line(line)
+                    if delta is None:
+                        break
+                    if delta:
+                        yield delta
+        except Exception as e:
+            self._stream_stats["failed"] += 1
+            logger.error(f"Streaming chat completion failed: {e}")
+            raise
+    
+    async def _open_stream(self, payload: Dict[str, Any]) -> Tuple[AsyncExitStack, AsyncIterator[str], Optional[str]]:
+        """
+        One streaming attempt: open the stream under the circuit breaker and concurrency limiter
+        and read up to its first content delta. Returns the open stream (for the caller to close),
+        its remaining lines and the first delta, or None if the stream ended without content.
+        """
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(self.guard.guarded())
+            response = await stack.enter_async_context(self.client.stream(
+                "POST",
+                CHAT_COMPLETIONS_PATH,
+                json=payload,
+                timeout=self.config.transport.timeout_for(CHAT_COMPLETIONS_PATH)
+            ))
+            response.raise_for_status()
+            lines = response.aiter_lines()
+            first_delta = None
+            async for line in lines:
+                delta = self._parse_stream_line(line)
+                if delta is None:
+                    break
+                if delta:
+                    first_delta = delta
+                    break
+            # Keep the stream open past this block; it is closed with an error only if the attempt failed
+            return stack.pop_all(), lines, first_delta
+    
+    @staticmethod
+    def _parse_stream_line(line: str) -> Optional[str]:
+        """
+        Extract the content delta from one server-sent event line.
+        Returns None at the end of the stream and "" for lines without content.
+        """
+        line = line.strip()
+        if not line.startswith("data:"):
+            return ""
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return None
+        try:
+            chunk = json.loads(data)
+            return chunk["choices"][0].get("delta", {}).get("content") or ""
+        except (ValueError, KeyError, IndexError, TypeError):
+            logger.debug(f"Ignoring unparseable stream chunk: {data[:100]}")
+            return ""
+    
+    def _record_ttft(self, ttft_ms: float):
+        """Record time from request start to the first content delta"""
+        self._stream_stats["last_ttft_ms"] = ttft_ms
+        self._stream_stats["max_ttft_ms"] = max(self._stream_stats["max_ttft_ms"], ttft_ms)
+        self._stream_stats["total_ttft_ms"] += ttft_ms
+        self._stream_stats["first_tokens"] += 1
+    
+    def get_streaming_stats(self) -> Dict[str, Any]:
+        """Stream count and time-to-first-token latency"""
+        first_tokens = self._stream_stats["first_tokens"]
+        return {
+            "streams": self._stream_stats["streams"],
+            "failed": self._stream_stats["failed"],
+            "last_ttft_ms": round(self._stream_stats["last_ttft_ms"], 2),
+            "max_ttft_ms": round(self._stream_stats["max_ttft_ms"], 2),
+            "avg_ttft_ms": round(self._stream_stats["total_ttft_ms"] / first_tokens, 2) if first_tokens else 0.0
+        }
+    
     async def close(self):
-        """Close the HTTP client"""
+        """Flush pending telemetry, finish background insights and close the HTTP client"""
+        await self.telemetry.stop()
+        if self._insights_tasks:
+            await asyncio.gather(*self._insights_tasks.values(), return_exceptions=True)
         await self.client.aclose()
 
 # Initialize Galileo AI LLM integration
@@ -553,11 +880,85 @@ def create_galileo_llm_integration() -> Optional[GalileoLLMIntegration]:
         enable_monitoring=os.getenv("GALILEO_ENABLE_MONITORING", "true").lower() == "true",
         model_name=os.getenv("GALILEO_MODEL_NAME", "galileo-llm-v1"),
         temperature=float(os.getenv("GALILEO_TEMPERATURE", "0.1")),
-        max_tokens=int(os.getenv("GALILEO_MAX_TOKENS", "4000"))
+        max_tokens=int(os.getenv("GALILEO_MAX_TOKENS", "4000")),
+        transport=create_transport_config(),
+        telemetry=TelemetryConfig(
+            max_queue_size=int(os.getenv("GALILEO_TELEMETRY_QUEUE_SIZE", "1000")),
+            batch_size=int(os.getenv("GALILEO_TELEMETRY_BATCH_SIZE", "50")),
+            flush_interval=float(os.getenv("GALILEO_TELEMETRY_FLUSH_INTERVAL", "2.0"))
+        ),
+        insights_mode=os.getenv("GALILEO_INSIGHTS_MODE", INSIGHTS_BACKGROUND).lower(),
+        insights_cache_ttl=float(os.getenv("GALILEO_INSIGHTS_CACHE_TTL", "3600")),
+        limiter=AdaptiveLimiterConfig(
+            initial_limit=int(os.getenv("GALILEO_LIMIT_INITIAL", "10")),
+            min_limit=int(os.getenv("GALILEO_LIMIT_MIN", "1")),
+            max_limit=int(os.getenv("GALILEO_LIMIT_MAX", "50")),
+            latency_threshold_ms=float(os.getenv("GALILEO_LIMIT_LATENCY_THRESHOLD_MS", "20000")),
+            acquire_timeout=float(os.getenv("GALILEO_LIMIT_ACQUIRE_TIMEOUT", "2.0"))
+        ),
+        circuit_breaker=CircuitBreakerConfig(
+            enabled=os.getenv("GALILEO_CIRCUIT_BREAKER_ENABLED", "true").lower() == "true",
+            failure_threshold=int(os.getenv("GALILEO_CIRCUIT_FAILURE_THRESHOLD", "5")),
+            recovery_timeout=float(os.getenv("GALILEO_CIRCUIT_RECOVERY_TIMEOUT", "30")),
+            half_open_max_calls=int(os.getenv("GALILEO_CIRCUIT_HALF_OPEN_CALLS", "1"))
+        ),
+        retries=create_retry_config(),
+        prompt_budget=PromptBudgetConfig(
+            context_window=int(os.getenv("GALILEO_CONTEXT_WINDOW", "16000")),
+            reference_context_share=float(os.getenv("GALILEO_REFERENCE_CONTEXT_SHARE", "0.25"))
+        ),
+        stream_analysis=os.getenv("GALILEO_STREAM_ANALYSIS", "false").lower() == "true"
     )
     
     return GalileoLLMIntegration(config)
 
+def create_transport_config() -> GalileoTransportConfig:
+    """
+    Create the Galileo transport configuration from environment variables.
+    GALILEO_ENDPOINT_TIMEOUTS takes a JSON object keyed by endpoint path, e.g.
+    {"/chat/completions": {"read": 90}}, merged over the built-in defaults.
+    """
+    endpoint_timeouts = _default_endpoint_timeouts()
+    overrides = os.getenv("GALILEO_ENDPOINT_TIMEOUTS")
+    if overrides:
+        try:
+            for path, values in json.loads(overrides).items():
+                base = endpoint_timeouts.get(path, GalileoEndpointTimeouts())
+                endpoint_timeouts[path] = base.model_copy(update=values)
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring invalid GALILEO_ENDPOINT_TIMEOUTS: {e}")
+    
+    return GalileoTransportConfig(
+        max_connections=int(os.getenv("GALILEO_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("GALILEO_MAX_KEEPALIVE_CONNECTIONS", "10")),
+        keepalive_expiry=float(os.getenv("GALILEO_KEEPALIVE_EXPIRY", "30")),
+        http2=os.getenv("GALILEO_HTTP2", "false").lower() == "true",
+        warmup_connections=int(os.getenv("GALILEO_WARMUP_CONNECTIONS", "2")),
+        endpoint_timeouts=endpoint_timeouts
+    )
+
+def create_retry_config() -> GalileoRetryConfig:
+    """
+    Create the Galileo retry configuration from environment variables.
+    GALILEO_RETRY_POLICIES takes a JSON object keyed by endpoint path, e.g.
+    {"/chat/completions": {"hedge": true}}, merged over the built-in per-endpoint policies.
+    """
+    endpoint_policies = _default_retry_policies()
+    overrides = os.getenv("GALILEO_RETRY_POLICIES")
+    if overrides:
+        try:
+            for path, values in json.loads(overrides).items():
+                base = endpoint_policies.get(path, RetryPolicy())
+                endpoint_policies[path] = base.model_copy(update=values)
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring invalid GALILEO_RETRY_POLICIES: {e}")
+    
+    return GalileoRetryConfig(
+        default_policy=RetryPolicy(max_attempts=int(os.getenv("GALILEO_RETRY_MAX_ATTEMPTS", "3"))),
+        endpoint_policies=endpoint_policies,
+        budget=RetryBudgetConfig(ratio=float(os.getenv("GALILEO_RETRY_BUDGET_RATIO", "0.2")))
+    )
+
 # Global instance - lazy initialization
 _galileo_llm_instance = None
 
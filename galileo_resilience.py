@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Overload protection for Galileo AI LLM calls
+An adaptive (AIMD) concurrency limiter and a circuit breaker that fails fast while Galileo is unhealthy
+"""
+
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Circuit breaker states
+CIRCUIT_CLOSED = "closed"  # calls flow normally
+CIRCUIT_OPEN = "open"  # calls fail immediately until the recovery timeout passes
+CIRCUIT_HALF_OPEN = "half_open"  # a few trial calls decide whether to close or re-open
+
+class GalileoUnavailableError(Exception):
+    """Raised instead of calling Galileo when it is known to be unhealthy or overloaded"""
+
+class CircuitOpenError(GalileoUnavailableError):
+    """The circuit breaker is open"""
+
+class ConcurrencyLimitExceeded(GalileoUnavailableError):
+    """No concurrency slot became free within the acquire timeout"""
+
+class AdaptiveLimiterConfig(BaseModel):
+    """AIMD concurrency window for in-flight Galileo calls"""
+    initial_limit: int = 10
+    min_limit: int = 1
+    max_limit: int = 50
+    latency_threshold_ms: float = 20000.0  # slower successful calls shrink the window
+    backoff_ratio: float = 0.7  # multiplicative decrease on errors and slow calls
+    acquire_timeout: float = 2.0  # seconds to wait for a slot before failing fast
+
+class CircuitBreakerConfig(BaseModel):
+    """Trip and recovery settings for the Galileo circuit breaker"""
+    enabled: bool = True
+    failure_threshold: int = 5  # consecutive upstream failures that open the circuit
+    recovery_timeout: float = 30.0  # seconds to stay open before allowing trial calls
+    half_open_max_calls: int = 1  # trial calls allowed at once while half-open
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """True for errors that say Galileo itself is unhealthy (timeouts, connection errors, 5xx, 429)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return isinstance(error, httpx.TransportError)
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive-increase/multiplicative-decrease concurrency limiter.
+
+    Each fast, successful call grows the window by 1/limit (about +1 per full window);
+    an upstream failure or a call slower than latency_threshold_ms multiplies it by
+    backoff_ratio. Callers that cannot get a slot within acquire_timeout are rejected
+    instead of queueing behind a slow upstream.
+    """
+
+    def __init__(self, config: Optional[AdaptiveLimiterConfig] = None):
+        self.config = config or AdaptiveLimiterConfig()
+        self._limit = float(min(max(self.config.initial_limit, self.config.min_limit), self.config.max_limit))
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._stats = {
+            "accepted": 0,
+            "rejected": 0,
+            "increases": 0,
+            "decreases": 0
+        }
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency window"""
+        return int(self._limit)
+
+    async def acquire(self):
+        """Wait for a free slot, or raise ConcurrencyLimitExceeded after acquire_timeout"""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self._in_flight < self.limit),
+                    timeout=self.config.acquire_timeout
+                )
+            except asyncio.TimeoutError:
+                self._stats["rejected"] += 1
+                raise ConcurrencyLimitExceeded(
+                    f"Galileo AI concurrency limit reached ({self._in_flight}/{self.limit} in flight)"
+                )
+            self._in_flight += 1
+            self._stats["accepted"] += 1
+
+    async def release(self, latency_ms: float, success: Optional[bool]):
+        """Free a slot and adapt the window; success=None releases without adapting"""
+        async with self._condition:
+            self._in_flight -= 1
+            if success is True and latency_ms <= self.config.latency_threshold_ms:
+                if self._limit < self.config.max_limit:
+                    self._limit = min(self.config.max_limit, self._limit + 1.0 / self._limit)
+                    self._stats["increases"] += 1
+            elif success is not None:
+                previous = self.limit
+                self._limit = max(float(self.config.min_limit), self._limit * self.config.backoff_ratio)
+                self._stats["decreases"] += 1
+                if self.limit != previous:
+                    logger.warning(f"Galileo AI concurrency window reduced {previous} -> {self.limit}")
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current window, in-flight calls and adaptation counters"""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "min_limit": self.config.min_limit,
+            "max_limit": self.config.max_limit,
+            **self._stats
+        }
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker.
+
+    failure_threshold consecutive upstream failures open the circuit. While open, calls
+    fail immediately with CircuitOpenError. After recovery_timeout the breaker lets
+    half_open_max_calls trial calls through: a success closes the circuit, a failure
+    re-opens it.
+    """
+
+    def __init__(self, config: Optional[CircuitBreakerConfig] = None):
+        self.config = config or CircuitBreakerConfig()
+        self._state = CIRCUIT_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._stats = {
+            "opened": 0,
+            "rejected": 0,
+            "failures": 0,
+            "successes": 0
+        }
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the recovery timeout has passed"""
+        if self._state == CIRCUIT_OPEN and time.monotonic() - self._opened_at >= self.config.recovery_timeout:
+            self._state = CIRCUIT_HALF_OPEN
+            self._half_open_in_flight = 0
+            logger.info("Galileo AI circuit half-open, allowing trial calls")
+        return self._state
+
+    def before_call(self):
+        """Admit a call or raise CircuitOpenError"""
+        if not self.config.enabled:
+            return
+        state = self.state
+        if state == CIRCUIT_OPEN:
+            self._stats["rejected"] += 1
+            retry_in = self.config.recovery_timeout - (time.monotonic() - self._opened_at)
+            raise CircuitOpenError(f"Galileo AI circuit is open; retrying in {max(retry_in, 0):.0f}s")
+        if state == CIRCUIT_HALF_OPEN:
+            if self._half_open_in_flight >= self.config.half_open_max_calls:
+                self._stats["rejected"] += 1
+                raise CircuitOpenError("Galileo AI circuit is half-open and a trial call is in progress")
+            self._half_open_in_flight += 1
+
+    def record_success(self):
+        self._stats["successes"] += 1
+        self._consecutive_failures = 0
+        if self._state == CIRCUIT_HALF_OPEN:
+            logger.info("Galileo AI circuit closed after a successful trial call")
+            self._state = CIRCUIT_CLOSED
+            self._half_open_in_flight = 0
+
+    def record_failure(self):
+        self._stats["failures"] += 1
+        self._consecutive_failures += 1
+        if self._state == CIRCUIT_HALF_OPEN or self._consecutive_failures >= self.config.failure_threshold:
+            self._open()
+
+    def record_ignored(self):
+        """A call ended without telling us anything about upstream health (e.g. cancelled)"""
+        if self._state == CIRCUIT_HALF_OPEN and self._half_open_in_flight > 0:
+            self._half_open_in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """State, consecutive failures and transition counters"""
+        return {
+            "enabled": self.config.enabled,
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "failure_threshold": self.config.failure_threshold,
+            "recovery_timeout": self.config.recovery_timeout,
+            **self._stats
+        }
+
+    def _open(self):
+        if not self.config.enabled:
+            return
+        if self._state != CIRCUIT_OPEN:
+            self._stats["opened"] += 1
+            logger.warning(
+                f"Galileo AI circuit opened after {self._consecutive_failures} consecutive failure(s); "
+                f"failing fast for {self.config.recovery_timeout:.0f}s"
+            )
+        self._state = CIRCUIT_OPEN
+        self._opened_at = time.monotonic()
+        self._half_open_in_flight = 0
+
+class GalileoCallGuard:
+    """Runs Galileo calls through the circuit breaker and the adaptive limiter"""
+
+    def __init__(self,
+                 limiter_config: Optional[AdaptiveLimiterConfig] = None,
+                 breaker_config: Optional[CircuitBreakerConfig] = None):
+        self.limiter = AdaptiveConcurrencyLimiter(limiter_config)
+        self.breaker = CircuitBreaker(breaker_config)
+
+    @asynccontextmanager
+    async def guarded(self) -> AsyncIterator[None]:
+        """Hold a limiter slot for the duration of the block and record its outcome"""
+        self.breaker.before_call()
+        try:
+            await self.limiter.acquire()
+        except ConcurrencyLimitExceeded:
+            self.breaker.record_ignored()
+            raise
+        start_time = time.perf_counter()
+        success: Optional[bool] = None
+        try:
+            yield
+            success = True
+        except Exception as e:
+            success = not is_upstream_failure(e)
+            raise
+        finally:
+            # success stays None on cancellation or an abandoned stream
+            if success is True:
+                self.breaker.record_success()
+            elif success is False:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_ignored()
+            await self.limiter.release((time.perf_counter() - start_time) * 1000, success)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit_breaker": self.breaker.stats(),
+            "concurrency_limiter": self.limiter.stats()
+        }
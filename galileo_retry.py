@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Retries and hedged requests for Galileo AI endpoints
+Idempotency-aware retries with jittered exponential backoff under a shared retry budget,
+plus optional hedging after a p95-derived delay
+"""
+
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, TypeVar
+
+import httpx
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class RetryPolicy(BaseModel):
+    """Retry and hedging settings for one Galileo endpoint"""
+    max_attempts: int = 3  # including the first attempt
+    base_delay: float = 0.25  # seconds; doubled per retry, with full jitter
+    max_delay: float = 4.0
+    idempotent: bool = True  # non-idempotent requests are retried only when they cannot have been processed
+    retry_statuses: List[int] = Field(default_factory=lambda: [429, 502, 503, 504])
+    hedge: bool = False  # send a duplicate request when the first one is slower than the hedge delay
+    hedge_delay_ms: Optional[float] = None  # fixed hedge delay; None derives it from the observed p95
+    hedge_min_samples: int = 20  # latencies needed before the p95 is trusted
+
+class RetryBudgetConfig(BaseModel):
+    """Token bucket shared by all endpoints that caps retries to a fraction of traffic"""
+    ratio: float = 0.2  # tokens earned per request
+    min_tokens: float = 10.0  # starting balance, so a cold client can still retry
+    max_tokens: float = 100.0
+
+class GalileoRetryConfig(BaseModel):
+    """Per-endpoint retry policies and the shared retry budget"""
+    default_policy: RetryPolicy = Field(default_factory=RetryPolicy)
+    endpoint_policies: Dict[str, RetryPolicy] = Field(default_factory=dict)
+    budget: RetryBudgetConfig = Field(default_factory=RetryBudgetConfig)
+
+    def policy_for(self, path: str) -> RetryPolicy:
+        return self.endpoint_policies.get(path, self.default_policy)
+
+# Errors raised before the request could have reached the server
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+class RetryBudget:
+    """Each request deposits `ratio` tokens and each retry withdraws one"""
+
+    def __init__(self, config: Optional[RetryBudgetConfig] = None):
+        self.config = config or RetryBudgetConfig()
+        self._tokens = self.config.min_tokens
+
+    def deposit(self):
+        self._tokens = min(self.config.max_tokens, self._tokens + self.config.ratio)
+
+    def try_withdraw(self) -> bool:
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+class LatencyTracker:
+    """Rolling window of successful request latencies"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, latency_ms: float):
+        self._samples.append(latency_ms)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(percentile / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+class RetryingExecutor:
+    """
+    Run Galileo requests with the retry policy of their endpoint.
+
+    `attempt` performs a single request and raises on failure (httpx.HTTPStatusError for
+    error statuses). Retries are skipped when the retry budget is empty. With hedging
+    enabled, a second attempt starts if the first has not finished within the hedge
+    delay; the first successful response wins and the other attempt is cancelled, or
+    passed to `discard` if it finished too (e.g. to close an open stream).
+    `latency_key` keeps latencies (and so the hedge delay) of a different kind of call to
+    the same endpoint, such as time to first streamed delta, apart from the endpoint's own.
+    """
+
+    def __init__(self, config: Optional[GalileoRetryConfig] = None):
+        self.config = config or GalileoRetryConfig()
+        self.budget = RetryBudget(self.config.budget)
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    async def execute(self,
+                      path: str,
+                      attempt: Callable[[], Awaitable[T]],
+                      discard: Optional[Callable[[T], Awaitable[None]]] = None,
+                      latency_key: Optional[str] = None) -> T:
+        policy = self.config.policy_for(path)
+        stats = self._endpoint_stats(path)
+        stats["requests"] += 1
+        self.budget.deposit()
+
+        attempt_number = 1
+        while True:
+            try:
+                if policy.hedge and policy.idempotent:
+                    return await self._hedged_attempt(path, policy, attempt, discard, latency_key or path)
+                return await self._timed_attempt(latency_key or path, attempt)
+            except Exception as e:
+                if attempt_number >= policy.max_attempts or not self._is_retryable(e, policy):
+                    raise
+                if not self.budget.try_withdraw():
+                    stats["budget_exhausted"] += 1
+                    logger.warning(f"Galileo AI retry budget exhausted; not retrying {path}: {e}")
+                    raise
+                delay = self._backoff_delay(policy, attempt_number, e)
+                stats["retries"] += 1
+                logger.warning(f"Retrying Galileo AI {path} in {delay:.2f}s (attempt {attempt_number + 1}/{policy.max_attempts}): {e}")
+                await asyncio.sleep(delay)
+                attempt_number += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-endpoint retry and hedge counters, observed p95 and remaining retry budget"""
+        endpoints = {}
+        for path, counters in self._stats.items():
+            tracker = self._latencies.get(path)
+            p95 = tracker.percentile(95) if tracker else None
+            endpoints[path] = {**counters, "p95_ms": round(p95, 2) if p95 is not None else None}
+        return {
+            "budget_tokens": round(self.budget.tokens, 2),
+            "endpoints": endpoints
+        }
+
+    def hedge_delay(self, path: str, policy: RetryPolicy) -> Optional[float]:
+        """Seconds to wait before hedging, or None if there is not enough latency data yet"""
+        if policy.hedge_delay_ms is not None:
+            return policy.hedge_delay_ms / 1000
+        tracker = self._latencies.get(path)
+        if tracker is None or len(tracker) < policy.hedge_min_samples:
+            return None
+        return tracker.percentile(95) / 1000
+
+    async def _timed_attempt(self, path: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        start_time = time.perf_counter()
+        result = await attempt()
+        self._latencies.setdefault(path, LatencyTracker()).record((time.perf_counter() - start_time) * 1000)
+        return result
+
+    async def _hedged_attempt(self,
+                              path: str,
+                              policy: RetryPolicy,
+                              attempt: Callable[[], Awaitable[T]],
+                              discard: Optional[Callable[[T], Awaitable[None]]],
+                              latency_key: str) -> T:
+        delay = self.hedge_delay(latency_key, policy)
+        primary = asyncio.ensure_future(self._timed_attempt(latency_key, attempt))
+        if delay is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        stats = self._endpoint_stats(path)
+        stats["hedges"] += 1
+        hedge = asyncio.ensure_future(self._timed_attempt(latency_key, attempt))
+        pending = {primary, hedge}
+        winner = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        if task is hedge:
+                            stats["hedge_wins"] += 1
+                        return task.result()
+            # Both attempts failed; surface the primary's error
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            await self._discard_losers(path, (primary, hedge), winner, discard)
+
+    @staticmethod
+    async def _discard_losers(path: str,
+                              tasks: Iterable["asyncio.Future[T]"],
+                              winner: Optional["asyncio.Future[T]"],
+                              discard: Optional[Callable[[T], Awaitable[None]]]):
+        """Hand the results of attempts that also succeeded but lost the race to `discard`"""
+        if discard is None:
+            return
+        for task in tasks:
+            if task is winner or not task.done() or task.cancelled() or task.exception() is not None:
+                continue
+            try:
+                await discard(task.result())
+            except Exception as e:
+                logger.warning(f"Failed to discard losing hedged Galileo AI {path} attempt: {e}")
+
+    def _is_retryable(self, error: Exception, policy: RetryPolicy) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            # A 429 was rejected before processing, so it is safe to retry either way
+            return status in policy.retry_statuses and (policy.idempotent or status == 429)
+        if isinstance(error, _NOT_SENT_ERRORS):
+            return True
+        return policy.idempotent and isinstance(error, httpx.TransportError)
+
+    def _backoff_delay(self, policy: RetryPolicy, attempt_number: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After on 429/503 responses"""
+        delay = random.uniform(0, min(policy.max_delay, policy.base_delay * (2 ** (attempt_number - 1))))
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = error.response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    delay = max(delay, min(policy.max_delay, float(retry_after)))
+                except ValueError:
+                    pass
+        return delay
+
+    def _endpoint_stats(self, path: str) -> Dict[str, int]:
+        if path not in self._stats:
+            self._stats[path] = {"requests": 0, "retries": 0, "budget_exhausted": 0, "hedges": 0, "hedge_wins": 0}
+        return self._stats[path]
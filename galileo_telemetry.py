@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Background telemetry pipeline for Galileo AI metrics
+Events are accepted immediately and flushed to /metrics/log in batches
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+class TelemetryConfig(BaseModel):
+    """Queue bound and flush triggers for the telemetry pipeline"""
+    max_queue_size: int = 1000
+    batch_size: int = 50
+    flush_interval: float = 2.0  # seconds
+
+class TelemetryQueue:
+    """
+    Bounded in-memory queue of metrics events with a background flusher.
+
+    enqueue() never blocks or performs I/O. When the queue is full the oldest
+    event is dropped. A batch is sent when batch_size events are waiting or
+    flush_interval seconds have passed, whichever comes first; stop() flushes
+    whatever is left.
+    """
+
+    def __init__(self,
+                 send_batch: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+                 config: Optional[TelemetryConfig] = None):
+        self.config = config or TelemetryConfig()
+        self._send_batch = send_batch
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=self.config.max_queue_size)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+        self._stats = {
+            "enqueued": 0,
+            "dropped": 0,
+            "sent": 0,
+            "failed": 0,
+            "flushes": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0
+        }
+
+    def enqueue(self, event: Dict[str, Any]):
+        """Accept an event without waiting for the network"""
+        if len(self._events) == self._events.maxlen:
+            # deque(maxlen) discards the oldest entry on append
+            self._stats["dropped"] += 1
+        self._events.append(event)
+        self._stats["enqueued"] += 1
+        self._ensure_worker()
+        if self._wakeup is not None and len(self._events) >= self.config.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Send every queued event, one batch at a time"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            while self._events:
+                batch = [self._events.popleft() for _ in range(min(self.config.batch_size, len(self._events)))]
+                start_time = time.perf_counter()
+                try:
+                    await self._send_batch(batch)
+                    self._stats["sent"] += len(batch)
+                except Exception as e:
+                    self._stats["failed"] += len(batch)
+                    logger.warning(f"Failed to send {len(batch)} telemetry event(s) to Galileo AI: {e}")
+                flush_ms = (time.perf_counter() - start_time) * 1000
+                self._stats["flushes"] += 1
+                self._stats["last_flush_ms"] = flush_ms
+                self._stats["max_flush_ms"] = max(self._stats["max_flush_ms"], flush_ms)
+                self._stats["total_flush_ms"] += flush_ms
+
+    async def stop(self):
+        """Stop the background flusher and flush remaining events"""
+        self._stopping = True
+        if self._worker is not None:
+            # Let an in-progress flush finish instead of cancelling it mid-batch
+            self._wakeup.set()
+            await self._worker
+            self._worker = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, drop count and flush latency"""
+        flushes = self._stats["flushes"]
+        return {
+            "queue_depth": len(self._events),
+            "max_queue_size": self.config.max_queue_size,
+            "enqueued": self._stats["enqueued"],
+            "dropped": self._stats["dropped"],
+            "sent": self._stats["sent"],
+            "failed": self._stats["failed"],
+            "flushes": flushes,
+            "last_flush_ms": round(self._stats["last_flush_ms"], 2),
+            "max_flush_ms": round(self._stats["max_flush_ms"], 2),
+            "avg_flush_ms": round(self._stats["total_flush_ms"] / flushes, 2) if flushes else 0.0
+        }
+
+    def _ensure_worker(self):
+        """Start the flusher on first use; it needs a running event loop"""
+        if self._stopping or (self._worker is not None and not self._worker.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wakeup = asyncio.Event()
+        self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.config.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._events:
+                await self.flush()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Idempotent case creation
+Each creation is keyed by a client Idempotency-Key or by a fingerprint of what it would create;
+a repeat within the TTL gets the first result, and concurrent repeats wait on the original call
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+from analysis_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+class IdempotencyConfig(BaseModel):
+    """How long case creation results are replayed"""
+    enabled: bool = True
+    key_ttl_seconds: float = 86400.0  # results for client-supplied Idempotency-Keys
+    fingerprint_ttl_seconds: float = 300.0  # results for derived keys (double-clicks, retries)
+    max_entries: int = 2000
+
+class IdempotencyKeyConflict(ValueError):
+    """An Idempotency-Key was reused for a different request"""
+
+def request_fingerprint(scope: str, payload: Dict[str, Any]) -> str:
+    """Stable hash of what a request would create"""
+    serialized = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(f"{scope}\x1f{serialized}".encode("utf-8")).hexdigest()
+
+def case_fingerprint(scope: str, detected_fields: Dict[str, Any], research_text: str) -> str:
+    """Fingerprint of a case creation from its detected fields and (normalized) research text"""
+    return request_fingerprint(scope, {"detected_fields": detected_fields, "research_text": normalize_text(research_text)})
+
+class IdempotencyStore:
+    """
+    TTL + LRU store of completed results, plus the calls still in flight. In-flight calls run to
+    completion even if every caller disconnects, so a creation Pega may already have performed is
+    still recorded. Failed calls are not stored, so they can be retried.
+    """
+
+    def __init__(self, config: Optional[IdempotencyConfig] = None, name: str = "idempotency"):
+        self.config = config or IdempotencyConfig()
+        self.name = name
+        self._results: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, Tuple[str, "asyncio.Task[Any]"]] = {}
+        self._stats = {"executed": 0, "replayed": 0, "joined": 0, "failed": 0, "conflicts": 0, "evictions": 0}
+
+    def resolve_key(self, scope: str, fingerprint: str, client_key: Optional[str] = None) -> Tuple[str, float]:
+        """Store key and TTL for a request: the client's key when given, otherwise its fingerprint"""
+        if client_key:
+            if len(client_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+                raise ValueError(f"Idempotency-Key longer than {MAX_IDEMPOTENCY_KEY_LENGTH} characters")
+            return f"{scope}:key:{client_key}", self.config.key_ttl_seconds
+        return f"{scope}:fingerprint:{fingerprint}", self.config.fingerprint_ttl_seconds
+
+    async def run(self,
+                  key: str,
+                  fingerprint: str,
+                  func: Callable[[], Awaitable[T]],
+                  ttl_seconds: float,
+                  should_store: Optional[Callable[[T], bool]] = None) -> Tuple[T, bool]:
+        """
+        Run func() once per key. Returns the result and whether it was replayed (from the store or
+        a call already in flight) rather than produced by this call.
+        """
+        if not self.config.enabled:
+            return await func(), False
+
+        self._expire()
+        stored = self._results.get(key)
+        if stored is not None:
+            self._check_fingerprint(key, stored[1], fingerprint)
+            self._results.move_to_end(key)
+            self._stats["replayed"] += 1
+            logger.info(f"🔁 {self.name}: replayed stored result for {key[:48]}")
+            return stored[2], True
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self._check_fingerprint(key, in_flight[0], fingerprint)
+            self._stats["joined"] += 1
+            logger.info(f"🔁 {self.name}: waiting on the in-flight call for {key[:48]}")
+            return await asyncio.shield(in_flight[1]), True
+
+        task = asyncio.ensure_future(func())
+        self._in_flight[key] = (fingerprint, task)
+        self._stats["executed"] += 1
+        task.add_done_callback(
+            lambda finished: self._finish(key, fingerprint, finished, ttl_seconds, should_store)
+        )
+        return await asyncio.shield(task), False
+
+    def _check_fingerprint(self, key: str, recorded: str, fingerprint: str):
+        if recorded != fingerprint:
+            self._stats["conflicts"] += 1
+            raise IdempotencyKeyConflict("Idempotency-Key was already used for a different request")
+
+    def _finish(self, key: str, fingerprint: str, finished: "asyncio.Task[Any]",
+                ttl_seconds: float, should_store: Optional[Callable[[Any], bool]]):
+        self._in_flight.pop(key, None)
+        if finished.cancelled() or finished.exception() is not None:
+            self._stats["failed"] += 1
+            return
+        result = finished.result()
+        if should_store is not None and not should_store(result):
+            return
+        self._results[key] = (time.time() + ttl_seconds, fingerprint, result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.config.max_entries:
+            self._results.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _expire(self):
+        now = time.time()
+        for key in [key for key, (expires_at, _, _) in self._results.items() if expires_at <= now]:
+            del self._results[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Calls executed, duplicates answered without a new call, and store size"""
+        return {
+            **self._stats,
+            "enabled": self.config.enabled,
+            "stored": len(self._results),
+            "in_flight": len(self._in_flight)
+        }
+
+def create_idempotency_config() -> IdempotencyConfig:
+    """
+    Create the case creation idempotency configuration from environment variables
+    """
+    return IdempotencyConfig(
+        enabled=os.getenv("CASE_IDEMPOTENCY_ENABLED", "true").lower() == "true",
+        key_ttl_seconds=float(os.getenv("CASE_IDEMPOTENCY_KEY_TTL", "86400")),
+        fingerprint_ttl_seconds=float(os.getenv("CASE_IDEMPOTENCY_FINGERPRINT_TTL", "300")),
+        max_entries=int(os.getenv("CASE_IDEMPOTENCY_MAX_ENTRIES", "2000"))
+    )
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Incremental parser for streamed JSON objects
+Emits each top-level field as soon as its value closes and recovers fields from truncated or malformed output
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Parser states
+_SEEK_OBJECT = "seek_object"  # skipping preamble (code fences, prose) before the opening brace
+_EXPECT_KEY = "expect_key"
+_IN_KEY = "in_key"
+_EXPECT_COLON = "expect_colon"
+_EXPECT_VALUE = "expect_value"
+_IN_VALUE = "in_value"
+_AFTER_VALUE = "after_value"
+_DONE = "done"
+
+_OPENERS = {"{": "}", "[": "]"}
+
+class IncrementalJSONParser:
+    """
+    Parse one top-level JSON object from text that arrives in pieces.
+
+    feed() returns the (key, value) pairs whose values closed in that delta. Each value
+    is decoded on its own, so one malformed value is skipped (and counted) instead of
+    invalidating the whole object. fields holds everything decoded so far, which is
+    the recovered object when the stream stops early or the text is truncated.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.errors: List[str] = []
+        self._buffer: List[str] = []
+        self._state = _SEEK_OBJECT
+        self._key_chars: List[str] = []
+        self._key: Optional[str] = None
+        self._value_chars: List[str] = []
+        self._closers: List[str] = []
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def complete(self) -> bool:
+        """True once the closing brace of the top-level object has been seen"""
+        return self._state == _DONE
+
+    def has_fields(self, required: Iterable[str]) -> bool:
+        """True when every required field has been decoded"""
+        return all(field in self.fields for field in required)
+
+    def feed(self, delta: str) -> List[Tuple[str, Any]]:
+        """Consume the next piece of text and return fields completed by it"""
+        completed: List[Tuple[str, Any]] = []
+        for char in delta:
+            if self._state == _DONE:
+                break
+            field = self._consume(char)
+            if field is not None:
+                completed.append(field)
+        return completed
+
+    @classmethod
+    def parse_partial(cls, text: str) -> Dict[str, Any]:
+        """Decode every complete top-level field from possibly broken JSON text"""
+        parser = cls()
+        parser.feed(text)
+        return parser.fields
+
+    def _consume(self, char: str) -> Optional[Tuple[str, Any]]:
+        state = self._state
+        if state == _SEEK_OBJECT:
+            if char == "{":
+                self._state = _EXPECT_KEY
+            return None
+
+        if state == _EXPECT_KEY:
+            if char == '"':
+                self._state = _IN_KEY
+                self._key_chars = []
+            elif char == "}":
+                self._state = _DONE
+            return None
+
+        if state == _IN_KEY:
+            if self._escaped:
+                self._escaped = False
+                self._key_chars.append(char)
+            elif char == "\\":
+                self._escaped = True
+                self._key_chars.append(char)
+            elif char == '"':
+                self._key = self._decode_key("".join(self._key_chars))
+                self._state = _EXPECT_COLON
+            else:
+                self._key_chars.append(char)
+            return None
+
+        if state == _EXPECT_COLON:
+            if char == ":":
+                self._state = _EXPECT_VALUE
+            elif not char.isspace():
+                # Missing colon; treat the character as the start of the value
+                self._state = _EXPECT_VALUE
+                return self._consume(char)
+            return None
+
+        if state == _EXPECT_VALUE:
+            if char.isspace():
+                return None
+            self._state = _IN_VALUE
+            self._value_chars = [char]
+            self._closers = []
+            self._in_string = char == '"'
+            self._escaped = False
+            if char in _OPENERS:
+                self._closers.append(_OPENERS[char])
+            return None
+
+        if state == _IN_VALUE:
+            return self._consume_value(char)
+
+        if state == _AFTER_VALUE:
+            if char == ",":
+                self._state = _EXPECT_KEY
+            elif char == "}":
+                self._state = _DONE
+            return None
+
+        return None
+
+    def _consume_value(self, char: str) -> Optional[Tuple[str, Any]]:
+        if self._in_string:
+            self._value_chars.append(char)
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                if not self._closers:
+                    # A top-level string value is complete at its closing quote
+                    self._state = _AFTER_VALUE
+                    return self._finish_value()
+            return None
+
+        if char == '"':
+            self._in_string = True
+            self._value_chars.append(char)
+            return None
+
+        if self._closers:
+            self._value_chars.append(char)
+            if char in _OPENERS:
+                self._closers.append(_OPENERS[char])
+            elif char == self._closers[-1]:
+                self._closers.pop()
+                if not self._closers:
+                    self._state = _AFTER_VALUE
+                    return self._finish_value()
+            return None
+
+        # Scalar (number, true, false, null) ends at a delimiter
+        if char in ",}":
+            field = self._finish_value()
+            self._state = _EXPECT_KEY if char == "," else _DONE
+            return field
+        self._value_chars.append(char)
+        return None
+
+    def _finish_value(self) -> Optional[Tuple[str, Any]]:
+        raw = "".join(self._value_chars).strip()
+        key = self._key
+        self._value_chars = []
+        self._key = None
+        if key is None:
+            return None
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            self.errors.append(key)
+            logger.debug(f"Skipping malformed value for '{key}': {raw[:100]}")
+            return None
+        self.fields[key] = value
+        return key, value
+
+    @staticmethod
+    def _decode_key(raw: str) -> str:
+        try:
+            return json.loads(f'"{raw}"')
+        except ValueError:
+            return raw
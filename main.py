@@ -2,12 +2,12 @@ from fastapi import FastAPI, HTTPException, Depends, Header
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
-import requests
+import httpx
 import os
 from dotenv import load_dotenv
 import logging
-import base64
 from datetime import datetime, timedelta
+from pega_client import DEFAULT_PEGA_BASE_URL, close_pega_client, pega_client, pega_error_message
 
 # Load environment variables
 load_dotenv()
@@ -21,13 +21,13 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Pega Model Context Protocol Server")
 
-# Pega Configuration
-PEGA_BASE_URL = os.getenv("PEGA_BASE_URL", "https://roche-gtech-dt1.pegacloud.net/prweb/api/v1")
-PEGA_USERNAME = os.getenv("PEGA_USERNAME", "nadadhub")
-PEGA_PASSWORD = os.getenv("PEGA_PASSWORD", "Pwrm*2025")
+# Pega Configuration (credentials, pooling and timeouts live in pega_client)
+PEGA_BASE_URL = os.getenv("PEGA_BASE_URL", DEFAULT_PEGA_BASE_URL)
 
-# Basic auth header
-BASIC_AUTH = base64.b64encode(f"{PEGA_USERNAME}:{PEGA_PASSWORD}".encode()).decode()
+@app.on_event("shutdown")
+async def close_pega_connections():
+    """Close pooled Pega connections"""
+    await close_pega_client()
 
 class CaseRequest(BaseModel):
     caseTypeID: str
@@ -46,12 +46,6 @@ async def create_case(case_request: CaseRequest):
     try:
         logger.info("Attempting to create case with type: %s", case_request.caseTypeID)
         
-        # Set headers with basic auth
-        headers = {
-            "Authorization": f"Basic {BASIC_AUTH}",
-            "Content-Type": "application/json"
-        }
-        
         # Transform the content to match Pega's expected schema
         transformed_content = {
             "pxObjClass": case_request.content.get("pxObjClass", "Roche-Pathworks-Work-DPIA"),
@@ -69,12 +63,7 @@ async def create_case(case_request: CaseRequest):
         }
         
         logger.info("Sending request to Pega API: %s", PEGA_BASE_URL)
-        response = requests.post(
-            f"{PEGA_BASE_URL}/cases",
-            json=payload,
-            headers=headers,
-            verify=True
-        )
+        response = await pega_client().create_case(payload)
         
         logger.info("Pega API response status: %d", response.status_code)
         logger.info("Pega API response body: %s", response.text)
@@ -90,21 +79,11 @@ async def create_case(case_request: CaseRequest):
                 links=[{"rel": "self", "href": f"{PEGA_BASE_URL}/cases/{result.get('ID', '')}"}]
             )
         else:
-            error_msg = f"Failed to create case. Status code: {response.status_code}"
-            try:
-                error_data = response.json()
-                if "errors" in error_data:
-                    error_details = error_data["errors"][0].get("message", "")
-                    validation_messages = error_data["errors"][0].get("ValidationMessages", [])
-                    if validation_messages:
-                        error_details += " - " + validation_messages[0].get("ValidationMessage", "")
-                    error_msg = error_details
-            except:
-                error_msg = response.text
+            error_msg = pega_error_message(response)
             logger.error(error_msg)
             raise HTTPException(status_code=response.status_code, detail=error_msg)
             
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error("Network error: %s", str(e), exc_info=True)
         raise HTTPException(status_code=500, detail=f"Network error: {str(e)}")
     except Exception as e:
@@ -119,19 +98,10 @@ async def health_check():
 @app.get("/cases/{case_id}")
 async def get_case(case_id: str):
     try:
-        headers = {
-            "Authorization": f"Basic {BASIC_AUTH}",
-            "Content-Type": "application/json"
-        }
-        
-        response = requests.get(
-            f"{PEGA_BASE_URL}/cases/{case_id}",
-            headers=headers,
-            verify=True
-        )
+        response = await pega_client().get_case(case_id)
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Error retrieving case: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving case: {str(e)}")
 
@@ -143,11 +113,6 @@ async def list_cases(
     per_page: int = 25
 ):
     try:
-        headers = {
-            "Authorization": f"Basic {BASIC_AUTH}",
-            "Content-Type": "application/json"
-        }
-        
         params = {
             "page": page,
             "per_page": per_page
@@ -157,15 +122,10 @@ async def list_cases(
         if caseTypeID:
             params["caseTypeID"] = caseTypeID
             
-        response = requests.get(
-            f"{PEGA_BASE_URL}/cases",
-            headers=headers,
-            params=params,
-            verify=True
-        )
+        response = await pega_client().list_cases(params)
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Error listing cases: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error listing cases: {str(e)}")
 
@@ -4,20 +4,29 @@ from dotenv import load_dotenv
 # Load environment variables FIRST before any other imports
 load_dotenv()
 
-from fastapi import FastAPI, HTTPException, Depends, Header, Form, Request, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, Header, Form, Request, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List, Union
-import requests
+from typing import Optional, Dict, Any, List, Tuple, Union
+import httpx
 import logging
-import base64
 import json
 from datetime import datetime, timedelta
 import asyncio
+import time
 import uuid
+from case_batch import (
+    BATCH_ITEM_CREATED, BATCH_ITEM_DEMO, BATCH_ITEM_QUEUED, batch_summary, create_case_batch_config, ndjson_line, run_batch
+)
+from case_outbox import OUTBOX_CREATED, OUTBOX_FAILED, CaseOutbox, create_case_outbox_config
 from galileo_claude_adapter import claude_integration, AnalysisResult
+from chat_session import apply_analysis_to_session, apply_late_analysis, mark_session_progress, session_progress
+from idempotency import (
+    IdempotencyKeyConflict, IdempotencyStore, case_fingerprint, create_idempotency_config, request_fingerprint
+)
+from pega_client import DEFAULT_PEGA_BASE_URL, close_pega_client, pega_client, pega_error_message
 from rdchat_integration import setup_rdchat_routes
 
 # Configure logging
@@ -42,13 +51,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Pega Configuration
-PEGA_BASE_URL = os.getenv("PEGA_BASE_URL", "https://roche-gtech-dt1.pegacloud.net/prweb/api/v1")
-PEGA_USERNAME = os.getenv("PEGA_USERNAME", "nadadhub")
-PEGA_PASSWORD = os.getenv("PEGA_PASSWORD", "Pwrm*2025")
-
-# Basic auth header
-BASIC_AUTH = base64.b64encode(f"{PEGA_USERNAME}:{PEGA_PASSWORD}".encode()).decode()
+@app.on_event("startup")
+async def warm_up_galileo_transport():
+    """Open pooled Galileo AI connections so the first /chat after a deploy is not the slowest one"""
+    opened = await claude_integration.warmup()
+    logger.info(f"Galileo AI warmup opened {opened} connection(s)")
+
+@app.on_event("shutdown")
+async def close_galileo_integration():
+    """Flush queued Galileo AI telemetry and close connections"""
+    await claude_integration.close()
+
+@app.on_event("startup")
+async def start_case_outbox():
+    """Start replaying case-creation intents left undelivered by a previous run"""
+    outbox = case_outbox()
+    if outbox is not None:
+        outbox.start()
+
+@app.on_event("shutdown")
+async def close_pega_connections():
+    """Let outbox attempts in flight finish, then close pooled Pega connections"""
+    if _case_outbox_instance is not None:
+        await _case_outbox_instance.stop()
+    await close_pega_client()
+
+# Pega Configuration (credentials, pooling and timeouts live in pega_client)
+PEGA_BASE_URL = os.getenv("PEGA_BASE_URL", DEFAULT_PEGA_BASE_URL)
 
 # DPIA questionnaire flow - integrated with Claude analysis
 dpia_questions = {
@@ -129,6 +158,7 @@ class ChatMessage(BaseModel):
     context: Optional[Dict[str, Any]] = None
     user_id: Optional[str] = None
     session_id: Optional[str] = None
+    analysis_mode: Optional[str] = None  # overrides CHAT_ANALYSIS_MODE for this message
 
 class ChatResponse(BaseModel):
     response: str
@@ -137,10 +167,17 @@ class ChatResponse(BaseModel):
     next_action: Optional[str] = None
     missing_fields: Optional[List[str]] = None
     detected_fields: Optional[Dict[str, str]] = None
+    # Speculative analysis: keyword answer sent before the LLM result replaces it
+    provisional: bool = False
+    analysis_id: Optional[str] = None
+    session_id: Optional[str] = None  # set on provisional replies, for GET /chat/{session_id}/reconciliation
+    prompt_tokens: Optional[int] = None  # estimated size of the conversational prompt for this turn
 
 class AnalysisRequest(BaseModel):
     research_text: str
     enhance_fields: bool = True
+    enhancement_strategy: Optional[str] = None  # "single_prompt" or "concurrent"
+    max_concurrency: Optional[int] = None
 
 class FieldUpdateRequest(BaseModel):
     field_responses: Dict[str, str]
@@ -163,6 +200,29 @@ class CaseResponse(BaseModel):
     nextAssignmentName: Optional[str]
     links: Optional[List[Dict[str, str]]]
 
+class CaseBatchRequest(BaseModel):
+    items: List[CaseCreationRequest]  # items with empty detected_fields are analyzed first
+    analysis_concurrency: Optional[int] = None
+    pega_concurrency: Optional[int] = None
+
+case_batch_config = create_case_batch_config()
+
+# Idempotency scopes: cases created from detected fields (every analysis path shares one scope,
+# so a chat "yes" and a /create-case for the same fields are the same case), and raw Pega payloads
+CASE_IDEMPOTENCY_SCOPE = "case"
+PEGA_CASE_IDEMPOTENCY_SCOPE = "pega-case"
+case_idempotency = IdempotencyStore(create_idempotency_config(), name="case_creation")
+
+case_outbox_config = create_case_outbox_config()
+_case_outbox_instance: Optional[CaseOutbox] = None
+
+def case_outbox() -> Optional[CaseOutbox]:
+    """The case-creation outbox (lazy loading), or None when CASE_OUTBOX_ENABLED=false"""
+    global _case_outbox_instance
+    if _case_outbox_instance is None and case_outbox_config.enabled:
+        _case_outbox_instance = CaseOutbox(lambda payload: pega_client().create_case(payload), case_outbox_config)
+    return _case_outbox_instance
+
 # Add new request models for context management
 class ContextRequest(BaseModel):
     context: str
@@ -173,69 +233,87 @@ class FileUploadRequest(BaseModel):
     file_name: str
     context_type: str = "reference"
 
-# Claude-powered endpoints
-@app.post("/chat", response_model=ChatResponse)
-async def chat_with_claude(chat_request: ChatMessage):
-    """Enhanced chat endpoint that integrates Claude analysis with questionnaire workflow"""
-    try:
-        user_id = chat_request.user_id or str(uuid.uuid4())
-        session_id = chat_request.session_id or str(uuid.uuid4())
-        message = chat_request.message
-        
-        logger.info(f"Chat request from user {user_id}: {message[:100]}...")
-        
-        # Initialize session if needed
-        if session_id not in enhanced_sessions:
-            enhanced_sessions[session_id] = {
-                "user_id": user_id,
-                "analysis_results": {},
-                "extracted_fields": {},
-                "conversation_history": [],
-                "current_task": "chat",
-                "questionnaire_state": "start",
-                "missing_fields": [],
-                "created_at": datetime.now().isoformat()
-            }
-        
-        session = enhanced_sessions[session_id]
-        
-        # Check if this looks like research text for analysis
-        research_keywords = [
-            "cells", "stain", "analysis", "research", "study", "groups", "pathologist", "therapeutic", "assay",
-            "imaging", "microscopy", "time-lapse", "molecule", "distribution", "mammalian", "fluorescence",
-            "confocal", "leica", "sp8", "quantification", "monitoring", "protocol", "experiment", "specimen",
-            "biospecimen", "tissue", "biopsy", "slide", "section", "antibody", "protein", "gene", "dna", "rna"
-        ]
-        
-        # More flexible detection: shorter text OR contains research keywords
-        is_research_text = (
-            (len(message) > 50 and any(keyword in message.lower() for keyword in research_keywords)) or
-            (len(message) > 100 and any(keyword in message.lower() for keyword in ["cells", "stain", "analysis", "research", "study"]))
-        )
-        
-        if is_research_text:
-            # This looks like research text - analyze it with Claude
-            logger.info("Research text detected, performing Claude analysis")
-            # Analyze with Claude
-            logger.info("About to call claude_integration.analyze_research_text")
-            analysis_result = await claude_integration.analyze_research_text(message)
-            logger.info("Analysis completed successfully")
-            
-            # Update session with analysis results
-            session["analysis_results"] = {
-                "detected_fields": analysis_result.detected_fields,
-                "missing_fields": analysis_result.missing_fields,
-                "confidence_scores": analysis_result.confidence_scores,
-                "analysis_summary": analysis_result.analysis_summary
-            }
-            session["extracted_fields"].update(analysis_result.detected_fields)
-            session["missing_fields"] = analysis_result.missing_fields
-            session["current_task"] = "dpia_analysis"
-            
-            # Generate response based on analysis
-            if analysis_result.missing_fields:
-                missing_fields_text = ", ".join(analysis_result.missing_fields)
-                response_text = f"""🤖 **Claude AI Analysis Complete!**
+# Chat turn routes
+CHAT_ROUTE_ANALYSIS = "analysis"  # research text to analyze
+CHAT_ROUTE_MISSING_FIELDS = "missing_fields"  # answers to missing field prompts
+CHAT_ROUTE_CREATE_CASE = "create_case"  # confirmation to create the case
+CHAT_ROUTE_CONVERSATION = "conversation"  # free-form conversation with the LLM
+
+# How /chat analyzes research text
+CHAT_ANALYSIS_STANDARD = "standard"  # wait for the (tiered) analysis
+CHAT_ANALYSIS_SPECULATIVE = "speculative"  # answer from keywords now, replace with the LLM result when it arrives
+CHAT_ANALYSIS_MODES = (CHAT_ANALYSIS_STANDARD, CHAT_ANALYSIS_SPECULATIVE)
+CHAT_ANALYSIS_MODE = os.getenv("CHAT_ANALYSIS_MODE", CHAT_ANALYSIS_STANDARD)
+
+# Pending speculative LLM analyses (referenced so they are not garbage collected)
+_speculative_tasks = set()
+
+RESEARCH_KEYWORDS = [
+    "cells", "stain", "analysis", "research", "study", "groups", "pathologist", "therapeutic", "assay",
+    "imaging", "microscopy", "time-lapse", "molecule", "distribution", "mammalian", "fluorescence",
+    "confocal", "leica", "sp8", "quantification", "monitoring", "protocol", "experiment", "specimen",
+    "biospecimen", "tissue", "biopsy", "slide", "section", "antibody", "protein", "gene", "dna", "rna"
+]
+
+def _get_chat_session(session_id: str, user_id: str) -> Dict[str, Any]:
+    """Get the chat session, initializing it if needed"""
+    if session_id not in enhanced_sessions:
+        enhanced_sessions[session_id] = {
+            "user_id": user_id,
+            "analysis_results": {},
+            "extracted_fields": {},
+            "conversation": claude_integration.new_conversation(),  # recent turns + running summary, token-bounded
+            "current_task": "chat",
+            "questionnaire_state": "start",
+            "missing_fields": [],
+            "progress": 0,  # user steps taken; see chat_session.apply_late_analysis
+            "created_at": datetime.now().isoformat()
+        }
+    return enhanced_sessions[session_id]
+
+def _classify_chat_turn(session: Dict[str, Any], message: str) -> str:
+    """Decide how a chat message is handled based on its content and the session state"""
+    # More flexible detection: shorter text OR contains research keywords
+    is_research_text = (
+        (len(message) > 50 and any(keyword in message.lower() for keyword in RESEARCH_KEYWORDS)) or
+        (len(message) > 100 and any(keyword in message.lower() for keyword in ["cells", "stain", "analysis", "research", "study"]))
+    )
+    
+    if is_research_text:
+        return CHAT_ROUTE_ANALYSIS
+    if session.get("missing_fields") and session.get("current_task") == "dpia_analysis":
+        return CHAT_ROUTE_MISSING_FIELDS
+    if ("yes" in message.lower() or "create" in message.lower()) and session.get("current_task") == "dpia_analysis" and not session.get("missing_fields"):
+        return CHAT_ROUTE_CREATE_CASE
+    return CHAT_ROUTE_CONVERSATION
+
+def _chat_context(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Session state passed to the LLM with conversational messages (detected fields are not repeated)"""
+    return {
+        "current_task": session.get("current_task", "chat"),
+        "extracted_fields": session.get("extracted_fields", {}),
+        "missing_fields": session.get("missing_fields", []),
+        "analysis_summary": session.get("analysis_results", {}).get("analysis_summary")
+    }
+
+def _record_conversation_turn(session: Dict[str, Any], message: str, response_text: str) -> Optional[int]:
+    """Add a turn to the bounded conversation context; returns the turn's estimated prompt tokens"""
+    conversation = session["conversation"]
+    conversation.add_turn(message, response_text)
+    return (conversation.last_prompt or {}).get("prompt_tokens")
+
+def _chat_analysis_mode(chat_request: ChatMessage) -> str:
+    """Analysis mode requested for this message, falling back to CHAT_ANALYSIS_MODE"""
+    mode = chat_request.analysis_mode or CHAT_ANALYSIS_MODE
+    if mode not in CHAT_ANALYSIS_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown analysis_mode '{mode}'. Use one of: {', '.join(CHAT_ANALYSIS_MODES)}")
+    return mode
+
+def _analysis_chat_response(analysis_result: AnalysisResult) -> ChatResponse:
+    """Chat reply presenting an analysis and asking for whatever is still missing"""
+    if analysis_result.missing_fields:
+        missing_fields_text = ", ".join(analysis_result.missing_fields)
+        response_text = f"""🤖 **Claude AI Analysis Complete!**
 
 I've analyzed your research text and extracted the following information:
 
@@ -247,35 +325,123 @@ To complete your DPIA assessment, I still need:
 • {missing_fields_text.replace(', ', chr(10) + '• ')}
 
 Please provide the missing information, and I'll create your DPIA case automatically!"""
-                
-                return ChatResponse(
-                    response=response_text,
-                    analysis_result=analysis_result,
-                    suggestions=[f"Please provide: {field}" for field in analysis_result.missing_fields],
-                    next_action="provide_missing_fields",
-                    missing_fields=analysis_result.missing_fields,
-                    detected_fields=analysis_result.detected_fields
-                )
-            else:
-                response_text = f"""🎉 **Perfect! Claude AI Analysis Complete!**
+        
+        return ChatResponse(
+            response=response_text,
+            analysis_result=analysis_result,
+            suggestions=[f"Please provide: {field}" for field in analysis_result.missing_fields],
+            next_action="provide_missing_fields",
+            missing_fields=analysis_result.missing_fields,
+            detected_fields=analysis_result.detected_fields
+        )
+    
+    response_text = f"""🎉 **Perfect! Claude AI Analysis Complete!**
 
 I've successfully analyzed your research text and extracted all required fields:
 
 {_format_extracted_fields(analysis_result.detected_fields)}
 
 ✅ All mandatory fields detected! Would you like me to create a DPIA case now?"""
-                
-                return ChatResponse(
-                    response=response_text,
-                    analysis_result=analysis_result,
-                    suggestions=["Create DPIA case", "Review information", "Make changes"],
-                    next_action="create_case",
-                    missing_fields=[],
-                    detected_fields=analysis_result.detected_fields
-                )
+    
+    return ChatResponse(
+        response=response_text,
+        analysis_result=analysis_result,
+        suggestions=["Create DPIA case", "Review information", "Make changes"],
+        next_action="create_case",
+        missing_fields=[],
+        detected_fields=analysis_result.detected_fields
+    )
+
+def _start_speculative_chat_analysis(session: Dict[str, Any], message: str) -> Tuple[ChatResponse, "asyncio.Task[Dict[str, Any]]"]:
+    """
+    Start the keyword detectors and the Galileo AI analysis together. Returns the provisional
+    reply and a task that reconciles the session with the LLM result when it arrives.
+    """
+    analysis_id = str(uuid.uuid4())
+    provisional, llm_task = claude_integration.start_speculative_analysis(message)
+    apply_analysis_to_session(session, provisional, message)
+    session["reconciliation"] = {"analysis_id": analysis_id, "status": "pending"}
+    
+    reconcile_task = asyncio.create_task(_reconcile_speculative_analysis(
+        session, analysis_id, message, provisional, llm_task, session_progress(session)
+    ))
+    _speculative_tasks.add(reconcile_task)
+    reconcile_task.add_done_callback(_speculative_tasks.discard)
+    
+    chat_response = _analysis_chat_response(provisional)
+    chat_response.provisional = True
+    chat_response.analysis_id = analysis_id
+    return chat_response, reconcile_task
+
+async def _reconcile_speculative_analysis(session: Dict[str, Any],
+                                          analysis_id: str,
+                                          research_text: str,
+                                          provisional: AnalysisResult,
+                                          llm_task: "asyncio.Task[AnalysisResult]",
+                                          started_at_progress: int) -> Dict[str, Any]:
+    """
+    Wait for the LLM analysis, replace the provisional answer and record the reconciliation event.
+    If the user answered fields or created the case meanwhile, only fields still missing are filled in.
+    """
+    start_time = datetime.now()
+    try:
+        final = await llm_task
+    except Exception as e:
+        logger.error(f"Speculative Galileo AI analysis failed: {e}")
+        final = claude_integration._create_fallback_result(research_text, error=str(e))
+    reconciled, changes = claude_integration.reconcile_analysis(provisional, final)
+    claude_integration.prefetch_project_title(research_text, reconciled)
+    chat_response = _analysis_chat_response(reconciled)
+    chat_response.analysis_id = analysis_id
+    reconciliation = {
+        "analysis_id": analysis_id,
+        **changes,
+        "llm_wait_ms": round((datetime.now() - start_time).total_seconds() * 1000, 2),
+        "chat_response": chat_response.model_dump()
+    }
+    
+    # A newer analysis in the same session supersedes this one
+    if session.get("reconciliation", {}).get("analysis_id") == analysis_id:
+        if changes["status"] == "reconciled":
+            reconciliation["session_update"] = apply_late_analysis(session, reconciled, research_text, started_at_progress)
+        session["reconciliation"] = reconciliation
+    return reconciliation
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+# Claude-powered endpoints
+@app.post("/chat", response_model=ChatResponse)
+async def chat_with_claude(chat_request: ChatMessage):
+    """Enhanced chat endpoint that integrates Claude analysis with questionnaire workflow"""
+    try:
+        user_id = chat_request.user_id or str(uuid.uuid4())
+        session_id = chat_request.session_id or str(uuid.uuid4())
+        message = chat_request.message
+        
+        logger.info(f"Chat request from user {user_id}: {message[:100]}...")
+        
+        session = _get_chat_session(session_id, user_id)
+        chat_route = _classify_chat_turn(session, message)
+        
+        if chat_route == CHAT_ROUTE_ANALYSIS:
+            # This looks like research text - analyze it with Claude
+            if _chat_analysis_mode(chat_request) == CHAT_ANALYSIS_SPECULATIVE:
+                logger.info("Research text detected, starting speculative analysis")
+                chat_response, _ = _start_speculative_chat_analysis(session, message)
+                chat_response.session_id = session_id
+                return chat_response
+            
+            logger.info("Research text detected, performing Claude analysis")
+            analysis_result = await claude_integration.analyze_research_text(message)
+            logger.info("Analysis completed successfully")
+            
+            apply_analysis_to_session(session, analysis_result, message)
+            return _analysis_chat_response(analysis_result)
         
         # Handle missing field responses
-        elif session.get("missing_fields") and session.get("current_task") == "dpia_analysis":
+        elif chat_route == CHAT_ROUTE_MISSING_FIELDS:
             # Try to extract missing field information from the response
             updated_fields = {}
             for field in session["missing_fields"]:
@@ -293,6 +459,7 @@ I've successfully analyzed your research text and extracted all required fields:
             
             # Update session with new field values
             session["extracted_fields"].update(updated_fields)
+            mark_session_progress(session)
             remaining_missing = [f for f in session["missing_fields"] if f not in updated_fields]
             session["missing_fields"] = remaining_missing
             
@@ -328,14 +495,15 @@ Ready to create your DPIA case! Shall I proceed?"""
                 )
         
         # Handle case creation confirmation
-        elif ("yes" in message.lower() or "create" in message.lower()) and session.get("current_task") == "dpia_analysis" and not session.get("missing_fields"):
+        elif chat_route == CHAT_ROUTE_CREATE_CASE:
+            mark_session_progress(session)
             # Create the DPIA case
             try:
                 case_request = CaseCreationRequest(
                     detected_fields=session["extracted_fields"],
                     research_text=session.get("original_text", "")
                 )
-                case_response = await create_dpia_case_with_claude(case_request)
+                case_response, _ = await create_case_idempotently(case_request)
                 
                 response_text = f"""🎉 **DPIA Case Created Successfully!**
 
@@ -368,34 +536,119 @@ Is there anything else I can help you with?"""
         
         else:
             # Regular conversational response using Claude
-            context = {
-                "analysis_results": session.get("analysis_results", {}),
-                "missing_fields": session.get("missing_fields", []),
-                "current_task": session.get("current_task", "chat"),
-                "extracted_fields": session.get("extracted_fields", {})
-            }
-            
             response_text = await claude_integration.generate_conversational_response(
-                message, context
+                message, _chat_context(session), session["conversation"]
             )
             
             # Update conversation history
-            session["conversation_history"].append({
-                "user": message,
-                "assistant": response_text,
-                "timestamp": datetime.now().isoformat()
-            })
+            prompt_tokens = _record_conversation_turn(session, message, response_text)
             
             return ChatResponse(
                 response=response_text,
                 suggestions=["Paste research text for analysis", "Ask a question", "Start questionnaire"],
-                next_action="await_input"
+                next_action="await_input",
+                prompt_tokens=prompt_tokens
             )
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
 
+@app.post("/chat/stream")
+async def chat_with_claude_stream(chat_request: ChatMessage):
+    """
+    Streaming variant of /chat using Server-Sent Events.
+    Emits `token` events ({"delta": ...}) as the reply is generated, then one `final`
+    event with the same fields as /chat (detected_fields, missing_fields, next_action, ...).
+    Analysis, missing-field and case-creation turns are not token-streamed; their
+    complete reply is sent as a single token event.
+    In speculative analysis mode, research text first gets a `provisional` event (the keyword
+    answer, provisional: true), then a `reconciled` event with the fields the LLM changed,
+    then `final` with the reconciled reply.
+    """
+    user_id = chat_request.user_id or str(uuid.uuid4())
+    session_id = chat_request.session_id or str(uuid.uuid4())
+    chat_request = chat_request.model_copy(update={"user_id": user_id, "session_id": session_id})
+    session = _get_chat_session(session_id, user_id)
+    chat_route = _classify_chat_turn(session, chat_request.message)
+    
+    async def event_stream():
+        try:
+            if chat_route == CHAT_ROUTE_ANALYSIS and _chat_analysis_mode(chat_request) == CHAT_ANALYSIS_SPECULATIVE:
+                chat_response, reconcile_task = _start_speculative_chat_analysis(session, chat_request.message)
+                yield _sse_event("provisional", {**chat_response.model_dump(), "session_id": session_id})
+                # Shielded so the session is still reconciled if the client disconnects
+                reconciliation = dict(await asyncio.shield(reconcile_task))
+                final_response = reconciliation.pop("chat_response")
+                yield _sse_event("reconciled", {**reconciliation, "session_id": session_id})
+                yield _sse_event("final", {**final_response, "session_id": session_id})
+                return
+            
+            if chat_route != CHAT_ROUTE_CONVERSATION:
+                chat_response = await chat_with_claude(chat_request)
+                yield _sse_event("token", {"delta": chat_response.response})
+                yield _sse_event("final", {**chat_response.model_dump(), "session_id": session_id})
+                return
+            
+            start_time = datetime.now()
+            first_token_ms = None
+            deltas = []
+            async for delta in claude_integration.stream_conversational_response(
+                chat_request.message, _chat_context(session), session["conversation"]
+            ):
+                if first_token_ms is None:
+                    first_token_ms = (datetime.now() - start_time).total_seconds() * 1000
+                deltas.append(delta)
+                yield _sse_event("token", {"delta": delta})
+            
+            response_text = "".join(deltas)
+            prompt_tokens = _record_conversation_turn(session, chat_request.message, response_text)
+            final_response = ChatResponse(
+                response=response_text,
+                suggestions=["Paste research text for analysis", "Ask a question", "Start questionnaire"],
+                next_action="await_input",
+                missing_fields=session.get("missing_fields", []),
+                detected_fields=session.get("extracted_fields", {}),
+                prompt_tokens=prompt_tokens
+            )
+            yield _sse_event("final", {
+                **final_response.model_dump(),
+                "session_id": session_id,
+                "time_to_first_token_ms": round(first_token_ms, 2) if first_token_ms is not None else None
+            })
+            
+        except Exception as e:
+            logger.error(f"Error in streaming chat endpoint: {e}")
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            yield _sse_event("error", {"detail": f"Chat processing failed: {detail}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/chat/{session_id}/reconciliation")
+async def get_chat_reconciliation(session_id: str):
+    """
+    Reconciliation event for the session's latest speculative analysis: status "pending" until
+    the LLM result arrives, then the changed fields and the reconciled chat reply
+    """
+    session = enhanced_sessions.get(session_id)
+    if session is None or "reconciliation" not in session:
+        raise HTTPException(status_code=404, detail=f"No speculative analysis for session {session_id}")
+    return {"session_id": session_id, **session["reconciliation"]}
+
+@app.get("/chat/{session_id}/context")
+async def get_chat_context_stats(session_id: str):
+    """Size of the session's conversation context and the breakdown of its latest prompt"""
+    session = enhanced_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown session {session_id}")
+    return {"session_id": session_id, **session["conversation"].stats()}
+
 # Original questionnaire endpoint - enhanced with Claude integration
 @app.post("/question")
 async def get_question(
@@ -809,14 +1062,25 @@ async def analyze_research_text(analysis_request: AnalysisRequest):
         
         # Optionally enhance field detection
         if analysis_request.enhance_fields:
+            weak_fields = {
+                field: value for field, value in analysis_result.detected_fields.items()
+                if value == "Unknown" or analysis_result.confidence_scores.get(field, 0) < 0.5
+            }
+            try:
+                enhancements, enhancement_metrics = await claude_integration.enhance_fields_batch(
+                    weak_fields,
+                    analysis_request.research_text,
+                    strategy=analysis_request.enhancement_strategy,
+                    max_concurrency=analysis_request.max_concurrency
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            
             enhanced_fields = {}
-            for field, value in analysis_result.detected_fields.items():
-                if value == "Unknown" or analysis_result.confidence_scores.get(field, 0) < 0.5:
-                    enhanced_value, confidence = await claude_integration.enhance_field_detection(
-                        field, analysis_request.research_text, value
-                    )
-                    enhanced_fields[field] = enhanced_value
-                    analysis_result.confidence_scores[field] = confidence
+            for field, (enhanced_value, confidence) in enhancements.items():
+                enhanced_fields[field] = enhanced_value
+                analysis_result.confidence_scores[field] = confidence
+            analysis_result.enhancement_metrics = enhancement_metrics
             
             # Update with enhanced fields
             analysis_result.detected_fields.update(enhanced_fields)
@@ -830,6 +1094,8 @@ async def analyze_research_text(analysis_request: AnalysisRequest):
         logger.info(f"Analysis complete. Found {len(analysis_result.detected_fields) - len(analysis_result.missing_fields)} fields")
         return analysis_result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in analysis endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -861,8 +1127,62 @@ async def update_fields_with_responses(update_request: FieldUpdateRequest):
         logger.error(f"Error updating fields: {e}")
         raise HTTPException(status_code=500, detail=f"Field update failed: {str(e)}")
 
+def _is_pega_case(case_response: CaseResponse) -> bool:
+    """
+    Real Pega cases and queued outbox intents are replayed (a queued ID resolves to the real case
+    later); a demo fallback is retried on the next request
+    """
+    return case_response.status in ("Created", "Queued")
+
+async def _run_idempotent(scope: str,
+                          fingerprint: str,
+                          idempotency_key: Optional[str],
+                          create,
+                          response: Optional[Response] = None) -> Tuple[CaseResponse, bool]:
+    """Run a case creation once per key, marking replayed HTTP responses with Idempotent-Replayed"""
+    try:
+        key, ttl_seconds = case_idempotency.resolve_key(scope, fingerprint, idempotency_key)
+        case_response, replayed = await case_idempotency.run(key, fingerprint, create, ttl_seconds, should_store=_is_pega_case)
+    except IdempotencyKeyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if replayed:
+        logger.info(f"🔁 Returning existing case {case_response.ID} instead of creating a duplicate")
+        if response is not None:
+            response.headers["Idempotent-Replayed"] = "true"
+    return case_response, replayed
+
+def case_request_fingerprint(case_request: CaseCreationRequest) -> str:
+    """
+    Idempotency fingerprint of a case creation request: the detected fields the case is created
+    from, with any user responses applied, and its research text. Every creation path uses this
+    one; a batch item without fields is fingerprinted with the fields its analysis detected.
+    """
+    fields = {**case_request.detected_fields, **(case_request.user_responses or {})}
+    return case_fingerprint(CASE_IDEMPOTENCY_SCOPE, fields, case_request.research_text)
+
+async def create_case_idempotently(case_request: CaseCreationRequest,
+                                   idempotency_key: Optional[str] = None,
+                                   response: Optional[Response] = None) -> Tuple[CaseResponse, bool]:
+    """
+    Create the case once per Idempotency-Key or, without one, per detected fields and research
+    text. Returns the case and whether it was an earlier (or in-flight) creation's result.
+    """
+    fingerprint = case_request_fingerprint(case_request)
+    return await _run_idempotent(
+        CASE_IDEMPOTENCY_SCOPE, fingerprint, idempotency_key, lambda: _create_case_with_claude(case_request), response
+    )
+
 @app.post("/create-case", response_model=CaseResponse)
-async def create_dpia_case_with_claude(case_request: CaseCreationRequest):
+async def create_dpia_case_with_claude(case_request: CaseCreationRequest,
+                                       response: Response,
+                                       idempotency_key: Optional[str] = Header(None)):
+    """Create a CALM or DPIA case in Pega with Claude-enhanced data (idempotent, see create_case_idempotently)"""
+    case_response, _ = await create_case_idempotently(case_request, idempotency_key, response)
+    return case_response
+
+async def _create_case_with_claude(case_request: CaseCreationRequest) -> CaseResponse:
     """Create a CALM or DPIA case in Pega with Claude-enhanced data"""
     try:
         logger.info("Creating case with Claude-enhanced data")
@@ -871,13 +1191,6 @@ async def create_dpia_case_with_claude(case_request: CaseCreationRequest):
         case_type = determine_case_type(case_request.detected_fields, case_request.research_text)
         logger.info(f"Determined case type: {case_type}")
         
-        # Generate a better project title if needed
-        project_title = "Unknown"
-        if case_request.detected_fields.get("project_title") == "Unknown" or not case_request.detected_fields.get("project_title"):
-            project_title = await claude_integration.generate_project_title(case_request.research_text)
-        else:
-            project_title = case_request.detected_fields.get("project_title", "Unknown")
-        
         # Create Pega case with appropriate case type
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         case_id_prefix = case_type.upper()
@@ -887,10 +1200,7 @@ async def create_dpia_case_with_claude(case_request: CaseCreationRequest):
         case_content = {}
         
         # Determine the correct Pega case type ID
-        if case_type.upper() == "CALM":
-            pega_case_type = "Roche-Pathworks-Work-CALM"
-        else:
-            pega_case_type = "Roche-Pathworks-Work-DPIA"
+        pega_case_type = pega_case_type_id(case_type)
         
         logger.info(f"Attempting to create case with type: {pega_case_type}")
         
@@ -901,23 +1211,22 @@ async def create_dpia_case_with_claude(case_request: CaseCreationRequest):
             content=case_content
         )
         
+        # The Pega content is empty, so nothing here waits on a project title or another completion
         case_response = await create_pega_case(pega_request)
         
-        # Generate success message with Claude
-        success_message = await claude_integration.generate_conversational_response(
-            f"Successfully created {case_type} case {case_response.ID} with project title: {project_title}",
-            {"case_created": True, "case_id": case_response.ID, "project_title": project_title, "case_type": case_type}
-        )
-        
         logger.info(f"{case_type} case created successfully: {case_response.ID}")
         return case_response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating case: {e}")
         raise HTTPException(status_code=500, detail=f"Case creation failed: {str(e)}")
 
 @app.post("/create-calm-case", response_model=CaseResponse)
-async def create_calm_case_with_claude(case_request: CaseCreationRequest):
+async def create_calm_case_with_claude(case_request: CaseCreationRequest,
+                                       response: Response,
+                                       idempotency_key: Optional[str] = Header(None)):
     """Create a CALM case in Pega with Claude-enhanced data"""
     try:
         logger.info("Creating CALM case with Claude-enhanced data")
@@ -926,8 +1235,13 @@ async def create_calm_case_with_claude(case_request: CaseCreationRequest):
         case_request.detected_fields["recommended_case_type"] = "CALM"
         
         # Use the existing case creation logic
-        return await create_dpia_case_with_claude(case_request)
+        return await create_dpia_case_with_claude(case_request, response, idempotency_key)
         
+    except HTTPException as e:
+        if e.status_code < 500:
+            raise
+        logger.error(f"Error creating CALM case: {e.detail}")
+        raise HTTPException(status_code=500, detail=f"CALM case creation failed: {e.detail}")
     except Exception as e:
         logger.error(f"Error creating CALM case: {e}")
         raise HTTPException(status_code=500, detail=f"CALM case creation failed: {str(e)}")
@@ -1017,6 +1331,71 @@ def determine_case_type(detected_fields: Dict[str, str], research_text: str) ->
         logger.error(f"Error determining case type: {e}")
         return "DPIA"  # Default fallback
 
+def pega_case_type_id(case_type: str) -> str:
+    """Pega case type ID for a CALM or DPIA case"""
+    return "Roche-Pathworks-Work-CALM" if case_type.upper() == "CALM" else "Roche-Pathworks-Work-DPIA"
+
+async def _create_batch_case(item: CaseCreationRequest,
+                             analysis_slots: asyncio.Semaphore,
+                             pega_slots: asyncio.Semaphore) -> Dict[str, Any]:
+    """Analyze one batch item if it has no detected fields, then create its case"""
+    missing_fields = []
+    analyzed = not item.detected_fields
+    if analyzed:
+        async with analysis_slots:
+            analysis_result = await claude_integration.analyze_research_text(item.research_text)
+        item = item.model_copy(update={"detected_fields": dict(analysis_result.detected_fields)})
+        missing_fields = analysis_result.missing_fields
+    detected_fields = {**item.detected_fields, **(item.user_responses or {})}
+    
+    case_type = determine_case_type(detected_fields, item.research_text)
+    pega_request = CaseRequest(caseTypeID=pega_case_type_id(case_type), processID="pyStartCase", content={})
+    # Fingerprinted like /create-case, from the fields the case is created from (analysed ones for an item
+    # sent without fields), so a text analysed once and submitted through either endpoint is created once
+    fingerprint = case_request_fingerprint(item)
+    async with pega_slots:
+        case_response, replayed = await _run_idempotent(
+            CASE_IDEMPOTENCY_SCOPE, fingerprint, None, lambda: create_pega_case(pega_request)
+        )
+    
+    return {
+        "status": _BATCH_ITEM_STATUSES.get(case_response.status, BATCH_ITEM_DEMO),
+        "case_id": case_response.ID,
+        "case_status": case_response.status,
+        "case_type": case_type,
+        "analyzed": analyzed,
+        "replayed": replayed,
+        "missing_fields": missing_fields
+    }
+
+_BATCH_ITEM_STATUSES = {"Created": BATCH_ITEM_CREATED, "Queued": BATCH_ITEM_QUEUED}
+
+def _validate_case_batch(batch: CaseBatchRequest):
+    if not batch.items:
+        raise HTTPException(status_code=400, detail="Batch has no items")
+    if len(batch.items) > case_batch_config.max_items:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch has {len(batch.items)} items; the limit is {case_batch_config.max_items}"
+        )
+
+async def _case_batch_results(batch: CaseBatchRequest):
+    """Per-item results in completion order, then a summary"""
+    analysis_concurrency = case_batch_config.bounded(batch.analysis_concurrency, case_batch_config.analysis_concurrency)
+    pega_concurrency = case_batch_config.bounded(batch.pega_concurrency, case_batch_config.pega_concurrency)
+    analysis_slots = asyncio.Semaphore(analysis_concurrency)
+    pega_slots = asyncio.Semaphore(pega_concurrency)
+    logger.info(f"📦 Creating {len(batch.items)} cases (analysis concurrency {analysis_concurrency}, Pega concurrency {pega_concurrency})")
+    
+    start_time = time.perf_counter()
+    results = []
+    async for result in run_batch(batch.items, lambda index, item: _create_batch_case(item, analysis_slots, pega_slots)):
+        results.append(result)
+        yield {"type": "item", **result}
+    summary = batch_summary(results, (time.perf_counter() - start_time) * 1000)
+    logger.info(f"📦 Batch finished: {summary['created']} created, {summary['queued']} queued, {summary['demo']} demo, {summary['failed']} failed")
+    yield summary
+
 # Enhanced tools endpoint for MCP compatibility
 @app.post("/tools/call")
 async def call_tool(tool_request: Dict[str, Any]):
@@ -1058,7 +1437,8 @@ async def call_tool(tool_request: Dict[str, Any]):
                         "confidence_scores": analysis_result.confidence_scores,
                         "interactive_prompts": analysis_result.interactive_prompts,
                         "suggestions": analysis_result.suggestions,
-                        "analysis_summary": analysis_result.analysis_summary
+                        "analysis_summary": analysis_result.analysis_summary,
+                        "field_tiers": analysis_result.field_tiers
                     }
                 }
                 
@@ -1077,8 +1457,11 @@ async def call_tool(tool_request: Dict[str, Any]):
                             research_text=research_text,
                             user_responses=prompt_responses
                         )
-                        case_response = await create_dpia_case_with_claude(case_request)
+                        case_response, replayed = await create_case_idempotently(
+                            case_request, arguments.get("idempotency_key")
+                        )
                         result["case_created"] = True
+                        result["replayed"] = replayed
                         result["case_id"] = case_response.ID
                         result["case_status"] = case_response.status
                         result["case_type"] = case_type
@@ -1150,10 +1533,13 @@ async def call_tool(tool_request: Dict[str, Any]):
                     detected_fields=detected_fields,
                     research_text=research_text
                 )
-                case_response = await create_dpia_case_with_claude(case_request)
+                case_response, replayed = await create_case_idempotently(
+                    case_request, arguments.get("idempotency_key")
+                )
                 
                 result = {
                     "case_created": True,
+                    "replayed": replayed,
                     "case_id": case_response.ID,
                     "case_status": case_response.status,
                     "case_type": case_type,
@@ -1171,13 +1557,58 @@ async def call_tool(tool_request: Dict[str, Any]):
             
             return {"content": [{"text": json.dumps(result)}]}
             
+        elif tool_name == "create_dpia_cases_batch":
+            # Same as /cases/batch, with the results collected into one reply (ordered by item)
+            batch = CaseBatchRequest(
+                items=[{"detected_fields": {}, **item} for item in arguments.get("items", [])],
+                analysis_concurrency=arguments.get("analysis_concurrency"),
+                pega_concurrency=arguments.get("pega_concurrency")
+            )
+            _validate_case_batch(batch)
+            lines = [line async for line in _case_batch_results(batch)]
+            summary = lines.pop()
+            result = {"results": sorted(lines, key=lambda line: line["index"]), "summary": summary}
+            return {"content": [{"text": json.dumps(result, default=str)}]}
+            
         else:
             raise HTTPException(status_code=400, detail=f"Unknown tool: {tool_name}")
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Tool execution error: {e}")
         raise HTTPException(status_code=500, detail=f"Tool execution failed: {str(e)}")
 
+def _pega_case_response(result: Dict[str, Any]) -> CaseResponse:
+    """CaseResponse for a case Pega confirmed"""
+    return CaseResponse(
+        ID=result.get("ID", ""),
+        status="Created",
+        nextAssignmentID=result.get("nextPageID", ""),
+        nextAssignmentName="Review Case",
+        links=[{"rel": "self", "href": f"{PEGA_BASE_URL}/cases/{result.get('ID', '')}"}]
+    )
+
+async def _create_pega_case_via_outbox(outbox: CaseOutbox, payload: Dict[str, Any]) -> CaseResponse:
+    """
+    Record the intent durably before the POST. A case Pega has not confirmed within the
+    acknowledgment timeout is returned as Queued under its provisional ID and delivered by the
+    outbox worker; GET /cases/{id} resolves the provisional ID once Pega has the case.
+    """
+    outcome = await outbox.submit(payload)
+    if outcome.status == OUTBOX_CREATED:
+        logger.info("Case created successfully: %s", outcome.response)
+        return _pega_case_response(outcome.response or {"ID": outcome.case_id})
+    if outcome.status == OUTBOX_FAILED:
+        raise HTTPException(status_code=502, detail=outcome.error)
+    return CaseResponse(
+        ID=outcome.outbox_id,
+        status="Queued",
+        nextAssignmentID=None,
+        nextAssignmentName=None,
+        links=[{"rel": "status", "href": f"/cases/outbox/{outcome.outbox_id}"}]
+    )
+
 # Original Pega endpoints (enhanced)
 async def create_pega_case(case_request) -> CaseResponse:
     """Create a case in Pega system - handles both CaseRequest objects and dictionaries"""
@@ -1196,12 +1627,6 @@ async def create_pega_case(case_request) -> CaseResponse:
         
         logger.info("Attempting to create case with type: %s", case_type_id)
         
-        # Set headers with basic auth
-        headers = {
-            "Authorization": f"Basic {BASIC_AUTH}",
-            "Content-Type": "application/json"
-        }
-        
         # Prepare request payload
         payload = {
             "caseTypeID": case_type_id,
@@ -1211,38 +1636,20 @@ async def create_pega_case(case_request) -> CaseResponse:
         
         logger.info("Sending request to Pega API: %s", PEGA_BASE_URL)
         logger.info("Payload being sent to Pega: %s", json.dumps(payload, indent=2))
-        response = requests.post(
-            f"{PEGA_BASE_URL}/cases",
-            json=payload,
-            headers=headers,
-            verify=True,
-            timeout=30
-        )
+        outbox = case_outbox()
+        if outbox is not None:
+            return await _create_pega_case_via_outbox(outbox, payload)
+        
+        response = await pega_client().create_case(payload)
         
         logger.info("Pega API response status: %d", response.status_code)
         
         if response.status_code in [201, 200]:
             result = response.json()
             logger.info("Case created successfully: %s", result)
-            return CaseResponse(
-                ID=result.get("ID", ""),
-                status="Created",
-                nextAssignmentID=result.get("nextPageID", ""),
-                nextAssignmentName="Review Case",
-                links=[{"rel": "self", "href": f"{PEGA_BASE_URL}/cases/{result.get('ID', '')}"}]
-            )
+            return _pega_case_response(result)
         else:
-            error_msg = f"Failed to create case. Status code: {response.status_code}"
-            try:
-                error_data = response.json()
-                if "errors" in error_data:
-                    error_details = error_data["errors"][0].get("message", "")
-                    validation_messages = error_data["errors"][0].get("ValidationMessages", [])
-                    if validation_messages:
-                        error_details += " - " + validation_messages[0].get("ValidationMessage", "")
-                    error_msg = error_details
-            except:
-                error_msg = response.text
+            error_msg = pega_error_message(response)
             logger.error(error_msg)
             
             # Return demo mode response if Pega is unavailable
@@ -1256,7 +1663,7 @@ async def create_pega_case(case_request) -> CaseResponse:
                 links=[{"rel": "demo", "href": f"demo/cases/{demo_case_id}"}]
             )
             
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error("Network error: %s", str(e), exc_info=True)
         # Return demo mode response
         demo_case_id = f"DEMO-{datetime.now().strftime('%Y%m%d%H%M%S')}"
@@ -1268,14 +1675,46 @@ async def create_pega_case(case_request) -> CaseResponse:
             nextAssignmentName="Demo Review",
             links=[{"rel": "demo", "href": f"demo/cases/{demo_case_id}"}]
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Unexpected error: %s", str(e), exc_info=True)
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @app.post("/cases", response_model=CaseResponse)
-async def create_case(case_request: CaseRequest):
-    """Legacy endpoint for direct Pega case creation"""
-    return await create_pega_case(case_request)
+async def create_case(case_request: CaseRequest,
+                      response: Response,
+                      idempotency_key: Optional[str] = Header(None)):
+    """
+    Legacy endpoint for direct Pega case creation. Deduplicated only when an Idempotency-Key is
+    sent: a raw payload (often empty content) does not identify a case on its own.
+    """
+    if not idempotency_key:
+        return await create_pega_case(case_request)
+    fingerprint = request_fingerprint(PEGA_CASE_IDEMPOTENCY_SCOPE, case_request.model_dump())
+    case_response, _ = await _run_idempotent(
+        PEGA_CASE_IDEMPOTENCY_SCOPE, fingerprint, idempotency_key, lambda: create_pega_case(case_request), response
+    )
+    return case_response
+
+@app.post("/cases/batch")
+async def create_cases_batch(batch: CaseBatchRequest):
+    """
+    Analyze and create many cases at once, with bounded concurrency toward Galileo AI and Pega.
+    Streams NDJSON: one `item` line per case as it completes (`index` is its position in the
+    request, `status` is created, demo or failed), then a `summary` line.
+    """
+    _validate_case_batch(batch)
+    
+    async def result_stream():
+        async for line in _case_batch_results(batch):
+            yield ndjson_line(line)
+    
+    return StreamingResponse(
+        result_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/health")
 async def health_check():
@@ -1293,6 +1732,9 @@ async def health_check():
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
             "claude_integration": claude_status,
+            "pega_client": pega_client().get_stats(),
+            "case_idempotency": case_idempotency.get_stats(),
+            "case_outbox": case_outbox().stats() if case_outbox_config.enabled else {"enabled": False},
             "version": "2.0.0"
         }
     except Exception as e:
@@ -1302,24 +1744,83 @@ async def health_check():
             "timestamp": datetime.now().isoformat()
         }
 
+@app.get("/cases/stream")
+async def stream_cases(
+    status: Optional[str] = None,
+    caseTypeID: Optional[str] = None,
+    per_page: int = 100,
+    max_pages: Optional[int] = None
+):
+    """
+    Every case across all Pega pages as NDJSON: one `case` line per case (the next page is
+    fetched while the current one is written), then a `summary` line, or an `error` line if Pega
+    fails part-way. status and caseTypeID are filtered server-side.
+    """
+    filters = {"status": status, "caseTypeID": caseTypeID}
+    per_page = min(max(per_page, 1), 500)
+    
+    async def case_stream():
+        start_time = time.perf_counter()
+        first_row_ms = None
+        count = 0
+        try:
+            async for case in pega_client().iter_cases(filters, per_page=per_page, max_pages=max_pages):
+                if first_row_ms is None:
+                    first_row_ms = (time.perf_counter() - start_time) * 1000
+                count += 1
+                yield ndjson_line({"type": "case", "case": case})
+        except httpx.HTTPError as e:
+            logger.error(f"Error streaming cases: {e}")
+            yield ndjson_line({"type": "error", "detail": f"Error listing cases: {str(e)}", "cases": count})
+            return
+        yield ndjson_line({
+            "type": "summary",
+            "cases": count,
+            "time_to_first_row_ms": round(first_row_ms, 2) if first_row_ms is not None else None,
+            "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 2)
+        })
+    
+    return StreamingResponse(
+        case_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/cases/outbox")
+async def get_case_outbox(status: Optional[str] = None, limit: int = 50):
+    """Outbox counters and the most recent case-creation intents (optionally in one state)"""
+    outbox = case_outbox()
+    if outbox is None:
+        return {"stats": {"enabled": False}, "entries": []}
+    return {"stats": outbox.stats(), "entries": outbox.entries(status, min(max(limit, 1), 500))}
+
+@app.get("/cases/outbox/{outbox_id}")
+async def get_case_outbox_entry(outbox_id: str):
+    """Where one case-creation intent stands, and its Pega case ID once delivered"""
+    outbox = case_outbox()
+    entry = outbox.get(outbox_id) if outbox is not None else None
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"No outbox entry {outbox_id}")
+    return entry
+
 @app.get("/cases/{case_id}")
 async def get_case(case_id: str):
-    """Get a specific case from Pega"""
+    """Get a specific case from Pega (a provisional outbox ID resolves to its Pega case once delivered)"""
+    outbox = case_outbox()
+    if outbox is not None and outbox.is_provisional(case_id):
+        entry = outbox.get(case_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"No outbox entry {case_id}")
+        if entry["status"] == OUTBOX_FAILED:
+            raise HTTPException(status_code=502, detail=entry["last_error"])
+        if entry["status"] != OUTBOX_CREATED:
+            return JSONResponse(status_code=202, content=entry)
+        case_id = entry["case_id"]
     try:
-        headers = {
-            "Authorization": f"Basic {BASIC_AUTH}",
-            "Content-Type": "application/json"
-        }
-        
-        response = requests.get(
-            f"{PEGA_BASE_URL}/cases/{case_id}",
-            headers=headers,
-            verify=True,
-            timeout=30
-        )
+        response = await pega_client().get_case(case_id)
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Error retrieving case: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving case: {str(e)}")
 
@@ -1332,11 +1833,6 @@ async def list_cases(
 ):
     """List cases from Pega"""
     try:
-        headers = {
-            "Authorization": f"Basic {BASIC_AUTH}",
-            "Content-Type": "application/json"
-        }
-        
         params = {
             "page": page,
             "per_page": per_page
@@ -1346,16 +1842,10 @@ async def list_cases(
         if caseTypeID:
             params["caseTypeID"] = caseTypeID
             
-        response = requests.get(
-            f"{PEGA_BASE_URL}/cases",
-            headers=headers,
-            params=params,
-            verify=True,
-            timeout=30
-        )
+        response = await pega_client().list_cases(params)
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Error listing cases: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error listing cases: {str(e)}")
 
@@ -1501,7 +1991,20 @@ async def get_galileo_status():
                 "provider": status.get("llm_provider", "Unknown"),
                 "model_name": status.get("model_name", "Unknown"),
                 "monitoring_enabled": status.get("monitoring_enabled", False),
-                "integration_active": status.get("llm_provider") == "Galileo AI"
+                "integration_active": status.get("llm_provider") == "Galileo AI",
+                "analysis_cache": status.get("analysis_cache", {}),
+                "request_coalescing": status.get("request_coalescing", {}),
+                "field_enhancement": status.get("field_enhancement", {}),
+                "tiered_analysis": status.get("tiered_analysis", {}),
+                "speculative_analysis": {"mode": CHAT_ANALYSIS_MODE, **status.get("speculative_analysis", {})},
+                "project_titles": status.get("project_titles", {}),
+                "conversation_context": status.get("conversation_context", {}),
+                "telemetry": status.get("telemetry", {}),
+                "insights": status.get("insights", {}),
+                "streaming": status.get("streaming", {}),
+                "circuit_breaker": status.get("resilience", {}).get("circuit_breaker", {}),
+                "concurrency_limiter": status.get("resilience", {}).get("concurrency_limiter", {}),
+                "retries": status.get("retries", {})
             },
             "context_status": status,
             "timestamp": datetime.now().isoformat()
@@ -1528,7 +2031,7 @@ async def get_galileo_performance():
 async def submit_galileo_feedback(feedback_request: Dict[str, Any]):
     """Submit feedback for Galileo AI model improvement"""
     try:
-        # Log feedback for Galileo AI monitoring
+        # Queue feedback on the same batched telemetry path as analysis metrics
         if hasattr(claude_integration, 'galileo_client') and claude_integration.galileo_client:
             await claude_integration.galileo_client.log_analysis_metrics(
                 analysis_input=feedback_request.get("input_text", ""),
@@ -1545,6 +2048,48 @@ async def submit_galileo_feedback(feedback_request: Dict[str, Any]):
         logger.error(f"Error submitting Galileo AI feedback: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/galileo/insights/{fingerprint}")
+async def get_galileo_insights(fingerprint: str):
+    """Get Galileo AI insights for an analysis (fingerprint from analysis_result.galileo_insights)"""
+    insights = claude_integration.get_analysis_insights(fingerprint)
+    if insights is None:
+        return {
+            "status": "pending",
+            "fingerprint": fingerprint,
+            "timestamp": datetime.now().isoformat()
+        }
+    return {
+        "status": "success",
+        "fingerprint": fingerprint,
+        "insights": insights,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.post("/galileo/cache/invalidate")
+async def invalidate_galileo_cache():
+    """Drop all cached Galileo AI analysis results"""
+    try:
+        removed = claude_integration.invalidate_analysis_cache()
+        return {
+            "status": "success",
+            "entries_removed": removed,
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Error invalidating Galileo AI cache: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/cases/cache/invalidate")
+async def invalidate_case_cache(case_id: Optional[str] = None):
+    """Drop cached Pega reads for one case (and all case lists), or everything"""
+    removed = pega_client().invalidate_cache(case_id)
+    return {
+        "status": "success",
+        "case_id": case_id,
+        "entries_removed": removed,
+        "timestamp": datetime.now().isoformat()
+    }
+
 # Setup RDChat integration routes
 setup_rdchat_routes(app)
 
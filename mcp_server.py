@@ -13,7 +13,6 @@ import os
 import sys
 from typing import Any, Dict, List, Optional
 
-import requests
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
@@ -28,7 +27,8 @@ from mcp.types import (
     EmbeddedResource,
 )
 from dotenv import load_dotenv
-import base64
+
+from pega_client import close_pega_client, pega_client
 
 # Load environment variables
 load_dotenv()
@@ -37,14 +37,6 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("pega-mcp-server")
 
-# Pega Configuration
-PEGA_BASE_URL = os.getenv("PEGA_BASE_URL", "https://roche-gtech-dt1.pegacloud.net/prweb/api/v1")
-PEGA_USERNAME = os.getenv("PEGA_USERNAME", "nadadhub")
-PEGA_PASSWORD = os.getenv("PEGA_PASSWORD", "Pwrm*2025")
-
-# Basic auth header
-BASIC_AUTH = base64.b64encode(f"{PEGA_USERNAME}:{PEGA_PASSWORD}".encode()).decode()
-
 class PegaMCPServer:
     def __init__(self):
         self.server = Server("pega-mcp-server")
@@ -93,6 +85,11 @@ class PegaMCPServer:
                                 "case_id": {
                                     "type": "string",
                                     "description": "The case ID to retrieve"
+                                },
+                                "refresh": {
+                                    "type": "boolean",
+                                    "description": "Bypass the case cache and read from Pega (default: false)",
+                                    "default": False
                                 }
                             },
                             "required": ["case_id"]
@@ -121,6 +118,11 @@ class PegaMCPServer:
                                     "type": "integer",
                                     "description": "Items per page (default: 25)",
                                     "default": 25
+                                },
+                                "all_pages": {
+                                    "type": "boolean",
+                                    "description": "Return every matching case across all pages instead of one page (default: false)",
+                                    "default": False
                                 }
                             }
                         }
@@ -185,11 +187,6 @@ class PegaMCPServer:
     async def _create_case(self, arguments: Dict[str, Any]) -> CallToolResult:
         """Create a new Pega case."""
         try:
-            headers = {
-                "Authorization": f"Basic {BASIC_AUTH}",
-                "Content-Type": "application/json"
-            }
-            
             case_type_id = arguments.get("caseTypeID", "Roche-Pathworks-Work-DPIA")
             process_id = arguments.get("processID", "pyStartCase")
             content = arguments.get("content", {})
@@ -200,12 +197,7 @@ class PegaMCPServer:
                 "content": content
             }
             
-            response = requests.post(
-                f"{PEGA_BASE_URL}/cases",
-                json=payload,
-                headers=headers,
-                verify=True
-            )
+            response = await pega_client().create_case(payload)
             
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -230,16 +222,9 @@ class PegaMCPServer:
         """Get a specific Pega case."""
         try:
             case_id = arguments["case_id"]
-            headers = {
-                "Authorization": f"Basic {BASIC_AUTH}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(
-                f"{PEGA_BASE_URL}/cases/{case_id}",
-                headers=headers,
-                verify=True
-            )
+            if arguments.get("refresh"):
+                pega_client().invalidate_cache(case_id)
+            response = await pega_client().get_case(case_id)
             
             if response.status_code == 200:
                 result = response.json()
@@ -265,11 +250,6 @@ class PegaMCPServer:
     async def _list_cases(self, arguments: Dict[str, Any]) -> CallToolResult:
         """List Pega cases."""
         try:
-            headers = {
-                "Authorization": f"Basic {BASIC_AUTH}",
-                "Content-Type": "application/json"
-            }
-            
             params = {}
             if "status" in arguments:
                 params["status"] = arguments["status"]
@@ -280,12 +260,17 @@ class PegaMCPServer:
             if "per_page" in arguments:
                 params["per_page"] = arguments["per_page"]
             
-            response = requests.get(
-                f"{PEGA_BASE_URL}/cases",
-                headers=headers,
-                params=params,
-                verify=True
-            )
+            if arguments.get("all_pages"):
+                filters = {key: params[key] for key in ("status", "caseTypeID") if key in params}
+                cases = [case async for case in pega_client().iter_cases(filters, per_page=params.get("per_page", 100))]
+                return CallToolResult(
+                    content=[TextContent(
+                        type="text",
+                        text=f"Cases list ({len(cases)} across all pages):\n{json.dumps({'cases': cases}, indent=2)}"
+                    )]
+                )
+            
+            response = await pega_client().list_cases(params)
             
             if response.status_code == 200:
                 result = response.json()
@@ -314,17 +299,7 @@ class PegaMCPServer:
             case_id = arguments["case_id"]
             content = arguments["content"]
             
-            headers = {
-                "Authorization": f"Basic {BASIC_AUTH}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.put(
-                f"{PEGA_BASE_URL}/cases/{case_id}",
-                json=content,
-                headers=headers,
-                verify=True
-            )
+            response = await pega_client().update_case(case_id, content)
             
             if response.status_code in [200, 204]:
                 return CallToolResult(
@@ -350,16 +325,7 @@ class PegaMCPServer:
         """Get assignments for a case."""
         try:
             case_id = arguments["case_id"]
-            headers = {
-                "Authorization": f"Basic {BASIC_AUTH}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(
-                f"{PEGA_BASE_URL}/cases/{case_id}/assignments",
-                headers=headers,
-                verify=True
-            )
+            response = await pega_client().get_assignments(case_id)
             
             if response.status_code == 200:
                 result = response.json()
@@ -401,7 +367,10 @@ class PegaMCPServer:
 async def main():
     """Main entry point."""
     server = PegaMCPServer()
-    await server.run()
+    try:
+        await server.run()
+    finally:
+        await close_pega_client()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Local Galileo AI stand-in for offline development, load tests and benchmarks
+Implements /chat/completions (including streaming), /insights/analysis, /metrics/log and
+/metrics/performance with configurable latency, error injection and rate limiting.
+
+    python mock_galileo_server.py --port 8090 --latency-profile lognormal --latency-ms 800
+    GALILEO_BASE_URL=http://localhost:8090/v1 GALILEO_API_KEY=mock GALILEO_PROJECT_ID=mock python main_claude.py
+"""
+
+import os
+import re
+import json
+import math
+import time
+import random
+import asyncio
+import hashlib
+import logging
+import argparse
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from tiered_analysis import KeywordAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Latency profiles
+LATENCY_NONE = "none"
+LATENCY_FIXED = "fixed"  # every request takes latency_ms
+LATENCY_LOGNORMAL = "lognormal"  # median latency_ms, spread latency_sigma
+LATENCY_LONG_TAIL = "long_tail"  # latency_ms, but tail_probability of requests take tail_multiplier times longer
+LATENCY_PROFILES = (LATENCY_NONE, LATENCY_FIXED, LATENCY_LOGNORMAL, LATENCY_LONG_TAIL)
+
+class MockGalileoConfig(BaseModel):
+    """Behaviour of the mock server; can be changed at runtime with POST /mock/config"""
+    latency_profile: str = LATENCY_NONE
+    latency_ms: float = 0.0
+    latency_sigma: float = 0.5  # lognormal shape
+    tail_probability: float = 0.05
+    tail_multiplier: float = 10.0
+    token_interval_ms: float = 0.0  # delay between streamed chunks
+    stream_chunk_chars: int = 16
+    error_rate: float = 0.0  # share of requests answered with an error status
+    error_statuses: List[int] = Field(default_factory=lambda: [500, 502, 503])
+    rate_limit_rps: float = 0.0  # 0 disables rate limiting
+    rate_limit_burst: int = 10
+    seed: Optional[int] = None  # seed the latency/error generator for reproducible runs
+
+def sample_latency_ms(rng: random.Random, profile: str, latency_ms: float, sigma: float = 0.5,
+                      tail_probability: float = 0.05, tail_multiplier: float = 10.0) -> float:
+    """One latency draw in milliseconds from a latency profile"""
+    if profile == LATENCY_FIXED:
+        return latency_ms
+    if profile == LATENCY_LOGNORMAL:
+        return rng.lognormvariate(math.log(max(latency_ms, 1e-3)), sigma)
+    if profile == LATENCY_LONG_TAIL:
+        return latency_ms * tail_multiplier if rng.random() < tail_probability else latency_ms
+    return 0.0
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def take(self) -> Optional[float]:
+        """Take a token; returns None on success or the seconds until one is available"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return None
+        return (1.0 - self.tokens) / self.rate
+
+class MockGalileoState:
+    """Configuration, random source, rate limiter and request statistics shared by the routes"""
+
+    def __init__(self, config: MockGalileoConfig):
+        self.analyzer = KeywordAnalyzer()
+        self.metrics_events: List[Dict[str, Any]] = []
+        self.latencies_ms: List[float] = []
+        self.counters = {"requests": 0, "errors_injected": 0, "rate_limited": 0, "streams": 0}
+        self.configure(config)
+
+    def configure(self, config: MockGalileoConfig):
+        if config.latency_profile not in LATENCY_PROFILES:
+            raise ValueError(f"Unknown latency profile '{config.latency_profile}'; expected one of {LATENCY_PROFILES}")
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.bucket = TokenBucket(config.rate_limit_rps, config.rate_limit_burst) if config.rate_limit_rps > 0 else None
+
+    def sample_latency(self) -> float:
+        """Seconds to wait before answering, drawn from the configured profile"""
+        config = self.config
+        return sample_latency_ms(
+            self.random, config.latency_profile, config.latency_ms,
+            config.latency_sigma, config.tail_probability, config.tail_multiplier
+        ) / 1000
+
+    async def admit(self) -> Optional[JSONResponse]:
+        """Apply rate limiting, latency and error injection; returns an error response or None"""
+        self.counters["requests"] += 1
+        if self.bucket is not None:
+            retry_after = self.bucket.take()
+            if retry_after is not None:
+                self.counters["rate_limited"] += 1
+                return JSONResponse(
+                    status_code=429,
+                    content={"error": {"type": "rate_limit_exceeded", "message": "Mock Galileo rate limit exceeded"}},
+                    headers={"Retry-After": f"{max(retry_after, 0.001):.3f}"}
+                )
+
+        latency = self.sample_latency()
+        if latency > 0:
+            await asyncio.sleep(latency)
+        self.latencies_ms.append(latency * 1000)
+
+        if self.config.error_rate > 0 and self.random.random() < self.config.error_rate:
+            self.counters["errors_injected"] += 1
+            status = self.random.choice(self.config.error_statuses)
+            return JSONResponse(status_code=status, content={"error": {"type": "injected", "status": status}})
+        return None
+
+    def percentile(self, percentile: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))]
+
+def extract_research_text(prompt: str) -> str:
+    """Pull the research text out of an analysis prompt (or return the prompt itself)"""
+    match = re.search(r"\*\*Research Text:\*\*\s*(.*?)\s*(?:Respond with valid JSON only\.|$)", prompt, re.S)
+    return match.group(1).strip() if match else prompt
+
+def build_dpia_analysis(analyzer: KeywordAnalyzer, text: str) -> Dict[str, Any]:
+    """Deterministic structured DPIA analysis derived from the research text with keyword detectors"""
+    analysis = analyzer.build_analysis(text, analyzer.detect_fields(text), summary=f"Mock analysis of {len(text)} characters")
+    if analysis["recommended_case_type"] == "Unknown":
+        analysis.update(recommended_case_type="CALM", case_type_confidence=0.7, case_type_reasoning="No DPIA indicators found")
+    return analysis
+
+def build_completion_content(state: MockGalileoState, messages: List[Dict[str, Any]]) -> str:
+    """Answer content for a chat completion, shaped like the prompt that was sent"""
+    prompt = str(messages[-1].get("content", "")) if messages else ""
+    if "**Research Text:**" in prompt or "recommended_case_type" in prompt:
+        return json.dumps(build_dpia_analysis(state.analyzer, extract_research_text(prompt)))
+
+    if "enhanced_value" in prompt:
+        current_values = dict(re.findall(r"^\s*-\s*(\w+):\s*'(.*)'\s*$", prompt, re.M))
+        if current_values:
+            return json.dumps({field: {"enhanced_value": value, "confidence": 0.5} for field, value in current_values.items()})
+        current = re.search(r"Current detected value:\s*'(.*?)'", prompt)
+        return json.dumps({"enhanced_value": current.group(1) if current else "Unknown", "confidence": 0.5})
+
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+    return f"Mock Galileo response ({digest}) to: {prompt[:200]}"
+
+def _completion_id(body: Dict[str, Any]) -> str:
+    return "chatcmpl-mock-" + hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+
+def create_app(config: Optional[MockGalileoConfig] = None) -> FastAPI:
+    """Create the mock server; routes are served both at the root and under /v1"""
+    state = MockGalileoState(config or create_mock_config())
+    app = FastAPI(title="Mock Galileo AI", version="1.0.0")
+    app.state.mock = state
+    router = APIRouter()
+
+    @router.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        rejection = await state.admit()
+        if rejection is not None:
+            return rejection
+
+        content = build_completion_content(state, body.get("messages", []))
+        completion_id = _completion_id(body)
+        model = body.get("model", "galileo-llm-v1")
+
+        if not body.get("stream"):
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(json.dumps(body.get("messages", []))) // 4, "completion_tokens": len(content) // 4}
+            }
+
+        state.counters["streams"] += 1
+        chunk_chars = max(state.config.stream_chunk_chars, 1)
+        interval = state.config.token_interval_ms / 1000
+
+        async def event_stream():
+            yield f"data: {json.dumps({'id': completion_id, 'choices': [{'index': 0, 'delta': {'role': 'assistant'}}]})}\n\n"
+            for start in range(0, len(content), chunk_chars):
+                if interval > 0 and start > 0:
+                    await asyncio.sleep(interval)
+                delta = {"content": content[start:start + chunk_chars]}
+                yield f"data: {json.dumps({'id': completion_id, 'choices': [{'index': 0, 'delta': delta}]})}\n\n"
+            yield f"data: {json.dumps({'id': completion_id, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    @router.post("/insights/analysis")
+    async def insights_analysis(request: Request):
+        body = await request.json()
+        rejection = await state.admit()
+        if rejection is not None:
+            return rejection
+        analysis = body.get("analysis_result") or {}
+        missing = analysis.get("missing_fields") or []
+        return {
+            "model_performance": "excellent" if not missing else "good",
+            "analysis_quality": "high" if not missing else "medium",
+            "recommendations": [f"Collect {field.replace('_', ' ')}" for field in missing]
+        }
+
+    @router.post("/metrics/log")
+    async def metrics_log(request: Request):
+        body = await request.json()
+        rejection = await state.admit()
+        if rejection is not None:
+            return rejection
+        events = body.get("events", [body])
+        state.metrics_events.extend(events)
+        return {"status": "logged", "events": len(events)}
+
+    @router.get("/metrics/performance")
+    async def metrics_performance():
+        rejection = await state.admit()
+        if rejection is not None:
+            return rejection
+        return {
+            **state.counters,
+            "metrics_events": len(state.metrics_events),
+            "latency_ms": {
+                "p50": round(state.percentile(50), 2),
+                "p95": round(state.percentile(95), 2),
+                "p99": round(state.percentile(99), 2)
+            }
+        }
+
+    @router.head("/")
+    async def root_head():
+        # Connection warmup probes the base URL
+        return JSONResponse(content=None)
+
+    app.include_router(router)
+    app.include_router(router, prefix="/v1")
+
+    @app.get("/mock/config")
+    async def get_mock_config():
+        return state.config.model_dump()
+
+    @app.post("/mock/config")
+    async def update_mock_config(updates: Dict[str, Any]):
+        try:
+            state.configure(state.config.model_copy(update=updates))
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"detail": str(e)})
+        return state.config.model_dump()
+
+    @app.get("/mock/stats")
+    async def get_mock_stats():
+        return {**state.counters, "metrics_events": len(state.metrics_events), "p95_ms": round(state.percentile(95), 2)}
+
+    return app
+
+def create_mock_config() -> MockGalileoConfig:
+    """Create the mock configuration from MOCK_GALILEO_* environment variables"""
+    seed = os.getenv("MOCK_GALILEO_SEED")
+    return MockGalileoConfig(
+        latency_profile=os.getenv("MOCK_GALILEO_LATENCY_PROFILE", LATENCY_NONE),
+        latency_ms=float(os.getenv("MOCK_GALILEO_LATENCY_MS", "0")),
+        latency_sigma=float(os.getenv("MOCK_GALILEO_LATENCY_SIGMA", "0.5")),
+        tail_probability=float(os.getenv("MOCK_GALILEO_TAIL_PROBABILITY", "0.05")),
+        tail_multiplier=float(os.getenv("MOCK_GALILEO_TAIL_MULTIPLIER", "10")),
+        token_interval_ms=float(os.getenv("MOCK_GALILEO_TOKEN_INTERVAL_MS", "0")),
+        error_rate=float(os.getenv("MOCK_GALILEO_ERROR_RATE", "0")),
+        rate_limit_rps=float(os.getenv("MOCK_GALILEO_RATE_LIMIT_RPS", "0")),
+        rate_limit_burst=int(os.getenv("MOCK_GALILEO_RATE_LIMIT_BURST", "10")),
+        seed=int(seed) if seed else None
+    )
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a local Galileo AI stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-profile", choices=LATENCY_PROFILES)
+    parser.add_argument("--latency-ms", type=float)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--rate-limit-rps", type=float)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    overrides = {
+        key: value for key, value in {
+            "latency_profile": args.latency_profile,
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+            "rate_limit_rps": args.rate_limit_rps,
+            "seed": args.seed
+        }.items() if value is not None
+    }
+    config = create_mock_config().model_copy(update=overrides)
+
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"🧪 Mock Galileo AI on http://{args.host}:{args.port}/v1 ({config.latency_profile} latency, {config.error_rate:.0%} errors)")
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Local Pega stand-in for offline development, load tests and benchmarks
+Implements POST/GET /cases, GET/PUT /cases/{ID} and GET /cases/{ID}/assignments over in-memory
+cases, with per-operation latency, error injection, 429 throttling with Retry-After and Pega-style
+validation errors.
+
+    python mock_pega_server.py --port 8091 --latency-profile lognormal --latency-ms 300 --seed-cases 1000
+    PEGA_BASE_URL=http://localhost:8091/prweb/api/v1 PEGA_VERIFY_SSL=false python main_claude.py
+"""
+
+import os
+import json
+import random
+import asyncio
+import hashlib
+import logging
+import argparse
+import itertools
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, Field
+
+from mock_galileo_server import LATENCY_NONE, LATENCY_PROFILES, TokenBucket, sample_latency_ms
+from pega_client import (
+    OP_CREATE_CASE, OP_GET_ASSIGNMENTS, OP_GET_CASE, OP_LIST_CASES, OP_UPDATE_CASE, PEGA_OPERATIONS
+)
+
+logger = logging.getLogger(__name__)
+
+MOCK_PEGA_PREFIX = "/prweb/api/v1"
+SEED_CASE_STATUSES = ("New", "Open", "Resolved-Completed")
+
+class MockPegaConfig(BaseModel):
+    """Behaviour of the mock server; can be changed at runtime with POST /mock/config"""
+    latency_profile: str = LATENCY_NONE
+    latency_ms: float = 0.0
+    operation_latency_ms: Dict[str, float] = Field(default_factory=dict)  # per-operation overrides, e.g. {"create_case": 1500}
+    latency_sigma: float = 0.5  # lognormal shape
+    tail_probability: float = 0.05
+    tail_multiplier: float = 10.0
+    list_row_latency_ms: float = 0.0  # extra cost per case in a list page
+    error_rate: float = 0.0  # share of requests answered with an error status
+    operation_error_rates: Dict[str, float] = Field(default_factory=dict)
+    error_statuses: List[int] = Field(default_factory=lambda: [500, 502, 503])
+    rate_limit_rps: float = 0.0  # 0 disables rate limiting
+    rate_limit_burst: int = 10
+    throttle_rate: float = 0.0  # share of requests answered 429 regardless of rate
+    retry_after_seconds: float = 1.0  # Retry-After on throttled (not rate-limited) requests
+    validation_error_rate: float = 0.0  # share of creates/updates rejected with a validation error
+    validation_status: int = 422
+    case_types: List[str] = Field(default_factory=list)  # accepted caseTypeIDs; empty accepts any
+    required_fields: List[str] = Field(default_factory=list)  # content fields a create must include
+    require_if_match: bool = False  # reject updates without an If-Match header (428)
+    seed_cases: int = 0  # cases present at startup, for list benchmarks
+    seed_case_type: str = "Roche-Pathworks-Work-DPIA"
+    seed: Optional[int] = None  # seed the latency/error generator for reproducible runs
+
+def pega_error(status: int, error_id: str, message: str,
+               validation_messages: Optional[List[Dict[str, str]]] = None,
+               headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    """Error response in Pega's DX API shape (errors[0].message and ValidationMessages)"""
+    error: Dict[str, Any] = {"ID": error_id, "message": message}
+    if validation_messages:
+        error["ValidationMessages"] = validation_messages
+    return JSONResponse(status_code=status, content={"errors": [error]}, headers=headers)
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%f")[:-3] + " GMT"
+
+def _body_etag(payload: Any) -> str:
+    return '"' + hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16] + '"'
+
+class MockPegaState:
+    """In-memory cases plus configuration, random source, rate limiter and request statistics"""
+
+    def __init__(self, config: MockPegaConfig):
+        self.configure(config)
+        self.reset()
+
+    def reset(self):
+        """Drop every case and statistic, then add the configured seed cases"""
+        self.cases: Dict[str, Dict[str, Any]] = {}
+        self.versions: Dict[str, int] = {}
+        self._case_numbers = itertools.count(1001)
+        self.latencies_ms: Dict[str, List[float]] = {operation: [] for operation in PEGA_OPERATIONS}
+        self.counters = {
+            "requests": 0, "cases_created": 0, "cases_updated": 0, "errors_injected": 0,
+            "rate_limited": 0, "throttled": 0, "validation_errors": 0, "precondition_failures": 0, "not_modified": 0
+        }
+        for number in range(self.config.seed_cases):
+            case = self.add_case(self.config.seed_case_type, {"pyLabel": f"Seeded case {number + 1}"})
+            case["status"] = SEED_CASE_STATUSES[number % len(SEED_CASE_STATUSES)]
+
+    def configure(self, config: MockPegaConfig):
+        if config.latency_profile not in LATENCY_PROFILES:
+            raise ValueError(f"Unknown latency profile '{config.latency_profile}'; expected one of {LATENCY_PROFILES}")
+        unknown = (set(config.operation_latency_ms) | set(config.operation_error_rates)) - set(PEGA_OPERATIONS)
+        if unknown:
+            raise ValueError(f"Unknown operations {sorted(unknown)}; expected some of {PEGA_OPERATIONS}")
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.bucket = TokenBucket(config.rate_limit_rps, config.rate_limit_burst) if config.rate_limit_rps > 0 else None
+
+    def sample_latency(self, operation: str) -> float:
+        """Seconds to wait before answering an operation, drawn from the configured profile"""
+        config = self.config
+        return sample_latency_ms(
+            self.random, config.latency_profile, config.operation_latency_ms.get(operation, config.latency_ms),
+            config.latency_sigma, config.tail_probability, config.tail_multiplier
+        ) / 1000
+
+    async def admit(self, operation: str) -> Optional[JSONResponse]:
+        """Apply rate limiting, throttling, latency and error injection; returns an error response or None"""
+        self.counters["requests"] += 1
+        if self.bucket is not None:
+            retry_after = self.bucket.take()
+            if retry_after is not None:
+                self.counters["rate_limited"] += 1
+                return pega_error(429, "Pega_API_429", "Mock Pega rate limit exceeded",
+                                  headers={"Retry-After": f"{max(retry_after, 0.001):.3f}"})
+        if self.config.throttle_rate > 0 and self.random.random() < self.config.throttle_rate:
+            self.counters["throttled"] += 1
+            return pega_error(429, "Pega_API_429", "Mock Pega is throttling requests",
+                              headers={"Retry-After": f"{self.config.retry_after_seconds:g}"})
+
+        latency = self.sample_latency(operation)
+        if latency > 0:
+            await asyncio.sleep(latency)
+        self.latencies_ms[operation].append(latency * 1000)
+
+        error_rate = self.config.operation_error_rates.get(operation, self.config.error_rate)
+        if error_rate > 0 and self.random.random() < error_rate:
+            self.counters["errors_injected"] += 1
+            status = self.random.choice(self.config.error_statuses)
+            return pega_error(status, "Pega_API_000", f"Injected mock error ({status})")
+        return None
+
+    def validation_failure(self, messages: List[Dict[str, str]]) -> Optional[JSONResponse]:
+        """A validation error for the given messages, or a random one at validation_error_rate"""
+        if not messages and self.config.validation_error_rate > 0 and self.random.random() < self.config.validation_error_rate:
+            messages = [{"ValidationMessage": "Injected mock validation failure", "Path": ".pyLabel"}]
+        if not messages:
+            return None
+        self.counters["validation_errors"] += 1
+        return pega_error(self.config.validation_status, "Pega_API_055", "Error_Validation_Fail", messages)
+
+    def add_case(self, case_type_id: str, content: Dict[str, Any]) -> Dict[str, Any]:
+        number = next(self._case_numbers)
+        timestamp = _now()
+        case = {
+            "ID": f"{case_type_id.upper()} D-{number}",
+            "caseTypeID": case_type_id,
+            "name": content.get("pyLabel") or case_type_id.rsplit("-", 1)[-1],
+            "status": "New",
+            "stage": "Create",
+            "urgency": "10",
+            "createTime": timestamp,
+            "createdBy": "mock",
+            "lastUpdateTime": timestamp,
+            "lastUpdatedBy": "mock",
+            "content": dict(content)
+        }
+        self.cases[case["ID"]] = case
+        self.versions[case["ID"]] = 1
+        return case
+
+    def etag(self, case_id: str) -> str:
+        return f'"{self.versions[case_id]}"'
+
+    def list_page(self, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        """One page of case summaries (without content) matching status/caseTypeID"""
+        filters = {field: query[field].lower() for field in ("status", "caseTypeID") if query.get(field)}
+        summaries = [
+            {key: value for key, value in case.items() if key != "content"}
+            for case in self.cases.values()
+            if all(str(case.get(field, "")).lower() == value for field, value in filters.items())
+        ]
+        if "page" not in query and "per_page" not in query:
+            return summaries
+        per_page = max(int(query.get("per_page", 100)), 1)
+        start = (max(int(query.get("page", 1)), 1) - 1) * per_page
+        return summaries[start:start + per_page]
+
+    def percentile(self, operation: str, percentile: float) -> float:
+        samples = self.latencies_ms.get(operation) or []
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "cases": len(self.cases),
+            "operations": {
+                operation: {
+                    "requests": len(samples),
+                    "p50_ms": round(self.percentile(operation, 50), 2),
+                    "p95_ms": round(self.percentile(operation, 95), 2)
+                }
+                for operation, samples in self.latencies_ms.items() if samples
+            }
+        }
+
+def _not_found(case_id: str) -> JSONResponse:
+    return pega_error(404, "Pega_API_005", f"Case {case_id} not found")
+
+def _not_modified(state: MockPegaState, request: Request, etag: str) -> Optional[Response]:
+    if request.headers.get("If-None-Match") == etag:
+        state.counters["not_modified"] += 1
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+def create_app(config: Optional[MockPegaConfig] = None) -> FastAPI:
+    """Create the mock server; routes are served both at the root and under /prweb/api/v1"""
+    state = MockPegaState(config or create_mock_pega_config())
+    app = FastAPI(title="Mock Pega", version="1.0.0")
+    app.state.mock = state
+    router = APIRouter()
+
+    @router.post("/cases")
+    async def create_case(request: Request):
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        rejection = await state.admit(OP_CREATE_CASE)
+        if rejection is not None:
+            return rejection
+        if not isinstance(body, dict):
+            return state.validation_failure([{"ValidationMessage": "Request body must be a JSON object", "Path": "."}])
+
+        case_type_id = body.get("caseTypeID") or ""
+        content = body.get("content") or {}
+        messages = []
+        if not case_type_id:
+            messages.append({"ValidationMessage": "caseTypeID is required", "Path": ".caseTypeID"})
+        elif state.config.case_types and case_type_id not in state.config.case_types:
+            messages.append({"ValidationMessage": f"Unknown case type {case_type_id}", "Path": ".caseTypeID"})
+        messages.extend(
+            {"ValidationMessage": f"{field} is required", "Path": f".{field}"}
+            for field in state.config.required_fields if content.get(field) in (None, "")
+        )
+        failure = state.validation_failure(messages)
+        if failure is not None:
+            return failure
+
+        case = state.add_case(case_type_id, content)
+        state.counters["cases_created"] += 1
+        return JSONResponse(
+            status_code=201,
+            content={
+                "ID": case["ID"],
+                "nextAssignmentID": f"ASSIGN-WORKLIST {case['ID']}!{body.get('processID') or 'pyStartCase'}".upper(),
+                "nextPageID": "Perform",
+                "pxObjClass": "Pega-API-CaseManagement-Case"
+            },
+            headers={"ETag": state.etag(case["ID"])}
+        )
+
+    @router.get("/cases")
+    async def list_cases(request: Request):
+        rejection = await state.admit(OP_LIST_CASES)
+        if rejection is not None:
+            return rejection
+        try:
+            cases = state.list_page(dict(request.query_params))
+        except ValueError:
+            return state.validation_failure([{"ValidationMessage": "page and per_page must be integers", "Path": ".page"}])
+        if state.config.list_row_latency_ms > 0 and cases:
+            await asyncio.sleep(state.config.list_row_latency_ms * len(cases) / 1000)
+        payload = {"cases": cases}
+        etag = _body_etag(payload)
+        return _not_modified(state, request, etag) or JSONResponse(content=payload, headers={"ETag": etag})
+
+    @router.get("/cases/{case_id}")
+    async def get_case(case_id: str, request: Request):
+        rejection = await state.admit(OP_GET_CASE)
+        if rejection is not None:
+            return rejection
+        case = state.cases.get(case_id)
+        if case is None:
+            return _not_found(case_id)
+        etag = state.etag(case_id)
+        return _not_modified(state, request, etag) or JSONResponse(
+            content={**case, "actions": [{"ID": "pyUpdateCaseDetails", "name": "Edit details"}]},
+            headers={"ETag": etag}
+        )
+
+    @router.put("/cases/{case_id}")
+    async def update_case(case_id: str, request: Request):
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        rejection = await state.admit(OP_UPDATE_CASE)
+        if rejection is not None:
+            return rejection
+        case = state.cases.get(case_id)
+        if case is None:
+            return _not_found(case_id)
+
+        if_match = request.headers.get("If-Match")
+        if if_match is None and state.config.require_if_match:
+            state.counters["precondition_failures"] += 1
+            return pega_error(428, "Pega_API_428", "If-Match header is required")
+        if if_match is not None and if_match != state.etag(case_id):
+            state.counters["precondition_failures"] += 1
+            return pega_error(412, "Pega_API_412", f"Case {case_id} was changed since {if_match}")
+        if not isinstance(body, dict):
+            return state.validation_failure([{"ValidationMessage": "Request body must be a JSON object", "Path": "."}])
+        failure = state.validation_failure([])
+        if failure is not None:
+            return failure
+
+        # Accept both {"content": {...}} and a bare content object
+        content = body.get("content") if isinstance(body.get("content"), dict) else body
+        case["content"].update(content)
+        if "status" in content:
+            case["status"] = content["status"]
+        case["lastUpdateTime"] = _now()
+        state.versions[case_id] += 1
+        state.counters["cases_updated"] += 1
+        return Response(status_code=204, headers={"ETag": state.etag(case_id)})
+
+    @router.get("/cases/{case_id}/assignments")
+    async def get_assignments(case_id: str, request: Request):
+        rejection = await state.admit(OP_GET_ASSIGNMENTS)
+        if rejection is not None:
+            return rejection
+        case = state.cases.get(case_id)
+        if case is None:
+            return _not_found(case_id)
+        assignments = [] if case["status"].startswith("Resolved") else [{
+            "ID": f"ASSIGN-WORKLIST {case_id}!PYSTARTCASE",
+            "name": "Review case details",
+            "type": "Worklist",
+            "routedTo": case["createdBy"],
+            "urgency": case["urgency"],
+            "actions": [{"ID": "pyUpdateCaseDetails", "name": "Edit details"}]
+        }]
+        payload = {"assignments": assignments}
+        etag = f'"{case_id}:{state.versions[case_id]}:{len(assignments)}"'
+        return _not_modified(state, request, etag) or JSONResponse(content=payload, headers={"ETag": etag})
+
+    app.include_router(router)
+    app.include_router(router, prefix=MOCK_PEGA_PREFIX)
+
+    @app.get("/mock/config")
+    async def get_mock_config():
+        return state.config.model_dump()
+
+    @app.post("/mock/config")
+    async def update_mock_config(updates: Dict[str, Any]):
+        try:
+            state.configure(state.config.model_copy(update=updates))
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"detail": str(e)})
+        return state.config.model_dump()
+
+    @app.get("/mock/stats")
+    async def get_mock_stats():
+        return state.get_stats()
+
+    @app.post("/mock/reset")
+    async def reset_mock():
+        state.reset()
+        return state.get_stats()
+
+    return app
+
+def _json_env(name: str) -> Dict[str, float]:
+    value = os.getenv(name)
+    if not value:
+        return {}
+    try:
+        return {operation: float(setting) for operation, setting in json.loads(value).items()}
+    except (ValueError, AttributeError) as e:
+        logger.warning(f"Ignoring invalid {name}: {e}")
+        return {}
+
+def _list_env(name: str) -> List[str]:
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+def create_mock_pega_config() -> MockPegaConfig:
+    """
+    Create the mock configuration from MOCK_PEGA_* environment variables.
+    MOCK_PEGA_OPERATION_LATENCY_MS and MOCK_PEGA_OPERATION_ERROR_RATES take JSON objects keyed
+    by operation, e.g. {"create_case": 1500}.
+    """
+    seed = os.getenv("MOCK_PEGA_SEED")
+    return MockPegaConfig(
+        latency_profile=os.getenv("MOCK_PEGA_LATENCY_PROFILE", LATENCY_NONE),
+        latency_ms=float(os.getenv("MOCK_PEGA_LATENCY_MS", "0")),
+        operation_latency_ms=_json_env("MOCK_PEGA_OPERATION_LATENCY_MS"),
+        latency_sigma=float(os.getenv("MOCK_PEGA_LATENCY_SIGMA", "0.5")),
+        tail_probability=float(os.getenv("MOCK_PEGA_TAIL_PROBABILITY", "0.05")),
+        tail_multiplier=float(os.getenv("MOCK_PEGA_TAIL_MULTIPLIER", "10")),
+        list_row_latency_ms=float(os.getenv("MOCK_PEGA_LIST_ROW_LATENCY_MS", "0")),
+        error_rate=float(os.getenv("MOCK_PEGA_ERROR_RATE", "0")),
+        operation_error_rates=_json_env("MOCK_PEGA_OPERATION_ERROR_RATES"),
+        rate_limit_rps=float(os.getenv("MOCK_PEGA_RATE_LIMIT_RPS", "0")),
+        rate_limit_burst=int(os.getenv("MOCK_PEGA_RATE_LIMIT_BURST", "10")),
+        throttle_rate=float(os.getenv("MOCK_PEGA_THROTTLE_RATE", "0")),
+        retry_after_seconds=float(os.getenv("MOCK_PEGA_RETRY_AFTER_SECONDS", "1")),
+        validation_error_rate=float(os.getenv("MOCK_PEGA_VALIDATION_ERROR_RATE", "0")),
+        validation_status=int(os.getenv("MOCK_PEGA_VALIDATION_STATUS", "422")),
+        case_types=_list_env("MOCK_PEGA_CASE_TYPES"),
+        required_fields=_list_env("MOCK_PEGA_REQUIRED_FIELDS"),
+        require_if_match=os.getenv("MOCK_PEGA_REQUIRE_IF_MATCH", "false").lower() == "true",
+        seed_cases=int(os.getenv("MOCK_PEGA_SEED_CASES", "0")),
+        seed=int(seed) if seed else None
+    )
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a local Pega stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--latency-profile", choices=LATENCY_PROFILES)
+    parser.add_argument("--latency-ms", type=float)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--rate-limit-rps", type=float)
+    parser.add_argument("--throttle-rate", type=float)
+    parser.add_argument("--validation-error-rate", type=float)
+    parser.add_argument("--seed-cases", type=int)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    overrides = {
+        key: value for key, value in {
+            "latency_profile": args.latency_profile,
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+            "rate_limit_rps": args.rate_limit_rps,
+            "throttle_rate": args.throttle_rate,
+            "validation_error_rate": args.validation_error_rate,
+            "seed_cases": args.seed_cases,
+            "seed": args.seed
+        }.items() if value is not None
+    }
+    config = create_mock_pega_config().model_copy(update=overrides)
+
+    logging.basicConfig(level=logging.INFO)
+    logger.info(
+        f"🧪 Mock Pega on http://{args.host}:{args.port}{MOCK_PEGA_PREFIX} "
+        f"({config.latency_profile} latency, {config.error_rate:.0%} errors, {config.seed_cases} seeded cases)"
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Read-through cache for Pega case reads
+Fresh entries are served without a round trip; expired entries are revalidated with
+If-None-Match / If-Modified-Since when Pega sent an ETag or Last-Modified, and our own
+creates and updates invalidate the entries they make stale
+"""
+
+import os
+import json
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import httpx
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# Cached Pega resources, each with its own TTL
+RESOURCE_CASE = "case"
+RESOURCE_CASE_LIST = "case_list"
+RESOURCE_ASSIGNMENTS = "assignments"
+
+# How a read was answered (also set as response.extensions["pega_cache"])
+CACHE_HIT = "hit"
+CACHE_REVALIDATED = "revalidated"
+CACHE_MISS = "miss"
+
+# Describe the original encoded body; the cache stores the decoded content
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+def _default_ttls() -> Dict[str, float]:
+    """Case lists change whenever anyone creates a case, so they expire soonest"""
+    return {RESOURCE_CASE: 30.0, RESOURCE_CASE_LIST: 10.0, RESOURCE_ASSIGNMENTS: 15.0}
+
+class PegaCacheConfig(BaseModel):
+    """Which Pega reads are cached and for how long"""
+    enabled: bool = True
+    max_entries: int = 512
+    ttl_seconds: Dict[str, float] = Field(default_factory=_default_ttls)
+
+class CachedPegaResponse(BaseModel):
+    """A successful Pega GET response and its validators"""
+    resource: str
+    path: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+def _resource_stats() -> Dict[str, int]:
+    return {CACHE_HIT: 0, CACHE_REVALIDATED: 0, CACHE_MISS: 0}
+
+class PegaReadCache:
+    """
+    LRU of Pega GET responses keyed by path and query parameters. Expired entries are kept
+    (until evicted) so their validators can turn the next fetch into a 304.
+    """
+
+    def __init__(self, config: Optional[PegaCacheConfig] = None):
+        self.config = config or PegaCacheConfig()
+        self._entries: "OrderedDict[str, CachedPegaResponse]" = OrderedDict()
+        self._stats = {resource: _resource_stats() for resource in _default_ttls()}
+        self._evictions = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def make_key(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key from the request path and its (order-independent) query parameters"""
+        return f"{path}?{json.dumps(params or {}, sort_keys=True, default=str)}"
+
+    def lookup(self, key: str) -> Optional[CachedPegaResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def is_fresh(entry: CachedPegaResponse) -> bool:
+        return entry.expires_at > time.time()
+
+    @staticmethod
+    def validators(entry: Optional[CachedPegaResponse]) -> Optional[Dict[str, str]]:
+        """Conditional request headers for revalidating an expired entry"""
+        if entry is None:
+            return None
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers or None
+
+    def store(self, resource: str, key: str, path: str, response: httpx.Response) -> CachedPegaResponse:
+        """Cache a successful response"""
+        entry = CachedPegaResponse(
+            resource=resource,
+            path=path,
+            status_code=response.status_code,
+            headers={name: value for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS},
+            content=response.content,
+            expires_at=time.time() + self.ttl_for(resource),
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified")
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.config.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+        return entry
+
+    def revalidated(self, entry: CachedPegaResponse, response: httpx.Response) -> CachedPegaResponse:
+        """Pega answered 304: keep the cached body and restart its TTL"""
+        entry.expires_at = time.time() + self.ttl_for(entry.resource)
+        entry.etag = response.headers.get("etag", entry.etag)
+        entry.last_modified = response.headers.get("last-modified", entry.last_modified)
+        return entry
+
+    def ttl_for(self, resource: str) -> float:
+        return self.config.ttl_seconds.get(resource, 0.0)
+
+    def record(self, resource: str, outcome: str):
+        self._stats.setdefault(resource, _resource_stats())[outcome] += 1
+
+    @staticmethod
+    def to_response(entry: CachedPegaResponse, request: httpx.Request, outcome: str) -> httpx.Response:
+        """Rebuild an httpx.Response from a cached entry so callers can't tell the difference"""
+        return httpx.Response(
+            entry.status_code,
+            headers=entry.headers,
+            content=entry.content,
+            request=request,
+            extensions={"pega_cache": outcome}
+        )
+
+    def invalidate_case(self, case_id: str) -> int:
+        """Drop a case, its assignments and every case list"""
+        case_path = f"/cases/{case_id}"
+        return self._remove(lambda entry: entry.resource == RESOURCE_CASE_LIST
+                            or entry.path == case_path or entry.path.startswith(case_path + "/"))
+
+    def invalidate_lists(self) -> int:
+        """Drop every cached case list (a case was created)"""
+        return self._remove(lambda entry: entry.resource == RESOURCE_CASE_LIST)
+
+    def clear(self) -> int:
+        return self._remove(lambda entry: True)
+
+    def _remove(self, predicate) -> int:
+        stale = [key for key, entry in self._entries.items() if predicate(entry)]
+        for key in stale:
+            del self._entries[key]
+        self._invalidations += len(stale)
+        return len(stale)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rates per resource; revalidations still cost a (body-less) round trip"""
+        resources = {}
+        for resource, counts in self._stats.items():
+            lookups = sum(counts.values())
+            resources[resource] = {
+                **counts,
+                "hit_ratio": round((counts[CACHE_HIT] + counts[CACHE_REVALIDATED]) / lookups, 3) if lookups else 0.0,
+                "round_trips_avoided_ratio": round(counts[CACHE_HIT] / lookups, 3) if lookups else 0.0
+            }
+        return {
+            "enabled": self.config.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.config.max_entries,
+            "ttl_seconds": self.config.ttl_seconds,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations,
+            "resources": resources
+        }
+
+def create_pega_cache_config() -> PegaCacheConfig:
+    """
+    Create the Pega read cache configuration from environment variables
+    """
+    return PegaCacheConfig(
+        enabled=os.getenv("PEGA_CACHE_ENABLED", "true").lower() == "true",
+        max_entries=int(os.getenv("PEGA_CACHE_MAX_ENTRIES", "512")),
+        ttl_seconds={
+            RESOURCE_CASE: float(os.getenv("PEGA_CACHE_CASE_TTL", "30")),
+            RESOURCE_CASE_LIST: float(os.getenv("PEGA_CACHE_LIST_TTL", "10")),
+            RESOURCE_ASSIGNMENTS: float(os.getenv("PEGA_CACHE_ASSIGNMENTS_TTL", "15"))
+        }
+    )
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Shared async Pega client
+One pooled httpx.AsyncClient (keepalive, per-operation timeouts) for every Pega call, and a
+synchronous facade over it for the command-line scripts
+"""
+
+import os
+import time
+import json
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import httpx
+from pydantic import BaseModel, Field
+
+from pega_cache import (
+    CACHE_HIT, CACHE_MISS, CACHE_REVALIDATED, RESOURCE_ASSIGNMENTS, RESOURCE_CASE, RESOURCE_CASE_LIST,
+    PegaCacheConfig, PegaReadCache, create_pega_cache_config
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_PEGA_BASE_URL = "https://roche-gtech-dt1.pegacloud.net/prweb/api/v1"
+
+# Pega operations, each with its own timeouts
+OP_CREATE_CASE = "create_case"
+OP_GET_CASE = "get_case"
+OP_LIST_CASES = "list_cases"
+OP_UPDATE_CASE = "update_case"
+OP_GET_ASSIGNMENTS = "get_assignments"
+PEGA_OPERATIONS = (OP_CREATE_CASE, OP_GET_CASE, OP_LIST_CASES, OP_UPDATE_CASE, OP_GET_ASSIGNMENTS)
+
+class PegaTimeouts(BaseModel):
+    """Timeouts (in seconds) applied to one Pega operation"""
+    connect: float = 5.0
+    read: float = 15.0
+    write: float = 10.0
+    pool: float = 5.0
+
+    def to_httpx(self) -> httpx.Timeout:
+        return httpx.Timeout(connect=self.connect, read=self.read, write=self.write, pool=self.pool)
+
+def _default_operation_timeouts() -> Dict[str, PegaTimeouts]:
+    """Case creation and updates run Pega flows and can be slow; reads should fail fast"""
+    return {
+        OP_CREATE_CASE: PegaTimeouts(connect=5.0, read=30.0, write=10.0, pool=5.0),
+        OP_UPDATE_CASE: PegaTimeouts(connect=5.0, read=30.0, write=10.0, pool=5.0),
+        OP_GET_CASE: PegaTimeouts(connect=3.0, read=10.0, write=5.0, pool=2.0),
+        OP_LIST_CASES: PegaTimeouts(connect=3.0, read=15.0, write=5.0, pool=2.0),
+        OP_GET_ASSIGNMENTS: PegaTimeouts(connect=3.0, read=10.0, write=5.0, pool=2.0),
+    }
+
+class PegaConfig(BaseModel):
+    """Pega endpoint, credentials, connection pool and timeout settings"""
+    base_url: str = DEFAULT_PEGA_BASE_URL
+    username: str = ""
+    password: str = ""
+    verify_ssl: bool = True
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    default_timeouts: PegaTimeouts = Field(default_factory=PegaTimeouts)
+    operation_timeouts: Dict[str, PegaTimeouts] = Field(default_factory=_default_operation_timeouts)
+    cache: PegaCacheConfig = Field(default_factory=PegaCacheConfig)
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def timeout_for(self, operation: str) -> httpx.Timeout:
+        """Get the httpx timeout for an operation, falling back to the defaults"""
+        return self.operation_timeouts.get(operation, self.default_timeouts).to_httpx()
+
+def pega_error_message(response: httpx.Response) -> str:
+    """Readable error from a failed Pega response, including the first validation message"""
+    try:
+        error_data = response.json()
+        if "errors" in error_data:
+            error_details = error_data["errors"][0].get("message", "")
+            validation_messages = error_data["errors"][0].get("ValidationMessages", [])
+            if validation_messages:
+                error_details += " - " + validation_messages[0].get("ValidationMessage", "")
+            return error_details
+    except (ValueError, AttributeError, IndexError, TypeError):
+        pass
+    return response.text or f"Pega request failed with status {response.status_code}"
+
+def case_page_items(body: Any) -> List[Dict[str, Any]]:
+    """Cases in one page of a Pega case list (a bare list, or under cases / data / pxResults)"""
+    if isinstance(body, list):
+        return body
+    if isinstance(body, dict):
+        for key in ("cases", "data", "pxResults"):
+            if isinstance(body.get(key), list):
+                return body[key]
+    return []
+
+def case_matches(case: Dict[str, Any], filters: Optional[Dict[str, str]]) -> bool:
+    """Case-insensitive equality on every given filter (e.g. status, caseTypeID)"""
+    return all(str(case.get(field, "")).lower() == str(value).lower() for field, value in (filters or {}).items() if value)
+
+def _operation_stats() -> Dict[str, Any]:
+    return {"requests": 0, "errors": 0, "timeouts": 0, "total_latency_ms": 0.0, "max_latency_ms": 0.0}
+
+class PegaClient:
+    """
+    Async Pega API client. Methods return the httpx.Response so callers keep their own status
+    handling; network failures and timeouts raise httpx.HTTPError. Case, case list and
+    assignment reads go through a read-through cache that our own writes invalidate.
+    """
+
+    def __init__(self, config: PegaConfig, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.config = config
+        self.client = httpx.AsyncClient(
+            base_url=config.base_url,
+            auth=httpx.BasicAuth(config.username, config.password),
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+            limits=config.limits(),
+            verify=config.verify_ssl,
+            timeout=config.default_timeouts.to_httpx(),
+            transport=transport
+        )
+        self._stats = {operation: _operation_stats() for operation in PEGA_OPERATIONS}
+        self.cache = PegaReadCache(config.cache) if config.cache.enabled else None
+        logger.info(f"Pega client initialized for {config.base_url}")
+
+    async def request(self, operation: str, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send one request with the operation's timeouts and record its latency"""
+        stats = self._stats.setdefault(operation, _operation_stats())
+        stats["requests"] += 1
+        start_time = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, timeout=self.config.timeout_for(operation), **kwargs)
+            if response.status_code >= 400:
+                stats["errors"] += 1
+            return response
+        except httpx.TimeoutException:
+            stats["timeouts"] += 1
+            stats["errors"] += 1
+            raise
+        except httpx.HTTPError:
+            stats["errors"] += 1
+            raise
+        finally:
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            stats["total_latency_ms"] += latency_ms
+            stats["max_latency_ms"] = max(stats["max_latency_ms"], latency_ms)
+
+    async def cached_get(self, operation: str, resource: str, path: str,
+                         params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """
+        GET through the read cache: a fresh entry is returned without a round trip, an expired
+        one is revalidated, and only 200 responses are stored
+        """
+        if self.cache is None:
+            return await self.request(operation, "GET", path, params=params)
+
+        key = self.cache.make_key(path, params)
+        entry = self.cache.lookup(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record(resource, CACHE_HIT)
+            return self.cache.to_response(entry, self.client.build_request("GET", path, params=params), CACHE_HIT)
+
+        response = await self.request(operation, "GET", path, params=params, headers=self.cache.validators(entry))
+        if response.status_code == 304 and entry is not None:
+            self.cache.record(resource, CACHE_REVALIDATED)
+            return self.cache.to_response(self.cache.revalidated(entry, response), response.request, CACHE_REVALIDATED)
+
+        self.cache.record(resource, CACHE_MISS)
+        if response.status_code == 200:
+            self.cache.store(resource, key, path, response)
+        response.extensions["pega_cache"] = CACHE_MISS
+        return response
+
+    async def create_case(self, payload: Dict[str, Any]) -> httpx.Response:
+        response = await self.request(OP_CREATE_CASE, "POST", "/cases", json=payload)
+        if self.cache is not None and response.status_code < 400:
+            self.cache.invalidate_lists()
+        return response
+
+    async def get_case(self, case_id: str) -> httpx.Response:
+        return await self.cached_get(OP_GET_CASE, RESOURCE_CASE, f"/cases/{case_id}")
+
+    async def list_cases(self, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        return await self.cached_get(OP_LIST_CASES, RESOURCE_CASE_LIST, "/cases", params=params)
+
+    async def update_case(self, case_id: str, payload: Dict[str, Any], etag: Optional[str] = None) -> httpx.Response:
+        headers = {"If-Match": etag} if etag else None
+        try:
+            return await self.request(OP_UPDATE_CASE, "PUT", f"/cases/{case_id}", json=payload, headers=headers)
+        finally:
+            # Even a failed or timed-out update may have changed the case (or shown our copy is stale)
+            if self.cache is not None:
+                self.cache.invalidate_case(case_id)
+
+    async def get_assignments(self, case_id: str) -> httpx.Response:
+        return await self.cached_get(OP_GET_ASSIGNMENTS, RESOURCE_ASSIGNMENTS, f"/cases/{case_id}/assignments")
+
+    async def _fetch_case_page(self, params: Dict[str, Any], page: int, per_page: int) -> List[Dict[str, Any]]:
+        """One page of the case list, uncached so a full walk does not evict hot entries"""
+        response = await self.request(OP_LIST_CASES, "GET", "/cases", params={**params, "page": page, "per_page": per_page})
+        response.raise_for_status()
+        return case_page_items(response.json())
+
+    async def iter_case_pages(self,
+                              params: Optional[Dict[str, Any]] = None,
+                              per_page: int = 100,
+                              prefetch: bool = True,
+                              max_pages: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Walk every page of the case list. With prefetch, page N+1 is requested as soon as page N
+        arrives, so it downloads while the caller consumes page N. A short page ends the walk.
+        """
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        page = 1
+        next_page = asyncio.ensure_future(self._fetch_case_page(params, page, per_page))
+        try:
+            while next_page is not None:
+                items = await next_page
+                next_page = None
+                has_more = len(items) >= per_page and (max_pages is None or page < max_pages)
+                if has_more and prefetch:
+                    next_page = asyncio.ensure_future(self._fetch_case_page(params, page + 1, per_page))
+                if items:
+                    yield items
+                if not has_more:
+                    return
+                page += 1
+                if next_page is None:
+                    next_page = asyncio.ensure_future(self._fetch_case_page(params, page, per_page))
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+    async def iter_cases(self,
+                         filters: Optional[Dict[str, str]] = None,
+                         per_page: int = 100,
+                         prefetch: bool = True,
+                         max_pages: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Every case across all pages matching the filters. Filters are sent to Pega and applied
+        again here, since not every Pega case list honours them.
+        """
+        async for items in self.iter_case_pages(filters, per_page, prefetch, max_pages):
+            for case in items:
+                if case_matches(case, filters):
+                    yield case
+
+    def invalidate_cache(self, case_id: Optional[str] = None) -> int:
+        """Drop cached reads for one case (and all case lists), or everything"""
+        if self.cache is None:
+            return 0
+        return self.cache.invalidate_case(case_id) if case_id else self.cache.clear()
+
+    def case_url(self, case_id: str) -> str:
+        return f"{self.config.base_url}/cases/{case_id}"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-operation request counts and latencies"""
+        return {
+            "base_url": self.config.base_url,
+            "operations": {
+                operation: {
+                    **{key: round(value, 2) if isinstance(value, float) else value for key, value in stats.items()},
+                    "avg_latency_ms": round(stats["total_latency_ms"] / stats["requests"], 2) if stats["requests"] else 0.0
+                }
+                for operation, stats in self._stats.items()
+            },
+            "cache": self.cache.get_stats() if self.cache is not None else {"enabled": False}
+        }
+
+    async def close(self):
+        await self.client.aclose()
+
+class SyncPegaClient:
+    """
+    Blocking facade over PegaClient for command-line scripts. The async client runs on a private
+    event loop, so its connection pool is reused across calls. Not for use inside a running loop.
+    """
+
+    def __init__(self, config: Optional[PegaConfig] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._loop = asyncio.new_event_loop()
+        self._client = PegaClient(config or create_pega_config(), transport=transport)
+
+    @property
+    def config(self) -> PegaConfig:
+        return self._client.config
+
+    def _run(self, call: Callable[[], Awaitable[T]]) -> T:
+        return self._loop.run_until_complete(call())
+
+    def create_case(self, payload: Dict[str, Any]) -> httpx.Response:
+        return self._run(lambda: self._client.create_case(payload))
+
+    def get_case(self, case_id: str) -> httpx.Response:
+        return self._run(lambda: self._client.get_case(case_id))
+
+    def list_cases(self, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        return self._run(lambda: self._client.list_cases(params))
+
+    def update_case(self, case_id: str, payload: Dict[str, Any], etag: Optional[str] = None) -> httpx.Response:
+        return self._run(lambda: self._client.update_case(case_id, payload, etag))
+
+    def get_assignments(self, case_id: str) -> httpx.Response:
+        return self._run(lambda: self._client.get_assignments(case_id))
+
+    def invalidate_cache(self, case_id: Optional[str] = None) -> int:
+        return self._client.invalidate_cache(case_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self._client.get_stats()
+
+    def close(self):
+        if not self._loop.is_closed():
+            self._run(self._client.close)
+            self._loop.close()
+
+    def __enter__(self) -> "SyncPegaClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def create_pega_config() -> PegaConfig:
+    """
+    Create the Pega client configuration from environment variables.
+    PEGA_OPERATION_TIMEOUTS takes a JSON object keyed by operation, e.g.
+    {"create_case": {"read": 60}}, merged over the built-in defaults.
+    """
+    operation_timeouts = _default_operation_timeouts()
+    overrides = os.getenv("PEGA_OPERATION_TIMEOUTS")
+    if overrides:
+        try:
+            for operation, values in json.loads(overrides).items():
+                base = operation_timeouts.get(operation, PegaTimeouts())
+                operation_timeouts[operation] = base.model_copy(update=values)
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring invalid PEGA_OPERATION_TIMEOUTS: {e}")
+
+    return PegaConfig(
+        base_url=os.getenv("PEGA_BASE_URL", DEFAULT_PEGA_BASE_URL),
+        username=os.getenv("PEGA_USERNAME", "nadadhub"),
+        password=os.getenv("PEGA_PASSWORD", "Pwrm*2025"),
+        verify_ssl=os.getenv("PEGA_VERIFY_SSL", "true").lower() == "true",
+        max_connections=int(os.getenv("PEGA_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("PEGA_MAX_KEEPALIVE_CONNECTIONS", "10")),
+        keepalive_expiry=float(os.getenv("PEGA_KEEPALIVE_EXPIRY", "30")),
+        operation_timeouts=operation_timeouts,
+        cache=create_pega_cache_config()
+    )
+
+# Shared client for the API servers (created on first use, inside their event loop)
+_pega_client_instance: Optional[PegaClient] = None
+
+def pega_client() -> PegaClient:
+    """Get the shared Pega client (lazy loading)"""
+    global _pega_client_instance
+    if _pega_client_instance is None:
+        _pega_client_instance = PegaClient(create_pega_config())
+    return _pega_client_instance
+
+async def close_pega_client():
+    """Close the shared Pega client's connections"""
+    global _pega_client_instance
+    if _pega_client_instance is not None:
+        await _pega_client_instance.close()
+        _pega_client_instance = None
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Token-budget-aware prompt assembly
+Estimates token counts locally and trims long research texts to fit the model's context window
+"""
+
+import math
+import re
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Trim strategies reported in TrimReport.strategy
+TRIM_NONE = "none"  # the text fit as-is
+TRIM_SELECTED = "relevance_selection"  # whole sections were kept in order of DPIA relevance
+TRIM_TRUNCATED = "truncated"  # not even one section fit, so the text was cut
+
+OMISSION_MARKER = "[...]"
+
+# Cues for the fields the analysis extracts; sections mentioning them are kept first
+DPIA_RELEVANCE_TERMS = (
+    "pi ", "principal investigator", "pathologist", "investigator", "project", "title", "purpose",
+    "aim", "objective", "therapeutic", "oncology", "immunology", "neuro", "ophthalm", "pulmon",
+    "stain", "assay", "antibody", "marker", "dapi", "h&e", "ihc", "fluoresc", "brightfield",
+    "tissue", "slide", "section", "biopsy", "specimen", "biospecimen", "sample", "scan",
+    "microscop", "imaging", "quantif", "patient", "human", "donor", "sensitive", "transfer",
+    "volume", "calm", "dpia"
+)
+
+class PromptBudgetConfig(BaseModel):
+    """Context window and budget split used when assembling prompts"""
+    context_window: int = 16000  # total tokens the model accepts (prompt + completion)
+    safety_margin: int = 256  # slack for estimation error and chat message framing
+    chars_per_token: float = 4.0  # local estimate; English prose averages about 4 characters per token
+    reference_context_share: float = 0.25  # share of the input budget reference context may use
+
+class TrimReport(BaseModel):
+    """What was kept from one input so the prompt fits its budget"""
+    budget_tokens: int
+    original_tokens: int
+    kept_tokens: int
+    sections_total: int
+    sections_kept: int
+    trimmed: bool
+    strategy: str = TRIM_NONE
+
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """
+    Cheap local token estimate; the larger of a character-based and a word-based count,
+    so dense technical text (short words, symbols) is not underestimated
+    """
+    if not text:
+        return 0
+    by_chars = len(text) / chars_per_token
+    by_words = len(text.split()) * 4 / 3
+    return int(math.ceil(max(by_chars, by_words)))
+
+def split_sections(text: str) -> List[str]:
+    """Split text into paragraphs, or sentences when there are no blank lines"""
+    sections = [part.strip() for part in re.split(r"\n\s*\n", text) if part.strip()]
+    if len(sections) <= 1:
+        sections = [part.strip() for part in re.split(r"(?<=[.!?])\s+|\n+", text) if part.strip()]
+    return sections
+
+def _split_oversized(sections: List[str], max_tokens: int, chars_per_token: float) -> List[str]:
+    """Break sections larger than max_tokens into sentences, then into fixed-size chunks"""
+    result: List[str] = []
+    max_chars = max(int(max_tokens * chars_per_token), 1)
+    for section in sections:
+        if estimate_tokens(section, chars_per_token) <= max_tokens:
+            result.append(section)
+            continue
+        for sentence in re.split(r"(?<=[.!?])\s+|\n+", section):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if estimate_tokens(sentence, chars_per_token) <= max_tokens:
+                result.append(sentence)
+            else:
+                result.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+    return result
+
+def truncate_text(text: str, budget_tokens: int, chars_per_token: float = 4.0) -> str:
+    """Cut text so its estimate fits budget_tokens, marking the cut"""
+    if estimate_tokens(text, chars_per_token) <= budget_tokens:
+        return text
+    max_chars = int(budget_tokens * chars_per_token) - len(OMISSION_MARKER) - 1
+    while max_chars > 0:
+        truncated = f"{text[:max_chars].rstrip()} {OMISSION_MARKER}"
+        if estimate_tokens(truncated, chars_per_token) <= budget_tokens:
+            return truncated
+        # Dense text (short words) is estimated by word count, so cut further
+        max_chars = int(max_chars * 0.9)
+    return ""
+
+def relevance_score(section: str, terms: Sequence[str] = DPIA_RELEVANCE_TERMS) -> int:
+    """Number of DPIA field cues mentioned in a section"""
+    lowered = f" {section.lower()} "
+    return sum(1 for term in terms if term in lowered)
+
+def fit_text(text: str,
+             budget_tokens: int,
+             chars_per_token: float = 4.0,
+             terms: Sequence[str] = DPIA_RELEVANCE_TERMS) -> Tuple[str, TrimReport]:
+    """
+    Fit text into budget_tokens.
+
+    The first section (usually the title or aim) is kept when it fits, then the
+    remaining sections in order of relevance score. Kept sections stay in their
+    original order, with an omission marker wherever sections were dropped.
+    """
+    budget_tokens = max(budget_tokens, 0)
+    original_tokens = estimate_tokens(text, chars_per_token)
+    sections = split_sections(text)
+    if original_tokens <= budget_tokens:
+        return text, TrimReport(
+            budget_tokens=budget_tokens,
+            original_tokens=original_tokens,
+            kept_tokens=original_tokens,
+            sections_total=len(sections),
+            sections_kept=len(sections),
+            trimmed=False
+        )
+
+    # No single section may take more than half the budget, so selection has something to choose from
+    sections = _split_oversized(sections, max(budget_tokens // 2, 1), chars_per_token)
+    costs = [estimate_tokens(section, chars_per_token) + 1 for section in sections]
+    marker_cost = estimate_tokens(OMISSION_MARKER, chars_per_token) + 1
+    order = [0] + sorted(range(1, len(sections)), key=lambda i: (-relevance_score(sections[i], terms), i))
+    kept: List[int] = []
+    used = 0
+    for index in order:
+        # Reserve room for one omission marker per kept section in the worst case
+        if used + costs[index] + marker_cost <= budget_tokens:
+            kept.append(index)
+            used += costs[index] + marker_cost
+
+    if not kept:
+        truncated = truncate_text(text, budget_tokens, chars_per_token)
+        return truncated, TrimReport(
+            budget_tokens=budget_tokens,
+            original_tokens=original_tokens,
+            kept_tokens=estimate_tokens(truncated, chars_per_token),
+            sections_total=len(sections),
+            sections_kept=0,
+            trimmed=True,
+            strategy=TRIM_TRUNCATED
+        )
+
+    parts: List[str] = []
+    previous = -1
+    for index in sorted(kept):
+        if index != previous + 1:
+            parts.append(OMISSION_MARKER)
+        parts.append(sections[index])
+        previous = index
+    if previous != len(sections) - 1:
+        parts.append(OMISSION_MARKER)
+    fitted = "\n\n".join(parts)
+
+    return fitted, TrimReport(
+        budget_tokens=budget_tokens,
+        original_tokens=original_tokens,
+        kept_tokens=estimate_tokens(fitted, chars_per_token),
+        sections_total=len(sections),
+        sections_kept=len(kept),
+        trimmed=True,
+        strategy=TRIM_SELECTED
+    )
+
+def input_budget(config: PromptBudgetConfig, output_reserve: int, fixed_prompt_tokens: int) -> int:
+    """Tokens left for variable inputs after the fixed prompt, the output reserve and the safety margin"""
+    return max(config.context_window - output_reserve - config.safety_margin - fixed_prompt_tokens, 0)
+
+def format_reference_context(context_data: Optional[Dict[str, Any]]) -> str:
+    """Render the reference context and analysis guidelines as one prompt section"""
+    if not context_data:
+        return ""
+    parts = []
+    if context_data.get("reference_context"):
+        parts.append(f"Reference context:\n{context_data['reference_context']}")
+    if context_data.get("analysis_guidelines"):
+        parts.append(f"Analysis guidelines:\n{context_data['analysis_guidelines']}")
+    return "\n\n".join(parts)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Single-flight request coalescing
+Concurrent callers with the same key share one in-flight call instead of each making their own
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """
+    Deduplicate concurrent async calls by key.
+
+    The first caller starts the shared task; later callers with the same key await it.
+    Each caller waits through asyncio.shield, so one caller disconnecting does not
+    cancel the work for everyone else. The shared task is cancelled only when every
+    caller waiting on it has gone away.
+    """
+
+    def __init__(self, name: str = "single_flight"):
+        self.name = name
+        self._tasks: Dict[str, "asyncio.Task[Any]"] = {}
+        self._waiters: Dict[str, int] = {}
+        self._stats = {
+            "upstream_calls": 0,
+            "coalesced_calls": 0,
+            "cancelled_flights": 0
+        }
+
+    async def run(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run func() for this key, or join the call already in flight"""
+        task = self._tasks.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda finished, key=key: self._forget(key, finished))
+            self._stats["upstream_calls"] += 1
+        else:
+            self._stats["coalesced_calls"] += 1
+            logger.info(f"{self.name}: joined in-flight call ({self._waiters.get(key, 0)} other waiter(s))")
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._tasks.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] <= 0 and not task.done():
+                    # Nobody is left to receive the result
+                    task.cancel()
+                    self._stats["cancelled_flights"] += 1
+                    logger.info(f"{self.name}: cancelled in-flight call after all callers went away")
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently in flight"""
+        return len(self._tasks)
+
+    def stats(self) -> Dict[str, Any]:
+        """Upstream calls made, calls saved by coalescing and abandoned flights"""
+        return {**self._stats, "in_flight": self.in_flight()}
+
+    def _forget(self, key: str, finished: "asyncio.Task[Any]"):
+        if self._tasks.get(key) is finished:
+            del self._tasks[key]
+            self._waiters.pop(key, None)
+        if not finished.cancelled():
+            # Mark the exception as retrieved when every waiter has already left
+            finished.exception()
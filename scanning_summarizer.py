@@ -125,18 +125,22 @@ class ScanningRequestSummarizer:
             "stain"
         ]
     
-    def detect_therapeutic_area(self, text: str) -> str:
-        """Detect therapeutic area from text based on keywords"""
+    def keyword_scores(self, text: str, categories: Dict[str, List[str]]) -> Dict[str, int]:
+        """Count whole-word keyword occurrences for each category"""
         text_lower = text.lower()
-        
-        # Count matches for each therapeutic area
-        area_scores = {}
-        for area, keywords in self.therapeutic_areas.items():
+        scores = {}
+        for category, keywords in categories.items():
             score = 0
             for keyword in keywords:
                 # Count occurrences of each keyword
                 score += len(re.findall(rf'\b{re.escape(keyword)}\b', text_lower))
-            area_scores[area] = score
+            scores[category] = score
+        return scores
+    
+    def detect_therapeutic_area(self, text: str) -> str:
+        """Detect therapeutic area from text based on keywords"""
+        # Count matches for each therapeutic area
+        area_scores = self.keyword_scores(text, self.therapeutic_areas)
         
         # Find the area with highest score
         max_score = max(area_scores.values())
@@ -182,16 +186,8 @@ class ScanningRequestSummarizer:
 
     def detect_procedure(self, text: str) -> str:
         """Detect procedure type from text based on keywords"""
-        text_lower = text.lower()
-        
         # Count matches for each procedure type
-        procedure_scores = {}
-        for procedure, keywords in self.procedures.items():
-            score = 0
-            for keyword in keywords:
-                # Count occurrences of each keyword
-                score += len(re.findall(rf'\b{re.escape(keyword)}\b', text_lower))
-            procedure_scores[procedure] = score
+        procedure_scores = self.keyword_scores(text, self.procedures)
         
         # Check for combined procedures (BF+IF gets priority if both are found)
         bf_score = procedure_scores.get("Bright-field (BF)", 0)
@@ -249,13 +245,7 @@ class ScanningRequestSummarizer:
         text_lower = text.lower()
         
         # Count matches for each assay/staining type
-        staining_scores = {}
-        for staining_type, keywords in self.assay_staining_types.items():
-            score = 0
-            for keyword in keywords:
-                # Count occurrences of each keyword
-                score += len(re.findall(rf'\b{re.escape(keyword)}\b', text_lower))
-            staining_scores[staining_type] = score
+        staining_scores = self.keyword_scores(text, self.assay_staining_types)
         
         # Find the staining type with highest score
         max_score = max(staining_scores.values())
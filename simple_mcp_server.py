@@ -9,8 +9,7 @@ import json
 import sys
 import os
 import asyncio
-import base64
-import requests
+import httpx
 from typing import Dict, Any, List
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
@@ -21,21 +20,22 @@ from datetime import datetime
 
 # Import our scanning summarizer
 from scanning_summarizer import ScanningRequestSummarizer
+from pega_client import DEFAULT_PEGA_BASE_URL, close_pega_client, pega_client
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
-# Pega Configuration
-PEGA_BASE_URL = os.getenv("PEGA_BASE_URL", "https://roche-gtech-dt1.pegacloud.net/prweb/api/v1")
-PEGA_USERNAME = os.getenv("PEGA_USERNAME", "nadadhub")
-PEGA_PASSWORD = os.getenv("PEGA_PASSWORD", "Pwrm*2025")
-
-# Basic auth header
-BASIC_AUTH = base64.b64encode(f"{PEGA_USERNAME}:{PEGA_PASSWORD}".encode()).decode()
+# Pega Configuration (credentials, pooling and timeouts live in pega_client)
+PEGA_BASE_URL = os.getenv("PEGA_BASE_URL", DEFAULT_PEGA_BASE_URL)
 
 app = FastAPI(title="Pega DPIA Analysis MCP Server", version="2.0.0")
 
+@app.on_event("shutdown")
+async def close_pega_connections():
+    """Close pooled Pega connections"""
+    await close_pega_client()
+
 # MCP Protocol Models
 class Tool(BaseModel):
     name: str
@@ -213,11 +213,6 @@ async def call_tool(tool_call: ToolCall):
 
 async def create_case(arguments: Dict[str, Any]) -> Dict[str, Any]:
     """Create a new Pega case"""
-    headers = {
-        "Authorization": f"Basic {BASIC_AUTH}",
-        "Content-Type": "application/json"
-    }
-    
     case_type_id = arguments.get("caseTypeID", "Roche-Pathworks-Work-DPIA")
     process_id = arguments.get("processID", "pyStartCase")
     content = arguments.get("content", {})
@@ -228,42 +223,28 @@ async def create_case(arguments: Dict[str, Any]) -> Dict[str, Any]:
         "content": content
     }
     
-    url = f"{PEGA_BASE_URL}/cases"
-    
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        response = await pega_client().create_case(payload)
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise Exception(f"Failed to create case: {str(e)}")
 
 async def get_case(arguments: Dict[str, Any]) -> Dict[str, Any]:
     """Get a specific Pega case"""
-    headers = {
-        "Authorization": f"Basic {BASIC_AUTH}",
-        "Content-Type": "application/json"
-    }
-    
     case_id = arguments.get("case_id")
     if not case_id:
         raise Exception("case_id is required")
     
-    url = f"{PEGA_BASE_URL}/cases/{case_id}"
-    
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = await pega_client().get_case(case_id)
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise Exception(f"Failed to get case: {str(e)}")
 
 async def list_cases(arguments: Dict[str, Any]) -> Dict[str, Any]:
     """List Pega cases"""
-    headers = {
-        "Authorization": f"Basic {BASIC_AUTH}",
-        "Content-Type": "application/json"
-    }
-    
     params = {}
     if arguments.get("status"):
         params["status"] = arguments["status"]
@@ -275,13 +256,11 @@ async def list_cases(arguments: Dict[str, Any]) -> Dict[str, Any]:
     params["page"] = page
     params["per_page"] = per_page
     
-    url = f"{PEGA_BASE_URL}/cases"
-    
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = await pega_client().list_cases(params)
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise Exception(f"Failed to list cases: {str(e)}")
 
 async def analyze_and_create_dpia(arguments: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the DPIA analysis result cache
+"""
+
+import os
+import time
+import tempfile
+
+from analysis_cache import AnalysisCache, make_cache_key
+
+def test_cache_key_normalization():
+    """Whitespace differences share a key; model, temperature and context do not"""
+    context = {"reference_context": "", "analysis_guidelines": ""}
+    key = make_cache_key("Lung  stem cells\n(AT2-TRITC)", "galileo-llm-v1", 0.1, context)
+
+    assert key == make_cache_key(" Lung stem cells (AT2-TRITC) ", "galileo-llm-v1", 0.1, context)
+    assert key != make_cache_key("Lung stem cells (AT2-TRITC)", "galileo-llm-v2", 0.1, context)
+    assert key != make_cache_key("Lung stem cells (AT2-TRITC)", "galileo-llm-v1", 0.2, context)
+    assert key != make_cache_key("Lung stem cells (AT2-TRITC)", "galileo-llm-v1", 0.1,
+                                 {"reference_context": "new", "analysis_guidelines": ""})
+    print("✅ Cache keys normalize text and include model settings and context")
+
+def test_lru_eviction_and_ttl():
+    """Oldest entries are evicted first and expired entries are misses"""
+    cache = AnalysisCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", {"value": 1})
+    cache.set("b", {"value": 2})
+    assert cache.get("a") == {"value": 1}
+    cache.set("c", {"value": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"value": 1}
+    assert cache.stats()["evictions"] == 1
+
+    short_cache = AnalysisCache(max_entries=2, ttl_seconds=0.01)
+    short_cache.set("a", {"value": 1})
+    time.sleep(0.02)
+    assert short_cache.get("a") is None
+    assert short_cache.stats()["expirations"] == 1
+    print("✅ LRU eviction and TTL expiry work")
+
+def test_sqlite_tier_survives_restart():
+    """Entries written to SQLite are visible to a new cache instance until invalidated"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "analysis_cache.sqlite3")
+        cache = AnalysisCache(sqlite_path=path)
+        cache.set("key", {"detected_fields": {"pi_name": "John"}})
+        cache.close()
+
+        restarted = AnalysisCache(sqlite_path=path)
+        assert restarted.get("key") == {"detected_fields": {"pi_name": "John"}}
+        assert restarted.stats()["disk_hits"] == 1
+
+        assert restarted.invalidate_all() == 1
+        assert restarted.get("key") is None
+        restarted.close()
+    print("✅ SQLite tier persists results and honors invalidation")
+
+if __name__ == "__main__":
+    test_cache_key_normalization()
+    test_lru_eviction_and_ttl()
+    test_sqlite_tier_survives_restart()
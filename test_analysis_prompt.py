@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Test script for the versioned analysis prompt template
+"""
+
+from analysis_cache import make_cache_key
+from analysis_prompt import ANALYSIS_PROMPT, ANALYSIS_PROMPT_VERSION
+from galileo_integration import DPIAAnalysisRequest, GalileoConfig, GalileoLLMIntegration
+
+def test_static_prefix_is_byte_identical():
+    """Different research texts and contexts share the same system prompt and prefix"""
+    integration = GalileoLLMIntegration(GalileoConfig(api_key="test-key", project_id="test-project"))
+    first = integration._analysis_payload(
+        DPIAAnalysisRequest(text="Scan lung tissue slides"),
+        integration._build_analysis_prompt(DPIAAnalysisRequest(text="Scan lung tissue slides"))[0]
+    )
+    second_request = DPIAAnalysisRequest(text="3D imaging of cleared mouse eyes",
+                                         context={"reference_context": "Local SOP", "analysis_guidelines": ""})
+    second = integration._analysis_payload(second_request, integration._build_analysis_prompt(second_request)[0])
+
+    assert first["messages"][0] == second["messages"][0]
+    assert first["messages"][1]["content"].startswith(ANALYSIS_PROMPT.prefix)
+    assert second["messages"][1]["content"].startswith(ANALYSIS_PROMPT.prefix)
+    assert "{" not in ANALYSIS_PROMPT.render_suffix("")
+    assert first["metadata"]["prompt_version"] == ANALYSIS_PROMPT_VERSION
+    print("✅ Static prompt prefix is byte-identical across calls")
+
+def test_prompt_version_is_part_of_the_cache_key():
+    """Results produced by a different prompt version are not served from cache"""
+    current = make_cache_key("lung sections", "galileo-llm-v1", 0.1, None, prompt_version=ANALYSIS_PROMPT_VERSION)
+    previous = make_cache_key("lung sections", "galileo-llm-v1", 0.1, None, prompt_version="dpia-analysis-v1")
+    assert current != previous
+    print("✅ Prompt version separates cache entries")
+
+if __name__ == "__main__":
+    test_static_prefix_is_byte_identical()
+    test_prompt_version_is_part_of_the_cache_key()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for single-pass validation of Galileo analysis responses
+"""
+
+import json
+import asyncio
+
+import httpx
+import pytest
+
+from galileo_claude_adapter import AnalysisResult, GalileoClaudeAdapter
+from galileo_integration import ChatCompletionEnvelope, DPIAAnalysisRequest
+
+ANALYSIS = {
+    "therapeutic_area": "Pulmonology",
+    "procedure_type": "Imaging",
+    "assay_type": "Immunofluorescence",
+    "pi_name": "John",
+    "pathologist": None,
+    "missing_fields": ["pathologist"],
+    "confidence_scores": {"therapeutic_area": 0.9},
+    "interactive_prompts": ["Who is the pathologist?"],
+    "suggestions": [],
+    "analysis_summary": "Lung imaging study",
+    "recommended_case_type": "DPIA",
+    "case_type_confidence": 1
+}
+
+def _analyze(mock_galileo, content: str):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={
+            "id": "chatcmpl-test",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 10}
+        })
+
+    async def scenario():
+        integration = mock_galileo(handler)
+        try:
+            result = await integration.analyze_dpia_text(DPIAAnalysisRequest(text="Lung sections"))
+            return result, integration.get_parse_stats()
+        finally:
+            await integration.close()
+
+    return asyncio.run(scenario())
+
+def test_content_validates_in_one_pass(mock_galileo):
+    """Well-formed JSON content validates directly, with defaults for omitted fields"""
+    result, stats = _analyze(mock_galileo, json.dumps(ANALYSIS))
+    assert not result.is_fallback
+    assert result.therapeutic_area == "Pulmonology"
+    assert result.project_title == "Research Analysis"
+    assert result.case_type_confidence == 1.0
+    assert result.prompt_version is not None
+    assert stats["slow_path"] == 0
+    print("✅ Content validated in a single pass")
+
+def test_fenced_content_uses_tolerant_parser(mock_galileo):
+    """Code-fenced content is still accepted; only malformed content leaves the fast path"""
+    result, stats = _analyze(mock_galileo, f"```json\n{json.dumps(ANALYSIS)}\n```")
+    assert result.recommended_case_type == "DPIA"
+    assert stats["slow_path"] == 0
+
+    truncated = json.dumps(ANALYSIS)[:-40]
+    result, stats = _analyze(mock_galileo, truncated)
+    assert stats["slow_path"] == 1
+    assert result.therapeutic_area == "Pulmonology"
+    print("✅ Fenced content validated; truncated content recovered by the tolerant parser")
+
+def test_adapter_view_matches_result(mock_galileo):
+    """The adapter view nests detected fields and turns prompts into question dicts"""
+    result, _ = _analyze(mock_galileo, json.dumps(ANALYSIS))
+    view = AnalysisResult.from_galileo_result(result)
+    assert view.detected_fields["pi_name"] == "John"
+    assert view.detected_fields["pathologist"] == "Unknown"
+    assert view.interactive_prompts == [{"question": "Who is the pathologist?", "field": "unknown", "type": "text"}]
+    assert AnalysisResult.model_validate(view.model_dump()) == view
+    print("✅ Adapter view built from the validated result")
+
+def test_fenced_field_enhancement_is_parsed(mock_galileo):
+    """A code-fenced reply to a single-field enhancement prompt is parsed, not treated as a failure"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        content = '```json\n{"enhanced_value": "Mark Lee", "confidence": 0.9}\n```'
+        return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+    async def scenario():
+        integration = mock_galileo(handler, install=True)
+        try:
+            return await GalileoClaudeAdapter().enhance_field_detection("pathologist", "Pathologist: Mark Lee", "Unknown")
+        finally:
+            await integration.close()
+
+    assert asyncio.run(scenario()) == ("Mark Lee", 0.9)
+    print("✅ Fenced single-field enhancement parsed")
+
+def test_envelope_ignores_extra_keys():
+    """Only the completion content is read from the envelope"""
+    body = b'{"id": "x", "usage": {"total_tokens": 5}, "choices": [{"message": {"role": "assistant", "content": "hi"}, "logprobs": null}]}'
+    assert ChatCompletionEnvelope.model_validate_json(body).content == "hi"
+    print("✅ Envelope validated from bytes")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(["-q", "-s", __file__]))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded-concurrency batch runner
+"""
+
+import asyncio
+
+from case_batch import BATCH_ITEM_CREATED, BATCH_ITEM_FAILED, CaseBatchConfig, batch_summary, run_batch
+
+def test_results_stream_in_completion_order():
+    """Fast items are reported before slow ones, with failures as their own results"""
+    async def process(index: int, delay):
+        if delay is None:
+            raise ValueError("bad item")
+        await asyncio.sleep(delay)
+        return {"status": BATCH_ITEM_CREATED}
+
+    async def scenario():
+        return [result async for result in run_batch([0.1, 0.0, None, 0.05], process)]
+
+    results = asyncio.run(scenario())
+    assert [result["index"] for result in results][:2] in ([1, 2], [2, 1])
+    assert results[-1]["index"] == 0
+    failed = [result for result in results if result["status"] == BATCH_ITEM_FAILED]
+    assert len(failed) == 1 and failed[0]["error"] == "bad item"
+    summary = batch_summary(results, 1.0)
+    assert summary["total"] == 4 and summary["created"] == 3 and summary["failed"] == 1
+    print("✅ Results streamed as items completed")
+
+def test_semaphore_bounds_concurrency():
+    """No more items run at once than the semaphore allows"""
+    running = {"now": 0, "peak": 0}
+
+    async def scenario():
+        slots = asyncio.Semaphore(3)
+
+        async def process(index: int, item: int):
+            async with slots:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+                await asyncio.sleep(0.01)
+                running["now"] -= 1
+            return {"status": BATCH_ITEM_CREATED}
+
+        return [result async for result in run_batch(range(12), process)]
+
+    assert len(asyncio.run(scenario())) == 12
+    assert running["peak"] == 3
+    print("✅ Concurrency bounded at 3")
+
+def test_stopping_early_cancels_remaining_items():
+    """A consumer that stops (client disconnect) cancels the items still running"""
+    cancelled = []
+
+    async def process(index: int, delay: float):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return {"status": BATCH_ITEM_CREATED}
+
+    async def scenario():
+        results = run_batch([0.0, 5.0, 5.0], process)
+        first = await results.__anext__()
+        await results.aclose()
+        await asyncio.sleep(0)
+        return first
+
+    assert asyncio.run(scenario())["index"] == 0
+    assert sorted(cancelled) == [1, 2]
+    print("✅ Remaining items cancelled when the consumer stops")
+
+def test_concurrency_overrides_are_clamped():
+    config = CaseBatchConfig(pega_concurrency=4, max_concurrency=8)
+    assert config.bounded(None, config.pega_concurrency) == 4
+    assert config.bounded(50, config.pega_concurrency) == 8
+    assert config.bounded(-2, config.pega_concurrency) == 1
+    print("✅ Per-request concurrency clamped")
+
+if __name__ == "__main__":
+    test_results_stream_in_completion_order()
+    test_semaphore_bounds_concurrency()
+    test_stopping_early_cancels_remaining_items()
+    test_concurrency_overrides_are_clamped()
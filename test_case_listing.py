@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for the prefetching case listing
+"""
+
+import asyncio
+
+import httpx
+
+from pega_cache import PegaCacheConfig
+from pega_client import PegaClient, PegaConfig, case_matches, case_page_items
+
+def _client(total_cases: int, events: list, fail_page: int = 0):
+    """Client against a fake Pega that logs when each page is requested and answered"""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        per_page = int(request.url.params["per_page"])
+        events.append(f"request {page}")
+        await asyncio.sleep(0.02)
+        if page == fail_page:
+            return httpx.Response(503, json={"errors": [{"message": "Pega unavailable"}]})
+        start = (page - 1) * per_page
+        cases = [
+            {"ID": f"DPIA-{number}", "status": "Open" if number % 2 else "Resolved", "caseTypeID": "Roche-Pathworks-Work-DPIA"}
+            for number in range(start + 1, min(start + per_page, total_cases) + 1)
+        ]
+        return httpx.Response(200, json={"cases": cases})
+
+    config = PegaConfig(base_url="http://pega.test/prweb/api/v1", cache=PegaCacheConfig(enabled=False))
+    return PegaClient(config, transport=httpx.MockTransport(handler))
+
+def test_walks_all_pages_with_prefetch():
+    """Page N+1 is requested before the caller has finished with page N"""
+    async def scenario():
+        events = []
+        client = _client(25, events)
+        try:
+            async for items in client.iter_case_pages(per_page=10):
+                events.append(f"consume {len(items)}")
+                await asyncio.sleep(0.03)
+                events.append("done")
+            return events
+        finally:
+            await client.close()
+
+    events = asyncio.run(scenario())
+    assert [event for event in events if event.startswith("consume")] == ["consume 10", "consume 10", "consume 5"]
+    assert events.index("request 2") < events.index("done")
+    assert "request 4" not in events
+    print("✅ All pages walked with the next page prefetched")
+
+def test_without_prefetch_pages_are_sequential():
+    async def scenario():
+        events = []
+        client = _client(20, events)
+        try:
+            async for items in client.iter_case_pages(per_page=10, prefetch=False):
+                events.append("consume")
+            return events
+        finally:
+            await client.close()
+
+    # A full last page needs one more (empty) request to know the list has ended
+    assert asyncio.run(scenario()) == ["request 1", "consume", "request 2", "consume", "request 3"]
+    print("✅ Sequential walk when prefetch is off")
+
+def test_filters_and_early_stop():
+    """Filters apply locally, and a caller that stops early cancels the prefetch"""
+    async def scenario():
+        events = []
+        client = _client(1000, events)
+        try:
+            resolved = []
+            async for case in client.iter_cases({"status": "resolved"}, per_page=10):
+                resolved.append(case)
+                if len(resolved) == 3:
+                    break
+            await asyncio.sleep(0.05)
+            return resolved, events
+        finally:
+            await client.close()
+
+    resolved, events = asyncio.run(scenario())
+    assert [case["ID"] for case in resolved] == ["DPIA-2", "DPIA-4", "DPIA-6"]
+    assert len([event for event in events if event.startswith("request")]) <= 2
+    print("✅ Filters applied and prefetch cancelled on early stop")
+
+def test_page_error_raises():
+    async def scenario():
+        client = _client(100, [], fail_page=2)
+        rows = 0
+        try:
+            async for case in client.iter_cases(per_page=10):
+                rows += 1
+        except httpx.HTTPStatusError as e:
+            return rows, e.response.status_code
+        finally:
+            await client.close()
+
+    assert asyncio.run(scenario()) == (10, 503)
+    print("✅ A failing page surfaces as an HTTP error after the rows already yielded")
+
+def test_page_shapes_and_matching():
+    assert case_page_items([{"ID": "A"}]) == [{"ID": "A"}]
+    assert case_page_items({"pxResults": [{"ID": "B"}]}) == [{"ID": "B"}]
+    assert case_page_items({"unexpected": True}) == []
+    assert case_matches({"status": "Open", "caseTypeID": "X"}, {"status": "open", "caseTypeID": None})
+    assert not case_matches({"status": "Open"}, {"status": "Resolved"})
+    print("✅ Page shapes and filters")
+
+if __name__ == "__main__":
+    test_walks_all_pages_with_prefetch()
+    test_without_prefetch_pages_are_sequential()
+    test_filters_and_early_stop()
+    test_page_error_raises()
+    test_page_shapes_and_matching()
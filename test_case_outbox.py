@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test script for the durable case-creation outbox
+"""
+
+import os
+import asyncio
+import tempfile
+
+import httpx
+
+from case_outbox import OUTBOX_CREATED, OUTBOX_FAILED, OUTBOX_PENDING, CaseOutbox, CaseOutboxConfig
+
+def _config(path: str, **overrides) -> CaseOutboxConfig:
+    values = dict(sqlite_path=path, ack_timeout_seconds=0.2, base_backoff_seconds=0.0, poll_interval_seconds=60)
+    values.update(overrides)
+    return CaseOutboxConfig(**values)
+
+def _pega(*responses):
+    """Fake Pega create call answering with the given statuses in turn (the last one repeats)"""
+    calls = []
+
+    async def send(payload):
+        calls.append(payload)
+        status = responses[min(len(calls), len(responses)) - 1]
+        request = httpx.Request("POST", "http://pega.test/cases")
+        if status == "timeout":
+            raise httpx.ReadTimeout("Pega too slow", request=request)
+        if status == "circuit_open":
+            raise RuntimeError("Pega circuit is open")
+        if status == "bad_payload":
+            raise TypeError("Object of type set is not JSON serializable")
+        if status == 201:
+            return httpx.Response(201, json={"ID": f"DPIA-{len(calls)}"}, request=request)
+        return httpx.Response(status, json={"errors": [{"message": f"status {status}"}]}, request=request)
+
+    return send, calls
+
+def test_confirmed_case_returns_real_id():
+    """When Pega answers within the acknowledgment timeout the caller gets the real case"""
+    async def scenario(path):
+        send, _ = _pega(201)
+        outbox = CaseOutbox(send, _config(path))
+        try:
+            outcome = await outbox.submit({"caseTypeID": "DPIA"})
+            return outcome, outbox.get(outcome.outbox_id)
+        finally:
+            await outbox.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        outcome, entry = asyncio.run(scenario(os.path.join(directory, "outbox.sqlite3")))
+    assert outcome.status == OUTBOX_CREATED and outcome.case_id == "DPIA-1"
+    assert entry["status"] == OUTBOX_CREATED and entry["case_id"] == "DPIA-1"
+    print("✅ Confirmed case returned with its Pega ID")
+
+def test_outage_is_acknowledged_and_replayed():
+    """A 503 is acknowledged with the provisional ID and reconciled by the replay"""
+    async def scenario(path):
+        send, calls = _pega(503, "timeout", 201)
+        outbox = CaseOutbox(send, _config(path))
+        try:
+            outcome = await outbox.submit({"caseTypeID": "DPIA"})
+            await outbox.replay_due()
+            await outbox.replay_due()
+            return outcome, outbox.get(outcome.outbox_id), calls, outbox.stats()
+        finally:
+            await outbox.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        outcome, entry, calls, stats = asyncio.run(scenario(os.path.join(directory, "outbox.sqlite3")))
+    assert outcome.status == OUTBOX_PENDING and outcome.outbox_id.startswith("PENDING-")
+    assert len(calls) == 3
+    assert entry["status"] == OUTBOX_CREATED and entry["case_id"] == "DPIA-3" and entry["attempts"] == 3
+    assert stats["reconciled"] == 1 and stats["pending"] == 0
+    print("✅ Outage acknowledged immediately and reconciled by replay")
+
+def test_slow_pega_gets_provisional_ack():
+    """The caller stops waiting at the acknowledgment timeout; the attempt keeps going"""
+    async def scenario(path):
+        async def slow_send(payload):
+            await asyncio.sleep(0.4)
+            return httpx.Response(201, json={"ID": "DPIA-9"}, request=httpx.Request("POST", "http://pega.test/cases"))
+
+        outbox = CaseOutbox(slow_send, _config(path))
+        try:
+            outcome = await outbox.submit({"caseTypeID": "DPIA"})
+            await asyncio.sleep(0.4)
+            return outcome, outbox.get(outcome.outbox_id)
+        finally:
+            await outbox.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        outcome, entry = asyncio.run(scenario(os.path.join(directory, "outbox.sqlite3")))
+    assert outcome.status == OUTBOX_PENDING
+    assert entry["status"] == OUTBOX_CREATED and entry["case_id"] == "DPIA-9"
+    print("✅ Slow Pega acknowledged provisionally and delivered in the background")
+
+def test_intents_survive_restart():
+    """Intents left pending are replayed by the next process using the same file"""
+    async def first_run(path):
+        send, _ = _pega(503)
+        outbox = CaseOutbox(send, _config(path))
+        outcome = await outbox.submit({"caseTypeID": "CALM"})
+        await outbox.stop()
+        return outcome.outbox_id
+
+    async def second_run(path, outbox_id):
+        send, calls = _pega(201)
+        outbox = CaseOutbox(send, _config(path))
+        try:
+            await outbox.replay_due()
+            return outbox.get(outbox_id), calls
+        finally:
+            await outbox.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "outbox.sqlite3")
+        outbox_id = asyncio.run(first_run(path))
+        entry, calls = asyncio.run(second_run(path, outbox_id))
+    assert calls == [{"caseTypeID": "CALM"}]
+    assert entry["status"] == OUTBOX_CREATED
+    print("✅ Pending intent replayed after a restart")
+
+def test_rejections_and_exhausted_retries_fail():
+    """A 4xx is not retried; retries stop at max_attempts"""
+    async def scenario(path):
+        rejecting, rejected_calls = _pega(400)
+        outbox = CaseOutbox(rejecting, _config(path))
+        rejected = await outbox.submit({"caseTypeID": "BAD"})
+        await outbox.stop()
+
+        down, down_calls = _pega(503)
+        outbox = CaseOutbox(down, _config(path, max_attempts=2))
+        try:
+            outcome = await outbox.submit({"caseTypeID": "DPIA"})
+            await outbox.replay_due()
+            return rejected, len(rejected_calls), outbox.get(outcome.outbox_id), len(down_calls)
+        finally:
+            await outbox.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        rejected, rejected_calls, exhausted, down_calls = asyncio.run(scenario(os.path.join(directory, "outbox.sqlite3")))
+    assert rejected.status == OUTBOX_FAILED and "status 400" in rejected.error and rejected_calls == 1
+    assert exhausted["status"] == OUTBOX_FAILED and down_calls == 2
+    print("✅ Rejections fail at once and retries stop at the limit")
+
+def test_unexpected_send_errors_are_recorded():
+    """Errors other than httpx's are retried (or failed when the payload is at fault), never left sending"""
+    async def scenario(path):
+        flaky, _ = _pega("circuit_open", 201)
+        outbox = CaseOutbox(flaky, _config(path))
+        try:
+            outcome = await outbox.submit({"caseTypeID": "DPIA"})
+            pending = outbox.get(outcome.outbox_id)
+            await outbox.replay_due()
+            replayed = outbox.get(outcome.outbox_id)
+        finally:
+            await outbox.stop()
+
+        broken, broken_calls = _pega("bad_payload")
+        outbox = CaseOutbox(broken, _config(path))
+        try:
+            failed = await outbox.submit({"caseTypeID": "DPIA"})
+            await outbox.replay_due()
+            return pending, replayed, failed, len(broken_calls)
+        finally:
+            await outbox.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pending, replayed, failed, broken_calls = asyncio.run(scenario(os.path.join(directory, "outbox.sqlite3")))
+    assert pending["status"] == OUTBOX_PENDING and "circuit is open" in pending["last_error"]
+    assert replayed["status"] == OUTBOX_CREATED
+    assert failed.status == OUTBOX_FAILED and "TypeError" in failed.error and broken_calls == 1
+    print("✅ Unexpected send errors were retried or failed instead of left sending")
+
+if __name__ == "__main__":
+    test_confirmed_case_returns_real_id()
+    test_outage_is_acknowledged_and_replayed()
+    test_slow_pega_gets_provisional_ack()
+    test_intents_survive_restart()
+    test_rejections_and_exhausted_retries_fail()
+    test_unexpected_send_errors_are_recorded()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for chat session analysis state
+"""
+
+from chat_session import (
+    SESSION_ANALYSIS_MERGED, SESSION_ANALYSIS_REPLACED, apply_analysis_to_session, apply_late_analysis,
+    mark_session_progress, session_progress
+)
+from galileo_claude_adapter import AnalysisResult
+from idempotency import case_fingerprint
+
+RESEARCH_TEXT = "Oncology study of tumour biopsies stained with IHC; PI Jane Doe, pathologist Mark Lee."
+
+def _analysis(detected_fields, missing_fields) -> AnalysisResult:
+    return AnalysisResult(
+        detected_fields=detected_fields,
+        missing_fields=missing_fields,
+        confidence_scores={field: 0.9 for field in detected_fields},
+        interactive_prompts=[],
+        suggestions=[],
+        analysis_summary="test"
+    )
+
+PROVISIONAL = _analysis(
+    {"therapeutic_area": "Oncology", "pi_name": "Unknown", "pathologist": "Unknown"}, ["pi_name", "pathologist"]
+)
+RECONCILED = _analysis(
+    {"therapeutic_area": "Immuno-oncology", "pi_name": "Jane Doe", "pathologist": "Mark Lee"}, []
+)
+
+def _session():
+    session = {"extracted_fields": {}, "missing_fields": [], "current_task": "chat"}
+    apply_analysis_to_session(session, PROVISIONAL, RESEARCH_TEXT)
+    return session
+
+def test_late_analysis_replaces_untouched_session():
+    """With no user step since it started, the reconciled analysis replaces the provisional one"""
+    session = _session()
+    started_at = session_progress(session)
+    assert apply_late_analysis(session, RECONCILED, RESEARCH_TEXT, started_at) == SESSION_ANALYSIS_REPLACED
+    assert session["extracted_fields"]["therapeutic_area"] == "Immuno-oncology"
+    assert session["missing_fields"] == []
+    print("✅ Late analysis replaced the untouched session's analysis")
+
+def test_answer_before_reconciliation_is_kept():
+    """A field the user answered while the LLM ran keeps their answer; only still-missing fields are filled"""
+    session = _session()
+    started_at = session_progress(session)
+
+    # The user answers pi_name before the speculative LLM analysis finishes
+    session["extracted_fields"]["pi_name"] = "John Smith"
+    session["missing_fields"] = ["pathologist"]
+    session["current_task"] = "collecting"
+    mark_session_progress(session)
+
+    assert apply_late_analysis(session, RECONCILED, RESEARCH_TEXT, started_at) == SESSION_ANALYSIS_MERGED
+    assert session["extracted_fields"]["pi_name"] == "John Smith"
+    assert session["extracted_fields"]["pathologist"] == "Mark Lee"
+    assert session["extracted_fields"]["therapeutic_area"] == "Oncology"
+    assert session["missing_fields"] == []
+    assert session["current_task"] == "collecting"
+    print("✅ User's answer survived the late reconciliation; only missing fields were filled")
+
+def test_late_analysis_after_case_creation_changes_nothing():
+    """Once the case was created, a late analysis leaves the reset session alone"""
+    session = _session()
+    started_at = session_progress(session)
+    session["current_task"], session["missing_fields"] = "chat", []
+    mark_session_progress(session)
+    before = {key: (dict(value) if isinstance(value, dict) else value) for key, value in session.items()}
+
+    assert apply_late_analysis(session, RECONCILED, RESEARCH_TEXT, started_at) == SESSION_ANALYSIS_MERGED
+    assert session == before
+    print("✅ Late analysis after case creation left the session untouched")
+
+def test_sessions_with_different_texts_get_different_fingerprints():
+    """The analysed text is kept in the session, so identical fields from different texts are different cases"""
+    first, second = {"extracted_fields": {}}, {"extracted_fields": {}}
+    apply_analysis_to_session(first, RECONCILED, RESEARCH_TEXT)
+    apply_analysis_to_session(second, RECONCILED, "A different lung study with the same PI and pathologist.")
+    assert first["original_text"] == RESEARCH_TEXT
+    assert first["extracted_fields"] == second["extracted_fields"]
+    # Same fingerprint the chat confirmation builds before creating the case
+    fingerprints = [case_fingerprint("case", session["extracted_fields"], session["original_text"]) for session in (first, second)]
+    assert fingerprints[0] != fingerprints[1]
+    print("✅ Sessions with the same fields but different research texts fingerprint differently")
+
+if __name__ == "__main__":
+    test_late_analysis_replaces_untouched_session()
+    test_answer_before_reconciliation_is_kept()
+    test_late_analysis_after_case_creation_changes_nothing()
+    test_sessions_with_different_texts_get_different_fingerprints()
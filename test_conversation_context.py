@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded conversation context used by conversational replies
+"""
+
+import json
+import asyncio
+
+import httpx
+import pytest
+
+from galileo_claude_adapter import GalileoClaudeAdapter
+from conversation_context import (
+    ConversationContext, ConversationContextConfig, build_conversation_messages, compact_context
+)
+
+SESSION_STATE = {
+    "current_task": "dpia_analysis",
+    "extracted_fields": {"therapeutic_area": "Oncology", "pi_name": "Unknown", "pathologist": "Mark Lee"},
+    "missing_fields": ["pi_name"],
+    "analysis_summary": None
+}
+
+def _long_session(turns: int, config: ConversationContextConfig) -> ConversationContext:
+    conversation = ConversationContext(config)
+    for i in range(turns):
+        conversation.add_turn(f"Question {i} about DPIA retention rules " * 5, f"Answer {i} explaining the retention policy " * 8)
+    return conversation
+
+def test_compact_context():
+    """State is serialized without indentation and without Unknown or empty values"""
+    compact = compact_context(SESSION_STATE)
+    assert "\n" not in compact and ": " not in compact
+    assert json.loads(compact) == {
+        "current_task": "dpia_analysis",
+        "extracted_fields": {"therapeutic_area": "Oncology", "pathologist": "Mark Lee"},
+        "missing_fields": ["pi_name"]
+    }
+    assert len(compact) < len(json.dumps(SESSION_STATE, indent=2)) * 0.7
+    print(f"✅ Compact context: {len(compact)} chars vs {len(json.dumps(SESSION_STATE, indent=2))} indented")
+
+def test_history_stays_within_budget():
+    """Older turns move into the running summary; prompt size stops growing with the session"""
+    config = ConversationContextConfig(history_token_budget=400, summary_token_budget=150)
+    sizes = []
+    for turns in (5, 20, 80):
+        conversation = _long_session(turns, config)
+        _, report = build_conversation_messages("system", "Next question?", SESSION_STATE, conversation)
+        assert conversation.history_tokens <= 400
+        assert conversation.summary_tokens <= 150
+        sizes.append(report["prompt_tokens"])
+    assert sizes[1] == sizes[2]
+    assert conversation.turns_summarized == 80 - len(conversation.turns)
+    assert "earlier turn(s) omitted" in conversation.summary
+    assert conversation.last_prompt["prompt_tokens"] == sizes[2]
+    print(f"✅ Prompt tokens after 5/20/80 turns: {sizes}")
+
+def test_summary_is_incremental():
+    """Each evicted turn adds one summary line; the newest turns stay verbatim"""
+    conversation = ConversationContext(ConversationContextConfig(history_token_budget=200, summary_token_budget=1000))
+    for i in range(6):
+        conversation.add_turn(f"Question {i} " + "x " * 60, f"Answer {i}")
+    assert len(conversation.summary_lines) == conversation.turns_summarized
+    assert conversation.summary_lines[0].startswith("- User: Question 0")
+    assert conversation.turns[-1].user.startswith("Question 5")
+    messages, _ = build_conversation_messages("system", "Latest", None, conversation)
+    assert messages[-1] == {"role": "user", "content": "Latest"}
+    assert "Question 0" in messages[0]["content"]
+    print(f"✅ {conversation.turns_summarized} turns summarized, {len(conversation.turns)} kept verbatim")
+
+def test_state_over_budget_drops_whole_entries():
+    """Oversized state loses whole entries, oldest answered fields first, and stays valid JSON"""
+    context = {
+        "current_task": "collecting",
+        "extracted_fields": {f"field_{i}": f"answer {i} " * 10 for i in range(12)},
+        "missing_fields": ["pathologist"],
+        "analysis_summary": "Summary of the oncology study"
+    }
+    config = ConversationContextConfig(state_token_budget=120)
+    messages, report = build_conversation_messages("system", "Next?", context, config=config)
+    state = json.loads(messages[0]["content"].split("Session state (JSON): ", 1)[1])
+    assert report["state_tokens"] <= 120 and report["state_entries_dropped"] > 0
+    assert "field_0" not in state["extracted_fields"] and "field_11" in state["extracted_fields"]
+    assert state["current_task"] == "collecting" and state["missing_fields"] == ["pathologist"]
+    assert state["analysis_summary"] == context["analysis_summary"]
+    print(f"✅ State trimmed to {report['state_tokens']} tokens by dropping {report['state_entries_dropped']} entries")
+
+def test_adapter_sends_bounded_history(mock_galileo):
+    """The conversational prompt carries recent turns and the adapter records its size"""
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(json.loads(request.content)["messages"])
+        return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": "Sure."}}]})
+
+    async def scenario():
+        integration = mock_galileo(handler, install=True)
+        try:
+            adapter = GalileoClaudeAdapter()
+            conversation = adapter.new_conversation()
+            for message in ("What is a DPIA?", "Who reviews it?"):
+                reply = await adapter.generate_conversational_response(message, SESSION_STATE, conversation)
+                conversation.add_turn(message, reply)
+            return adapter.get_conversation_stats()
+        finally:
+            await integration.close()
+
+    stats = asyncio.run(scenario())
+    assert [message["role"] for message in sent[1]] == ["system", "user", "assistant", "user"]
+    assert "Session state (JSON): {" in sent[1][0]["content"]
+    assert stats["prompts"] == 2 and stats["prompt_tokens_last"] > 0
+    print(f"✅ Adapter prompt sizes: last {stats['prompt_tokens_last']}, max {stats['prompt_tokens_max']} tokens")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(["-q", "-s", __file__]))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the Galileo AI circuit breaker and adaptive concurrency limiter
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from galileo_integration import DPIAAnalysisRequest
+from galileo_retry import GalileoRetryConfig, RetryPolicy
+from galileo_resilience import (
+    AdaptiveConcurrencyLimiter,
+    AdaptiveLimiterConfig,
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    ConcurrencyLimitExceeded,
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN
+)
+
+def test_circuit_opens_and_fails_fast_to_fallback(mock_galileo):
+    """Consecutive 5xx responses open the circuit; later analyses fall back without a request"""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(502, json={"error": "bad gateway"})
+
+    async def scenario():
+        integration = mock_galileo(
+            handler,
+            circuit_breaker=CircuitBreakerConfig(failure_threshold=2, recovery_timeout=60),
+            retries=GalileoRetryConfig(default_policy=RetryPolicy(max_attempts=1))
+        )
+        for i in range(2):
+            try:
+                await integration.analyze_dpia_text(DPIAAnalysisRequest(text=f"lung tissue sample {i}"))
+            except Exception:
+                pass
+        start_time = time.perf_counter()
+        result = await integration.analyze_dpia_text(DPIAAnalysisRequest(text="lung tissue sample 3"))
+        elapsed = time.perf_counter() - start_time
+        stats = integration.get_resilience_stats()
+        await integration.close()
+        return result, elapsed, stats
+
+    result, elapsed, stats = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert result.is_fallback
+    assert elapsed < 0.5
+    assert stats["circuit_breaker"]["state"] == CIRCUIT_OPEN
+    assert stats["circuit_breaker"]["rejected"] == 1
+    print("✅ Open circuit failed fast to the fallback result")
+
+def test_half_open_trial_closes_circuit():
+    """After the recovery timeout one trial call is admitted and a success closes the circuit"""
+    breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=1, recovery_timeout=0.05))
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    time.sleep(0.06)
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    breaker.before_call()
+    try:
+        breaker.before_call()
+        second_trial_admitted = True
+    except Exception:
+        second_trial_admitted = False
+    assert not second_trial_admitted
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
+    print("✅ Half-open trial call closed the circuit")
+
+def test_limiter_backs_off_and_rejects_when_full():
+    """Failures shrink the window multiplicatively; a full window rejects after the acquire timeout"""
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter(AdaptiveLimiterConfig(
+            initial_limit=4, min_limit=1, backoff_ratio=0.5, acquire_timeout=0.05
+        ))
+        await limiter.acquire()
+        await limiter.release(10.0, success=False)
+        limit_after_failure = limiter.limit
+        await limiter.acquire()
+        await limiter.acquire()
+        try:
+            await limiter.acquire()
+            rejected = False
+        except ConcurrencyLimitExceeded:
+            rejected = True
+        await limiter.release(10.0, success=True)
+        await limiter.release(10.0, success=True)
+        return limit_after_failure, rejected, limiter.stats()
+
+    limit_after_failure, rejected, stats = asyncio.run(scenario())
+    assert limit_after_failure == 2
+    assert rejected
+    assert stats["rejected"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["limit"] >= 2
+    print("✅ Limiter backed off and rejected when the window was full")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(["-q", "-s", __file__]))
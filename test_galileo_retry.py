@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for Galileo AI retries and hedged requests
+"""
+
+import asyncio
+
+import httpx
+
+from galileo_retry import GalileoRetryConfig, RetryBudgetConfig, RetryPolicy, RetryingExecutor
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://galileo.test/v1/chat/completions")
+    return httpx.HTTPStatusError(f"{status}", request=request, response=httpx.Response(status, request=request))
+
+def test_transient_error_is_retried():
+    """A 502 followed by a success returns the success and counts one retry"""
+    async def scenario():
+        executor = RetryingExecutor(GalileoRetryConfig(default_policy=RetryPolicy(base_delay=0.01)))
+        attempts = []
+
+        async def attempt():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise _status_error(502)
+            return "ok"
+
+        result = await executor.execute("/chat/completions", attempt)
+        return result, len(attempts), executor.stats()
+
+    result, attempts, stats = asyncio.run(scenario())
+    assert result == "ok"
+    assert attempts == 2
+    assert stats["endpoints"]["/chat/completions"]["retries"] == 1
+    print("✅ Transient 502 retried")
+
+def test_non_idempotent_request_only_retried_when_not_sent():
+    """A non-idempotent request is not retried after a 503 but is after a connect error"""
+    async def scenario():
+        executor = RetryingExecutor(GalileoRetryConfig(
+            default_policy=RetryPolicy(base_delay=0.01, idempotent=False)
+        ))
+        attempts = []
+
+        async def failing_after_send():
+            attempts.append("503")
+            raise _status_error(503)
+
+        try:
+            await executor.execute("/metrics/log", failing_after_send)
+        except httpx.HTTPStatusError:
+            pass
+
+        async def failing_to_connect():
+            attempts.append("connect")
+            if attempts.count("connect") == 1:
+                raise httpx.ConnectError("connection refused")
+            return "ok"
+
+        result = await executor.execute("/metrics/log", failing_to_connect)
+        return attempts, result
+
+    attempts, result = asyncio.run(scenario())
+    assert attempts == ["503", "connect", "connect"]
+    assert result == "ok"
+    print("✅ Non-idempotent request retried only when it was never sent")
+
+def test_retry_budget_limits_retries():
+    """An empty retry budget stops retries"""
+    async def scenario():
+        executor = RetryingExecutor(GalileoRetryConfig(
+            default_policy=RetryPolicy(base_delay=0.01, max_attempts=5),
+            budget=RetryBudgetConfig(ratio=0.0, min_tokens=1.0)
+        ))
+        attempts = []
+
+        async def attempt():
+            attempts.append(1)
+            raise _status_error(503)
+
+        try:
+            await executor.execute("/chat/completions", attempt)
+        except httpx.HTTPStatusError:
+            pass
+        return len(attempts), executor.stats()
+
+    attempts, stats = asyncio.run(scenario())
+    assert attempts == 2
+    assert stats["endpoints"]["/chat/completions"]["budget_exhausted"] == 1
+    print("✅ Retry budget capped retries")
+
+def test_hedged_request_wins_over_slow_primary():
+    """A hedge sent after the hedge delay wins and the slow primary is cancelled"""
+    async def scenario():
+        executor = RetryingExecutor(GalileoRetryConfig(
+            default_policy=RetryPolicy(hedge=True, hedge_delay_ms=20)
+        ))
+        attempts = []
+        cancelled = []
+
+        async def attempt():
+            attempts.append(1)
+            if len(attempts) == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(1)
+                    raise
+                return "slow"
+            return "fast"
+
+        result = await executor.execute("/chat/completions", attempt)
+        return result, cancelled, executor.stats()
+
+    result, cancelled, stats = asyncio.run(scenario())
+    assert result == "fast"
+    assert cancelled == [1]
+    assert stats["endpoints"]["/chat/completions"]["hedges"] == 1
+    assert stats["endpoints"]["/chat/completions"]["hedge_wins"] == 1
+    print("✅ Hedge won and the slow attempt was cancelled")
+
+def test_losing_hedge_result_is_discarded():
+    """When both attempts finish together the loser is discarded; its latency stays under its own key"""
+    async def scenario():
+        executor = RetryingExecutor(GalileoRetryConfig(
+            default_policy=RetryPolicy(hedge=True, hedge_delay_ms=20)
+        ))
+        release = asyncio.Event()
+        attempts = []
+        discarded = []
+
+        async def attempt():
+            attempts.append(f"stream-{len(attempts) + 1}")
+            name = attempts[-1]
+            if len(attempts) == 2:
+                release.set()
+            await release.wait()
+            return name
+
+        async def discard(result):
+            discarded.append(result)
+
+        result = await executor.execute("/chat/completions", attempt, discard=discard, latency_key="/chat/completions:stream")
+        return result, discarded, executor
+
+    result, discarded, executor = asyncio.run(scenario())
+    assert len(discarded) == 1 and discarded[0] != result
+    assert executor.hedge_delay("/chat/completions", RetryPolicy(hedge=True, hedge_min_samples=1)) is None
+    assert executor.hedge_delay("/chat/completions:stream", RetryPolicy(hedge=True, hedge_min_samples=1)) is not None
+    print(f"✅ Winner {result} kept, loser {discarded[0]} discarded")
+
+if __name__ == "__main__":
+    test_transient_error_is_retried()
+    test_non_idempotent_request_only_retried_when_not_sent()
+    test_retry_budget_limits_retries()
+    test_hedged_request_wins_over_slow_primary()
+    test_losing_hedge_result_is_discarded()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming Galileo AI chat completions
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from galileo_integration import CHAT_COMPLETIONS_PATH
+from galileo_retry import GalileoRetryConfig, RetryPolicy
+
+def _sse_body(deltas):
+    lines = [f"data: {json.dumps({'choices': [{'delta': {'content': delta}}]})}\n\n" for delta in deltas]
+    # Role-only chunk with no content, as sent at the start of OpenAI-style streams
+    lines.insert(0, f"data: {json.dumps({'choices': [{'delta': {'role': 'assistant'}}]})}\n\n")
+    lines.append("data: [DONE]\n\n")
+    return "".join(lines).encode("utf-8")
+
+# Short backoff so retried streams do not slow the tests down
+FAST_RETRIES = GalileoRetryConfig(endpoint_policies={CHAT_COMPLETIONS_PATH: RetryPolicy(base_delay=0.01)})
+
+def test_stream_yields_deltas_and_records_ttft(mock_galileo):
+    """Content deltas are yielded in order and time-to-first-token is recorded"""
+    payloads = []
+
+    def handler(request):
+        payloads.append(json.loads(request.content))
+        return httpx.Response(200, content=_sse_body(["Hello", ", ", "world"]),
+                              headers={"Content-Type": "text/event-stream"})
+
+    async def scenario():
+        integration = mock_galileo(handler, retries=FAST_RETRIES)
+        deltas = [delta async for delta in integration.stream_chat_completion([{"role": "user", "content": "hi"}])]
+        stats = integration.get_streaming_stats()
+        await integration.close()
+        return deltas, stats
+
+    deltas, stats = asyncio.run(scenario())
+    assert deltas == ["Hello", ", ", "world"]
+    assert payloads[0]["stream"] is True
+    assert stats["streams"] == 1
+    assert stats["failed"] == 0
+    assert stats["avg_ttft_ms"] > 0
+    print("✅ Streamed deltas in order with time-to-first-token recorded")
+
+def test_stream_error_is_counted_and_raised(mock_galileo):
+    """HTTP errors surface to the caller and are counted as failed streams"""
+    def handler(request):
+        return httpx.Response(503, content=b"unavailable")
+
+    async def scenario():
+        integration = mock_galileo(handler, retries=FAST_RETRIES)
+        try:
+            async for _ in integration.stream_chat_completion([{"role": "user", "content": "hi"}]):
+                pass
+        except httpx.HTTPStatusError:
+            raised = True
+        else:
+            raised = False
+        stats = integration.get_streaming_stats()
+        await integration.close()
+        return raised, stats
+
+    raised, stats = asyncio.run(scenario())
+    assert raised
+    assert stats["failed"] == 1
+    print("✅ Failed stream raised and counted")
+
+def test_failure_before_first_delta_is_retried(mock_galileo):
+    """A stream that fails before any content is retried; one that fails mid-stream is not"""
+    calls = []
+
+    async def broken_after_first_chunk():
+        yield _sse_body(["Hel"])[:-len("data: [DONE]\n\n")]
+        raise httpx.ReadError("connection reset")
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503, content=b"unavailable")
+        if len(calls) == 2:
+            return httpx.Response(200, content=_sse_body(["Hello"]), headers={"Content-Type": "text/event-stream"})
+        return httpx.Response(200, content=broken_after_first_chunk(), headers={"Content-Type": "text/event-stream"})
+
+    async def scenario():
+        integration = mock_galileo(handler, retries=FAST_RETRIES)
+        recovered = [delta async for delta in integration.stream_chat_completion([{"role": "user", "content": "hi"}])]
+        partial = []
+        try:
+            async for delta in integration.stream_chat_completion([{"role": "user", "content": "hi"}]):
+                partial.append(delta)
+        except httpx.ReadError:
+            pass
+        stats = integration.get_streaming_stats()
+        await integration.close()
+        return recovered, partial, stats
+
+    recovered, partial, stats = asyncio.run(scenario())
+    assert recovered == ["Hello"]
+    assert partial == ["Hel"]
+    assert len(calls) == 3
+    assert stats["streams"] == 2 and stats["failed"] == 1
+    print("✅ Stream retried before its first delta; mid-stream failure raised without retry")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(["-q", "-s", __file__]))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for the batched Galileo AI telemetry queue
+"""
+
+import asyncio
+
+from galileo_telemetry import TelemetryConfig, TelemetryQueue
+
+def test_size_trigger_sends_batches():
+    """A full batch is sent without waiting for the flush interval"""
+    async def scenario():
+        batches = []
+
+        async def send_batch(events):
+            batches.append(events)
+
+        queue = TelemetryQueue(send_batch, TelemetryConfig(batch_size=3, flush_interval=60))
+        for i in range(3):
+            queue.enqueue({"event": i})
+        await asyncio.sleep(0.05)
+        await queue.stop()
+        return batches, queue.stats()
+
+    batches, stats = asyncio.run(scenario())
+    assert batches == [[{"event": 0}, {"event": 1}, {"event": 2}]]
+    assert stats["sent"] == 3
+    assert stats["queue_depth"] == 0
+    print("✅ Size trigger flushed a full batch")
+
+def test_drop_oldest_and_flush_on_stop():
+    """A full queue drops the oldest events; stop() flushes the rest"""
+    async def scenario():
+        sent = []
+
+        async def send_batch(events):
+            sent.extend(event["event"] for event in events)
+
+        queue = TelemetryQueue(send_batch, TelemetryConfig(max_queue_size=3, batch_size=10, flush_interval=60))
+        for i in range(5):
+            queue.enqueue({"event": i})
+        depth_before_stop = queue.stats()["queue_depth"]
+        await queue.stop()
+        return sent, depth_before_stop, queue.stats()
+
+    sent, depth_before_stop, stats = asyncio.run(scenario())
+    assert depth_before_stop == 3
+    assert sent == [2, 3, 4]
+    assert stats["dropped"] == 2
+    print("✅ Oldest events dropped and remaining events flushed on shutdown")
+
+def test_failed_batch_is_counted():
+    """Send failures are counted instead of raised to the caller"""
+    async def scenario():
+        async def send_batch(events):
+            raise RuntimeError("Galileo unavailable")
+
+        queue = TelemetryQueue(send_batch, TelemetryConfig(batch_size=10, flush_interval=60))
+        queue.enqueue({"event": 1})
+        await queue.stop()
+        return queue.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["failed"] == 1
+    assert stats["flushes"] == 1
+    print("✅ Failed batches are counted")
+
+if __name__ == "__main__":
+    test_size_trigger_sends_batches()
+    test_drop_oldest_and_flush_on_stop()
+    test_failed_batch_is_counted()
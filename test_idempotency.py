@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for idempotent case creation
+"""
+
+import asyncio
+
+from idempotency import IdempotencyConfig, IdempotencyKeyConflict, IdempotencyStore, case_fingerprint
+
+def _creator():
+    """Fake case creation that counts calls"""
+    calls = []
+
+    async def create():
+        calls.append(len(calls) + 1)
+        await asyncio.sleep(0.05)
+        return {"ID": f"DPIA-{len(calls)}", "status": "Created"}
+
+    return create, calls
+
+def test_concurrent_duplicates_share_one_call():
+    """Concurrent requests with the same key wait on the first one"""
+    async def scenario():
+        store = IdempotencyStore()
+        create, calls = _creator()
+        results = await asyncio.gather(*[store.run("k", "fp", create, 60) for _ in range(5)])
+        return results, calls, store.get_stats()
+
+    results, calls, stats = asyncio.run(scenario())
+    assert calls == [1]
+    assert {result["ID"] for result, _ in results} == {"DPIA-1"}
+    assert [replayed for _, replayed in results].count(False) == 1
+    assert stats["joined"] == 4
+    print("✅ Five concurrent duplicates made one creation")
+
+def test_replay_and_expiry():
+    """A repeat within the TTL is replayed; after it, the case is created again"""
+    async def scenario():
+        store = IdempotencyStore()
+        create, calls = _creator()
+        first, _ = await store.run("k", "fp", create, 60)
+        repeat, replayed = await store.run("k", "fp", create, 60)
+        await store.run("short", "fp", create, 0)
+        await store.run("short", "fp", create, 0)
+        return first, repeat, replayed, calls
+
+    first, repeat, replayed, calls = asyncio.run(scenario())
+    assert repeat == first and replayed
+    assert len(calls) == 3
+    print("✅ Stored result replayed until it expires")
+
+def test_failures_and_rejected_results_are_retried():
+    """Exceptions and results should_store rejects (demo cases) are not remembered"""
+    async def scenario():
+        store = IdempotencyStore()
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("Pega unavailable")
+            return {"ID": "DEMO-1", "status": "Demo Mode"}
+
+        try:
+            await store.run("k", "fp", flaky, 60)
+        except RuntimeError:
+            pass
+        is_real = lambda result: result["status"] == "Created"
+        await store.run("k", "fp", flaky, 60, should_store=is_real)
+        _, replayed = await store.run("k", "fp", flaky, 60, should_store=is_real)
+        return attempts, replayed
+
+    attempts, replayed = asyncio.run(scenario())
+    assert len(attempts) == 3 and not replayed
+    print("✅ Failed and demo creations retried")
+
+def test_key_reuse_for_another_request_conflicts():
+    """The same client key with a different request is rejected"""
+    async def scenario():
+        store = IdempotencyStore()
+        create, _ = _creator()
+        key, ttl = store.resolve_key("case", "fp-a", "client-key")
+        await store.run(key, "fp-a", create, ttl)
+        try:
+            await store.run(key, "fp-b", create, ttl)
+        except IdempotencyKeyConflict:
+            return True
+        return False
+
+    assert asyncio.run(scenario())
+    print("✅ Idempotency-Key reuse with a different request rejected")
+
+def test_keys_and_fingerprints():
+    """Client keys get the long TTL; fingerprints ignore whitespace differences"""
+    store = IdempotencyStore(IdempotencyConfig(key_ttl_seconds=100, fingerprint_ttl_seconds=5))
+    assert store.resolve_key("case", "fp", "abc") == ("case:key:abc", 100)
+    assert store.resolve_key("case", "fp") == ("case:fingerprint:fp", 5)
+    fields = {"pi_name": "Jane Doe"}
+    assert case_fingerprint("case", fields, "Slide  scanning\nstudy") == case_fingerprint("case", fields, "Slide scanning study")
+    assert case_fingerprint("case", fields, "study") != case_fingerprint("case", {"pi_name": "Mark Lee"}, "study")
+    try:
+        store.resolve_key("case", "fp", "x" * 300)
+        raise AssertionError("expected an overlong key to be rejected")
+    except ValueError:
+        pass
+    print("✅ Key resolution and fingerprints")
+
+if __name__ == "__main__":
+    test_concurrent_duplicates_share_one_call()
+    test_replay_and_expiry()
+    test_failures_and_rejected_results_are_retried()
+    test_key_reuse_for_another_request_conflicts()
+    test_keys_and_fingerprints()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental structured-output parser
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from galileo_integration import DPIAAnalysisRequest, MANDATORY_ANALYSIS_FIELDS
+from incremental_json import IncrementalJSONParser
+
+ANALYSIS = {
+    "therapeutic_area": "Pulmonology",
+    "procedure_type": "Fluorescence (IF)",
+    "assay_type": "AT2-TRITC + DAPI",
+    "pi_name": "Jane Doe",
+    "pathologist": "Smith",
+    "confidence_scores": {"pi_name": 0.9, "assay_type": 0.8},
+    "missing_fields": [],
+    "case_type_confidence": 0.9,
+    "recommended_case_type": "DPIA"
+}
+
+def test_fields_are_emitted_as_they_close():
+    """Feeding one character at a time emits each field once, in order"""
+    text = "```json\n" + json.dumps(ANALYSIS, indent=2) + "\n```"
+    parser = IncrementalJSONParser()
+    emitted = []
+    for char in text:
+        emitted.extend(parser.feed(char))
+    assert [field for field, _ in emitted] == list(ANALYSIS)
+    assert parser.fields == ANALYSIS
+    assert parser.complete
+    print("✅ Fields emitted as their values closed")
+
+def test_partial_and_malformed_objects_are_recovered():
+    """A malformed value is skipped and a truncated object keeps its complete fields"""
+    text = '{"therapeutic_area": "Oncology", "case_type_confidence": 0.9x, "pi_name": "Jane", "analysis_summary": "Tumour sec'
+    recovered = IncrementalJSONParser.parse_partial(text)
+    assert recovered == {"therapeutic_area": "Oncology", "pi_name": "Jane"}
+    print("✅ Partial object recovered")
+
+def test_stream_analysis_stops_early_when_mandatory_fields_present(mock_galileo):
+    """Generation stops once every mandatory field has been decoded"""
+    content = json.dumps(ANALYSIS)
+    chunks = [content[i:i + 7] for i in range(0, len(content), 7)]
+    body = "".join(
+        f"data: {json.dumps({'choices': [{'delta': {'content': chunk}}]})}\n\n" for chunk in chunks
+    ) + "data: [DONE]\n\n"
+
+    def handler(request):
+        return httpx.Response(200, content=body.encode("utf-8"), headers={"Content-Type": "text/event-stream"})
+
+    async def scenario():
+        integration = mock_galileo(handler)
+        seen = []
+        fields = await integration.stream_analysis(
+            DPIAAnalysisRequest(text="lung tissue sections"),
+            on_field=lambda field, value: seen.append(field),
+            stop_when_fields=MANDATORY_ANALYSIS_FIELDS
+        )
+        stats = integration.get_parse_stats()
+        await integration.close()
+        return fields, seen, stats
+
+    fields, seen, stats = asyncio.run(scenario())
+    assert seen == MANDATORY_ANALYSIS_FIELDS
+    assert "recommended_case_type" not in fields
+    assert stats["early_stops"] == 1
+    print("✅ Analysis stream stopped once mandatory fields were present")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(["-q", "-s", __file__]))
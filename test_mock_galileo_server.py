@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for the local Galileo AI stand-in server
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from galileo_integration import DPIAAnalysisRequest
+from galileo_retry import GalileoRetryConfig, RetryPolicy
+from mock_galileo_server import LATENCY_FIXED, LATENCY_LONG_TAIL, MockGalileoConfig, MockGalileoState, create_app
+
+SAMPLE_TEXT = (
+    "Lung stem cells (AT2-TRITC) and total cells (DAPI) are stained in lung sections from 4 groups. "
+    "We need slide scanning and quantification per lung section. PI as John, Pathologist as Smith."
+)
+
+def _mock_app(mock_config: MockGalileoConfig) -> httpx.ASGITransport:
+    """Transport that serves requests from the mock app in-process"""
+    return httpx.ASGITransport(app=create_app(mock_config))
+
+def test_analysis_is_deterministic_dpia_json(mock_galileo):
+    """The analysis prompt gets structured DPIA JSON built from the research text"""
+    async def scenario():
+        integration = mock_galileo(_mock_app(MockGalileoConfig()))
+        try:
+            first = await integration.analyze_dpia_text(DPIAAnalysisRequest(text=SAMPLE_TEXT))
+            second = await integration.analyze_dpia_text(DPIAAnalysisRequest(text=SAMPLE_TEXT))
+            return first, second
+        finally:
+            await integration.close()
+
+    first, second = asyncio.run(scenario())
+    assert not first.is_fallback
+    assert first.recommended_case_type == "DPIA"
+    assert first.model_dump() == second.model_dump()
+    print(f"✅ Deterministic mock analysis: {first.therapeutic_area} / {first.pi_name} / {first.recommended_case_type}")
+
+def test_streaming_completion(mock_galileo):
+    """Streamed chat completions arrive in several SSE chunks"""
+    async def scenario():
+        integration = mock_galileo(_mock_app(MockGalileoConfig(stream_chunk_chars=4)))
+        try:
+            return [delta async for delta in integration.stream_chat_completion([{"role": "user", "content": "Hello there"}])]
+        finally:
+            await integration.close()
+
+    deltas = asyncio.run(scenario())
+    assert len(deltas) > 1
+    assert "Hello there" in "".join(deltas)
+    print(f"✅ Streamed {len(deltas)} chunks")
+
+def test_rate_limit_returns_retry_after():
+    """Requests beyond the burst are rejected with 429 and a Retry-After header"""
+    async def scenario():
+        app = create_app(MockGalileoConfig(rate_limit_rps=1, rate_limit_burst=2))
+        async with httpx.AsyncClient(base_url="http://mock-galileo", transport=httpx.ASGITransport(app=app)) as client:
+            return [await client.post("/v1/metrics/log", json={"events": [{}]}) for _ in range(3)]
+
+    responses = asyncio.run(scenario())
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert float(responses[-1].headers["Retry-After"]) > 0
+    print("✅ Rate limit answered with 429 and Retry-After")
+
+def test_injected_errors_are_retried(mock_galileo):
+    """Injected 5xx errors are seeded and the client's retries recover from them"""
+    async def scenario():
+        integration = mock_galileo(
+            _mock_app(MockGalileoConfig(error_rate=0.3, error_statuses=[503], seed=7)),
+            retries=GalileoRetryConfig(default_policy=RetryPolicy(max_attempts=4, base_delay=0.001))
+        )
+        try:
+            replies = [await integration.chat_completion([{"role": "user", "content": f"ping {i}"}]) for i in range(5)]
+            return replies, integration.get_retry_stats()
+        finally:
+            await integration.close()
+
+    replies, stats = asyncio.run(scenario())
+    assert len(replies) == 5
+    assert stats["endpoints"]["/chat/completions"]["retries"] > 0
+    print(f"✅ Recovered from injected errors with {stats['endpoints']['/chat/completions']['retries']} retries")
+
+def test_latency_profiles():
+    """Fixed latency is constant and the long-tail profile adds occasional slow requests"""
+    fixed = MockGalileoState(MockGalileoConfig(latency_profile=LATENCY_FIXED, latency_ms=50))
+    assert {fixed.sample_latency() for _ in range(10)} == {0.05}
+
+    tail = MockGalileoState(MockGalileoConfig(
+        latency_profile=LATENCY_LONG_TAIL, latency_ms=10, tail_probability=0.2, tail_multiplier=10, seed=1
+    ))
+    samples = [tail.sample_latency() for _ in range(200)]
+    assert set(samples) == {0.01, 0.1}
+    print(f"✅ Long-tail profile: {samples.count(0.1)}/200 slow requests")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(["-q", "-s", __file__]))
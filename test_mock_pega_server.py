@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script for the local Pega stand-in server
+"""
+
+import asyncio
+
+import httpx
+
+from mock_galileo_server import LATENCY_FIXED
+from mock_pega_server import MockPegaConfig, MockPegaState, create_app
+from pega_cache import PegaCacheConfig
+from pega_client import OP_CREATE_CASE, OP_GET_CASE, PegaClient, PegaConfig, pega_error_message
+
+CASE_REQUEST = {"caseTypeID": "Roche-Pathworks-Work-DPIA", "processID": "pyStartCase", "content": {"pyLabel": "Lung study"}}
+
+def _client(mock_config: MockPegaConfig) -> PegaClient:
+    """Uncached Pega client whose HTTP transport talks to the mock app in-process"""
+    return PegaClient(
+        PegaConfig(base_url="http://mock-pega/prweb/api/v1", cache=PegaCacheConfig(enabled=False)),
+        transport=httpx.ASGITransport(app=create_app(mock_config))
+    )
+
+def test_case_lifecycle():
+    """Created cases can be read, revalidated, updated with If-Match and have assignments"""
+    async def scenario():
+        client = _client(MockPegaConfig())
+        try:
+            created = await client.create_case(CASE_REQUEST)
+            case_id = created.json()["ID"]
+            first = await client.get_case(case_id)
+            revalidated = await client.request(
+                OP_GET_CASE, "GET", f"/cases/{case_id}", headers={"If-None-Match": first.headers["ETag"]}
+            )
+            updated = await client.update_case(case_id, {"content": {"status": "Open"}}, etag=first.headers["ETag"])
+            stale = await client.update_case(case_id, {"content": {"pyLabel": "Stale"}}, etag=first.headers["ETag"])
+            case = await client.get_case(case_id)
+            assignments = await client.get_assignments(case_id)
+            missing = await client.get_case("ROCHE-PATHWORKS-WORK-DPIA D-9")
+            return created, first, revalidated, updated, stale, case, assignments, missing
+        finally:
+            await client.close()
+
+    created, first, revalidated, updated, stale, case, assignments, missing = asyncio.run(scenario())
+    assert created.status_code == 201
+    assert first.json()["content"]["pyLabel"] == "Lung study"
+    assert revalidated.status_code == 304
+    assert updated.status_code == 204
+    assert stale.status_code == 412
+    assert case.json()["status"] == "Open"
+    assert len(assignments.json()["assignments"]) == 1
+    assert missing.status_code == 404
+    print(f"✅ Case lifecycle against mock Pega: {created.json()['ID']}")
+
+def test_validation_errors_use_pega_format():
+    """Missing required fields and unknown case types are rejected in Pega's error shape"""
+    async def scenario():
+        client = _client(MockPegaConfig(required_fields=["pyLabel", "PIName"], case_types=["Roche-Pathworks-Work-DPIA"]))
+        try:
+            missing_field = await client.create_case(CASE_REQUEST)
+            unknown_type = await client.create_case({**CASE_REQUEST, "caseTypeID": "Other"})
+            return missing_field, unknown_type
+        finally:
+            await client.close()
+
+    missing_field, unknown_type = asyncio.run(scenario())
+    assert missing_field.status_code == 422
+    assert pega_error_message(missing_field) == "Error_Validation_Fail - PIName is required"
+    assert "Unknown case type Other" in pega_error_message(unknown_type)
+    print(f"✅ Validation error: {pega_error_message(missing_field)}")
+
+def test_throttling_and_injected_errors():
+    """Rate limiting and throttling answer 429 with Retry-After; errors are injected per operation"""
+    async def scenario():
+        limited = _client(MockPegaConfig(rate_limit_rps=1, rate_limit_burst=2))
+        throttled = _client(MockPegaConfig(throttle_rate=1.0, retry_after_seconds=2))
+        failing = _client(MockPegaConfig(operation_error_rates={OP_CREATE_CASE: 1.0}, error_statuses=[503]))
+        try:
+            rate_limited = [await limited.create_case(CASE_REQUEST) for _ in range(3)]
+            return rate_limited, await throttled.list_cases(), await failing.create_case(CASE_REQUEST), await failing.list_cases()
+        finally:
+            for client in (limited, throttled, failing):
+                await client.close()
+
+    rate_limited, throttled, failed_create, listing = asyncio.run(scenario())
+    assert [response.status_code for response in rate_limited] == [201, 201, 429]
+    assert float(rate_limited[-1].headers["Retry-After"]) > 0
+    assert throttled.status_code == 429 and throttled.headers["Retry-After"] == "2"
+    assert failed_create.status_code == 503
+    assert listing.status_code == 200
+    print("✅ 429 with Retry-After and per-operation error injection")
+
+def test_paginated_listing_with_seed_cases():
+    """Seeded cases are listed page by page and filtered by status"""
+    async def scenario():
+        client = _client(MockPegaConfig(seed_cases=250))
+        try:
+            pages = [len(items) async for items in client.iter_case_pages(per_page=100)]
+            open_cases = [case async for case in client.iter_cases({"status": "open"}, per_page=50)]
+            return pages, open_cases
+        finally:
+            await client.close()
+
+    pages, open_cases = asyncio.run(scenario())
+    assert pages == [100, 100, 50]
+    assert len(open_cases) == 83
+    assert all(case["status"] == "Open" and "content" not in case for case in open_cases)
+    print(f"✅ Listed {sum(pages)} seeded cases in {len(pages)} pages, {len(open_cases)} open")
+
+def test_operation_latency_overrides():
+    """Per-operation latency overrides the profile's default latency"""
+    state = MockPegaState(MockPegaConfig(latency_profile=LATENCY_FIXED, latency_ms=20, operation_latency_ms={OP_CREATE_CASE: 300}))
+    assert state.sample_latency(OP_CREATE_CASE) == 0.3
+    assert state.sample_latency(OP_GET_CASE) == 0.02
+    try:
+        state.configure(MockPegaConfig(operation_latency_ms={"delete_case": 1}))
+        assert False, "unknown operations should be rejected"
+    except ValueError:
+        pass
+    print("✅ Per-operation latency overrides")
+
+if __name__ == "__main__":
+    test_case_lifecycle()
+    test_validation_errors_use_pega_format()
+    test_throttling_and_injected_errors()
+    test_paginated_listing_with_seed_cases()
+    test_operation_latency_overrides()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the Pega case read cache
+"""
+
+import time
+import asyncio
+
+import httpx
+
+from pega_cache import CACHE_HIT, CACHE_MISS, CACHE_REVALIDATED, RESOURCE_CASE, RESOURCE_CASE_LIST, PegaCacheConfig, PegaReadCache
+from pega_client import PegaClient, PegaConfig
+
+def _client(ttl: float = 30.0):
+    """Client against a fake Pega that sends ETags and honours If-None-Match"""
+    calls = []
+    version = {"DPIA-1": 1}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path, request.headers.get("If-None-Match")))
+        if request.method == "POST":
+            return httpx.Response(201, json={"ID": "DPIA-2"})
+        if request.method == "PUT":
+            version["DPIA-1"] += 1
+            return httpx.Response(204)
+        if request.url.path.endswith("/cases"):
+            return httpx.Response(200, json={"cases": [{"ID": "DPIA-1"}]})
+        etag = f'"v{version["DPIA-1"]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, headers={"ETag": etag}, json={"ID": "DPIA-1", "version": version["DPIA-1"]})
+
+    ttls = {RESOURCE_CASE: ttl, RESOURCE_CASE_LIST: ttl}
+    config = PegaConfig(base_url="http://pega.test/prweb/api/v1", cache=PegaCacheConfig(ttl_seconds=ttls))
+    return PegaClient(config, transport=httpx.MockTransport(handler)), calls
+
+def test_fresh_reads_skip_pega():
+    """Repeated reads within the TTL are served from the cache"""
+    async def scenario():
+        client, calls = _client()
+        try:
+            first = await client.get_case("DPIA-1")
+            second = await client.get_case("DPIA-1")
+            return first, second, calls, client.get_stats()["cache"]
+        finally:
+            await client.close()
+
+    first, second, calls, stats = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert first.extensions["pega_cache"] == CACHE_MISS and second.extensions["pega_cache"] == CACHE_HIT
+    assert second.json() == first.json()
+    assert stats["resources"][RESOURCE_CASE]["hit_ratio"] == 0.5
+    print("✅ Fresh case read served without a round trip")
+
+def test_expired_entries_revalidate_with_etag():
+    """After the TTL the cached ETag turns the fetch into a 304"""
+    async def scenario():
+        client, calls = _client(ttl=0.0)
+        try:
+            await client.get_case("DPIA-1")
+            revalidated = await client.get_case("DPIA-1")
+            return revalidated, calls
+        finally:
+            await client.close()
+
+    revalidated, calls = asyncio.run(scenario())
+    assert calls[1][2] == '"v1"'
+    assert revalidated.status_code == 200 and revalidated.extensions["pega_cache"] == CACHE_REVALIDATED
+    assert revalidated.json()["version"] == 1
+    print("✅ Expired entry revalidated with If-None-Match")
+
+def test_writes_invalidate():
+    """Our own update drops the case; our own create drops case lists"""
+    async def scenario():
+        client, calls = _client()
+        try:
+            await client.list_cases({"page": 1})
+            await client.create_case({"caseTypeID": "DPIA"})
+            listed = await client.list_cases({"page": 1})
+            await client.get_case("DPIA-1")
+            await client.update_case("DPIA-1", {"content": {}})
+            updated = await client.get_case("DPIA-1")
+            return listed, updated
+        finally:
+            await client.close()
+
+    listed, updated = asyncio.run(scenario())
+    assert listed.extensions["pega_cache"] == CACHE_MISS
+    assert updated.extensions["pega_cache"] == CACHE_MISS and updated.json()["version"] == 2
+    print("✅ Creates and updates invalidate stale reads")
+
+def test_lru_eviction_and_param_keys():
+    """Query parameter order does not matter; the oldest entry is evicted first"""
+    cache = PegaReadCache(PegaCacheConfig(max_entries=1))
+    assert cache.make_key("/cases", {"page": 1, "status": "Open"}) == cache.make_key("/cases", {"status": "Open", "page": 1})
+    response = httpx.Response(200, json={}, request=httpx.Request("GET", "http://pega.test/cases"))
+    cache.store(RESOURCE_CASE, "a", "/cases/a", response)
+    cache.store(RESOURCE_CASE, "b", "/cases/b", response)
+    assert cache.lookup("a") is None and cache.lookup("b").expires_at > time.time()
+    assert cache.get_stats()["evictions"] == 1
+    print("✅ Cache keys and LRU eviction")
+
+if __name__ == "__main__":
+    test_fresh_reads_skip_pega()
+    test_expired_entries_revalidate_with_etag()
+    test_writes_invalidate()
+    test_lru_eviction_and_param_keys()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared async Pega client and its sync facade
+"""
+
+import asyncio
+import base64
+
+import httpx
+
+from pega_client import OP_CREATE_CASE, OP_GET_CASE, PegaClient, PegaConfig, SyncPegaClient, pega_error_message
+
+CONFIG = PegaConfig(base_url="http://pega.test/prweb/api/v1", username="user", password="secret")
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.method == "POST" and request.url.path.endswith("/cases"):
+        return httpx.Response(201, json={"ID": "DPIA-1", "nextPageID": "A-1", "timeouts": request.extensions["timeout"]})
+    if request.url.path.endswith("/cases/missing"):
+        return httpx.Response(404, json={"errors": [{"message": "Case not found", "ValidationMessages": [{"ValidationMessage": "Unknown ID"}]}]})
+    return httpx.Response(200, json={"ID": request.url.path.rsplit("/", 1)[-1], "auth": request.headers["Authorization"]})
+
+def test_auth_and_operation_timeouts():
+    """Requests carry basic auth and each operation's own timeouts"""
+    async def scenario():
+        client = PegaClient(CONFIG, transport=httpx.MockTransport(_handler))
+        try:
+            created = (await client.create_case({"caseTypeID": "Roche-Pathworks-Work-DPIA"})).json()
+            fetched = (await client.get_case("DPIA-1")).json()
+            return created, fetched
+        finally:
+            await client.close()
+
+    created, fetched = asyncio.run(scenario())
+    assert created["timeouts"]["read"] == CONFIG.operation_timeouts[OP_CREATE_CASE].read
+    assert fetched["auth"] == "Basic " + base64.b64encode(b"user:secret").decode()
+    print("✅ Basic auth and per-operation timeouts applied")
+
+def test_errors_and_stats():
+    """Error responses are returned for the caller to handle and counted per operation"""
+    def slow(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("Pega too slow", request=request)
+
+    async def scenario():
+        client = PegaClient(CONFIG, transport=httpx.MockTransport(_handler))
+        timing_out = PegaClient(CONFIG, transport=httpx.MockTransport(slow))
+        try:
+            missing = await client.get_case("missing")
+            try:
+                await timing_out.get_case("DPIA-1")
+                raise AssertionError("expected a timeout")
+            except httpx.TimeoutException:
+                pass
+            return missing, client.get_stats(), timing_out.get_stats()
+        finally:
+            await client.close()
+            await timing_out.close()
+
+    missing, stats, timeout_stats = asyncio.run(scenario())
+    assert missing.status_code == 404
+    assert pega_error_message(missing) == "Case not found - Unknown ID"
+    assert stats["operations"][OP_GET_CASE]["errors"] == 1
+    assert timeout_stats["operations"][OP_GET_CASE]["timeouts"] == 1
+    print("✅ Pega errors surfaced and counted")
+
+def test_slow_pega_does_not_block_event_loop():
+    """Other coroutines keep running while a Pega call is waiting"""
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={"ID": "DPIA-1"})
+
+    async def scenario():
+        client = PegaClient(CONFIG, transport=httpx.MockTransport(slow_handler))
+        ticks = 0
+
+        async def other_traffic():
+            nonlocal ticks
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        try:
+            await asyncio.gather(client.get_case("DPIA-1"), other_traffic())
+            return ticks
+        finally:
+            await client.close()
+
+    assert asyncio.run(scenario()) == 10
+    print("✅ Event loop kept serving while Pega was slow")
+
+def test_sync_facade():
+    """The sync facade reuses one client across calls"""
+    with SyncPegaClient(CONFIG, transport=httpx.MockTransport(_handler)) as pega:
+        first = pega.get_case("DPIA-1").json()
+        second = pega.list_cases({"page": 1}).json()
+        stats = pega.get_stats()
+    assert first["ID"] == "DPIA-1" and second["ID"] == "cases"
+    assert stats["operations"][OP_GET_CASE]["requests"] == 1
+    print("✅ Sync facade served two calls on one client")
+
+if __name__ == "__main__":
+    test_auth_and_operation_timeouts()
+    test_errors_and_stats()
+    test_slow_pega_does_not_block_event_loop()
+    test_sync_facade()
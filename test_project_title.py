@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for project titles taken from the analysis or generated in the background
+"""
+
+import json
+import asyncio
+
+import httpx
+import pytest
+
+from galileo_claude_adapter import GalileoClaudeAdapter
+
+RESEARCH_TEXT = (
+    "Oncology study of cancer tumor biopsies. Brightfield light microscopy of IHC immunohistochemistry "
+    "with DAB chromogen. Pathologist: Mark Lee; PI: Jane Doe."
+)
+# Only one bright-field keyword, so the procedure is escalated to the LLM
+ESCALATED_TEXT = RESEARCH_TEXT.replace("Brightfield light microscopy", "Brightfield imaging")
+
+def _adapter(mock_galileo):
+    """Adapter whose Galileo integration answers title prompts and records them"""
+    title_prompts = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        prompt = json.loads(request.content)["messages"][-1]["content"]
+        if "project title" in prompt.lower():
+            title_prompts.append(prompt)
+            await asyncio.sleep(0.01)
+            content = 'Project Title: "CD8 Infiltration in Tumor Biopsies"'
+        elif "enhanced_value" in prompt:
+            content = json.dumps({"procedure_type": {"enhanced_value": "Bright-field (BF)", "confidence": 0.9}})
+        else:
+            content = json.dumps({"therapeutic_area": "Oncology"})
+        return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+    integration = mock_galileo(handler, install=True)
+    return GalileoClaudeAdapter(), integration, title_prompts
+
+def _run(mock_galileo, scenario):
+    async def wrapper():
+        adapter, integration, title_prompts = _adapter(mock_galileo)
+        try:
+            return await scenario(adapter), title_prompts, adapter.get_title_stats()
+        finally:
+            await integration.close()
+
+    return asyncio.run(wrapper())
+
+def test_generated_title_uses_completion_text(mock_galileo):
+    """The completion text is cleaned up into the title instead of falling back"""
+    title, _, _ = _run(mock_galileo, lambda adapter: adapter.generate_project_title(RESEARCH_TEXT))
+    assert title == "CD8 Infiltration in Tumor Biopsies"
+    print(f"✅ Generated title: {title}")
+
+def test_analysed_title_skips_generation(mock_galileo):
+    """A title found by the analysis is used without another completion"""
+    title, title_prompts, stats = _run(mock_galileo, lambda adapter: adapter.resolve_project_title(RESEARCH_TEXT, "Tumor CD8 Study"))
+    assert title == "Tumor CD8 Study"
+    assert title_prompts == [] and stats["from_analysis"] == 1
+    print("✅ Analysed title used directly")
+
+def test_title_prefetched_after_analysis(mock_galileo):
+    """With only a guessed title, an LLM analysis starts generating one; it is awaited once and later requests hit the cache"""
+    async def scenario(adapter):
+        analysis = await adapter.analyze_research_text(ESCALATED_TEXT)
+        in_flight = adapter.get_title_stats()["in_flight"]
+        detected_title = analysis.detected_fields["project_title"]
+        first = await adapter.resolve_project_title(ESCALATED_TEXT, detected_title)
+        second = await adapter.resolve_project_title(ESCALATED_TEXT, detected_title)
+        return detected_title, in_flight, first, second
+
+    (detected_title, in_flight, first, second), title_prompts, stats = _run(mock_galileo, scenario)
+    assert detected_title == "Cancer Tumor Imaging Study"  # keyword guess, below the confidence threshold
+    assert in_flight == 1
+    assert first == second == "CD8 Infiltration in Tumor Biopsies"
+    assert len(title_prompts) == 1
+    assert stats["prefetched"] == 1 and stats["awaited_in_flight"] == 1 and stats["cache_hits"] == 1
+    print("✅ Title prefetched after analysis, awaited once and then served from cache")
+
+def test_keyword_only_analysis_skips_prefetch(mock_galileo):
+    """An analysis the keyword tier answered alone starts no title completion and still counts as avoiding the LLM"""
+    async def scenario(adapter):
+        await adapter.analyze_research_text(RESEARCH_TEXT)
+        return adapter.get_tier_stats()
+
+    tier_stats, title_prompts, stats = _run(mock_galileo, scenario)
+    assert title_prompts == [] and stats["prefetched"] == 0 and stats["in_flight"] == 0
+    assert tier_stats["keyword_only"] == 1 and tier_stats["llm_avoided_ratio"] == 1.0
+    print("✅ Keyword-only analysis left the LLM untouched")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(["-q", "-s", __file__]))
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for token-budget-aware prompt assembly
+"""
+
+from galileo_integration import DPIAAnalysisRequest, GalileoConfig, GalileoLLMIntegration
+from prompt_budget import PromptBudgetConfig, estimate_tokens, fit_text, TRIM_NONE, TRIM_SELECTED
+
+FILLER = "The laboratory schedule and shipping logistics are described in the appendix. " * 20
+
+def test_short_text_is_untouched():
+    """Text inside the budget is returned unchanged"""
+    text = "Lung tissue sections stained with DAPI. PI: Dr. Smith."
+    fitted, report = fit_text(text, budget_tokens=500)
+    assert fitted == text
+    assert not report.trimmed
+    assert report.strategy == TRIM_NONE
+    print("✅ Short text kept as-is")
+
+def test_long_text_keeps_relevant_sections_within_budget():
+    """Relevant sections are kept first and the result fits the budget"""
+    sections = [
+        "Project: AT2 cell quantification in injured lungs.",
+        FILLER,
+        "PI is Dr. Jane Doe and the pathologist is Dr. Smith.",
+        FILLER,
+        "Tissue sections will be stained with TRITC and DAPI for slide scanning."
+    ]
+    text = "\n\n".join(sections)
+    budget = 120
+    fitted, report = fit_text(text, budget_tokens=budget)
+    assert report.trimmed
+    assert report.strategy == TRIM_SELECTED
+    assert estimate_tokens(fitted) <= budget
+    assert "Dr. Jane Doe" in fitted
+    assert "TRITC" in fitted
+    assert report.sections_kept < report.sections_total
+    assert fitted.startswith("Project:")
+    print("✅ Long text trimmed to relevant sections within budget")
+
+def test_analysis_prompt_reports_trim_decisions():
+    """The analysis prompt fits the context window and reports what was trimmed"""
+    config = GalileoConfig(
+        api_key="test-key",
+        project_id="test-project",
+        max_tokens=1000,
+        prompt_budget=PromptBudgetConfig(context_window=6000)
+    )
+    integration = GalileoLLMIntegration(config)
+    text = "\n\n".join(["PI: Dr. Smith. Lung tissue sections stained with DAPI.", FILLER * 10])
+    prompt, report = integration._build_analysis_prompt(DPIAAnalysisRequest(text=text))
+    assert report["research_text"]["trimmed"]
+    assert report["estimated_prompt_tokens"] + report["output_reserve_tokens"] <= 6000
+    assert "Dr. Smith" in prompt
+    print("✅ Analysis prompt fit the context window and reported trimming")
+
+if __name__ == "__main__":
+    test_short_text_is_untouched()
+    test_long_text_keeps_relevant_sections_within_budget()
+    test_analysis_prompt_reports_trim_decisions()
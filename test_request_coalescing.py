@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for single-flight coalescing of identical in-flight calls
+"""
+
+import asyncio
+
+from request_coalescing import SingleFlight
+
+def test_concurrent_callers_share_one_call():
+    """Five concurrent callers with the same key make one upstream call"""
+    async def scenario():
+        flights = SingleFlight("test")
+        calls = []
+
+        async def upstream():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"therapeutic_area": "Pulmonology"}
+
+        results = await asyncio.gather(*[flights.run("same-text", upstream) for _ in range(5)])
+        return flights, calls, results
+
+    flights, calls, results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(result == {"therapeutic_area": "Pulmonology"} for result in results)
+    assert flights.stats()["coalesced_calls"] == 4
+    assert flights.stats()["in_flight"] == 0
+    print("✅ Concurrent identical calls were coalesced")
+
+def test_initiator_cancellation_keeps_shared_call():
+    """Cancelling the first caller does not cancel the call for the remaining waiters"""
+    async def scenario():
+        flights = SingleFlight("test")
+
+        async def upstream():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        initiator = asyncio.ensure_future(flights.run("key", upstream))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.run("key", upstream))
+        await asyncio.sleep(0)
+        initiator.cancel()
+        return await follower, initiator.cancelled(), flights.stats()
+
+    result, initiator_cancelled, stats = asyncio.run(scenario())
+    assert result == "done"
+    assert initiator_cancelled
+    assert stats["cancelled_flights"] == 0
+    print("✅ Remaining waiters still receive the shared result")
+
+def test_last_waiter_cancellation_cancels_upstream():
+    """The upstream call is cancelled once every caller has gone away"""
+    async def scenario():
+        flights = SingleFlight("test")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def upstream():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.ensure_future(flights.run("key", upstream))
+        await started.wait()
+        caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        return flights.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["cancelled_flights"] == 1
+    print("✅ Abandoned upstream call was cancelled")
+
+if __name__ == "__main__":
+    test_concurrent_callers_share_one_call()
+    test_initiator_cancellation_keeps_shared_call()
+    test_last_waiter_cancellation_cancels_upstream()
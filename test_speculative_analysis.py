@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for speculative (keyword answer first, LLM result reconciled later) analysis
+"""
+
+import json
+import asyncio
+
+import httpx
+import pytest
+
+from galileo_claude_adapter import GalileoClaudeAdapter
+from tiered_analysis import TIER_KEYWORD, TIER_LLM
+
+RESEARCH_TEXT = (
+    "Oncology study of cancer tumor biopsies. Brightfield light microscopy of IHC immunohistochemistry "
+    "with DAB chromogen. Pathologist: Mark Lee; PI: Jane Doe; Purpose: quantify CD8 infiltration."
+)
+
+LLM_ANALYSIS = {
+    "therapeutic_area": "Immuno-oncology",
+    "procedure_type": "Bright-field (BF)",
+    "assay_type": "IHC",
+    "pi_name": "Jane Doe",
+    "pathologist": "Unknown",
+    "missing_fields": ["pathologist"],
+    "recommended_case_type": "DPIA"
+}
+
+def _adapter(mock_galileo, content: str, release: asyncio.Event):
+    """Adapter whose Galileo completion waits for `release` before answering with `content`"""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+    integration = mock_galileo(handler, install=True)
+    adapter = GalileoClaudeAdapter()
+    adapter.analysis_cache = None
+    return adapter, integration
+
+def _speculate(mock_galileo, content: str):
+    async def scenario():
+        release = asyncio.Event()
+        adapter, integration = _adapter(mock_galileo, content, release)
+        try:
+            provisional, llm_task = adapter.start_speculative_analysis(RESEARCH_TEXT)
+            await asyncio.sleep(0.01)
+            pending_while_provisional = not llm_task.done()
+            release.set()
+            reconciled, changes = adapter.reconcile_analysis(provisional, await llm_task)
+            return provisional, pending_while_provisional, reconciled, changes, adapter.get_speculative_stats()
+        finally:
+            await integration.close()
+
+    return asyncio.run(scenario())
+
+def test_provisional_answer_before_llm(mock_galileo):
+    """The keyword answer is available while the LLM analysis is still running"""
+    provisional, pending, _, _, _ = _speculate(mock_galileo, json.dumps(LLM_ANALYSIS))
+    assert pending
+    assert provisional.provisional
+    assert provisional.detected_fields["therapeutic_area"] == "Oncology"
+    assert set(provisional.field_tiers.values()) == {TIER_KEYWORD}
+    print("✅ Provisional keyword answer returned before the LLM finished")
+
+def test_llm_result_reconciled(mock_galileo):
+    """LLM values replace the provisional ones; fields it left Unknown keep their keyword value"""
+    _, _, reconciled, changes, stats = _speculate(mock_galileo, json.dumps(LLM_ANALYSIS))
+    assert not reconciled.provisional
+    assert changes["status"] == "reconciled"
+    assert changes["changed_fields"]["therapeutic_area"] == {"provisional": "Oncology", "final": "Immuno-oncology"}
+    assert "pi_name" not in changes["changed_fields"]
+    assert changes["kept_fields"] == ["pathologist", "project_title", "request_purpose"]
+    assert reconciled.detected_fields["pathologist"] == "Mark Lee"
+    assert reconciled.field_tiers["pathologist"] == TIER_KEYWORD
+    assert reconciled.field_tiers["therapeutic_area"] == TIER_LLM
+    assert "pathologist" not in reconciled.missing_fields
+    assert stats["runs"] == 1 and stats["revised"] == 1
+    print(f"✅ Reconciled: {sorted(changes['changed_fields'])} changed, {changes['kept_fields']} kept")
+
+def test_failed_llm_keeps_provisional(mock_galileo):
+    """An unusable LLM answer leaves the provisional result in place"""
+    provisional, _, reconciled, changes, stats = _speculate(mock_galileo, "not an analysis")
+    assert changes["status"] == "llm_unavailable" and changes["changed_fields"] == {}
+    assert reconciled.detected_fields == provisional.detected_fields
+    assert not reconciled.provisional
+    assert stats["kept_provisional"] == 1
+    print("✅ Provisional answer kept when the LLM analysis failed")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(["-q", "-s", __file__]))
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for the tiered (keyword first, LLM for weak fields) analysis
+"""
+
+import json
+import asyncio
+
+import httpx
+import pytest
+
+from galileo_claude_adapter import AnalysisResult, GalileoClaudeAdapter
+from galileo_integration import DPIAAnalysisResult
+from tiered_analysis import TIER_KEYWORD, TIER_LLM, KeywordAnalyzer, TieredAnalysisConfig, keyword_confidence
+
+CLEAR_TEXT = (
+    "Oncology study of cancer tumor biopsies. Brightfield light microscopy of IHC immunohistochemistry "
+    "with DAB chromogen. Pathologist: Mark Lee; PI: Jane Doe; Purpose: quantify CD8 infiltration."
+)
+# Only one bright-field keyword, so the procedure is not certain enough
+WEAK_PROCEDURE_TEXT = CLEAR_TEXT.replace("Brightfield light microscopy", "Brightfield imaging")
+
+def _adapter(mock_galileo, tiered: bool = True, monitoring: bool = False, payloads=None):
+    """Adapter whose Galileo integration records every completion prompt (and payload) it is sent"""
+    prompts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if "messages" not in body:
+            return httpx.Response(200, json={"status": "logged"})  # batched analysis metrics
+        if payloads is not None:
+            payloads.append(body)
+        prompt = body["messages"][-1]["content"]
+        prompts.append(prompt)
+        if "enhanced_value" in prompt:
+            content = json.dumps({
+                "procedure_type": {"enhanced_value": "Bright-field (BF)", "confidence": 0.9},
+                "recommended_case_type": {"enhanced_value": "CALM", "confidence": 0.8}
+            })
+        else:
+            content = json.dumps({"therapeutic_area": "Oncology", "recommended_case_type": "DPIA"})
+        return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+    integration = mock_galileo(handler, install=True, enable_monitoring=monitoring)
+    adapter = GalileoClaudeAdapter()
+    adapter.analysis_cache = None
+    adapter.tiered_analysis = TieredAnalysisConfig(enabled=tiered)
+    return adapter, integration, prompts
+
+def test_keyword_confidence():
+    """More hits raise confidence; a close runner-up lowers it"""
+    assert keyword_confidence({"A": 0, "B": 0}, "Unknown")[0] == 0.0
+    clear, _ = keyword_confidence({"A": 3, "B": 0}, "A")
+    contested, _ = keyword_confidence({"A": 3, "B": 2}, "A")
+    single, _ = keyword_confidence({"A": 1, "B": 0}, "A")
+    assert clear > single > contested
+    print(f"✅ Keyword confidence: clear {clear}, single hit {single}, contested {contested}")
+
+def test_keyword_analyzer_marks_stated_values():
+    """Labelled, clean names are confident; names that ran into the next sentence are not"""
+    detections = KeywordAnalyzer().detect_fields(CLEAR_TEXT)
+    assert detections["pi_name"].value == "Jane Doe" and detections["pi_name"].confidence >= 0.7
+    messy = KeywordAnalyzer().detect_fields("PI: Jane Doe. Pathologist: Dr. Lee. IHC staining with CD8")
+    assert messy["pathologist"].confidence < 0.7
+    print("✅ Explicit labels only count for clean values")
+
+def test_confident_fields_skip_llm(mock_galileo):
+    """When every mandatory field is confident, Galileo AI is not called at all"""
+    async def scenario():
+        adapter, integration, prompts = _adapter(mock_galileo)
+        try:
+            result = await adapter.analyze_research_text(CLEAR_TEXT)
+            return result, prompts, adapter.get_tier_stats()
+        finally:
+            await integration.close()
+
+    result, prompts, stats = asyncio.run(scenario())
+    assert prompts == []
+    assert set(result.field_tiers.values()) == {TIER_KEYWORD}
+    assert result.detected_fields["therapeutic_area"] == "Oncology"
+    assert stats["keyword_only"] == 1 and stats["llm_avoided_ratio"] == 1.0
+    print("✅ Keyword tier answered without calling the LLM")
+
+def test_weak_field_escalated_with_scoped_prompt(mock_galileo):
+    """Only the weak field (plus the case type) is sent to the LLM and its answer is recorded as the LLM tier"""
+    async def scenario():
+        adapter, integration, prompts = _adapter(mock_galileo)
+        try:
+            result = await adapter.analyze_research_text(WEAK_PROCEDURE_TEXT)
+            return result, prompts, adapter.get_tier_stats()
+        finally:
+            await integration.close()
+
+    result, prompts, stats = asyncio.run(scenario())
+    assert len(prompts) == 1
+    assert "- procedure_type:" in prompts[0] and "- pi_name:" not in prompts[0]
+    assert "- recommended_case_type (CALM or DPIA):" in prompts[0]
+    assert result.detected_fields["recommended_case_type"] == "CALM"
+    assert result.field_tiers["procedure_type"] == TIER_LLM
+    assert result.field_tiers["pi_name"] == TIER_KEYWORD
+    assert result.confidence_scores["procedure_type"] == 0.9
+    assert stats["llm_escalations"] == 1 and stats["fields_escalated"] == 1
+    assert stats["llm_avoided_ratio"] == 0.0
+    print("✅ Weak field escalated with a field-scoped prompt")
+
+def test_escalation_keeps_attribution_context_and_metrics(mock_galileo):
+    """Escalated analyses carry user/session IDs and reference context, and log analysis metrics"""
+    async def scenario():
+        payloads = []
+        adapter, integration, prompts = _adapter(mock_galileo, monitoring=True, payloads=payloads)
+        adapter.set_context("CD8 infiltration studies use bright-field IHC.", "reference")
+        try:
+            result = await adapter.analyze_research_text(WEAK_PROCEDURE_TEXT, user_id="user-1", session_id="session-1")
+            keyword_only = await adapter.analyze_research_text(WEAK_PROCEDURE_TEXT, enhance_fields=False)
+            return result, keyword_only, prompts, payloads, integration.telemetry.stats()
+        finally:
+            await integration.close()
+
+    result, keyword_only, prompts, payloads, telemetry = asyncio.run(scenario())
+    assert len(prompts) == 1
+    assert payloads[0]["user_id"] == "user-1" and payloads[0]["session_id"] == "session-1"
+    assert "CD8 infiltration studies use bright-field IHC." in prompts[0]
+    assert result.field_tiers["procedure_type"] == TIER_LLM
+    assert keyword_only.field_tiers["procedure_type"] == TIER_KEYWORD
+    assert telemetry["enqueued"] == 1
+    print("✅ Escalation sent attribution and reference context and logged analysis metrics")
+
+def test_fallback_result_has_no_llm_tiers():
+    """A Galileo outage result is not reported as answered by the LLM"""
+    result = AnalysisResult.from_galileo_result(DPIAAnalysisResult(is_fallback=True))
+    assert result.is_fallback and result.field_tiers is None
+    assert set(AnalysisResult.from_galileo_result(DPIAAnalysisResult()).field_tiers.values()) == {TIER_LLM}
+    print("✅ Fallback results carry no tier")
+
+def test_disabled_tiering_runs_full_analysis(mock_galileo):
+    """With tiering off every analysis goes to the full LLM prompt"""
+    async def scenario():
+        adapter, integration, prompts = _adapter(mock_galileo, tiered=False)
+        try:
+            result = await adapter.analyze_research_text(CLEAR_TEXT)
+            return result, prompts
+        finally:
+            await integration.close()
+
+    result, prompts = asyncio.run(scenario())
+    assert len(prompts) == 1 and "**Research Text:**" in prompts[0]
+    assert set(result.field_tiers.values()) == {TIER_LLM}
+    print("✅ Full LLM analysis when tiering is disabled")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(["-q", "-s", __file__]))
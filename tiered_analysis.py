@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tiered DPIA field detection
+Deterministic keyword detectors answer first, each with an evidence-based confidence;
+only fields below the confidence threshold are escalated to the LLM
+"""
+
+import os
+import re
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from scanning_summarizer import ScanningRequestSummarizer
+
+logger = logging.getLogger(__name__)
+
+# Tier that produced a field value
+TIER_KEYWORD = "keyword"
+TIER_LLM = "llm"
+
+# Recorded in place of the analysis prompt version for tiered results (and their cache keys)
+TIERED_ANALYSIS_VERSION = "dpia-tiered-v1"
+
+MANDATORY_FIELDS = ["therapeutic_area", "procedure_type", "assay_type", "pi_name", "pathologist"]
+TIERED_FIELDS = MANDATORY_FIELDS + ["project_title", "request_purpose"]
+
+# Used when the detectors find nothing, matching the DPIAAnalysisResult defaults
+FIELD_DEFAULTS = {"project_title": "Research Analysis", "request_purpose": "Data Analysis"}
+
+# The CALM/DPIA recommendation; the keyword tier only recognises DPIA, so escalated analyses also ask the LLM
+CASE_TYPE_FIELD = "recommended_case_type"
+CASE_TYPES = ("CALM", "DPIA")
+
+# Allowed values shown next to a field in field-scoped LLM prompts
+FIELD_HINTS = {CASE_TYPE_FIELD: "CALM or DPIA"}
+
+# Slide scanning indicators that always mean a DPIA case (same list as case creation uses)
+CRITICAL_DPIA_KEYWORDS = [
+    "slide scanning", "scan slides", "scanning", "slide submission", "submit slides",
+    "digital pathology", "gslide viewer", "dpia lab", "whole slide scanning",
+    "tissue section", "per section", "section analysis", "cells per lung section"
+]
+
+# Labels that show a value was stated rather than guessed
+_EXPLICIT_LABELS = {
+    "pi_name": re.compile(r"\b(?:pi|principal investigator|primary investigator|lead researcher)\b"),
+    "pathologist": re.compile(r"\b(?:pathologist|reviewed by|diagnosed by)\b"),
+    "project_title": re.compile(r"\btitle\b"),
+    "request_purpose": re.compile(r"\b(?:purpose|objective|goal|aim)\b")
+}
+
+# Confidence of a labelled value and of a contextual guess
+EXPLICIT_CONFIDENCE = 0.85
+INFERRED_CONFIDENCE = 0.45
+
+# Words that show a captured "name" ran into the surrounding sentence
+_NOT_NAME_WORDS = {"as", "is", "pi", "pathologist", "staining", "with", "for", "and", "lab", "study", "please"}
+
+class TieredAnalysisConfig(BaseModel):
+    """When the keyword tier may answer on its own"""
+    enabled: bool = True
+    confidence_threshold: float = 0.7  # fields below this are escalated to the LLM
+    escalation_fields: List[str] = Field(default_factory=lambda: list(MANDATORY_FIELDS))
+
+class FieldDetection(BaseModel):
+    """One detected field, how sure the detector is and why"""
+    value: str
+    confidence: float
+    evidence: str
+    tier: str = TIER_KEYWORD
+
+def keyword_confidence(scores: Dict[str, int], value: str) -> Tuple[float, str]:
+    """
+    Confidence for a category picked by keyword counts: grows with the number of hits
+    for the winner and shrinks with the share of hits the runner-up also got
+    """
+    if value == "Unknown":
+        return 0.0, "no keywords"
+    top = scores.get(value, 0)
+    if top == 0:
+        # Picked by a rule (e.g. fluorescence markers without a named stain), not by its own keywords
+        return 0.5, "inferred from related keywords"
+    runner_up = max((score for category, score in scores.items() if category != value), default=0)
+    margin = max(top - runner_up, 0) / top
+    ceiling = min(0.95, 0.5 + 0.15 * top)
+    return round(0.3 + (ceiling - 0.3) * margin, 2), f"{top} keyword hit(s), runner-up {runner_up}"
+
+class KeywordAnalyzer:
+    """Keyword tier of the tiered analysis, built on ScanningRequestSummarizer's detectors"""
+
+    def __init__(self, summarizer: Optional[ScanningRequestSummarizer] = None):
+        self.summarizer = summarizer or ScanningRequestSummarizer()
+
+    def detect_fields(self, text: str) -> Dict[str, FieldDetection]:
+        """Run every detector and attach an evidence-based confidence"""
+        summarizer = self.summarizer
+        text_lower = text.lower()
+        detections = {}
+
+        for field, detector, categories in (
+            ("therapeutic_area", summarizer.detect_therapeutic_area, summarizer.therapeutic_areas),
+            ("procedure_type", summarizer.detect_procedure, summarizer.procedures),
+            ("assay_type", summarizer.detect_assay_staining_type, summarizer.assay_staining_types)
+        ):
+            value = detector(text)
+            confidence, evidence = keyword_confidence(summarizer.keyword_scores(text, categories), value)
+            detections[field] = FieldDetection(value=value, confidence=confidence, evidence=evidence)
+
+        for field, detector in (
+            ("pi_name", summarizer.detect_pi),
+            ("pathologist", summarizer.detect_pathologist),
+            ("project_title", summarizer.detect_project_title),
+            ("request_purpose", summarizer.detect_request_purpose)
+        ):
+            value = detector(text)
+            if value == "Unknown":
+                detections[field] = FieldDetection(value=FIELD_DEFAULTS.get(field, "Unknown"), confidence=0.0, evidence="not found")
+            elif _EXPLICIT_LABELS[field].search(text_lower) and self._is_clean_value(field, value, text_lower):
+                detections[field] = FieldDetection(value=value, confidence=EXPLICIT_CONFIDENCE, evidence="explicitly labelled")
+            else:
+                detections[field] = FieldDetection(value=value, confidence=INFERRED_CONFIDENCE, evidence="inferred from context")
+        return detections
+
+    @staticmethod
+    def _is_clean_value(field: str, value: str, text_lower: str) -> bool:
+        """Names must look like names; titles and purposes must be quoted from the text, not synthesized"""
+        if field in ("pi_name", "pathologist"):
+            words = value.replace(".", " ").split()
+            return 1 <= len(words) <= 3 and all(word.isalpha() and word.lower() not in _NOT_NAME_WORDS for word in words)
+        return value.lower() in text_lower
+
+    @staticmethod
+    def classify_case_type(text: str) -> Tuple[str, float, str]:
+        """DPIA when slide scanning is mentioned; otherwise left for case creation to decide"""
+        text_lower = text.lower()
+        hits = [keyword for keyword in CRITICAL_DPIA_KEYWORDS if keyword in text_lower]
+        if hits:
+            return "DPIA", 0.9, f"Slide scanning indicators: {', '.join(hits)}"
+        return "Unknown", 0.0, "No slide scanning indicators found"
+
+    def build_analysis(self,
+                       text: str,
+                       detections: Dict[str, FieldDetection],
+                       summary: str = "",
+                       case_type: Optional[Tuple[str, float, str]] = None) -> Dict[str, Any]:
+        """
+        Analysis in the shape of the LLM's structured output (DPIAAnalysisResult fields).
+        case_type is (type, confidence, reasoning), by default from classify_case_type.
+        """
+        text_lower = text.lower()
+        missing = [field for field in MANDATORY_FIELDS if detections[field].value == "Unknown"]
+        case_type, case_confidence, case_reasoning = case_type or self.classify_case_type(text)
+        found = len(MANDATORY_FIELDS) - len(missing)
+        return {
+            **{field: detection.value for field, detection in detections.items()},
+            "biospecimen_type": "Tissue" if any(word in text_lower for word in ("tissue", "section", "biopsy")) else "Unknown",
+            "data_volume": "Unknown",
+            "sensitive_data": "Yes" if any(word in text_lower for word in ("patient", "human", "donor")) else "Unknown",
+            "cross_border_transfer": "Unknown",
+            "missing_fields": missing,
+            "confidence_scores": {field: detection.confidence for field, detection in detections.items()},
+            "interactive_prompts": [f"Please provide the {field.replace('_', ' ')}" for field in missing],
+            "suggestions": [f"Confirm the {field.replace('_', ' ')}" for field in missing] or ["Ready to create the case"],
+            "analysis_summary": summary or f"Keyword analysis detected {found}/{len(MANDATORY_FIELDS)} mandatory fields",
+            "recommended_case_type": case_type,
+            "case_type_confidence": case_confidence,
+            "case_type_reasoning": case_reasoning
+        }
+
+def create_tiered_analysis_config() -> TieredAnalysisConfig:
+    """
+    Create the tiered analysis configuration from environment variables.
+    GALILEO_TIERED_ANALYSIS=false sends every analysis to the LLM.
+    """
+    escalation_fields = os.getenv("GALILEO_TIER_ESCALATION_FIELDS")
+    return TieredAnalysisConfig(
+        enabled=os.getenv("GALILEO_TIERED_ANALYSIS", "true").lower() == "true",
+        confidence_threshold=float(os.getenv("GALILEO_TIER_CONFIDENCE_THRESHOLD", "0.7")),
+        escalation_fields=[field.strip() for field in escalation_fields.split(",") if field.strip()]
+        if escalation_fields else list(MANDATORY_FIELDS)
+    )